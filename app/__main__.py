@@ -1,19 +1,30 @@
 """
 AIRISS v4.1 모듈 실행 엔트리포인트
+
+    python -m app          # API 서버
+    python -m app worker   # 태스크 큐 워커 (workflow_tasks 테이블의 태스크를 가져와 실행)
 """
-from app.main import app
-import uvicorn
+import asyncio
 import os
+import sys
 
 if __name__ == "__main__":
-    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
-    SERVER_PORT = int(os.getenv("SERVER_PORT", "8002"))
-    
-    uvicorn.run(
-        app,
-        host=SERVER_HOST,
-        port=SERVER_PORT,
-        log_level="info",
-        reload=False,
-        access_log=True
-    )
+    if sys.argv[1:2] == ["worker"]:
+        from app.core.task_manager import run_worker
+        
+        asyncio.run(run_worker(num_workers=int(os.getenv("AIRISS_TASK_WORKERS", "5"))))
+    else:
+        from app.main import app
+        import uvicorn
+        
+        SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+        SERVER_PORT = int(os.getenv("SERVER_PORT", "8002"))
+        
+        uvicorn.run(
+            app,
+            host=SERVER_HOST,
+            port=SERVER_PORT,
+            log_level="info",
+            reload=False,
+            access_log=True
+        )
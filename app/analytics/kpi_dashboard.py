@@ -421,19 +421,21 @@ class AIRISSKPIDashboard:
 
 
 # FastAPI 라우터
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from app.utils.response_cache import cached_json_response
 
 kpi_router = APIRouter(prefix="/kpi", tags=["KPI Dashboard"])
 
 @kpi_router.get("/dashboard")
-async def get_kpi_dashboard(period_days: int = 30):
-    """KPI 대시보드 데이터 조회"""
+async def get_kpi_dashboard(request: Request, period_days: int = 30):
+    """KPI 대시보드 데이터 조회 (데이터 버전 기준 응답 캐시, ETag 재검증)"""
     dashboard = AIRISSKPIDashboard()
-    return dashboard.get_business_kpis(period_days)
+    return await cached_json_response(request, "kpi/dashboard", {"period_days": period_days},
+                                      lambda: dashboard.get_business_kpis(period_days))
 
 @kpi_router.get("/summary")
-async def get_kpi_summary():
+async def get_kpi_summary(request: Request):
     """KPI 요약 정보"""
     dashboard = AIRISSKPIDashboard()
-    data = dashboard.get_business_kpis(30)
-    return data.get("summary", {})
\ No newline at end of file
+    return await cached_json_response(request, "kpi/summary", None,
+                                      lambda: dashboard.get_business_kpis(30).get("summary", {}))
\ No newline at end of file
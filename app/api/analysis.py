@@ -21,6 +21,8 @@ import inspect
 from pathlib import Path
 from functools import lru_cache
 
+from app.utils.keyword_matcher import get_keyword_matcher
+
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
@@ -67,10 +69,10 @@ def init_services(ws_manager=None):
 
 # 서비스에서 하이브리드 분석기 import
 try:
-    from app.services import HybridAnalyzer
-    hybrid_analyzer = HybridAnalyzer()
+    from app.services.analyzer_registry import get_hybrid_analyzer
+    hybrid_analyzer = get_hybrid_analyzer()
     logger.info("✅ 서비스 HybridAnalyzer 로드 성공")
-except ImportError:
+except Exception:
     logger.warning("⚠️ 서비스 HybridAnalyzer 로드 실패, 로컬 정의 사용")
     hybrid_analyzer = None
 
@@ -476,6 +478,7 @@ class QuantitativeAnalyzer:
 class AIRISSTextAnalyzer:
     def __init__(self):
         self.framework = AIRISS_FRAMEWORK
+        self.keyword_matcher = get_keyword_matcher(self.framework)
         self.openai_available = False
         self.openai = None
         try:
@@ -491,19 +494,21 @@ class AIRISSTextAnalyzer:
         if not text or text.lower() in ['nan', 'null', '', 'none']:
             return {"score": 50, "confidence": 0, "signals": {"positive": 0, "negative": 0, "positive_words": [], "negative_words": []}}
         
-        keywords = self.framework[dimension]["keywords"]
-        text_lower = text.lower()
-        
-        positive_matches = []
-        negative_matches = []
-        
-        for word in keywords["positive"]:
-            if word in text_lower:
-                positive_matches.append(word)
+        hits = self.keyword_matcher.scan(text.lower())[dimension]
+        return self._score_dimension(text, hits)
+    
+    def analyze_all_dimensions(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """8대 영역 전체를 한 번의 키워드 스캔으로 분석 (영역별 결과는 analyze_text와 동일)"""
+        if not text or text.lower() in ['nan', 'null', '', 'none']:
+            return {dimension: self.analyze_text(text, dimension) for dimension in self.keyword_matcher.dimensions}
         
-        for word in keywords["negative"]:
-            if word in text_lower:
-                negative_matches.append(word)
+        keyword_hits = self.keyword_matcher.scan(text.lower())
+        return {dimension: self._score_dimension(text, hits) for dimension, hits in keyword_hits.items()}
+    
+    def _score_dimension(self, text: str, hits: Dict[str, List[str]]) -> Dict[str, Any]:
+        """키워드 매칭 결과로 영역 점수 및 신뢰도 산출"""
+        positive_matches = hits["positive"]
+        negative_matches = hits["negative"]
         
         positive_count = len(positive_matches)
         negative_count = len(negative_matches)
@@ -610,9 +615,7 @@ class AIRISSHybridAnalyzer:
         """종합 분석: 텍스트 + 정량 데이터"""
         
         # 1. 텍스트 분석
-        text_results = {}
-        for dimension in AIRISS_FRAMEWORK.keys():
-            text_results[dimension] = self.text_analyzer.analyze_text(opinion, dimension)
+        text_results = self.text_analyzer.analyze_all_dimensions(opinion)
         
         text_overall = self.text_analyzer.calculate_overall_score(
             {dim: result["score"] for dim, result in text_results.items()}
@@ -1029,7 +1032,24 @@ async def process_analysis_v4(job_id: str, request: AnalysisRequest, db_service,
         results = []
         total_rows = len(sample_df)
         
-        for idx, row in sample_df.iterrows():
+        # 하이브리드 모드는 전체 샘플을 먼저 일괄 점수화 (서비스 분석기 사용 시)
+        batch = None
+        if request.analysis_mode == "hybrid" and hasattr(hybrid_analyzer, "analyze_batch"):
+            batch_uid_col = uid_cols[0] if uid_cols and uid_cols[0] in sample_df.columns else None
+            batch_opinion_col = opinion_cols[0] if opinion_cols and opinion_cols[0] in sample_df.columns else None
+            batch_uids = (
+                [str(value) for value in sample_df[batch_uid_col].tolist()]
+                if batch_uid_col else [f"user_{idx}" for idx in sample_df.index]
+            )
+            batch_opinions = (
+                ["" if str(value).lower() in ['nan', 'null', '', 'none'] else str(value)
+                 for value in sample_df[batch_opinion_col].tolist()]
+                if batch_opinion_col else [""] * total_rows
+            )
+            batch = hybrid_analyzer.analyze_batch(batch_opinions, sample_df, uids=batch_uids)
+            logger.info(f"⚡ 일괄 점수화 완료: {len(batch)}행")
+        
+        for row_position, (idx, row) in enumerate(sample_df.iterrows()):
             try:
                 # UID와 의견 추출 (완전히 안전한 방식)
                 try:
@@ -1062,18 +1082,21 @@ async def process_analysis_v4(job_id: str, request: AnalysisRequest, db_service,
                     opinion = ""
                 
                 if request.analysis_mode == "hybrid" and opinion:
-                    analysis_result = hybrid_analyzer.comprehensive_analysis(
-                        uid=uid, 
-                        opinion=opinion, 
-                        row_data=row,
-                        save_to_storage=True,
-                        file_id=str(job_id),
-                        filename=filename,
-                        enable_ai=request.enable_ai_feedback,
-                        openai_api_key=request.openai_api_key,
-                        openai_model=request.openai_model,
-                        max_tokens=request.max_tokens
-                    )
+                    if batch is not None:
+                        # AI 피드백은 아래에서 별도로 생성하므로 여기서는 점수 + 저장만 수행
+                        analysis_result = await hybrid_analyzer.complete_batch_row(
+                            batch,
+                            row_position,
+                            save_to_storage=True,
+                            file_id=str(job_id),
+                            filename=filename
+                        )
+                    else:
+                        analysis_result = hybrid_analyzer.comprehensive_analysis(
+                            uid=uid, 
+                            opinion=opinion, 
+                            row_data=row
+                        )
                     text_analysis = analysis_result.get("text_analysis", {})
                     quant_analysis = analysis_result.get("quantitative_analysis", {})
                     hybrid_analysis = analysis_result.get("hybrid_analysis", {})
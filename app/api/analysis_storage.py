@@ -312,7 +312,7 @@ async def get_analysis_statistics(
 @router.get("/search")
 async def search_analysis_results(
     search_term: str = Query(..., description="검색어"),
-    search_type: str = Query("opinion", description="검색 타입 (opinion, uid, filename)"),
+    search_type: str = Query("opinion", description="검색 타입 (opinion, text: 의견+AI 피드백, uid, filename, all)"),
     limit: int = Query(50, description="결과 수 제한")
 ):
     """분석 결과 검색"""
@@ -31,8 +31,7 @@ async def create_download_link(
         logger.info(f"🔗 다운로드 링크 생성 요청: {job_id} - {format}")
         
         # 1. DB에서 분석 결과 조회
-        from app.db.sqlite_service import SQLiteService
-        db_service = SQLiteService()
+        from app.db.sqlite_service import sqlite_service as db_service
         await db_service.init_database()
         
         # 작업 존재 확인
@@ -13,8 +13,8 @@ import numpy as np
 # from sqlalchemy import text  # 주석 처리: Python 3.13 호환성 문제
 import asyncio
 from collections import Counter
-import re
-from app.db import db_service
+from app.db.sqlite_service import fulltext_condition, sqlite_service as db_service
+from app.utils.pagination import InvalidCursorError, count_cache, decode_cursor, encode_cursor, sqlite_keyset_segments
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -34,8 +34,10 @@ class SearchRequest(BaseModel):
     date_to: Optional[str] = None     # 분석 종료 날짜
     sort_by: str = "score"  # 정렬 기준: score, date, name, grade
     sort_order: str = "desc"  # 정렬 순서: asc, desc
-    page: int = 1           # 페이지 번호
+    page: int = 1           # 페이지 번호 (cursor 가 없을 때만 사용)
     page_size: int = 20     # 페이지 크기
+    cursor: Optional[str] = None  # 다음 페이지 커서 (이전 응답의 pagination.next_cursor)
+    include_total: bool = True    # 전체 건수 포함 여부 (조건별로 캐시됨)
     include_details: bool = False  # 상세 정보 포함 여부
 
 class AutocompleteRequest(BaseModel):
@@ -62,118 +64,125 @@ async def search_analysis_results(request: SearchRequest):
     try:
         logger.info(f"🔍 고급 검색 요청: {request}")
         
-        await db_service.init_database()
-        
-        # SQL 쿼리 빌드
-        base_query = """
-        SELECT DISTINCT
-            r.uid,
-            r.result_data,
-            j.created_at as analysis_date,
-            j.file_id,
-            j.id as job_id
-        FROM results r
-        JOIN jobs j ON r.job_id = j.id
-        WHERE j.status = 'completed'
-        """
-        
+        # SQL 쿼리 빌드 (필터/정렬은 results 의 인덱스 컬럼 사용 - JSON 파싱 없음)
+        conditions = ["j.status = 'completed'"]
         params = []
-        conditions = []
         
-        # 🔍 검색 조건 추가 (쿼리-파라미터 개수 일치 보장)
-        if request.uid and request.query:
-            conditions.append("(r.uid LIKE ? OR r.result_data LIKE ?)")
-            params.extend([f"%{request.uid}%", f"%{request.query}%"])
-        elif request.uid:
+        # 🔍 검색 조건 추가
+        if request.uid:
             conditions.append("r.uid LIKE ?")
             params.append(f"%{request.uid}%")
-        elif request.query:
-            conditions.append("r.result_data LIKE ?")
-            params.append(f"%{request.query}%")
+        if request.query:
+            # 인덱스 컬럼 부분 일치 또는 의견/AI 피드백 전문 검색 (results_fts)
+            query_conditions = ["r.uid LIKE ?", "r.name LIKE ?", "r.department LIKE ?", "r.position LIKE ?", "r.grade LIKE ?"]
+            params.extend([f"%{request.query}%"] * len(query_conditions))
+            text_condition, text_params = fulltext_condition(request.query)
+            if text_condition:
+                query_conditions.append(text_condition)
+                params.extend(text_params)
+            conditions.append("(" + " OR ".join(query_conditions) + ")")
         
         if request.department:
-            conditions.append("r.result_data LIKE ?")
-            params.append(f'%"부서":"%{request.department}%"%')
+            conditions.append("r.department LIKE ?")
+            params.append(f"%{request.department}%")
         
         if request.grade:
-            conditions.append("r.result_data LIKE ?")
-            params.append(f'%"OK등급":"{request.grade}"%')
+            conditions.append("r.grade = ?")
+            params.append(request.grade)
         
         # 점수 범위 필터링
         if request.score_min is not None:
-            conditions.append("CAST(json_extract(r.result_data, '$.AIRISS_v4_종합점수') AS REAL) >= ?")
+            conditions.append("r.score >= ?")
             params.append(request.score_min)
         
         if request.score_max is not None:
-            conditions.append("CAST(json_extract(r.result_data, '$.AIRISS_v4_종합점수') AS REAL) <= ?")
+            conditions.append("r.score <= ?")
             params.append(request.score_max)
         
         # 날짜 범위 필터링
         if request.date_from:
-            conditions.append("j.created_at >= ?")
+            conditions.append("r.analyzed_at >= ?")
             params.append(request.date_from)
         
         if request.date_to:
-            conditions.append("j.created_at <= ?")
+            conditions.append("r.analyzed_at <= ?")
             params.append(request.date_to)
         
-        # WHERE 절 추가
-        if conditions:
-            base_query += " AND " + " AND ".join(conditions)
+        from_sql = f"""
+        FROM results r
+        JOIN jobs j ON r.job_id = j.id
+        WHERE {" AND ".join(conditions)}
+        """
         
         # 정렬 추가
         order_mapping = {
-            "score": "CAST(json_extract(r.result_data, '$.AIRISS_v4_종합점수') AS REAL)",
-            "date": "j.created_at",
+            "score": "r.score",
+            "date": "r.analyzed_at",
             "name": "r.uid",
-            "grade": "json_extract(r.result_data, '$.OK등급')"
+            "grade": "r.grade"
         }
         
-        order_column = order_mapping.get(request.sort_by, order_mapping["score"])
-        order_direction = "DESC" if request.sort_order.lower() == "desc" else "ASC"
-        base_query += f" ORDER BY {order_column} {order_direction}"
+        sort_by = request.sort_by if request.sort_by in order_mapping else "score"
+        order_column = order_mapping[sort_by]
+        descending = request.sort_order.lower() == "desc"
+        order_direction = "DESC" if descending else "ASC"
+        sort_key = f"{sort_by}:{order_direction.lower()}"
         
-        # 페이징 추가
-        offset = (request.page - 1) * request.page_size
+        # 페이징: 커서가 있으면 키셋 (정렬값, rowid) 다음부터, 없으면 page 기준 OFFSET
+        segments = [("1", [])]
+        offset = 0
+        if request.cursor:
+            try:
+                sort_value, tie_value = decode_cursor(request.cursor, sort_key, size=2)
+            except (InvalidCursorError, ValueError) as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            segments = sqlite_keyset_segments(order_column, "r.rowid", sort_value, tie_value, descending)
+        else:
+            offset = (request.page - 1) * request.page_size
         
-        # 🔥 수정: 단일 커넥션으로 모든 쿼리 실행
         results = []
-        total_count = 0
+        total_count = None
+        count_key = ("search.results", " AND ".join(conditions), tuple(params))
         
         try:
-            # 단일 커넥션 생성
-            conn = await db_service.get_connection()
-            
-            # 전체 개수 조회 (먼저)
-            count_query = re.sub(
-                r"SELECT DISTINCT[\s\S]+?FROM",
-                "SELECT COUNT(DISTINCT r.uid) FROM",
-                base_query.split("ORDER BY")[0],
-                flags=re.MULTILINE
-            )
-            count_params = params[:len(conditions)]
-            logger.debug(f"[COUNT-QUERY] SQL: {count_query}")
-            logger.debug(f"[COUNT-QUERY] PARAMS: {count_params}")
-            count_cursor = await conn.execute(count_query, count_params)
-            count_result = await count_cursor.fetchone()
-            total_count = int(count_result[0]) if count_result else 0
-            await count_cursor.close()
+            # 풀에서 커넥션 대여 (반납 시 자동 정리)
+            async with db_service.connection() as conn:
+                # 전체 개수 - 같은 조건은 캐시 재사용 (다음 페이지 이동 시 다시 세지 않음)
+                if request.include_total:
+                    total_count = count_cache.get(count_key)
+                    if total_count is None:
+                        count_cursor = await conn.execute(f"SELECT COUNT(*) {from_sql}", params)
+                        count_result = await count_cursor.fetchone()
+                        total_count = int(count_result[0]) if count_result else 0
+                        await count_cursor.close()
+                        count_cache.set(count_key, total_count)
             
-            # 메인 쿼리 실행 (페이징 적용)
-            paginated_query = base_query + f" LIMIT {request.page_size} OFFSET {offset}"
-            cursor = await conn.execute(paginated_query, params)
-            rows = await cursor.fetchall()
-            await cursor.close()
-            
-            # 커넥션 종료
-            await conn.close()
+                # 메인 쿼리 실행 (다음 페이지 유무 확인용으로 1건 더 조회, 키셋 구간은 페이지가 찰 때까지 순서대로)
+                rows = []
+                for segment_sql, segment_params in segments:
+                    paginated_query = f"""
+                    SELECT r.uid, r.result_data, r.analyzed_at, j.file_id, j.id as job_id, r.score, r.grade,
+                           {order_column}, r.rowid
+                    {from_sql} AND {segment_sql}
+                    ORDER BY {order_column} {order_direction}, r.rowid {order_direction}
+                    LIMIT ? OFFSET ?
+                    """
+                    cursor = await conn.execute(
+                        paginated_query, [*params, *segment_params, request.page_size + 1 - len(rows), offset]
+                    )
+                    rows.extend(await cursor.fetchall())
+                    await cursor.close()
+                    if len(rows) > request.page_size:
+                        break
             
         except Exception as db_error:
             logger.error(f"❌ DB 쿼리 오류: {db_error}")
-            if 'conn' in locals():
-                await conn.close()
             raise HTTPException(status_code=500, detail=f"데이터베이스 오류: {str(db_error)}")
         
+        has_more = len(rows) > request.page_size
+        rows = rows[:request.page_size]
+        next_cursor = encode_cursor(sort_key, rows[-1][7:9]) if has_more and rows else None
+        
         # 결과 처리
         for row in rows:
             try:
@@ -186,8 +195,8 @@ async def search_analysis_results(request: SearchRequest):
                     "analysis_date": row[2],
                     "file_id": row[3],
                     "job_id": row[4],
-                    "score": result_data.get("AIRISS_v4_종합점수", 0),
-                    "grade": result_data.get("OK등급", ""),
+                    "score": row[5] if row[5] is not None else 0,
+                    "grade": row[6] or "",
                     "grade_description": result_data.get("등급설명", ""),
                     "percentile": result_data.get("백분위", ""),
                     "confidence": result_data.get("분석신뢰도", 0)
@@ -226,11 +235,13 @@ async def search_analysis_results(request: SearchRequest):
                 "page": request.page,
                 "page_size": request.page_size,
                 "total_count": total_count,
-                "total_pages": (total_count + request.page_size - 1) // request.page_size if total_count > 0 else 0
+                "total_pages": (total_count + request.page_size - 1) // request.page_size if total_count else 0,
+                "next_cursor": next_cursor,
+                "has_more": has_more
             },
             "search_info": {
                 "query": request.query,
-                "filters_applied": len(conditions),
+                "filters_applied": len(conditions) - 1,
                 "sort_by": request.sort_by,
                 "sort_order": request.sort_order
             },
@@ -241,7 +252,7 @@ async def search_analysis_results(request: SearchRequest):
             }
         }
         
-        logger.info(f"✅ 검색 완료: {len(results)}개 결과 반환 (전체 {total_count}개)")
+        logger.info(f"✅ 검색 완료: {len(results)}개 결과 반환 (전체 {total_count if total_count is not None else '-'}개)")
         return response
         
     except HTTPException:
@@ -251,6 +262,40 @@ async def search_analysis_results(request: SearchRequest):
         logger.error(f"오류 상세: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"검색 실패: {str(e)}")
 
+# 🎯 의견/AI 피드백 전문 검색
+@router.get("/fulltext")
+async def search_fulltext(
+    q: str = Query(..., min_length=1, description="검색어 (공백으로 여러 단어 AND 검색)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """평가의견/AI 강점·약점·피드백 전문 검색 - 관련도 순위와 강조 스니펫 포함"""
+    try:
+        logger.info(f"🔎 전문 검색 요청: {q}")
+        started = datetime.now()
+        found = await db_service.search_text(q, limit=limit, offset=offset)
+        elapsed_ms = round((datetime.now() - started).total_seconds() * 1000, 1)
+        
+        logger.info(f"✅ 전문 검색 완료: {len(found['results'])}개 반환 (일치 {found['total']}개, {elapsed_ms}ms)")
+        return {
+            "results": found["results"],
+            "pagination": {
+                "offset": offset,
+                "limit": limit,
+                "total_count": found["total"],
+                "total_capped": found["total_capped"]
+            },
+            "search_info": {
+                "query": q,
+                "ranking": "bm25" if found["ranked"] else "recent",
+                "elapsed_ms": elapsed_ms
+            }
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ 전문 검색 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"전문 검색 실패: {str(e)}")
+
 def _calculate_grade_distribution(results):
     """등급별 분포 계산"""
     if not results:
@@ -270,8 +315,6 @@ async def get_autocomplete_suggestions(request: AutocompleteRequest):
     try:
         logger.info(f"🔤 자동완성 요청: {request}")
         
-        await db_service.init_database()
-        
         suggestions = []
         query = ""
         params = []
@@ -286,23 +329,13 @@ async def get_autocomplete_suggestions(request: AutocompleteRequest):
             """
             params = [f"%{request.query}%", request.limit]
             
-        elif request.field == "grade":
-            query = """
-            SELECT DISTINCT json_extract(r.result_data, '$.OK등급') as grade
+        elif request.field in ("grade", "department", "name"):
+            column = request.field
+            query = f"""
+            SELECT DISTINCT r.{column}
             FROM results r
-            WHERE json_extract(r.result_data, '$.OK등급') LIKE ?
-            ORDER BY grade
-            LIMIT ?
-            """
-            params = [f"%{request.query}%", request.limit]
-            
-        elif request.field == "department":
-            query = """
-            SELECT DISTINCT json_extract(r.result_data, '$.부서') as dept
-            FROM results r
-            WHERE json_extract(r.result_data, '$.부서') LIKE ?
-            AND json_extract(r.result_data, '$.부서') IS NOT NULL
-            ORDER BY dept
+            WHERE r.{column} LIKE ?
+            ORDER BY r.{column}
             LIMIT ?
             """
             params = [f"%{request.query}%", request.limit]
@@ -312,18 +345,15 @@ async def get_autocomplete_suggestions(request: AutocompleteRequest):
         
         # 🔥 단일 커넥션 사용
         try:
-            conn = await db_service.get_connection()
-            cursor = await conn.execute(query, params)
-            rows = await cursor.fetchall()
-            await cursor.close()
-            await conn.close()
+            async with db_service.connection() as conn:
+                cursor = await conn.execute(query, params)
+                rows = await cursor.fetchall()
+                await cursor.close()
             
             suggestions = [row[0] for row in rows if row[0]]
             
         except Exception as db_error:
             logger.error(f"❌ 자동완성 DB 오류: {db_error}")
-            if 'conn' in locals():
-                await conn.close()
             raise HTTPException(status_code=500, detail=f"자동완성 DB 오류: {str(db_error)}")
         
         logger.info(f"✅ 자동완성: {len(suggestions)}개 제안")
@@ -351,34 +381,31 @@ async def get_employee_history(
     try:
         logger.info(f"👤 직원 히스토리 조회: {uid}")
         
-        await db_service.init_database()
-        
         query = """
         SELECT 
             r.result_data,
-            j.created_at,
+            r.analyzed_at,
             j.id,
-            j.file_id
+            j.file_id,
+            r.score,
+            r.grade
         FROM results r
         JOIN jobs j ON r.job_id = j.id
         WHERE r.uid = ? AND j.status = 'completed'
-        ORDER BY j.created_at DESC
+        ORDER BY r.analyzed_at DESC
         LIMIT ?
         """
         
         # 🔥 단일 커넥션 사용
         rows = []
         try:
-            conn = await db_service.get_connection()
-            cursor = await conn.execute(query, [uid, limit])
-            rows = await cursor.fetchall()
-            await cursor.close()
-            await conn.close()
+            async with db_service.connection() as conn:
+                cursor = await conn.execute(query, [uid, limit])
+                rows = await cursor.fetchall()
+                await cursor.close()
             
         except Exception as db_error:
             logger.error(f"❌ 직원 히스토리 DB 오류: {db_error}")
-            if 'conn' in locals():
-                await conn.close()
             raise HTTPException(status_code=500, detail=f"히스토리 DB 오류: {str(db_error)}")
         
         if not rows:
@@ -395,8 +422,8 @@ async def get_employee_history(
                 result_data = json.loads(row[0]) if isinstance(row[0], str) else row[0]
                 
                 analysis_date = row[1]
-                score = result_data.get("AIRISS_v4_종합점수", 0)
-                grade = result_data.get("OK등급", "")
+                score = row[4] if row[4] is not None else 0
+                grade = row[5] or ""
                 
                 entry = {
                     "analysis_date": analysis_date,
@@ -500,38 +527,36 @@ async def compare_employees(request: CompareRequest):
         if len(request.uids) > 10:
             raise HTTPException(status_code=400, detail="한 번에 최대 10명까지만 비교할 수 있습니다")
         
-        await db_service.init_database()
-        
         # 🔥 핵심 수정: 단일 커넥션으로 모든 직원 데이터 조회
         comparison_data = []
         
         try:
-            # 단일 커넥션 생성
-            conn = await db_service.get_connection()
-            
-            # 전체 직원의 최신 분석 결과를 한 번에 조회
-            uid_placeholders = ", ".join(["?" for _ in request.uids])
-            batch_query = f"""
-            WITH latest_analysis AS (
-                SELECT 
-                    r.uid,
-                    r.result_data,
-                    j.created_at,
-                    ROW_NUMBER() OVER (PARTITION BY r.uid ORDER BY j.created_at DESC) as rn
-                FROM results r
-                JOIN jobs j ON r.job_id = j.id
-                WHERE r.uid IN ({uid_placeholders}) AND j.status = 'completed'
-            )
-            SELECT uid, result_data, created_at
-            FROM latest_analysis
-            WHERE rn = 1
-            ORDER BY uid
-            """
+            # 풀에서 커넥션 대여 (반납 시 자동 정리)
+            async with db_service.connection() as conn:
+                # 전체 직원의 최신 분석 결과를 한 번에 조회
+                uid_placeholders = ", ".join(["?" for _ in request.uids])
+                batch_query = f"""
+                WITH latest_analysis AS (
+                    SELECT 
+                        r.uid,
+                        r.result_data,
+                        r.analyzed_at,
+                        r.score,
+                        r.grade,
+                        ROW_NUMBER() OVER (PARTITION BY r.uid ORDER BY r.analyzed_at DESC) as rn
+                    FROM results r
+                    JOIN jobs j ON r.job_id = j.id
+                    WHERE r.uid IN ({uid_placeholders}) AND j.status = 'completed'
+                )
+                SELECT uid, result_data, analyzed_at, score, grade
+                FROM latest_analysis
+                WHERE rn = 1
+                ORDER BY uid
+                """
             
-            cursor = await conn.execute(batch_query, request.uids)
-            rows = await cursor.fetchall()
-            await cursor.close()
-            await conn.close()
+                cursor = await conn.execute(batch_query, request.uids)
+                rows = await cursor.fetchall()
+                await cursor.close()
             
             # 결과 처리
             found_uids = set()
@@ -545,8 +570,8 @@ async def compare_employees(request: CompareRequest):
                     employee_data = {
                         "uid": uid,
                         "analysis_date": analysis_date,
-                        "overall_score": result_data.get("AIRISS_v4_종합점수", 0),
-                        "grade": result_data.get("OK등급", ""),
+                        "overall_score": row[3] if row[3] is not None else 0,
+                        "grade": row[4] or "",
                         "dimension_scores": {
                             "업무성과": result_data.get("업무성과_점수", 0),
                             "KPI달성": result_data.get("KPI달성_점수", 0),
@@ -583,8 +608,6 @@ async def compare_employees(request: CompareRequest):
                 
         except Exception as db_error:
             logger.error(f"❌ 비교 분석 DB 오류: {db_error}")
-            if 'conn' in locals():
-                await conn.close()
             raise HTTPException(status_code=500, detail=f"비교 분석 DB 오류: {str(db_error)}")
         
         if len(comparison_data) < 2:
@@ -699,93 +722,94 @@ async def get_team_summary(
     try:
         logger.info(f"🏢 팀 요약 조회: 부서={department}")
         
-        await db_service.init_database()
-        
-        # 기본 쿼리
-        base_query = """
-        SELECT 
-            r.result_data,
-            j.created_at
-        FROM results r
-        JOIN jobs j ON r.job_id = j.id
-        WHERE j.status = 'completed'
-        """
-        
+        # 부서 x 등급 단위로 DB 에서 집계 - 날짜 조건이 없으면 작업별 집계(result_stats)만 읽음
+        conditions = ["j.status = 'completed'"]
         params = []
         
-        # 부서 필터
-        if department:
-            base_query += " AND r.result_data LIKE ?"
-            params.append(f'%"부서":"%{department}%"%')
-        
-        # 날짜 필터
-        if date_from:
-            base_query += " AND j.created_at >= ?"
-            params.append(date_from)
-        
-        if date_to:
-            base_query += " AND j.created_at <= ?"
-            params.append(date_to)
+        if date_from or date_to:
+            # 날짜 필터는 결과 행 단위 조건이므로 results 에서 직접 집계
+            if department:
+                conditions.append("r.department LIKE ?")
+                params.append(f"%{department}%")
+            if date_from:
+                conditions.append("r.analyzed_at >= ?")
+                params.append(date_from)
+            if date_to:
+                conditions.append("r.analyzed_at <= ?")
+                params.append(date_to)
+            
+            query = f"""
+            SELECT 
+                COALESCE(r.department, '미분류') as dept,
+                COALESCE(r.grade, '') as grade,
+                COUNT(*),
+                SUM(COALESCE(r.score, 0)),
+                MAX(COALESCE(r.score, 0)),
+                MIN(COALESCE(r.score, 0))
+            FROM results r
+            JOIN jobs j ON r.job_id = j.id
+            WHERE {" AND ".join(conditions)}
+            GROUP BY dept, grade
+            """
+        else:
+            if department:
+                conditions.append("s.department LIKE ?")
+                params.append(f"%{department}%")
+            
+            # 점수 없는 결과는 0점으로 (결과 행 집계와 동일)
+            query = f"""
+            SELECT 
+                CASE WHEN s.department = '' THEN '미분류' ELSE s.department END as dept,
+                s.grade,
+                SUM(s.count),
+                SUM(s.score_sum),
+                MAX(CASE WHEN s.score_count < s.count THEN MAX(COALESCE(s.score_max, 0), 0) ELSE s.score_max END),
+                MIN(CASE WHEN s.score_count < s.count THEN MIN(COALESCE(s.score_min, 0), 0) ELSE s.score_min END)
+            FROM result_stats s
+            JOIN jobs j ON s.job_id = j.id
+            WHERE {" AND ".join(conditions)}
+            GROUP BY dept, s.grade
+            """
         
-        # 🔥 단일 커넥션 사용
         rows = []
         try:
-            conn = await db_service.get_connection()
-            cursor = await conn.execute(base_query, params)
-            rows = await cursor.fetchall()
-            await cursor.close()
-            await conn.close()
+            async with db_service.connection() as conn:
+                cursor = await conn.execute(query, params)
+                rows = await cursor.fetchall()
+                await cursor.close()
             
         except Exception as db_error:
             logger.error(f"❌ 팀 요약 DB 오류: {db_error}")
-            if 'conn' in locals():
-                await conn.close()
             raise HTTPException(status_code=500, detail=f"팀 요약 DB 오류: {str(db_error)}")
         
-        # 데이터 처리
+        # 부서 단위로 합산
         team_data = {}
         total_analyses = 0
         
-        for row in rows:
-            try:
-                import json
-                result_data = json.loads(row[0]) if isinstance(row[0], str) else row[0]
-                
-                dept = result_data.get("부서", "미분류")
-                score = result_data.get("AIRISS_v4_종합점수", 0)
-                grade = result_data.get("OK등급", "")
-                
-                if dept not in team_data:
-                    team_data[dept] = {
-                        "department": dept,
-                        "scores": [],
-                        "grades": [],
-                        "analysis_count": 0
-                    }
-                
-                team_data[dept]["scores"].append(score)
-                team_data[dept]["grades"].append(grade)
-                team_data[dept]["analysis_count"] += 1
-                total_analyses += 1
-                
-            except Exception as e:
-                logger.error(f"⚠️ 팀 데이터 처리 오류: {e}")
-                continue
+        for dept, grade, count, score_sum, score_max, score_min in rows:
+            data = team_data.setdefault(dept, {
+                "count": 0, "score_sum": 0.0, "highest": score_max, "lowest": score_min, "grades": {}
+            })
+            data["count"] += count
+            data["score_sum"] += score_sum or 0
+            data["highest"] = max(data["highest"], score_max)
+            data["lowest"] = min(data["lowest"], score_min)
+            data["grades"][grade] = data["grades"].get(grade, 0) + count
+            total_analyses += count
         
         # 팀별 통계 계산
         team_summary = []
         for dept, data in team_data.items():
-            if data["scores"]:
-                summary = {
-                    "department": dept,
-                    "analysis_count": data["analysis_count"],
-                    "average_score": round(np.mean(data["scores"]), 1),
-                    "highest_score": max(data["scores"]),
-                    "lowest_score": min(data["scores"]),
-                    "grade_distribution": dict(Counter(data["grades"])),
-                    "performance_level": _classify_team_performance(np.mean(data["scores"]))
-                }
-                team_summary.append(summary)
+            average = data["score_sum"] / data["count"]
+            team_summary.append({
+                "department": dept,
+                "analysis_count": data["count"],
+                "average_score": round(average, 1),
+                "highest_score": data["highest"],
+                "lowest_score": data["lowest"],
+                "grade_distribution": data["grades"],
+                "performance_level": _classify_team_performance(average)
+            })
         
         # 정렬 (평균 점수 기준)
         team_summary.sort(key=lambda x: x["average_score"], reverse=True)
@@ -913,47 +937,43 @@ async def get_favorites(
         # 상세 정보 포함 여부에 따라 분기
         if include_details:
             # 🔥 단일 커넥션으로 모든 즐겨찾기 분석 결과 조회
-            await db_service.init_database()
-            
             detailed_favorites = []
             favorite_uids = [f["uid"] for f in user_favorites]
             
             try:
-                conn = await db_service.get_connection()
-                
-                # 배치로 모든 즐겨찾기의 최신 분석 결과 조회
-                uid_placeholders = ", ".join(["?" for _ in favorite_uids])
-                batch_query = f"""
-                WITH latest_analysis AS (
-                    SELECT 
-                        r.uid,
-                        r.result_data,
-                        j.created_at,
-                        ROW_NUMBER() OVER (PARTITION BY r.uid ORDER BY j.created_at DESC) as rn
-                    FROM results r
-                    JOIN jobs j ON r.job_id = j.id
-                    WHERE r.uid IN ({uid_placeholders}) AND j.status = 'completed'
-                )
-                SELECT uid, result_data, created_at
-                FROM latest_analysis
-                WHERE rn = 1
-                """
+                async with db_service.connection() as conn:
+                    # 배치로 모든 즐겨찾기의 최신 분석 결과 조회
+                    uid_placeholders = ", ".join(["?" for _ in favorite_uids])
+                    batch_query = f"""
+                    WITH latest_analysis AS (
+                        SELECT 
+                            r.uid,
+                            r.result_data,
+                            r.analyzed_at,
+                            r.score,
+                            r.grade,
+                            ROW_NUMBER() OVER (PARTITION BY r.uid ORDER BY r.analyzed_at DESC) as rn
+                        FROM results r
+                        JOIN jobs j ON r.job_id = j.id
+                        WHERE r.uid IN ({uid_placeholders}) AND j.status = 'completed'
+                    )
+                    SELECT uid, result_data, analyzed_at, score, grade
+                    FROM latest_analysis
+                    WHERE rn = 1
+                    """
                 
-                cursor = await conn.execute(batch_query, favorite_uids)
-                analysis_results = await cursor.fetchall()
-                await cursor.close()
-                await conn.close()
+                    cursor = await conn.execute(batch_query, favorite_uids)
+                    analysis_results = await cursor.fetchall()
+                    await cursor.close()
                 
                 # 분석 결과를 딕셔너리로 변환
                 analysis_dict = {}
                 for row in analysis_results:
                     try:
-                        import json
                         uid = row[0]
-                        result_data = json.loads(row[1]) if isinstance(row[1], str) else row[1]
                         analysis_dict[uid] = {
-                            "latest_score": result_data.get("AIRISS_v4_종합점수", 0),
-                            "latest_grade": result_data.get("OK등급", ""),
+                            "latest_score": row[3] if row[3] is not None else 0,
+                            "latest_grade": row[4] or "",
                             "last_analysis": row[2],
                             "has_analysis": True
                         }
@@ -978,8 +998,6 @@ async def get_favorites(
                     
             except Exception as db_error:
                 logger.error(f"❌ 즐겨찾기 상세 조회 DB 오류: {db_error}")
-                if 'conn' in locals():
-                    await conn.close()
                 # DB 오류 시 기본 정보만 반환
                 detailed_favorites = [
                     {**favorite, "has_analysis": False, "error": str(db_error)} 
@@ -1067,8 +1085,9 @@ async def search_health_check():
             "status": "healthy",
             "service": "AIRISS Search API v4.1 Enhanced - Connection Optimized",
             "database": db_status,
+            "connection_pool": db_service.pool_stats(),
             "features": [
-                "고급 검색", "자동완성", "직원 히스토리", 
+                "고급 검색", "전문 검색", "자동완성", "직원 히스토리", 
                 "다중 비교", "팀 분석", "검색 히스토리", "즐겨찾기"
             ],
             "optimizations": [
@@ -4,15 +4,15 @@ AIRISS v4.0 분석 API 엔드포인트
 실시간 WebSocket 통합
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Header, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import io
 import logging
 
 from app.core.websocket_manager import ConnectionManager, manager
-from app.services.analysis_service import AnalysisService
+from app.services.analysis_service import AnalysisService, get_shared_analysis_service
 import json
 from app.exceptions import (
     AnalysisError,
@@ -32,21 +32,23 @@ class AnalysisRequest(BaseModel):
     openai_api_key: Optional[str] = None
     openai_model: str = "gpt-3.5-turbo"
     max_tokens: int = 1200
+    bypass_llm_cache: bool = False
+    llm_pack_size: Optional[int] = None  # AI 피드백 묶음 요청 직원 수 (없으면 AIRISS_LLM_PACK_SIZE)
+    chunk_size: Optional[int] = None  # 파이프라인 청크 크기 (없으면 AIRISS_ANALYSIS_CHUNK_SIZE)
+    dedup_opinions: Optional[bool] = None  # 중복 의견 묶기 (없으면 AIRISS_DEDUP_OPINIONS)
+
+# 사전 추정 요청 모델 (분석 요청과 같은 옵션 + 비교할 모델)
+class EstimateRequest(AnalysisRequest):
+    compare_models: Optional[List[str]] = None
 
 # 의존성 주입을 위한 함수
 def get_ws_manager():
     """WebSocket 매니저 인스턴스 반환"""
     return manager
 
-# 싱글톤 분석 서비스 인스턴스
-_analysis_service = None
-
 def get_analysis_service(ws_manager: ConnectionManager = Depends(get_ws_manager)):
-    """분석 서비스 싱글톤 인스턴스 반환"""
-    global _analysis_service
-    if _analysis_service is None:
-        _analysis_service = AnalysisService(ws_manager)
-    return _analysis_service
+    """분석 서비스 싱글톤 인스턴스 반환 (작업 복구와 같은 인스턴스)"""
+    return get_shared_analysis_service(ws_manager)
 
 @router.post("/upload")
 async def upload_file(
@@ -109,7 +111,11 @@ async def start_analysis(
             enable_ai_feedback=request.enable_ai_feedback,
             openai_api_key=request.openai_api_key,
             openai_model=request.openai_model,
-            max_tokens=request.max_tokens
+            max_tokens=request.max_tokens,
+            bypass_llm_cache=request.bypass_llm_cache,
+            llm_pack_size=request.llm_pack_size,
+            chunk_size=request.chunk_size,
+            dedup_opinions=request.dedup_opinions
         )
         return {"job_id": job_id, "status": "started", "message": "분석이 시작되었습니다"}
         
@@ -128,6 +134,34 @@ async def start_analysis(
         logger.error(f"Unexpected error in analyze: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/estimate/{file_id}")
+async def estimate_analysis(
+    file_id: str,
+    request: EstimateRequest,
+    service: AnalysisService = Depends(get_analysis_service)
+):
+    """분석 사전 추정 - 행 수/고유 의견 수/모델별 토큰·비용/예상 소요 시간/예상 메모리 (작업은 시작하지 않음)"""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        return await service.estimate_analysis(
+            file_id=file_id,
+            sample_size=request.sample_size,
+            enable_ai_feedback=request.enable_ai_feedback,
+            openai_model=request.openai_model,
+            max_tokens=request.max_tokens,
+            bypass_llm_cache=request.bypass_llm_cache,
+            llm_pack_size=request.llm_pack_size,
+            chunk_size=request.chunk_size,
+            dedup_opinions=request.dedup_opinions,
+            compare_models=request.compare_models
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in estimate: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/status/{job_id}")
 async def get_job_status(
     job_id: str,
@@ -146,6 +180,55 @@ async def get_job_status(
         logger.error(f"Unexpected error in get_job_status: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/resume/{job_id}")
+async def resume_job(
+    job_id: str,
+    service: AnalysisService = Depends(get_analysis_service)
+):
+    """
+    중단된 분석 작업을 마지막 체크포인트부터 재개
+
+    다른 인스턴스가 실행 중인 작업은 임대(AIRISS_JOB_LEASE_SECONDS)가 만료될 때까지 재개할 수 없습니다.
+    체크포인트 이후 행의 AI 피드백은 재개하는 인스턴스의 로컬 LLM 응답 캐시(AIRISS_LLM_CACHE_PATH)에
+    남아 있는 경우에만 재사용되며, 재배포로 캐시 파일이 사라졌거나 캐시가 꺼져 있으면 다시 요청됩니다.
+    """
+    resumed = await service.resume_analysis(job_id)
+    if not resumed:
+        raise HTTPException(status_code=409, detail="재개할 수 있는 작업이 아닙니다 (없음/완료/실행 중)")
+    return {"job_id": job_id, "status": "resumed", "resumed_from": service.active_jobs[job_id].get('resumed_from', 0)}
+
+@router.get("/stream/{job_id}")
+async def stream_results(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="이 원본 행 번호부터 전송 (재접속 시 마지막 row + 1)"),
+    format: str = Query("ndjson", description="ndjson 또는 sse"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    service: AnalysisService = Depends(get_analysis_service)
+):
+    """실행 중인 작업의 직원 결과를 청크 저장 즉시 스트리밍 (NDJSON / Server-Sent Events)"""
+    from app.services.result_stream import STREAM_FORMATS, format_ndjson, format_sse, iter_job_results
+    
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {format} (ndjson, sse)")
+    if service.get_job_status(job_id) is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    
+    # SSE 자동 재연결은 Last-Event-ID(마지막 행 번호)로 이어받기
+    if last_event_id and last_event_id.isdigit():
+        offset = max(offset, int(last_event_id) + 1)
+    
+    formatter = format_sse if format == "sse" else format_ndjson
+    
+    async def body():
+        async for event, payload in iter_job_results(service._get_db, job_id, offset=offset):
+            yield formatter(event, payload)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/jobs")
 async def get_analysis_jobs(
     service: AnalysisService = Depends(get_analysis_service)
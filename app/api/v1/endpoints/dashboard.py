@@ -1,30 +1,35 @@
 """
 Dashboard API Endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 from app.db import get_db
+from app.utils.response_cache import cached_json_response
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+def compute_dashboard_stats() -> Dict[str, Any]:
+    """Compute dashboard statistics"""
+    # Mock data for now
+    return {
+        "total_files": 15,
+        "total_analyses": 48,
+        "active_jobs": 2,
+        "success_rate": 94.5,
+        "average_processing_time": 127.3,  # seconds
+        "today_uploads": 3,
+        "today_analyses": 8
+    }
+
 @router.get("/stats")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get dashboard statistics"""
+async def get_dashboard_stats(request: Request, db: Session = Depends(get_db)):
+    """Get dashboard statistics (cached per data version, revalidated with ETag)"""
     try:
-        # Mock data for now
-        return {
-            "total_files": 15,
-            "total_analyses": 48,
-            "active_jobs": 2,
-            "success_rate": 94.5,
-            "average_processing_time": 127.3,  # seconds
-            "today_uploads": 3,
-            "today_analyses": 8
-        }
+        return await cached_json_response(request, "dashboard/stats", None, compute_dashboard_stats)
     except Exception as e:
         logger.error(f"Dashboard stats error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
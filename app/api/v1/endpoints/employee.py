@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.db.sqlite_service import SQLiteService
+from app.db.sqlite_service import SQLiteService, sqlite_service
 from app.schemas.employee import EmployeeSearchResponse, EmployeeListResponse
 import json
 import logging
@@ -14,9 +14,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# SQLiteService 인스턴스 생성
+# SQLiteService 공용 인스턴스 (커넥션 풀 공유)
 async def get_sqlite_service():
-    return SQLiteService()
+    return sqlite_service
 
 
 @router.get("/employee/{job_id}", response_model=EmployeeSearchResponse)
@@ -2,13 +2,13 @@
 AIRISS v4.2 직원별 AI 분석 API
 Employee AI Analysis REST API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
 
-from app.db.database import get_db
+from app.db.database import get_db, SessionLocal
 from app.schemas.employee import (
     EmployeeAIAnalysis,
     EmployeeAIAnalysisList,
@@ -18,6 +18,8 @@ from app.schemas.employee import (
     DashboardStatistics
 )
 from app.services.employee_service import EmployeeService
+from app.utils.pagination import InvalidCursorError
+from app.utils.response_cache import cached_json_response
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -75,6 +77,7 @@ async def get_employees_ai_analysis_list(
     sort_order: Optional[str] = Query("desc", description="정렬 순서 (asc, desc)"),
     page: int = Query(1, ge=1, description="페이지 번호"),
     page_size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 page 대신 사용)"),
     db: Session = Depends(get_db)
 ):
     """
@@ -83,7 +86,7 @@ async def get_employees_ai_analysis_list(
     - **필터**: 부서, 직급, AI등급, AI점수 범위
     - **검색**: 이름 또는 직원번호
     - **정렬**: AI점수, 이름, 부서별
-    - **페이징**: 페이지 번호와 크기 지정
+    - **페이징**: 페이지 번호와 크기 지정, 연속 조회는 next_cursor 를 cursor 로 전달
     """
     try:
         service = EmployeeService(db)
@@ -107,7 +110,8 @@ async def get_employees_ai_analysis_list(
         # 페이징 옵션
         pagination = {
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "cursor": cursor
         }
         
         result = service.get_employees_ai_analysis_list(
@@ -117,6 +121,8 @@ async def get_employees_ai_analysis_list(
         )
         
         return result
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"직원 AI 분석 목록 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -216,20 +222,28 @@ async def get_competency_radar_data(
 
 @router.get("/dashboard/statistics", response_model=DashboardStatistics)
 async def get_dashboard_statistics(
-    department: Optional[str] = Query(None, description="부서별 통계"),
-    db: Session = Depends(get_db)
+    request: Request,
+    department: Optional[str] = Query(None, description="부서별 통계")
 ):
     """
     대시보드용 전체 통계 데이터
     
     - **department**: 특정 부서만 필터링 (선택사항)
     - **returns**: 등급 분포, 평균 점수, 역량 통계 등
+    - 데이터 버전 기준 응답 캐시, ETag 가 같으면 304
     """
     try:
-        service = EmployeeService(db)
-        result = service.get_dashboard_statistics(department)
-        
-        return result
+        def compute():
+            # 계산 스레드/대기 요청과 요청 세션을 공유하지 않도록 캐시 계산 전용 세션 사용
+            db = SessionLocal()
+            try:
+                return EmployeeService(db).get_dashboard_statistics(department)
+            finally:
+                db.close()
+
+        return await cached_json_response(
+            request, "employees/dashboard/statistics", {"department": department}, compute
+        )
     except Exception as e:
         logger.error(f"대시보드 통계 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -23,6 +23,29 @@ async def health_check_root():
     """Root health endpoint"""
     return await health_check()
 
+@router.get("/health/analyzers")
+async def analyzer_health():
+    """Analyzer registry status - loaded components and their load times"""
+    from app.services.analyzer_registry import analyzer_registry
+    from app.services.analysis_cache import analysis_cache
+    from app.services.llm_executor import llm_executor
+    from app.services.llm_response_cache import llm_response_cache
+    from app.services.feedback_packing import packing_counters
+    from app.services.scoring_pool import scoring_pool
+    from app.services.progress_reporter import progress_counters
+    from app.db.sqlite_service import pool_stats
+    return {
+        **analyzer_registry.health(),
+        "analysis_cache": analysis_cache.stats(),
+        "llm_executor": llm_executor.stats(),
+        "llm_response_cache": llm_response_cache.stats(),
+        "llm_packing": dict(packing_counters),
+        "scoring_pool": scoring_pool.stats(),
+        "progress_updates": dict(progress_counters),
+        "sqlite_pools": pool_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 @router.get("/status")
 async def status_check(db: Session = Depends(get_db)):
     """Detailed status check"""
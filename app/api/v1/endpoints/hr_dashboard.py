@@ -1,12 +1,13 @@
 """
 HR Dashboard API Endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
-from app.db import get_db
+from app.db import get_db, SessionLocal
 from app.models.employee import EmployeeResult
+from app.utils.response_cache import cached_json_response
 import logging
 import random
 from io import BytesIO
@@ -27,44 +28,41 @@ import base64
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def calculate_department_stats(employees):
-    """실제 직원 데이터를 기반으로 부서별 통계 계산"""
-    department_stats = {}
+def aggregate_dashboard_stats(db: Session):
+    """
+    작업 x 부서 x 등급 집계(employee_result_stats)에서 등급 분포와 부서별 통계 계산
     
-    if not employees:
-        return department_stats
+    Returns:
+        (전체 인원, 등급별 인원, 부서별 통계 {부서: {count, total_score, avg_score, grades}})
+    """
+    from app.models.result_stats import EmployeeResultStats
+    from app.services.result_stats import ensure_stats
     
-    # 부서별 데이터 집계
-    for emp in employees:
-        dept = emp.get('department', '부서 미상')
-        
-        if dept not in department_stats:
-            department_stats[dept] = {
-                'count': 0,
-                'total_score': 0,
-                'avg_score': 0,
-                'grades': {'S': 0, 'A': 0, 'B': 0, 'C': 0, 'D': 0}
-            }
-        
-        department_stats[dept]['count'] += 1
-        
-        # 점수 집계
-        score = emp.get('performance_score', 0) or emp.get('ai_score', 0) or 0
-        department_stats[dept]['total_score'] += score
-        
-        # 등급 집계
-        grade = emp.get('grade', 'C')
-        if grade in department_stats[dept]['grades']:
-            department_stats[dept]['grades'][grade] += 1
-        else:
-            department_stats[dept]['grades']['C'] += 1
+    ensure_stats(db, EmployeeResultStats)
+    total = 0
+    grade_distribution = {}
+    department_stats = {}
+    for row in db.query(EmployeeResultStats).all():
+        grade = row.grade or 'C'
+        total += row.count
+        grade_distribution[grade] = grade_distribution.get(grade, 0) + row.count
+        
+        dept = department_stats.setdefault(row.department or '미정', {
+            'count': 0,
+            'total_score': 0,
+            'avg_score': 0,
+            'grades': {'S': 0, 'A': 0, 'B': 0, 'C': 0, 'D': 0}
+        })
+        dept['count'] += row.count
+        # 점수 없는 직원은 기본 점수 70 (직원 목록의 ai_score 기본값과 동일)
+        dept['total_score'] += (row.score_sum or 0) + 70 * (row.count - (row.score_count or 0))
+        dept['grades'][grade if grade in dept['grades'] else 'C'] += row.count
     
-    # 평균 점수 계산
-    for dept_name, dept_data in department_stats.items():
+    for dept_data in department_stats.values():
         if dept_data['count'] > 0:
             dept_data['avg_score'] = round(dept_data['total_score'] / dept_data['count'], 1)
     
-    return department_stats
+    return total, grade_distribution, department_stats
 
 def calculate_promotion_candidates(employees):
     """승진 후보자 예측 로직 - S등급만 대상"""
@@ -409,8 +407,20 @@ def identify_risk_employees(employees):
     return sorted(risk_employees, key=lambda x: x['risk_score'], reverse=True)
 
 @router.get("/stats")
-async def get_hr_dashboard_stats(db: Session = Depends(get_db)):
-    """HR 대시보드 통계 조회"""
+async def get_hr_dashboard_stats(request: Request):
+    """HR 대시보드 통계 조회 (데이터 버전 기준 응답 캐시, ETag 재검증)"""
+    return await cached_json_response(request, "hr-dashboard/stats", None, _compute_hr_dashboard_stats_in_session)
+
+def _compute_hr_dashboard_stats_in_session():
+    """캐시 계산 전용 세션으로 통계 계산 (계산 스레드/대기 요청과 요청 세션을 공유하지 않도록)"""
+    db = SessionLocal()
+    try:
+        return compute_hr_dashboard_stats(db)
+    finally:
+        db.close()
+
+def compute_hr_dashboard_stats(db: Session):
+    """HR 대시보드 통계 계산"""
     try:
         # 실제 데이터베이스에서 직원 정보를 가져오기
         employee_results = db.query(EmployeeResult).all()
@@ -485,18 +495,10 @@ async def get_hr_dashboard_stats(db: Session = Depends(get_db)):
         # 관리 필요 인력 식별
         risk_employees = identify_risk_employees(employees)
         
-        # 등급 분포 계산
-        grade_distribution = {}
-        s_grade_count = 0
-        a_grade_count = 0
-        for emp in employees:
-            grade = emp.get('grade', 'N/A')
-            grade_distribution[grade] = grade_distribution.get(grade, 0) + 1
-            # S와 A 등급 카운트
-            if grade == 'S':
-                s_grade_count += 1
-            elif grade == 'A':
-                a_grade_count += 1
+        # 등급 분포 / 부서별 통계는 집계 테이블에서 (부서 x 등급 행만 읽음)
+        total_employees, grade_distribution, department_stats = aggregate_dashboard_stats(db)
+        s_grade_count = grade_distribution.get('S', 0)
+        a_grade_count = grade_distribution.get('A', 0)
         
         # 실제 최우수 인재 수 (S 등급만)
         top_talents_count = s_grade_count
@@ -510,7 +512,7 @@ async def get_hr_dashboard_stats(db: Session = Depends(get_db)):
                 sorted_grades.append({
                     'grade': grade,
                     'count': grade_distribution[grade],
-                    'percentage': round(grade_distribution[grade] / len(employees) * 100, 1)
+                    'percentage': round(grade_distribution[grade] / total_employees * 100, 1)
                 })
         
         # 프론트엔드에서 등급 분포 계산을 위해 직원 데이터 포함 (필수 필드만)
@@ -547,7 +549,7 @@ async def get_hr_dashboard_stats(db: Session = Depends(get_db)):
                 'medium_risk_count': len([e for e in risk_employees if e['risk_level'] == 'medium'])
             },
             'grade_distribution': sorted_grades,
-            'department_stats': calculate_department_stats(employees),
+            'department_stats': department_stats,
             'employees': employees_for_frontend,  # 프론트엔드용 직원 데이터
             'previous_period': previous_period_data  # 이전 기간 데이터 추가
         }
@@ -644,7 +646,7 @@ async def export_dashboard_pdf(db: Session = Depends(get_db)):
     """HR 대시보드를 PDF로 내보내기"""
     try:
         # 대시보드 데이터 가져오기
-        stats_response = await get_hr_dashboard_stats(db)
+        stats_response = compute_hr_dashboard_stats(db)
         
         # PDF 생성
         buffer = BytesIO()
@@ -10,7 +10,7 @@ import logging
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.services.hybrid_analyzer import AIRISSHybridAnalyzer as HybridAnalyzer
+from app.services.analyzer_registry import get_hybrid_analyzer
 from app.services.text_analyzer import AIRISSTextAnalyzer as TextAnalyzer
 
 router = APIRouter()
@@ -75,8 +75,8 @@ async def analyze_employee(
     try:
         logger.info(f"🔍 LLM 분석 시작 - 직원 ID: {request.employee_data.employee_id}")
         
-        # HybridAnalyzer 초기화
-        analyzer = HybridAnalyzer()
+        # HybridAnalyzer (프로세스 공용 인스턴스)
+        analyzer = get_hybrid_analyzer()
         
         # 분석용 데이터 준비
         analysis_data = {
@@ -145,8 +145,8 @@ async def batch_analyze_employees(
     try:
         logger.info(f"📊 배치 분석 시작 - 총 {len(request.employees)}명")
         
-        # HybridAnalyzer 초기화 (재사용)
-        analyzer = HybridAnalyzer()
+        # HybridAnalyzer (프로세스 공용 인스턴스)
+        analyzer = get_hybrid_analyzer()
         
         for employee in request.employees:
             try:
@@ -79,10 +79,9 @@ async def upload_file(
         file_id = str(uuid.uuid4())
         import json
         
-        # DataFrame을 임시 파일로 저장
-        os.makedirs('temp_data', exist_ok=True)
-        file_path = os.path.abspath(f'temp_data/{file_id}.pkl')
-        df.to_pickle(file_path)
+        # DataFrame을 컬럼 단위 데이터셋으로 저장 (분석 시 필요한 컬럼/구간만 메모리 매핑으로 읽음)
+        from app.utils.columnar_store import dataset_path, write_dataset
+        file_path = write_dataset(df, dataset_path(file_id))
         logger.info(f"파일 저장 경로: {file_path}")
         
         file_record = FileModel(
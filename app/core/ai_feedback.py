@@ -10,8 +10,13 @@ from app.db.database import SessionLocal
 from app.models.user import User
 from passlib.hash import bcrypt
 
+from app.services.llm_response_cache import llm_response_cache
+
 logger = logging.getLogger(__name__)
 
+FEEDBACK_SYSTEM_PROMPT = "당신은 OK금융그룹의 전문 HR 분석가입니다. AIRISS 8대 영역을 기반으로 직원 평가를 분석하고 구체적인 피드백을 제공합니다."
+FEEDBACK_TEMPERATURE = 0.7
+
 
 class AIFeedbackEngine:
     def __init__(self):
@@ -31,9 +36,10 @@ class AIFeedbackEngine:
         analysis_result: Dict[str, Any],
         api_key: Optional[str] = None,
         model: str = "gpt-3.5-turbo",
-        max_tokens: int = 1200
+        max_tokens: int = 1200,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
-        """AI 피드백 생성"""
+        """AI 피드백 생성 (동일 프롬프트 응답은 LLM 응답 캐시에서 재사용)"""
         
         if not self.openai_available:
             return self._get_default_feedback("OpenAI 모듈이 설치되지 않았습니다.")
@@ -44,18 +50,35 @@ class AIFeedbackEngine:
         start_time = datetime.now()
         
         try:
-            client = self.openai.OpenAI(api_key=api_key.strip())
-            
             # 프롬프트 생성
             prompt = self._create_prompt(uid, opinion, analysis_result)
             
+            cache_key = llm_response_cache.make_key(
+                model, prompt, FEEDBACK_TEMPERATURE, max_tokens, system_prompt=FEEDBACK_SYSTEM_PROMPT
+            )
+            cached = llm_response_cache.get(cache_key, bypass=bypass_cache)
+            if cached is not None and cached["parsed"] is not None:
+                strengths, weaknesses, complete_feedback = cached["parsed"]
+                return {
+                    "ai_strengths": strengths,
+                    "ai_weaknesses": weaknesses,
+                    "ai_feedback": complete_feedback,
+                    "processing_time": round((datetime.now() - start_time).total_seconds(), 2),
+                    "model_used": model,
+                    "tokens_used": 0,
+                    "cached": True,
+                    "error": None
+                }
+            
+            client = self.openai.OpenAI(api_key=api_key.strip())
+            
             # OpenAI API 호출
             response = client.chat.completions.create(
                 model=model,
                 messages=[
                     {
                         "role": "system",
-                        "content": "당신은 OK금융그룹의 전문 HR 분석가입니다. AIRISS 8대 영역을 기반으로 직원 평가를 분석하고 구체적인 피드백을 제공합니다."
+                        "content": FEEDBACK_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -63,13 +86,22 @@ class AIFeedbackEngine:
                     }
                 ],
                 max_tokens=max_tokens,
-                temperature=0.7,
+                temperature=FEEDBACK_TEMPERATURE,
                 timeout=30
             )
             
             feedback_text = response.choices[0].message.content.strip()
             strengths, weaknesses, complete_feedback = self._parse_response(feedback_text)
             
+            usage = getattr(response, 'usage', None)
+            llm_response_cache.put(
+                cache_key,
+                feedback_text,
+                parsed=[strengths, weaknesses, complete_feedback],
+                prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+                completion_tokens=getattr(usage, 'completion_tokens', 0) or 0
+            )
+            
             processing_time = (datetime.now() - start_time).total_seconds()
             
             return {
@@ -79,6 +111,7 @@ class AIFeedbackEngine:
                 "processing_time": round(processing_time, 2),
                 "model_used": model,
                 "tokens_used": response.usage.total_tokens if hasattr(response, 'usage') else max_tokens,
+                "cached": False,
                 "error": None
             }
             
@@ -10,6 +10,7 @@ import logging
 import asyncio
 
 from app.core.airiss_framework import AIRISS_FRAMEWORK, get_ok_grade
+from app.utils.keyword_matcher import get_keyword_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,7 @@ class AIRISSTextAnalyzer:
     
     def __init__(self):
         self.framework = AIRISS_FRAMEWORK
+        self.keyword_matcher = get_keyword_matcher(self.framework)
         self.openai_available = False
         self.openai = None
         
@@ -43,20 +45,21 @@ class AIRISSTextAnalyzer:
                 }
             }
         
-        keywords = self.framework[dimension]["keywords"]
-        text_lower = text.lower()
-        
-        # 키워드 매칭
-        positive_matches = []
-        negative_matches = []
-        
-        for word in keywords["positive"]:
-            if word in text_lower:
-                positive_matches.append(word)
+        hits = self.keyword_matcher.scan(text.lower())[dimension]
+        return self._score_dimension(text, hits)
+    
+    def analyze_all_dimensions(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """8대 영역 전체를 한 번의 키워드 스캔으로 분석 (영역별 결과는 analyze_text와 동일)"""
+        if not text or text.lower() in ['nan', 'null', '', 'none']:
+            return {dimension: self.analyze_text(text, dimension) for dimension in self.keyword_matcher.dimensions}
         
-        for word in keywords["negative"]:
-            if word in text_lower:
-                negative_matches.append(word)
+        keyword_hits = self.keyword_matcher.scan(text.lower())
+        return {dimension: self._score_dimension(text, hits) for dimension, hits in keyword_hits.items()}
+    
+    def _score_dimension(self, text: str, hits: Dict[str, List[str]]) -> Dict[str, Any]:
+        """키워드 매칭 결과로 영역 점수 및 신뢰도 산출"""
+        positive_matches = hits["positive"]
+        negative_matches = hits["negative"]
         
         positive_count = len(positive_matches)
         negative_count = len(negative_matches)
@@ -360,9 +363,7 @@ class AIRISSHybridAnalyzer:
         """종합 분석: 텍스트 + 정량 데이터"""
         
         # 1. 텍스트 분석
-        text_results = {}
-        for dimension in AIRISS_FRAMEWORK.keys():
-            text_results[dimension] = self.text_analyzer.analyze_text(opinion, dimension)
+        text_results = self.text_analyzer.analyze_all_dimensions(opinion)
         
         text_overall = self.text_analyzer.calculate_overall_score(
             {dim: result["score"] for dim, result in text_results.items()}
@@ -427,9 +428,7 @@ class AIRISSHybridAnalyzer:
     
     def text_only_analysis(self, uid: str, opinion: str) -> Dict[str, Any]:
         """텍스트 분석만 수행"""
-        text_results = {}
-        for dimension in AIRISS_FRAMEWORK.keys():
-            text_results[dimension] = self.text_analyzer.analyze_text(opinion, dimension)
+        text_results = self.text_analyzer.analyze_all_dimensions(opinion)
         
         text_overall = self.text_analyzer.calculate_overall_score(
             {dim: result["score"] for dim, result in text_results.items()}
@@ -9,6 +9,8 @@ import re
 from sqlalchemy.orm import Session
 from app.models.job import Job
 
+from app.utils.keyword_matcher import get_keyword_matcher
+
 logger = logging.getLogger(__name__)
 
 # AIRISS 8대 영역 프레임워크 (v3.0에서 가져옴)
@@ -150,6 +152,7 @@ class TextAnalyzer:
     
     def __init__(self):
         self.framework = AIRISS_FRAMEWORK
+        self.keyword_matcher = get_keyword_matcher(self.framework)
         logger.info("텍스트 분석기 초기화 완료")
     
     def analyze_text(self, text: str, dimension: str) -> Dict[str, Any]:
@@ -161,20 +164,21 @@ class TextAnalyzer:
                 "signals": {"positive": 0, "negative": 0, "positive_words": [], "negative_words": []}
             }
         
-        keywords = self.framework[dimension]["keywords"]
-        text_lower = text.lower()
-        
-        # 키워드 매칭
-        positive_matches = []
-        negative_matches = []
-        
-        for word in keywords["positive"]:
-            if word in text_lower:
-                positive_matches.append(word)
+        hits = self.keyword_matcher.scan(text.lower())[dimension]
+        return self._score_dimension(text, hits)
+    
+    def analyze_all_dimensions(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """8대 영역 전체를 한 번의 키워드 스캔으로 분석 (영역별 결과는 analyze_text와 동일)"""
+        if not text or text.lower() in ['nan', 'null', '', 'none']:
+            return {dimension: self.analyze_text(text, dimension) for dimension in self.keyword_matcher.dimensions}
         
-        for word in keywords["negative"]:
-            if word in text_lower:
-                negative_matches.append(word)
+        keyword_hits = self.keyword_matcher.scan(text.lower())
+        return {dimension: self._score_dimension(text, hits) for dimension, hits in keyword_hits.items()}
+    
+    def _score_dimension(self, text: str, hits: Dict[str, List[str]]) -> Dict[str, Any]:
+        """키워드 매칭 결과로 영역 점수 및 신뢰도 산출"""
+        positive_matches = hits["positive"]
+        negative_matches = hits["negative"]
         
         positive_count = len(positive_matches)
         negative_count = len(negative_matches)
@@ -586,12 +590,8 @@ class AIRISSEngine:
         """개별 레코드 분석"""
         
         # 텍스트 분석
-        text_results = {}
-        dimension_scores = {}
-        for dimension in AIRISS_FRAMEWORK.keys():
-            result = self.text_analyzer.analyze_text(opinion, dimension)
-            text_results[dimension] = result
-            dimension_scores[dimension] = result["score"]
+        text_results = self.text_analyzer.analyze_all_dimensions(opinion)
+        dimension_scores = {dimension: result["score"] for dimension, result in text_results.items()}
         
         text_overall = self.text_analyzer.calculate_overall_score(dimension_scores)
         
@@ -34,9 +34,7 @@ class AIRISSHybridAnalyzer:
         """종합 분석: 텍스트 + 정량 데이터"""
         
         # 1. 텍스트 분석
-        text_results = {}
-        for dimension in AIRISS_FRAMEWORK.keys():
-            text_results[dimension] = self.text_analyzer.analyze_text(opinion, dimension)
+        text_results = self.text_analyzer.analyze_all_dimensions(opinion)
         
         text_overall = self.text_analyzer.calculate_overall_score(
             {dim: result["score"] for dim, result in text_results.items()}
@@ -34,8 +34,15 @@ except ImportError as e:
                         choices = [Choice()]
                     return Response()
 
+from app.services.llm_response_cache import llm_response_cache
+
 logger = logging.getLogger(__name__)
 
+# LLM 호출 설정 (응답 캐시 키 구성요소)
+LLM_SYSTEM_PROMPT = "You are an expert HR analyst specializing in employee evaluation."
+LLM_TEMPERATURE = 0.7
+LLM_MAX_TOKENS = 1000
+
 
 class OpinionProcessor:
     """평가의견 LLM 프로세서"""
@@ -221,30 +228,38 @@ class OpinionProcessor:
             # 오류 시 기본값 반환
             return self._get_default_analysis()
     
-    async def _call_llm(self, prompt: str) -> Dict[str, Any]:
+    async def _call_llm(self, prompt: str, bypass_cache: bool = False) -> Dict[str, Any]:
         """
-        LLM API 호출
+        LLM API 호출 (동일 프롬프트 응답은 LLM 응답 캐시에서 재사용)
         
         Args:
             prompt: 프롬프트
+            bypass_cache: True면 캐시를 읽지 않고 새로 호출
             
         Returns:
             파싱된 응답
         """
+        cache_key = llm_response_cache.make_key(
+            self.model, prompt, LLM_TEMPERATURE, LLM_MAX_TOKENS, system_prompt=LLM_SYSTEM_PROMPT
+        )
+        cached = llm_response_cache.get(cache_key, bypass=bypass_cache)
+        if cached is not None and cached["parsed"] is not None:
+            return cached["parsed"]
+        
         try:
             # OpenAI API 호출 (v1.0+)
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are an expert HR analyst specializing in employee evaluation."},
+                    {"role": "system", "content": LLM_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
-                max_tokens=1000
+                temperature=LLM_TEMPERATURE,
+                max_tokens=LLM_MAX_TOKENS
             )
             
             # 응답 파싱
-            content = response.choices[0].message.content
+            raw_content = content = response.choices[0].message.content
             
             # JSON 파싱 시도
             try:
@@ -254,10 +269,20 @@ class OpinionProcessor:
                     json_end = content.find("```", json_start)
                     content = content[json_start:json_end].strip()
                 
-                return json.loads(content)
+                parsed = json.loads(content)
             except json.JSONDecodeError:
                 logger.error(f"Failed to parse LLM response: {content}")
                 return self._get_default_analysis()
+            
+            usage = getattr(response, "usage", None)
+            llm_response_cache.put(
+                cache_key,
+                raw_content,
+                parsed=parsed,
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0
+            )
+            return parsed
                 
         except Exception as e:
             logger.error(f"LLM API call failed: {str(e)}")
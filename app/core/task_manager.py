@@ -1,17 +1,18 @@
 """
 ShrimpTaskManager - 워크플로우 태스크 관리 시스템
+큐 백엔드는 app.core.task_queue (기본: workflow_tasks 테이블 기반 내구성 큐, 테스트용 메모리 큐)
 """
 import asyncio
 import json
 import logging
 import traceback
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Set
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
-from sqlalchemy import Column, String, Text, Integer, DateTime, JSON
+from sqlalchemy import Column, String, Text, Integer, DateTime, JSON, Index, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
 
@@ -25,6 +26,7 @@ Base = declarative_base()
 class TaskStatus(str, Enum):
     """태스크 상태"""
     PENDING = "pending"
+    WAITING = "waiting"  # 의존 태스크 완료 대기 (큐에 들어가지 않음)
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
@@ -76,6 +78,27 @@ class TaskRecord(Base):
     
     parent_task_id = Column(String)
     checkpoint_data = Column(JSON)  # 복구용 체크포인트
+    
+    # 내구성 큐 (app.core.task_queue.DatabaseTaskQueue)
+    priority_rank = Column(Integer, default=1)       # 클수록 먼저 (critical=3 ... low=0)
+    available_at = Column(DateTime)                   # 이 시각 이후에만 가져갈 수 있음 (재시도 지연)
+    lease_owner = Column(String)                      # "{instance_id}/{worker_id}"
+    lease_expires_at = Column(DateTime)               # 만료되면 다른 워커가 다시 가져감
+    heartbeat_at = Column(DateTime)
+    handler_name = Column(String)                     # "module:function" - 다른 프로세스에서 핸들러 복원
+    affinity = Column(String)                         # 핸들러를 복원할 수 없으면 제출한 인스턴스만 실행
+    dependencies = Column(JSON)
+    retry_delay = Column(Integer, default=5)
+    
+    # 의존성 스케줄링 (DAG)
+    dependents = Column(JSON)                         # 역방향 간선 - 이 태스크를 기다리는 태스크 ID
+    remaining_dependencies = Column(Integer, default=0)
+    ready_at = Column(DateTime)                       # 마지막 의존성이 완료되어 실행 가능해진 시각
+    ready_key = Column(Float)                         # ready 큐 정렬 키 (ready 시각 - 우선순위 × aging)
+    
+    __table_args__ = (
+        Index("ix_workflow_tasks_ready", "status", "ready_key"),
+    )
 
 
 class Task(BaseModel):
@@ -97,6 +120,7 @@ class Task(BaseModel):
     retry_delay: int = 5  # seconds
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    ready_at: Optional[datetime] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     
@@ -113,13 +137,17 @@ class Task(BaseModel):
 class ShrimpTaskManager:
     """태스크 관리자"""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, queue=None):
+        """
+        Args:
+            queue: 태스크 큐 백엔드 (없으면 AIRISS_TASK_QUEUE_BACKEND 설정 - database | memory)
+        """
+        from app.core.task_queue import create_task_queue
+        
         self.db = db_session
+        self.queue = queue if queue is not None else create_task_queue()
         self.tasks: Dict[str, Task] = {}
         self.running_tasks: Set[str] = set()
-        self.task_queues: Dict[TaskPriority, asyncio.Queue] = {
-            priority: asyncio.Queue() for priority in TaskPriority
-        }
         self.workers: List[asyncio.Task] = []
         self.is_running = False
         
@@ -150,19 +178,61 @@ class ShrimpTaskManager:
         logger.info("ShrimpTaskManager stopped")
         
     async def submit_task(self, task: Task) -> str:
-        """태스크 제출"""
+        """태스크 제출 (미완료 의존성이 있으면 waiting - 마지막 의존성이 완료될 때 ready 로 승격)"""
+        dependency_status = await self._dependency_statuses(task.dependencies)
+        broken = [dep_id for dep_id, status in dependency_status.items()
+                  if status in (TaskStatus.FAILED, TaskStatus.CANCELLED)]
+        unmet = [dep_id for dep_id in task.dependencies if dependency_status.get(dep_id) != TaskStatus.COMPLETED]
+        
+        if broken:
+            task.status = TaskStatus.CANCELLED
+            task.error_message = f"Dependency did not complete: {broken[0]}"
+            task.completed_at = datetime.utcnow()
+        elif unmet:
+            task.status = TaskStatus.WAITING
+        else:
+            task.ready_at = datetime.utcnow()
+        
         # DB에 저장
-        self._save_task_to_db(task)
+        self._save_task_to_db(task, remaining_dependencies=len(unmet))
         
         # 메모리에 저장
         self.tasks[task.id] = task
         
-        # 큐에 추가
-        await self.task_queues[task.priority].put(task.id)
+        # 큐에 추가 (의존성 대기 중이면 역방향 간선만 연결)
+        if not broken:
+            if await self.queue.schedule(task.id, task.priority, unmet) and task.status == TaskStatus.WAITING:
+                self._mark_ready(task.id)
         
-        logger.info(f"Task submitted: {task.id} ({task.task_type})")
+        logger.info(f"Task submitted: {task.id} ({task.task_type}, {task.status.value})")
         return task.id
         
+    def _mark_ready(self, task_id: str):
+        """승격된 태스크의 메모리 상태 반영 (DB 큐는 이미 DB에 반영됨)"""
+        task = self.tasks.get(task_id)
+        if task and task.status == TaskStatus.WAITING:
+            task.status = TaskStatus.PENDING
+            task.ready_at = datetime.utcnow()
+            if not self.queue.durable:
+                self._update_task_in_db(task)
+                
+    async def _resolve_dependents(self, task: Task, succeeded: bool):
+        """태스크 종료를 의존 태스크에 반영 (승격 또는 연쇄 취소)"""
+        promoted, cancelled = await self.queue.resolve(task.id, succeeded)
+        for task_id in promoted:
+            self._mark_ready(task_id)
+        for task_id in cancelled:
+            child = self.tasks.get(task_id)
+            if child is None:
+                continue
+            child.status = TaskStatus.CANCELLED
+            child.error_message = f"Dependency did not complete: {task.id}"
+            child.completed_at = datetime.utcnow()
+            if not self.queue.durable:
+                self._update_task_in_db(child)
+        if cancelled:
+            logger.warning(f"Cancelled {len(cancelled)} tasks depending on {task.id}")
+        
     async def _worker(self, worker_id: str):
         """워커 프로세스"""
         logger.info(f"Worker {worker_id} started")
@@ -170,57 +240,116 @@ class ShrimpTaskManager:
         while self.is_running:
             task_id = None
             try:
-                # 우선순위 순으로 태스크 가져오기
-                for priority in [TaskPriority.CRITICAL, TaskPriority.HIGH, 
-                               TaskPriority.MEDIUM, TaskPriority.LOW]:
-                    try:
-                        task_id = await asyncio.wait_for(
-                            self.task_queues[priority].get(), 
-                            timeout=0.1
-                        )
-                        break
-                    except asyncio.TimeoutError:
-                        continue
-                        
+                # 우선순위 순으로 태스크 가져오기 (없으면 큐 백엔드가 폴링 주기만큼 대기)
+                task_id = await self.queue.claim(worker_id)
                 if task_id:
-                    await self._execute_task(task_id)
+                    await self._execute_task(task_id, worker_id)
                     
             except Exception as e:
                 logger.error(f"Worker {worker_id} error: {e}")
                 if task_id:
-                    await self._handle_task_error(task_id, e)
+                    await self._handle_task_error(task_id, e, worker_id)
                     
-    async def _execute_task(self, task_id: str):
+    async def _load_task(self, task_id: str) -> Optional[Task]:
+        """다른 프로세스가 제출한 태스크를 DB 레코드에서 복원 (콜백은 복원되지 않음)"""
+        from app.core.task_queue import resolve_task_handler
+        
+        record = self.db.query(TaskRecord).filter(TaskRecord.id == task_id).first()
+        if record is None:
+            return None
+        task = Task(
+            id=record.id,
+            job_id=record.job_id,
+            task_type=TaskType(record.task_type),
+            status=TaskStatus(record.status),
+            priority=TaskPriority(record.priority or TaskPriority.MEDIUM.value),
+            input_data=record.input_data or {},
+            output_data=record.output_data or {},
+            error_message=record.error_message,
+            retry_count=record.retry_count or 0,
+            max_retries=record.max_retries if record.max_retries is not None else 3,
+            retry_delay=record.retry_delay if record.retry_delay is not None else 5,
+            created_at=record.created_at or datetime.utcnow(),
+            ready_at=record.ready_at,
+            parent_task_id=record.parent_task_id,
+            dependencies=record.dependencies or [],
+            checkpoint_data=record.checkpoint_data or {},
+            handler=resolve_task_handler(record.handler_name)
+        )
+        self.tasks[task_id] = task
+        if task.handler is None and record.handler_name:
+            raise RuntimeError(f"Task handler not available in this process: {record.handler_name}")
+        return task
+        
+    async def _heartbeat(self, task_id: str, worker_id: str, run: asyncio.Future, lease_lost: asyncio.Event):
+        """실행 중 임대 연장 (임대 기간의 1/3 주기) - 임대를 잃으면 핸들러 취소"""
+        interval = max(1.0, getattr(self.queue, "lease_seconds", 60) / 3)
+        while not run.done():
+            await asyncio.sleep(interval)
+            if not await self.queue.heartbeat(task_id, worker_id):
+                lease_lost.set()
+                run.cancel()
+                return
+                
+    def _abandon_task(self, task_id: str, worker_id: str):
+        """임대를 잃은 태스크 - 다른 워커가 다시 실행하므로 완료/실패/의존성 반영을 하지 않음"""
+        logger.warning(f"Task lease lost, abandoning without completion writes: {task_id} ({worker_id})")
+                
+    async def _execute_task(self, task_id: str, worker_id: str = "worker"):
         """태스크 실행"""
         task = self.tasks.get(task_id)
-        if not task:
+        if not task and self.queue.durable:
+            task = await self._load_task(task_id)
+        if not task or task.status in (TaskStatus.CANCELLED, TaskStatus.PAUSED, TaskStatus.COMPLETED):
+            await self.queue.ack(task_id, worker_id)
             return
             
-        # 의존성 체크
-        if not await self._check_dependencies(task):
-            # 다시 큐에 넣기
-            await asyncio.sleep(1)
-            await self.task_queues[task.priority].put(task_id)
+        # 의존성 체크 (ready 큐에는 의존성이 모두 완료된 태스크만 들어오므로 보통 통과)
+        unmet = await self._unmet_dependencies(task)
+        if unmet:
+            task.status = TaskStatus.WAITING
+            if not self._update_task_in_db(task, worker_id):
+                self._abandon_task(task_id, worker_id)
+                return
+            await self.queue.ack(task_id, worker_id)
+            if await self.queue.schedule(task_id, task.priority, unmet):
+                self._mark_ready(task_id)
             return
             
+        lease_lost = asyncio.Event()
+        run = heartbeat = None
         try:
             # 상태 업데이트
             task.status = TaskStatus.RUNNING
             task.started_at = datetime.utcnow()
             self.running_tasks.add(task_id)
-            self._update_task_in_db(task)
+            if not self._update_task_in_db(task, worker_id):
+                self._abandon_task(task_id, worker_id)
+                return
             
             logger.info(f"Executing task: {task_id} ({task.task_type})")
             
-            # 핸들러 실행
+            # 핸들러 실행 (하트비트가 임대를 잃으면 핸들러를 취소)
             if task.handler:
-                result = await task.handler(task)
-                task.output_data = result
+                run = asyncio.ensure_future(task.handler(task))
+                heartbeat = asyncio.create_task(self._heartbeat(task_id, worker_id, run, lease_lost))
+                try:
+                    task.output_data = await run
+                except asyncio.CancelledError:
+                    if not lease_lost.is_set():
+                        raise
+                if lease_lost.is_set():
+                    self._abandon_task(task_id, worker_id)
+                    return
                 
             # 성공 처리
             task.status = TaskStatus.COMPLETED
             task.completed_at = datetime.utcnow()
-            self._update_task_in_db(task)
+            if not self._update_task_in_db(task, worker_id):
+                self._abandon_task(task_id, worker_id)
+                return
+            await self.queue.ack(task_id, worker_id)
+            await self._resolve_dependents(task, succeeded=True)
             
             if task.on_success:
                 await task.on_success(task)
@@ -228,12 +357,19 @@ class ShrimpTaskManager:
             logger.info(f"Task completed: {task_id}")
             
         except Exception as e:
-            await self._handle_task_error(task_id, e)
+            if lease_lost.is_set():
+                self._abandon_task(task_id, worker_id)
+            else:
+                await self._handle_task_error(task_id, e, worker_id)
             
         finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            if run is not None and not run.done():
+                run.cancel()
             self.running_tasks.discard(task_id)
             
-    async def _handle_task_error(self, task_id: str, error: Exception):
+    async def _handle_task_error(self, task_id: str, error: Exception, worker_id: str = "worker"):
         """태스크 에러 처리"""
         task = self.tasks.get(task_id)
         if not task:
@@ -247,40 +383,60 @@ class ShrimpTaskManager:
         
         # 재시도 가능 여부 확인
         if task.retry_count < task.max_retries:
+            delay = task.retry_delay * task.retry_count
             task.status = TaskStatus.RETRYING
-            self._update_task_in_db(task)
+            task.ready_at = datetime.utcnow() + timedelta(seconds=delay)
+            
+            # 재시도 지연 후 다시 보이도록 큐에 반납 (워커는 기다리지 않고 다음 태스크 처리)
+            # DB 큐는 상태/재시도 시각/임대 해제를 임대 확인 UPDATE 한 번으로 기록 - 콜백보다 먼저
+            if self.queue.durable:
+                if not await self.queue.release(task_id, worker_id, task.priority, delay=delay,
+                                                status=TaskStatus.RETRYING.value, values=self._task_values(task)):
+                    self._abandon_task(task_id, worker_id)
+                    return
+            else:
+                self._update_task_in_db(task)
+                await self.queue.release(task_id, worker_id, task.priority, delay=delay,
+                                         status=TaskStatus.RETRYING.value)
             
             if task.on_retry:
                 await task.on_retry(task)
-                
-            # 재시도 지연
-            await asyncio.sleep(task.retry_delay * task.retry_count)
-            
-            # 다시 큐에 추가
-            await self.task_queues[task.priority].put(task_id)
             logger.info(f"Task retry scheduled: {task_id} (attempt {task.retry_count})")
             
         else:
             # 최종 실패
             task.status = TaskStatus.FAILED
             task.completed_at = datetime.utcnow()
-            self._update_task_in_db(task)
+            if not self._update_task_in_db(task, worker_id):
+                self._abandon_task(task_id, worker_id)
+                return
+            await self.queue.ack(task_id, worker_id)
+            await self._resolve_dependents(task, succeeded=False)
             
             if task.on_failure:
                 await task.on_failure(task)
                 
             logger.error(f"Task permanently failed: {task_id}")
             
-    async def _check_dependencies(self, task: Task) -> bool:
-        """의존성 체크"""
-        for dep_id in task.dependencies:
-            dep_task = self.tasks.get(dep_id)
-            if not dep_task or dep_task.status != TaskStatus.COMPLETED:
-                return False
-        return True
-        
-    def _save_task_to_db(self, task: Task):
-        """DB에 태스크 저장"""
+    async def _dependency_statuses(self, dependency_ids: List[str]) -> Dict[str, Optional[TaskStatus]]:
+        """의존 태스크 상태 (DB 큐는 다른 프로세스의 변경까지 반영된 DB 상태 기준)"""
+        if self.queue.durable:
+            statuses = await self.queue.statuses(dependency_ids)
+            return {dep_id: TaskStatus(statuses[dep_id]) if dep_id in statuses else None
+                    for dep_id in dependency_ids}
+        return {dep_id: self.tasks[dep_id].status if dep_id in self.tasks else None
+                for dep_id in dependency_ids}
+        
+    async def _unmet_dependencies(self, task: Task) -> List[str]:
+        """아직 완료되지 않은 의존 태스크 ID"""
+        statuses = await self._dependency_statuses(task.dependencies)
+        return [dep_id for dep_id in task.dependencies if statuses.get(dep_id) != TaskStatus.COMPLETED]
+        
+    def _save_task_to_db(self, task: Task, remaining_dependencies: int = 0):
+        """DB에 태스크 저장 (큐/의존성 컬럼 포함)"""
+        from app.core.task_queue import AGING_SECONDS, priority_rank, ready_key, task_handler_name
+        
+        handler_name = task_handler_name(task.handler)
         record = TaskRecord(
             id=task.id,
             job_id=task.job_id,
@@ -289,27 +445,55 @@ class ShrimpTaskManager:
             priority=task.priority.value,
             input_data=task.input_data,
             output_data=task.output_data,
+            error_message=task.error_message,
             retry_count=task.retry_count,
             max_retries=task.max_retries,
+            completed_at=task.completed_at,
             parent_task_id=task.parent_task_id,
-            checkpoint_data=task.checkpoint_data
+            checkpoint_data=task.checkpoint_data,
+            priority_rank=priority_rank(task.priority),
+            handler_name=handler_name,
+            affinity=self.queue.instance_id if task.handler is not None and handler_name is None else None,
+            dependencies=task.dependencies,
+            retry_delay=task.retry_delay,
+            remaining_dependencies=remaining_dependencies,
+            ready_at=task.ready_at,
+            ready_key=ready_key(task.priority, aging_seconds=getattr(self.queue, "aging_seconds", AGING_SECONDS))
+            if task.ready_at else None
         )
         self.db.add(record)
         self.db.commit()
         
-    def _update_task_in_db(self, task: Task):
-        """DB의 태스크 업데이트"""
-        record = self.db.query(TaskRecord).filter(TaskRecord.id == task.id).first()
-        if record:
-            record.status = task.status.value
-            record.output_data = task.output_data
-            record.error_message = task.error_message
-            record.error_trace = task.error_trace
-            record.retry_count = task.retry_count
-            record.started_at = task.started_at
-            record.completed_at = task.completed_at
-            record.checkpoint_data = task.checkpoint_data
-            self.db.commit()
+    def _task_values(self, task: Task) -> Dict[Any, Any]:
+        """태스크 상태를 DB 컬럼 값으로"""
+        values = {
+            TaskRecord.status: task.status.value,
+            TaskRecord.output_data: task.output_data,
+            TaskRecord.error_message: task.error_message,
+            TaskRecord.error_trace: task.error_trace,
+            TaskRecord.retry_count: task.retry_count,
+            TaskRecord.started_at: task.started_at,
+            TaskRecord.completed_at: task.completed_at,
+            TaskRecord.checkpoint_data: task.checkpoint_data,
+        }
+        if task.ready_at is not None:
+            values[TaskRecord.ready_at] = task.ready_at
+        return values
+        
+    def _update_task_in_db(self, task: Task, worker_id: Optional[str] = None) -> bool:
+        """
+        DB의 태스크 업데이트
+        
+        worker_id 를 주면 DB 큐에서는 그 워커가 임대를 가진 경우에만 갱신합니다
+        (임대를 잃은 뒤 다른 워커가 다시 가져간 태스크의 상태를 덮어쓰지 않도록). 갱신 여부 반환.
+        """
+        query = self.db.query(TaskRecord).filter(TaskRecord.id == task.id)
+        owner = self.queue.lease_owner(worker_id) if worker_id is not None and self.queue.durable else None
+        if owner is not None:
+            query = query.filter(TaskRecord.lease_owner == owner)
+        updated = query.update(self._task_values(task), synchronize_session=False)
+        self.db.commit()
+        return bool(updated)
             
     async def get_task_status(self, task_id: str) -> Optional[Task]:
         """태스크 상태 조회"""
@@ -322,9 +506,10 @@ class ShrimpTaskManager:
     async def cancel_task(self, task_id: str):
         """태스크 취소"""
         task = self.tasks.get(task_id)
-        if task and task.status in [TaskStatus.PENDING, TaskStatus.RETRYING]:
+        if task and task.status in [TaskStatus.PENDING, TaskStatus.WAITING, TaskStatus.RETRYING]:
             task.status = TaskStatus.CANCELLED
             self._update_task_in_db(task)
+            await self._resolve_dependents(task, succeeded=False)
             logger.info(f"Task cancelled: {task_id}")
             
     async def pause_task(self, task_id: str):
@@ -342,7 +527,8 @@ class ShrimpTaskManager:
         task = self.tasks.get(task_id)
         if task and task.status == TaskStatus.PAUSED:
             task.status = TaskStatus.PENDING
-            await self.task_queues[task.priority].put(task_id)
+            self._update_task_in_db(task)
+            await self.queue.put(task_id, task.priority)
             logger.info(f"Task resumed: {task_id}")
             
     async def get_metrics(self) -> Dict[str, Any]:
@@ -352,15 +538,101 @@ class ShrimpTaskManager:
         for task in self.tasks.values():
             status_counts[task.status] = status_counts.get(task.status, 0) + 1
             
-        queue_sizes = {
-            priority.value: self.task_queues[priority].qsize() 
-            for priority in TaskPriority
-        }
-        
         return {
             "total_tasks": total_tasks,
             "running_tasks": len(self.running_tasks),
             "status_counts": status_counts,
-            "queue_sizes": queue_sizes,
+            "queue": await self.queue.stats(),
             "workers": len(self.workers)
-        }
\ No newline at end of file
+        }
+        
+    async def get_critical_path(self, job_id: str) -> Dict[str, Any]:
+        """
+        작업의 임계 경로 타이밍 (DB 기준 - 다른 프로세스가 실행한 태스크 포함)
+        
+        마지막으로 끝난 태스크에서 시작해, 각 태스크를 ready 로 만든 (가장 늦게 끝난) 의존 태스크를
+        거슬러 올라갑니다. 단계별로 ready 후 시작까지의 큐 대기와 실행 시간을 나눠 보여줍니다.
+        """
+        rows = self.db.query(
+            TaskRecord.id, TaskRecord.task_type, TaskRecord.status, TaskRecord.dependencies,
+            TaskRecord.created_at, TaskRecord.ready_at, TaskRecord.started_at, TaskRecord.completed_at
+        ).filter(TaskRecord.job_id == job_id).all()
+        if not rows:
+            return {"job_id": job_id, "tasks": 0, "critical_path": []}
+        
+        by_id = {row.id: row for row in rows}
+        finished = [row for row in rows if row.completed_at is not None]
+        if not finished:
+            return {"job_id": job_id, "tasks": len(rows), "finished": 0, "critical_path": []}
+        
+        def seconds(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+            return round((end - start).total_seconds(), 3) if start and end else None
+        
+        path = []
+        current = max(finished, key=lambda row: row.completed_at)
+        while current is not None:
+            dependencies = [by_id[dep_id] for dep_id in (current.dependencies or [])
+                            if dep_id in by_id and by_id[dep_id].completed_at is not None]
+            gating = max(dependencies, key=lambda row: row.completed_at) if dependencies else None
+            path.append({
+                "task_id": current.id,
+                "task_type": current.task_type,
+                "status": current.status,
+                "gated_by": gating.id if gating else None,
+                # 마지막 의존성 완료 → ready 승격 지연 (이벤트 기반이면 0에 가까움)
+                "dependency_latency_seconds": seconds(gating.completed_at, current.ready_at) if gating else None,
+                "queue_wait_seconds": seconds(current.ready_at, current.started_at),
+                "run_seconds": seconds(current.started_at, current.completed_at),
+            })
+            current = gating
+        path.reverse()
+        
+        started = min(row.created_at for row in rows if row.created_at is not None)
+        return {
+            "job_id": job_id,
+            "tasks": len(rows),
+            "finished": len(finished),
+            "makespan_seconds": seconds(started, by_id[path[-1]["task_id"]].completed_at),
+            "critical_run_seconds": round(sum(step["run_seconds"] or 0 for step in path), 3),
+            "critical_wait_seconds": round(sum((step["queue_wait_seconds"] or 0)
+                                               + (step["dependency_latency_seconds"] or 0) for step in path), 3),
+            "critical_path": path,
+        }
+
+
+async def run_worker(num_workers: int = 5):
+    """
+    독립 워커 프로세스 실행 (`python -m app worker`)
+    
+    DB 큐에서 태스크를 가져와 실행하며 SIGINT/SIGTERM 을 받으면 종료합니다.
+    종료 시 버퍼에 남은 결과를 기록하고 점수화 워커 프로세스와 SQLite 커넥션 풀을 닫습니다
+    (풀의 aiosqlite 스레드가 남아 있으면 프로세스가 끝나지 않음).
+    """
+    import signal
+    from app.core.task_queue import DatabaseTaskQueue, ensure_task_queue_schema
+    from app.db.database import SessionLocal, engine
+    from app.db.sqlite_service import close_pools
+    from app.services.result_writer import flush_all_writers
+    from app.services.scoring_pool import scoring_pool
+    
+    ensure_task_queue_schema(engine)
+    db = SessionLocal()
+    manager = ShrimpTaskManager(db, queue=DatabaseTaskQueue())
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+    
+    await manager.start(num_workers=num_workers)
+    logger.info(f"Task worker running: {manager.queue.instance_id} ({num_workers} workers)")
+    try:
+        await stop.wait()
+    finally:
+        await manager.stop()
+        db.close()
+        await asyncio.to_thread(flush_all_writers)
+        scoring_pool.shutdown()
+        await close_pools()
\ No newline at end of file
@@ -0,0 +1,597 @@
+"""
+ShrimpTaskManager 태스크 큐 백엔드
+
+- MemoryTaskQueue: 프로세스 내 우선순위 큐 (테스트/단일 프로세스용)
+- DatabaseTaskQueue: workflow_tasks 테이블 기반 내구성 큐
+  여러 uvicorn 워커/레플리카와 `python -m app worker` 프로세스가 같은 큐를 공유
+
+의존성(DAG) 스케줄링:
+- 의존성이 남은 태스크는 waiting 상태로 두고 큐에 넣지 않음 (역방향 간선 dependents 로 연결)
+- 의존 태스크가 완료되면 자식의 남은 의존성 수를 갱신해 0이 된 태스크만 ready 로 승격
+- 의존 태스크가 최종 실패/취소되면 그 뒤의 waiting 태스크를 연쇄 취소
+- ready 큐는 (ready 시각 - 우선순위 × AIRISS_TASK_AGING_SECONDS) 순 - 오래 기다린 낮은 우선순위도 결국 앞서게 됨 (aging)
+
+DB 큐 동작:
+- 가져가기(claim)는 조건부 UPDATE(compare-and-swap)로 원자적이며, 성공한 워커만 임대(lease)를 가짐
+- 실행 중에는 하트비트로 임대를 연장하고, 임대가 만료되면(visibility timeout) 다른 워커가 다시 가져감
+- 재시도/의존성 대기는 available_at 을 미래로 미뤄 그때까지 보이지 않게 함
+- 다른 프로세스에서 불러올 수 없는 핸들러(메서드/클로저)는 제출한 인스턴스만 가져감 (affinity)
+"""
+import asyncio
+import importlib
+import itertools
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import and_, func, inspect, or_, text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+QUEUE_BACKEND = os.getenv("AIRISS_TASK_QUEUE_BACKEND", "database")  # database | memory
+LEASE_SECONDS = float(os.getenv("AIRISS_TASK_LEASE_SECONDS", "60"))
+POLL_SECONDS = float(os.getenv("AIRISS_TASK_POLL_SECONDS", "0.5"))
+AGING_SECONDS = float(os.getenv("AIRISS_TASK_AGING_SECONDS", "30"))  # 우선순위 한 단계 = 대기 30초
+PROMOTE_SWEEP_SECONDS = float(os.getenv("AIRISS_TASK_PROMOTE_SWEEP_SECONDS", "10"))
+CLAIM_CANDIDATES = 8
+
+PRIORITY_RANKS = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+QUEUED_STATUSES = ("pending", "retrying")
+RUNNING_STATUS = "running"
+WAITING_STATUS = "waiting"
+COMPLETED_STATUS = "completed"
+TERMINAL_FAILURE_STATUSES = ("failed", "cancelled")
+
+# 다른 프로세스에서도 이름으로 찾을 수 있는 핸들러
+_task_handlers: Dict[str, Callable] = {}
+
+
+def register_task_handler(handler: Callable = None, name: Optional[str] = None):
+    """태스크 핸들러 등록 (데코레이터로도 사용 가능)"""
+    def register(fn: Callable) -> Callable:
+        _task_handlers[name or f"{fn.__module__}:{fn.__qualname__}"] = fn
+        return fn
+    return register(handler) if handler is not None else register
+
+
+def task_handler_name(handler: Optional[Callable]) -> Optional[str]:
+    """다른 프로세스에서 불러올 수 있는 핸들러 이름 (불가능하면 None)"""
+    if handler is None:
+        return None
+    for name, registered in _task_handlers.items():
+        if registered is handler:
+            return name
+    qualname = getattr(handler, "__qualname__", "")
+    module = getattr(handler, "__module__", None)
+    if module and qualname and "." not in qualname and "<" not in qualname:
+        return f"{module}:{qualname}"
+    return None
+
+
+def resolve_task_handler(name: Optional[str]) -> Optional[Callable]:
+    """핸들러 이름으로 함수 찾기 (등록된 핸들러 → 모듈 함수)"""
+    if not name:
+        return None
+    if name in _task_handlers:
+        return _task_handlers[name]
+    module_name, _, attribute = name.partition(":")
+    try:
+        return getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as e:
+        logger.error(f"Task handler not found: {name} ({e})")
+        return None
+
+
+def priority_rank(priority: Any) -> int:
+    return PRIORITY_RANKS.get(getattr(priority, "value", priority), PRIORITY_RANKS["medium"])
+
+
+def ready_key(priority: Any, ready_time: Optional[float] = None, aging_seconds: float = AGING_SECONDS) -> float:
+    """ready 큐 정렬 키 (작을수록 먼저) - 우선순위 한 단계는 aging_seconds 만큼 먼저 ready 된 것과 같음"""
+    return (time.time() if ready_time is None else ready_time) - priority_rank(priority) * aging_seconds
+
+
+class MemoryTaskQueue:
+    """프로세스 내 우선순위 큐 (재시작하면 사라짐)"""
+
+    durable = False
+
+    def __init__(self, aging_seconds: float = AGING_SECONDS):
+        self.instance_id = f"memory-{os.getpid()}"
+        self.aging_seconds = aging_seconds
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        # 의존성 그래프: 남은 의존성 수 / 역방향 간선 / 대기 중 우선순위
+        self._remaining: Dict[str, int] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self._waiting_priority: Dict[str, Any] = {}
+
+    @property
+    def queue(self) -> asyncio.PriorityQueue:
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        return self._queue
+
+    async def put(self, task_id: str, priority: Any):
+        """ready 태스크 추가"""
+        await self.queue.put((ready_key(priority, aging_seconds=self.aging_seconds), next(self._sequence), task_id))
+
+    async def schedule(self, task_id: str, priority: Any, unmet: Iterable[str]) -> bool:
+        """미완료 의존성이 없으면 바로 ready, 있으면 대기 (ready 여부 반환)"""
+        unmet = list(dict.fromkeys(unmet))
+        if not unmet:
+            await self.put(task_id, priority)
+            return True
+        self._remaining[task_id] = len(unmet)
+        self._waiting_priority[task_id] = priority
+        for dependency in unmet:
+            self._dependents.setdefault(dependency, []).append(task_id)
+        return False
+
+    async def resolve(self, task_id: str, succeeded: bool) -> Tuple[List[str], List[str]]:
+        """
+        태스크 종료를 자식들에게 반영
+
+        Returns:
+            (ready 로 승격된 태스크, 연쇄 취소된 태스크)
+        """
+        promoted: List[str] = []
+        cancelled: List[str] = []
+        if succeeded:
+            for child in self._dependents.pop(task_id, []):
+                if child not in self._remaining:
+                    continue
+                self._remaining[child] -= 1
+                if self._remaining[child] <= 0:
+                    del self._remaining[child]
+                    await self.put(child, self._waiting_priority.pop(child))
+                    promoted.append(child)
+            return promoted, cancelled
+
+        stack = list(self._dependents.pop(task_id, []))
+        while stack:
+            child = stack.pop()
+            if self._remaining.pop(child, None) is None:
+                continue
+            self._waiting_priority.pop(child, None)
+            cancelled.append(child)
+            stack.extend(self._dependents.pop(child, []))
+        return promoted, cancelled
+
+    async def claim(self, worker_id: str, timeout: float = POLL_SECONDS) -> Optional[str]:
+        try:
+            _, _, task_id = await asyncio.wait_for(self.queue.get(), timeout)
+            return task_id
+        except asyncio.TimeoutError:
+            return None
+
+    def lease_owner(self, worker_id: str) -> Optional[str]:
+        """임대 없음 (프로세스 내 큐)"""
+        return None
+
+    async def heartbeat(self, task_id: str, worker_id: str) -> bool:
+        return True
+
+    async def ack(self, task_id: str, worker_id: str):
+        pass
+
+    async def release(self, task_id: str, worker_id: str, priority: Any, delay: float = 0.0,
+                      status: str = QUEUED_STATUSES[0], values: Optional[Dict[Any, Any]] = None) -> bool:
+        """지연 후 다시 큐에 넣음 (values 는 DB 큐 전용 - 태스크 행은 호출 측이 갱신)"""
+        if delay <= 0:
+            await self.put(task_id, priority)
+            return True
+        loop = asyncio.get_running_loop()
+        loop.call_later(delay, lambda: asyncio.ensure_future(self.put(task_id, priority)))
+        return True
+
+    async def statuses(self, task_ids: Iterable[str]) -> Dict[str, str]:
+        return {}
+
+    async def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "queued": self.queue.qsize(), "waiting": len(self._remaining)}
+
+
+class DatabaseTaskQueue:
+    """workflow_tasks 테이블 기반 내구성 큐"""
+
+    durable = True
+
+    def __init__(self, lease_seconds: float = LEASE_SECONDS, poll_seconds: float = POLL_SECONDS,
+                 aging_seconds: float = AGING_SECONDS, session_factory: Optional[Callable] = None):
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.aging_seconds = aging_seconds
+        self._last_sweep = 0.0
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+        self._session_factory = session_factory
+        self._wakeup: Optional[asyncio.Event] = None
+        self.counters = {"claimed": 0, "reclaimed": 0, "claim_conflicts": 0, "lease_lost": 0, "released": 0,
+                         "promoted": 0, "swept": 0, "cascade_cancelled": 0}
+
+    def _session(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        from app.db.database import SessionLocal
+        return SessionLocal()
+
+    @property
+    def wakeup(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    async def put(self, task_id: str, priority: Any):
+        """행은 ShrimpTaskManager 가 이미 저장 - 같은 프로세스의 대기 워커만 깨움"""
+        self.wakeup.set()
+
+    def lease_owner(self, worker_id: str) -> str:
+        """임대 소유자 값 (인스턴스/워커)"""
+        return f"{self.instance_id}/{worker_id}"
+
+    def _claimable(self, now: datetime):
+        from app.core.task_manager import TaskRecord
+        return and_(
+            or_(
+                and_(TaskRecord.status.in_(QUEUED_STATUSES),
+                     or_(TaskRecord.available_at.is_(None), TaskRecord.available_at <= now)),
+                # 임대가 만료된 실행 중 태스크 (워커 종료/멈춤) → 다시 보임
+                and_(TaskRecord.status == RUNNING_STATUS, TaskRecord.lease_expires_at < now)
+            ),
+            or_(TaskRecord.affinity.is_(None), TaskRecord.affinity == self.instance_id)
+        )
+
+    def _claim_sync(self, worker_id: str) -> Optional[str]:
+        from app.core.task_manager import TaskRecord
+
+        db = self._session()
+        try:
+            now = datetime.utcnow()
+            candidates = db.query(TaskRecord.id, TaskRecord.status) \
+                .filter(self._claimable(now)) \
+                .order_by(TaskRecord.ready_key, TaskRecord.created_at) \
+                .limit(CLAIM_CANDIDATES) \
+                .all()
+            for task_id, status in candidates:
+                claimed = db.query(TaskRecord) \
+                    .filter(TaskRecord.id == task_id, self._claimable(now)) \
+                    .update({
+                        TaskRecord.status: RUNNING_STATUS,
+                        TaskRecord.lease_owner: self.lease_owner(worker_id),
+                        TaskRecord.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                        TaskRecord.heartbeat_at: now,
+                        TaskRecord.started_at: now,
+                    }, synchronize_session=False)
+                db.commit()
+                if claimed:
+                    self.counters["claimed"] += 1
+                    if status == RUNNING_STATUS:
+                        self.counters["reclaimed"] += 1
+                        logger.warning(f"Task lease expired, reclaimed: {task_id}")
+                    return task_id
+                self.counters["claim_conflicts"] += 1
+            return None
+        except OperationalError as e:
+            # SQLite 잠금 경합 등 - 다음 폴링에서 재시도
+            db.rollback()
+            logger.debug(f"Task claim skipped: {e}")
+            return None
+        finally:
+            db.close()
+
+    async def claim(self, worker_id: str, timeout: Optional[float] = None) -> Optional[str]:
+        """태스크 1개를 원자적으로 가져옴 (없으면 제출/승격 알림 또는 폴링 주기까지 대기 후 None)"""
+        task_id = await asyncio.to_thread(self._claim_sync, worker_id)
+        if task_id is None:
+            if time.monotonic() - self._last_sweep >= PROMOTE_SWEEP_SECONDS:
+                self._last_sweep = time.monotonic()
+                if await asyncio.to_thread(self._sweep_waiting_sync):
+                    return await asyncio.to_thread(self._claim_sync, worker_id)
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout or self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+        return task_id
+
+    def _update_lease(self, task_id: str, worker_id: str, values: Dict[Any, Any]) -> bool:
+        from app.core.task_manager import TaskRecord
+
+        db = self._session()
+        try:
+            updated = db.query(TaskRecord) \
+                .filter(TaskRecord.id == task_id,
+                        TaskRecord.lease_owner == self.lease_owner(worker_id)) \
+                .update(values, synchronize_session=False)
+            db.commit()
+            return bool(updated)
+        except OperationalError as e:
+            db.rollback()
+            logger.warning(f"Task lease update failed ({task_id}): {e}")
+            return True  # 일시적 잠금 - 임대를 잃은 것으로 보지 않음
+        finally:
+            db.close()
+
+    async def heartbeat(self, task_id: str, worker_id: str) -> bool:
+        """임대 연장 (다른 워커가 가져간 뒤면 False)"""
+        from app.core.task_manager import TaskRecord
+
+        now = datetime.utcnow()
+        kept = await asyncio.to_thread(self._update_lease, task_id, worker_id, {
+            TaskRecord.heartbeat_at: now,
+            TaskRecord.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+        })
+        if not kept:
+            self.counters["lease_lost"] += 1
+            logger.warning(f"Task lease lost: {task_id} ({worker_id})")
+        return kept
+
+    async def ack(self, task_id: str, worker_id: str):
+        """완료/최종 실패 후 임대 해제"""
+        from app.core.task_manager import TaskRecord
+
+        await asyncio.to_thread(self._update_lease, task_id, worker_id, {
+            TaskRecord.lease_owner: None,
+            TaskRecord.lease_expires_at: None,
+        })
+
+    async def release(self, task_id: str, worker_id: str, priority: Any, delay: float = 0.0,
+                      status: str = QUEUED_STATUSES[0], values: Optional[Dict[Any, Any]] = None) -> bool:
+        """
+        임대를 반납하고 delay 초 뒤에 다시 보이게 함 (재시도/의존성 대기)
+
+        상태/available_at/임대 해제와 values(오류 메시지, 재시도 횟수 등 태스크 컬럼)를 임대를 확인하는
+        UPDATE 한 번으로 기록하므로, 반납 전에 다른 워커가 재시도 지연 없이 가져가는 구간이 없습니다.
+        이미 임대를 잃었으면 아무것도 쓰지 않고 False.
+        """
+        from app.core.task_manager import TaskRecord
+
+        delay = max(0.0, delay)
+        released = await asyncio.to_thread(self._update_lease, task_id, worker_id, {
+            **(values or {}),
+            TaskRecord.status: status,
+            TaskRecord.available_at: datetime.utcnow() + timedelta(seconds=delay),
+            TaskRecord.ready_at: datetime.utcnow() + timedelta(seconds=delay),
+            TaskRecord.ready_key: time.time() + delay - TaskRecord.priority_rank * self.aging_seconds,
+            TaskRecord.lease_owner: None,
+            TaskRecord.lease_expires_at: None,
+        })
+        if released:
+            self.counters["released"] += 1
+        else:
+            self.counters["lease_lost"] += 1
+            logger.warning(f"Task lease lost before release: {task_id} ({worker_id})")
+        return released
+
+    def _link_sync(self, task_id: str, unmet: List[str]) -> bool:
+        """부모들에 역방향 간선을 추가한 뒤 남은 의존성 재계산 (그 사이 완료된 부모 반영)"""
+        from app.core.task_manager import TaskRecord
+
+        db = self._session()
+        try:
+            parents = db.query(TaskRecord).filter(TaskRecord.id.in_(unmet)).with_for_update().all()
+            for parent in parents:
+                parent.dependents = list(parent.dependents or []) + [task_id]
+            db.flush()
+            child = db.query(TaskRecord).filter(TaskRecord.id == task_id).first()
+            broken = [parent.id for parent in parents if parent.status in TERMINAL_FAILURE_STATUSES]
+            if broken and child is not None:
+                # 연결 전에 부모가 최종 실패 - 연쇄 취소에서 빠졌으므로 여기서 취소
+                child.status = TERMINAL_FAILURE_STATUSES[1]
+                child.error_message = f"Dependency did not complete: {broken[0]}"
+                child.completed_at = datetime.utcnow()
+                ready = False
+            else:
+                remaining = len(unmet) - sum(1 for parent in parents if parent.status == COMPLETED_STATUS)
+                ready = self._set_remaining(db, child, remaining)
+            db.commit()
+            return ready
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _set_remaining(self, db, child, remaining: int) -> bool:
+        """남은 의존성 수 기록, 0이면 ready 로 승격"""
+        if child is None or child.status != WAITING_STATUS:
+            return False
+        child.remaining_dependencies = remaining
+        if remaining > 0:
+            return False
+        now = datetime.utcnow()
+        child.status = QUEUED_STATUSES[0]
+        child.ready_at = now
+        child.available_at = None
+        child.ready_key = ready_key(child.priority, aging_seconds=self.aging_seconds)
+        return True
+
+    def _recount(self, db, children: List[Any]) -> List[str]:
+        """자식들의 남은 의존성을 완료 상태 기준으로 다시 세고 승격된 ID 반환 (여러 번 실행해도 같은 결과)"""
+        from app.core.task_manager import TaskRecord
+
+        dependency_ids = {dep for child in children for dep in (child.dependencies or [])}
+        completed = {
+            task_id for (task_id,) in db.query(TaskRecord.id)
+            .filter(TaskRecord.id.in_(dependency_ids), TaskRecord.status == COMPLETED_STATUS)
+        } if dependency_ids else set()
+        promoted = []
+        for child in children:
+            dependencies = set(child.dependencies or [])
+            if self._set_remaining(db, child, len(dependencies - completed)):
+                promoted.append(child.id)
+        return promoted
+
+    def _resolve_sync(self, task_id: str, succeeded: bool) -> Tuple[List[str], List[str]]:
+        from app.core.task_manager import TaskRecord
+
+        db = self._session()
+        try:
+            parent = db.query(TaskRecord).filter(TaskRecord.id == task_id).first()
+            children_ids = list((parent.dependents or []) if parent else [])
+            promoted: List[str] = []
+            cancelled: List[str] = []
+            if succeeded and children_ids:
+                children = db.query(TaskRecord) \
+                    .filter(TaskRecord.id.in_(children_ids), TaskRecord.status == WAITING_STATUS) \
+                    .with_for_update().all()
+                promoted = self._recount(db, children)
+            elif not succeeded:
+                now = datetime.utcnow()
+                frontier = children_ids
+                while frontier:
+                    children = db.query(TaskRecord) \
+                        .filter(TaskRecord.id.in_(frontier), TaskRecord.status == WAITING_STATUS).all()
+                    frontier = []
+                    for child in children:
+                        child.status = TERMINAL_FAILURE_STATUSES[1]
+                        child.error_message = f"Dependency did not complete: {task_id}"
+                        child.completed_at = now
+                        cancelled.append(child.id)
+                        frontier.extend(child.dependents or [])
+            db.commit()
+            return promoted, cancelled
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _sweep_waiting_sync(self) -> int:
+        """
+        안전망: 모든 의존성이 완료됐는데 waiting 으로 남은 태스크 승격
+        (완료 처리 중 프로세스가 종료된 경우 등)
+        """
+        from app.core.task_manager import TaskRecord
+
+        db = self._session()
+        try:
+            waiting = db.query(TaskRecord).filter(TaskRecord.status == WAITING_STATUS).limit(200).all()
+            promoted = self._recount(db, waiting) if waiting else []
+            db.commit()
+            if promoted:
+                self.counters["swept"] += len(promoted)
+                logger.warning(f"Promoted {len(promoted)} stranded waiting tasks")
+            return len(promoted)
+        except OperationalError as e:
+            db.rollback()
+            logger.debug(f"Waiting task sweep skipped: {e}")
+            return 0
+        finally:
+            db.close()
+
+    async def schedule(self, task_id: str, priority: Any, unmet: Iterable[str]) -> bool:
+        """미완료 의존성이 없으면 바로 ready, 있으면 부모에 연결해 대기 (ready 여부 반환)"""
+        unmet = list(dict.fromkeys(unmet))
+        ready = not unmet or await asyncio.to_thread(self._link_sync, task_id, unmet)
+        if ready:
+            self.wakeup.set()
+        return ready
+
+    async def resolve(self, task_id: str, succeeded: bool) -> Tuple[List[str], List[str]]:
+        """
+        태스크 종료를 자식들에게 반영 (다른 프로세스가 제출한 자식 포함)
+
+        Returns:
+            (ready 로 승격된 태스크, 연쇄 취소된 태스크)
+        """
+        promoted, cancelled = await asyncio.to_thread(self._resolve_sync, task_id, succeeded)
+        self.counters["promoted"] += len(promoted)
+        self.counters["cascade_cancelled"] += len(cancelled)
+        if promoted:
+            self.wakeup.set()
+        return promoted, cancelled
+
+    def _statuses_sync(self, task_ids: List[str]) -> Dict[str, str]:
+        from app.core.task_manager import TaskRecord
+
+        db = self._session()
+        try:
+            rows = db.query(TaskRecord.id, TaskRecord.status).filter(TaskRecord.id.in_(task_ids)).all()
+            return {task_id: status for task_id, status in rows}
+        finally:
+            db.close()
+
+    async def statuses(self, task_ids: Iterable[str]) -> Dict[str, str]:
+        task_ids = list(task_ids)
+        if not task_ids:
+            return {}
+        return await asyncio.to_thread(self._statuses_sync, task_ids)
+
+    def _stats_sync(self) -> Dict[str, Any]:
+        from app.core.task_manager import TaskRecord
+
+        db = self._session()
+        try:
+            queued = db.query(TaskRecord.priority, func.count(TaskRecord.id)) \
+                .filter(TaskRecord.status.in_(QUEUED_STATUSES)) \
+                .group_by(TaskRecord.priority) \
+                .all()
+            leased = db.query(func.count(TaskRecord.id)) \
+                .filter(TaskRecord.status == RUNNING_STATUS, TaskRecord.lease_owner.isnot(None)) \
+                .scalar()
+            waiting = db.query(func.count(TaskRecord.id)).filter(TaskRecord.status == WAITING_STATUS).scalar()
+            return {"queued": {priority: count for priority, count in queued},
+                    "leased": leased or 0, "waiting": waiting or 0}
+        finally:
+            db.close()
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "database",
+            "instance_id": self.instance_id,
+            "lease_seconds": self.lease_seconds,
+            "aging_seconds": self.aging_seconds,
+            **await asyncio.to_thread(self._stats_sync),
+            **self.counters,
+        }
+
+
+def ensure_task_queue_schema(engine) -> List[str]:
+    """
+    workflow_tasks 테이블에 큐 컬럼/인덱스 준비 (없으면 테이블 생성, 있으면 빠진 컬럼만 추가)
+
+    Returns:
+        추가된 컬럼 이름 목록
+    """
+    from app.core.task_manager import TaskRecord
+
+    table = TaskRecord.__table__
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        table.create(engine, checkfirst=True)
+        logger.info(f"Created {table.name} table for task queue")
+        return [column.name for column in table.columns]
+
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    added = []
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            added.append(column.name)
+    for index in table.indexes:
+        index.create(engine, checkfirst=True)
+    if added:
+        logger.info(f"Added task queue columns to {table.name}: {', '.join(added)}")
+    return added
+
+
+def create_task_queue(backend: Optional[str] = None):
+    """설정된 큐 백엔드 생성 (database 는 스키마 준비 포함)"""
+    backend = (backend or QUEUE_BACKEND).lower()
+    if backend == "memory":
+        return MemoryTaskQueue()
+    if backend != "database":
+        raise ValueError(f"Unknown task queue backend: {backend}")
+
+    from app.db.database import engine
+    ensure_task_queue_schema(engine)
+    return DatabaseTaskQueue()
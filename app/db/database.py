@@ -7,6 +7,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
+import json
 import os
 import logging
 
@@ -83,12 +84,20 @@ else:
             DATABASE_URL += "?sslmode=require"
             logger.info("🔒 Added sslmode=require for Neon compatibility")
 
+
+
+def _json_serializer(value) -> str:
+    """JSON 컬럼 직렬화 - 한글을 이스케이프하지 않아야 ILIKE/trigram 검색이 원문과 일치"""
+    return json.dumps(value, ensure_ascii=False)
+
+
 # Create engine with appropriate settings
 if DATABASE_URL.startswith("sqlite"):
     # SQLite settings
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},  # Needed for SQLite
+        json_serializer=_json_serializer,
         echo=False  # Set to True for SQL debugging
     )
     logger.info(f"Using SQLite database: {DATABASE_URL}")
@@ -109,6 +118,7 @@ else:
             max_overflow=10,
             pool_pre_ping=True,
             pool_timeout=30,  # 연결 풀 타임아웃
+            json_serializer=_json_serializer,
             echo=False  # Set to True for SQL debugging
         )
         
@@ -140,6 +150,7 @@ else:
         engine = create_engine(
             DATABASE_URL,
             connect_args={"check_same_thread": False},
+            json_serializer=_json_serializer,
             echo=False
         )
 
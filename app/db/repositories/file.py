@@ -14,6 +14,8 @@ import logging
 import pandas as pd
 import pickle
 
+from app.utils.columnar_store import dataset_path, is_dataset, read_dataset
+
 logger = logging.getLogger(__name__)
 
 
@@ -124,7 +126,14 @@ class FileRepository:
             # Try original file
             file_path = file_data.get('file_path', '')
             if not file_path:
-                file_path = f'temp_data/{file_data["id"]}.pkl'
+                file_path = dataset_path(file_data["id"])
+                if not is_dataset(file_path):
+                    file_path = f'temp_data/{file_data["id"]}.pkl'
+            
+            if is_dataset(file_path):
+                df = read_dataset(file_path)
+                logger.info(f"Dataset loaded: {file_path} ({len(df)} rows, {len(df.columns)} columns)")
+                return df if len(df) > 0 else None
             
             if file_path and os.path.exists(file_path):
                 file_size = os.path.getsize(file_path)
@@ -1,17 +1,417 @@
 # app/db/sqlite_service.py - Job ID 불일치 완전 해결 버전
+# 커넥션 풀: 경로별로 오래 유지되는 연결을 재사용 (WAL, synchronous=NORMAL, 캐시/mmap/busy_timeout 설정)
 import aiosqlite
+import asyncio
 import pickle
 import json
+import sqlite3
+import time
 import uuid
 import logging
 import os
 import traceback
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
+from app.utils.columnar_store import dataset_path, delete_dataset, is_dataset, read_dataset, write_dataset
+from app.utils.response_cache import FINISHED_JOB_STATUSES, bump_data_version
+from app.utils.text_search import fts5_match_expression, highlight_snippet, like_pattern, search_terms, split_terms
+
 logger = logging.getLogger(__name__)
 
+# 커넥션 풀 설정 (경로별로 오래 유지되는 연결을 재사용, 연결 시 PRAGMA 1회 적용)
+POOL_SIZE = int(os.getenv("AIRISS_SQLITE_POOL_SIZE", "4"))
+POOL_ACQUIRE_TIMEOUT = float(os.getenv("AIRISS_SQLITE_ACQUIRE_TIMEOUT", "30"))
+CACHE_SIZE_KIB = int(os.getenv("AIRISS_SQLITE_CACHE_KIB", "20000"))          # 연결당 페이지 캐시 (KiB)
+MMAP_SIZE_BYTES = int(os.getenv("AIRISS_SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+BUSY_TIMEOUT_MS = int(os.getenv("AIRISS_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA cache_size=-{CACHE_SIZE_KIB}",
+    f"PRAGMA mmap_size={MMAP_SIZE_BYTES}",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# results 테이블 검색용 컬럼 - result_data JSON 에서 추출해 저장 시 함께 기록 (앞쪽 키 우선)
+RESULT_FIELD_KEYS = {
+    "score": ("AIRISS_v4_종합점수", "hybrid_score", "overall_score", "score"),
+    "grade": ("OK등급", "ok_grade", "grade"),
+    "department": ("부서", "department"),
+    "position": ("직급", "직책", "position"),
+    "name": ("이름", "성명", "직원명", "name"),
+    "analyzed_at": ("분석일시", "분석시간", "analyzed_at"),
+}
+RESULT_FIELDS = tuple(RESULT_FIELD_KEYS)
+RESULTS_SCHEMA_VERSION = 3      # PRAGMA user_version - 1: 검색용 컬럼 백필, 2: 전문 검색 인덱스 구축, 3: 결과 집계 구축
+RESULT_BACKFILL_BATCH = 1000
+
+# 전문 검색 인덱스 (results_fts, rowid = results.rowid) 에 넣는 텍스트 - result_data JSON 키 (앞쪽 우선)
+RESULT_TEXT_KEYS = {
+    "opinion": ("원본의견", "opinion"),
+    "ai_strengths": ("AI_핵심강점", "ai_strengths"),
+    "ai_weaknesses": ("AI_개선영역", "ai_weaknesses"),
+    "ai_feedback": ("AI_종합피드백", "ai_feedback"),
+}
+RESULT_TEXT_FIELDS = tuple(RESULT_TEXT_KEYS)
+# 일치 건수가 이보다 많으면 bm25 순위 계산(전체 일치 행 점수화) 대신 최신순으로 반환
+FULLTEXT_RANK_LIMIT = int(os.getenv("AIRISS_FULLTEXT_RANK_LIMIT", "10000"))
+
+
+def extract_result_texts(result_data: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """result_data 에서 전문 검색 텍스트 추출 (트리거의 json_extract 와 같은 키 우선순위)"""
+    texts: Dict[str, Optional[str]] = {}
+    for field, keys in RESULT_TEXT_KEYS.items():
+        value = next((result_data[key] for key in keys
+                      if isinstance(result_data, dict) and result_data.get(key) is not None), None)
+        if value is not None and not isinstance(value, str):
+            value = json.dumps(value, ensure_ascii=False)
+        texts[field] = value
+    return texts
+
+
+def _result_text_sql(source: str) -> str:
+    """result_data 컬럼 식에서 전문 검색 텍스트를 꺼내는 SQL (잘못된 JSON 은 NULL)"""
+    data = f"CASE WHEN json_valid({source}) THEN {source} END"
+    return ", ".join(
+        "COALESCE({})".format(", ".join(f"json_extract({data}, '$.{key}')" for key in keys))
+        for keys in RESULT_TEXT_KEYS.values()
+    )
+
+
+RESULTS_FTS_SCHEMA = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5(
+        {", ".join(RESULT_TEXT_FIELDS)}, tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS results_fts_insert AFTER INSERT ON results BEGIN
+        INSERT INTO results_fts (rowid, {", ".join(RESULT_TEXT_FIELDS)})
+        VALUES (new.rowid, {_result_text_sql("new.result_data")});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS results_fts_delete AFTER DELETE ON results BEGIN
+        DELETE FROM results_fts WHERE rowid = old.rowid;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS results_fts_update AFTER UPDATE OF result_data ON results BEGIN
+        DELETE FROM results_fts WHERE rowid = old.rowid;
+        INSERT INTO results_fts (rowid, {", ".join(RESULT_TEXT_FIELDS)})
+        VALUES (new.rowid, {_result_text_sql("new.result_data")});
+    END""",
+)
+
+RESULT_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_results_job_id ON results (job_id)",
+    "CREATE INDEX IF NOT EXISTS idx_results_uid_analyzed ON results (uid, analyzed_at)",
+    "CREATE INDEX IF NOT EXISTS idx_results_score ON results (score)",
+    "CREATE INDEX IF NOT EXISTS idx_results_grade ON results (grade)",
+    "CREATE INDEX IF NOT EXISTS idx_results_department ON results (department, score)",
+    "CREATE INDEX IF NOT EXISTS idx_results_position ON results (position)",
+    "CREATE INDEX IF NOT EXISTS idx_results_name ON results (name)",
+    "CREATE INDEX IF NOT EXISTS idx_results_analyzed_at ON results (analyzed_at)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)",
+)
+
+
+# 대시보드용 결과 집계 (작업 x 부서 x 등급) - results 트리거가 같은 트랜잭션에서 증분 갱신
+RESULT_STATS_KEY = "job_id = {row}.job_id AND department = COALESCE({row}.department, '') AND grade = COALESCE({row}.grade, '')"
+
+
+def _result_stats_add_sql(row: str) -> str:
+    return f"""INSERT INTO result_stats (job_id, department, grade, count, score_count, score_sum, score_sumsq, score_min, score_max)
+        VALUES ({row}.job_id, COALESCE({row}.department, ''), COALESCE({row}.grade, ''), 1, {row}.score IS NOT NULL,
+                COALESCE({row}.score, 0), COALESCE({row}.score * {row}.score, 0), {row}.score, {row}.score)
+        ON CONFLICT (job_id, department, grade) DO UPDATE SET
+            count = count + 1,
+            score_count = score_count + excluded.score_count,
+            score_sum = score_sum + excluded.score_sum,
+            score_sumsq = score_sumsq + excluded.score_sumsq,
+            score_min = CASE WHEN score_min IS NULL OR excluded.score_min < score_min THEN excluded.score_min ELSE score_min END,
+            score_max = CASE WHEN score_max IS NULL OR excluded.score_max > score_max THEN excluded.score_max ELSE score_max END;"""
+
+
+def _result_stats_remove_sql(row: str) -> str:
+    key = RESULT_STATS_KEY.format(row=row)
+    # 빠진 점수가 최소/최대였으면 해당 키의 남은 결과에서 다시 계산 (results 의 job_id 인덱스 사용)
+    group = "FROM results WHERE job_id = result_stats.job_id AND COALESCE(department, '') = result_stats.department " \
+            "AND COALESCE(grade, '') = result_stats.grade"
+    return f"""UPDATE result_stats SET
+            count = count - 1,
+            score_count = score_count - ({row}.score IS NOT NULL),
+            score_sum = score_sum - COALESCE({row}.score, 0),
+            score_sumsq = score_sumsq - COALESCE({row}.score * {row}.score, 0)
+        WHERE {key};
+        DELETE FROM result_stats WHERE {key} AND count <= 0;
+        UPDATE result_stats SET score_min = (SELECT MIN(score) {group}), score_max = (SELECT MAX(score) {group})
+        WHERE {key} AND ({row}.score = score_min OR {row}.score = score_max);"""
+
+
+RESULT_STATS_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS result_stats (
+        job_id TEXT NOT NULL,
+        department TEXT NOT NULL,
+        grade TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        score_count INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        score_sumsq REAL NOT NULL DEFAULT 0,
+        score_min REAL,
+        score_max REAL,
+        PRIMARY KEY (job_id, department, grade)
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS result_stats_insert AFTER INSERT ON results BEGIN
+        {_result_stats_add_sql("new")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS result_stats_delete AFTER DELETE ON results BEGIN
+        {_result_stats_remove_sql("old")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS result_stats_update AFTER UPDATE OF job_id, department, grade, score ON results BEGIN
+        {_result_stats_remove_sql("old")}
+        {_result_stats_add_sql("new")}
+    END""",
+)
+
+RESULT_STATS_REBUILD_SQL = """
+    INSERT INTO result_stats (job_id, department, grade, count, score_count, score_sum, score_sumsq, score_min, score_max)
+    SELECT job_id, COALESCE(department, ''), COALESCE(grade, ''), COUNT(*), COUNT(score),
+           COALESCE(SUM(score), 0), COALESCE(SUM(score * score), 0), MIN(score), MAX(score)
+    FROM results
+    GROUP BY 1, 2, 3
+"""
+
+
+def extract_result_fields(result_data: Dict[str, Any], default_date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    result_data 에서 검색용 컬럼 값 추출
+    
+    점수는 숫자로, 분석일시는 ISO 형식으로 정규화하고 분석일시가 없으면 default_date 를 사용합니다.
+    """
+    fields: Dict[str, Any] = {}
+    for field, keys in RESULT_FIELD_KEYS.items():
+        value = next((result_data[key] for key in keys
+                      if isinstance(result_data, dict) and result_data.get(key) not in (None, "")), None)
+        if field == "score":
+            try:
+                value = float(value) if value is not None else None
+            except (TypeError, ValueError):
+                value = None
+        elif field == "analyzed_at":
+            try:
+                value = datetime.fromisoformat(str(value)).isoformat() if value is not None else None
+            except ValueError:
+                value = None
+            value = value or default_date
+        elif value is not None:
+            value = str(value).strip() or None
+        fields[field] = value
+    return fields
+
+
+def result_row(result_id: str, job_id: str, uid: str, result_data: Dict[str, Any], created_at: str) -> tuple:
+    """results INSERT 파라미터 (RESULT_INSERT_SQL 컬럼 순서)"""
+    fields = extract_result_fields(result_data, default_date=created_at)
+    # 한글 키를 이스케이프하지 않아야 SQLite json_extract 경로('$.원본의견')가 일치함 (전문 검색 트리거)
+    return (result_id, job_id, uid, json.dumps(result_data, ensure_ascii=False), created_at,
+            *(fields[field] for field in RESULT_FIELDS))
+
+
+RESULT_INSERT_SQL = f"""
+    INSERT INTO results (
+        id, job_id, uid, result_data, created_at, {", ".join(RESULT_FIELDS)}
+    ) VALUES ({", ".join("?" * (5 + len(RESULT_FIELDS)))})
+"""
+
+
+def fulltext_condition(query: Optional[str], alias: str = "r") -> Tuple[Optional[str], List[Any]]:
+    """
+    전문 검색 조건 SQL ({alias}.rowid IN results_fts ...) 과 파라미터
+    
+    3글자 이상 검색어는 trigram 인덱스 MATCH, 짧은 검색어는 results_fts 컬럼 부분 문자열로 찾고
+    모든 검색어가 일치해야 합니다. 검색어가 없으면 (None, []).
+    """
+    indexed, short = split_terms(search_terms(query))
+    clauses, params = _fulltext_clauses(indexed, short)
+    if not clauses:
+        return None, []
+    return f"{alias}.rowid IN (SELECT rowid FROM results_fts WHERE {' AND '.join(clauses)})", params
+
+
+def _fulltext_clauses(indexed: List[str], short: List[str]) -> Tuple[List[str], List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    match = fts5_match_expression(indexed)
+    if match:
+        clauses.append("results_fts MATCH ?")
+        params.append(match)
+    for term in short:
+        clauses.append("(" + " OR ".join(f"results_fts.{field} LIKE ? ESCAPE '\\'" for field in RESULT_TEXT_FIELDS) + ")")
+        params.extend([like_pattern(term)] * len(RESULT_TEXT_FIELDS))
+    return clauses, params
+
+
+async def open_connection(db_path: str) -> aiosqlite.Connection:
+    """PRAGMA 가 적용된 새 연결"""
+    conn = await aiosqlite.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+    for pragma in CONNECTION_PRAGMAS:
+        await conn.execute(pragma)
+    return conn
+
+
+class SQLiteConnectionPool:
+    """
+    aiosqlite 커넥션 풀 (DB 경로 + 이벤트 루프 단위)
+    
+    - 최대 size 개 연결을 필요할 때 열고 닫지 않고 재사용
+    - 모든 연결이 사용 중이면 반납될 때까지 대기 (대기자 수/대기 시간 집계)
+    - 반납 시 열린 트랜잭션은 롤백, 롤백도 실패한 연결은 폐기
+    """
+    
+    def __init__(self, db_path: str, size: int = POOL_SIZE, acquire_timeout: float = POOL_ACQUIRE_TIMEOUT):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.acquire_timeout = acquire_timeout
+        self._idle: List[aiosqlite.Connection] = []
+        self._slots = asyncio.Semaphore(self.size)
+        self._opened = 0
+        self._closed = False
+        
+        self.counters = {
+            "checkouts": 0,
+            "connects": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "hold_seconds": 0.0,
+            "max_hold_seconds": 0.0,
+        }
+        self.waiters = 0
+        self.max_waiters = 0
+        self.in_use = 0
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """연결 대여 (async with pool.acquire() as conn)"""
+        if self._closed:
+            raise RuntimeError(f"SQLite 커넥션 풀이 종료되었습니다: {self.db_path}")
+        
+        started = time.monotonic()
+        if self._slots.locked():
+            self.waiters += 1
+            self.max_waiters = max(self.max_waiters, self.waiters)
+            self.counters["waits"] += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+            except asyncio.TimeoutError:
+                self.counters["timeouts"] += 1
+                raise TimeoutError(f"SQLite 연결 대기 시간 초과 ({self.acquire_timeout}초): {self.db_path}")
+            finally:
+                self.waiters -= 1
+        else:
+            await self._slots.acquire()
+        
+        waited = time.monotonic() - started
+        self.counters["wait_seconds"] += waited
+        self.counters["max_wait_seconds"] = max(self.counters["max_wait_seconds"], waited)
+        
+        conn = None
+        try:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            self.counters["checkouts"] += 1
+            self.in_use += 1
+            checked_out = time.monotonic()
+            try:
+                yield conn
+            finally:
+                self.in_use -= 1
+                held = time.monotonic() - checked_out
+                self.counters["hold_seconds"] += held
+                self.counters["max_hold_seconds"] = max(self.counters["max_hold_seconds"], held)
+                await self._release(conn)
+        finally:
+            self._slots.release()
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = await open_connection(self.db_path)
+        self._opened += 1
+        self.counters["connects"] += 1
+        return conn
+    
+    async def _release(self, conn: aiosqlite.Connection):
+        try:
+            if conn.in_transaction:
+                await conn.rollback()
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"⚠️ SQLite 연결 폐기 (반납 중 롤백 실패): {e}")
+            await self._discard(conn)
+            return
+        if self._closed:
+            await self._discard(conn)
+        else:
+            self._idle.append(conn)
+    
+    async def _discard(self, conn: aiosqlite.Connection):
+        self._opened -= 1
+        self.counters["discarded"] += 1
+        try:
+            await conn.close()
+        except Exception:
+            pass
+    
+    async def close(self):
+        """유휴 연결 종료 (사용 중인 연결은 반납 시 종료)"""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await self._discard(conn)
+    
+    def stats(self) -> Dict[str, Any]:
+        checkouts = self.counters["checkouts"]
+        return {
+            "db_path": self.db_path,
+            "size": self.size,
+            "open": self._opened,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "waiters": self.waiters,
+            "max_waiters": self.max_waiters,
+            **{name: value for name, value in self.counters.items() if not name.endswith("seconds")},
+            "avg_wait_ms": round(self.counters["wait_seconds"] / checkouts * 1000, 3) if checkouts else 0.0,
+            "max_wait_ms": round(self.counters["max_wait_seconds"] * 1000, 3),
+            "avg_hold_ms": round(self.counters["hold_seconds"] / checkouts * 1000, 3) if checkouts else 0.0,
+            "max_hold_ms": round(self.counters["max_hold_seconds"] * 1000, 3),
+        }
+
+
+# 경로/이벤트 루프별 풀과 스키마 초기화 완료 경로
+_pools: Dict[tuple, SQLiteConnectionPool] = {}
+_initialized_paths: set = set()
+_init_locks: Dict[tuple, asyncio.Lock] = {}
+
+
+def get_pool(db_path: str) -> SQLiteConnectionPool:
+    """현재 이벤트 루프의 경로별 커넥션 풀 (없으면 생성)"""
+    key = (os.path.abspath(db_path), id(asyncio.get_running_loop()))
+    pool = _pools.get(key)
+    if pool is None or pool._closed:
+        pool = SQLiteConnectionPool(db_path)
+        _pools[key] = pool
+    return pool
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """모든 커넥션 풀 통계"""
+    return [pool.stats() for pool in _pools.values()]
+
+
+async def close_pools():
+    """현재 이벤트 루프의 커넥션 풀 종료 (서버 종료 시)"""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [key for key in _pools if key[1] == loop_id]:
+        await _pools.pop(key).close()
+
 class SQLiteService:
     """SQLite 데이터베이스 서비스 클래스"""
     
@@ -41,14 +441,34 @@ class SQLiteService:
         
         logger.info(f"🗃️ SQLite 데이터베이스 경로: {self.db_path}")
         
+    def connection(self):
+        """풀에서 연결 대여 (async with service.connection() as db)"""
+        return get_pool(self.db_path).acquire()
+
     async def get_connection(self):
-        """aiosqlite 연결 객체 반환 (with/as에서 사용 가능)"""
-        return await aiosqlite.connect(self.db_path)
+        """풀과 별개인 전용 aiosqlite 연결 반환 (호출 측에서 close) - 가능하면 connection() 사용"""
+        return await open_connection(self.db_path)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """이 서비스가 사용하는 커넥션 풀 통계"""
+        return get_pool(self.db_path).stats()
+
+    async def init_database(self, force: bool = False):
+        """데이터베이스 초기화 및 테이블 생성 (프로세스당 경로별 1회, force=True면 다시 실행)"""
+        path_key = os.path.abspath(self.db_path)
+        if path_key in _initialized_paths and not force:
+            return
+        lock_key = (path_key, id(asyncio.get_running_loop()))
+        lock = _init_locks.setdefault(lock_key, asyncio.Lock())
+        async with lock:
+            if path_key in _initialized_paths and not force:
+                return
+            await self._create_schema()
+            _initialized_paths.add(path_key)
 
-    async def init_database(self):
-        """데이터베이스 초기화 및 테이블 생성"""
+    async def _create_schema(self):
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 # Files 테이블
                 await db.execute("""
                     CREATE TABLE IF NOT EXISTS files (
@@ -60,9 +480,15 @@ class SQLiteService:
                         uid_columns TEXT NOT NULL,
                         opinion_columns TEXT NOT NULL,
                         quantitative_columns TEXT NOT NULL,
-                        file_data BLOB NOT NULL
+                        file_data BLOB,
+                        file_path TEXT
                     )
                 """)
+                # 이전 스키마 (DataFrame pickle BLOB) 에 데이터셋 경로 컬럼 추가
+                async with db.execute("PRAGMA table_info(files)") as cursor:
+                    file_columns = {row[1] for row in await cursor.fetchall()}
+                if 'file_path' not in file_columns:
+                    await db.execute("ALTER TABLE files ADD COLUMN file_path TEXT")
                 
                 # Jobs 테이블
                 await db.execute("""
@@ -85,9 +511,16 @@ class SQLiteService:
                         uid TEXT NOT NULL,
                         result_data TEXT NOT NULL,
                         created_at TIMESTAMP NOT NULL,
+                        score REAL,
+                        grade TEXT,
+                        department TEXT,
+                        position TEXT,
+                        name TEXT,
+                        analyzed_at TIMESTAMP,
                         FOREIGN KEY (job_id) REFERENCES jobs (id)
                     )
                 """)
+                await self._migrate_results(db)
                 
                 await db.commit()
                 logger.info("✅ SQLite 데이터베이스 초기화 완료")
@@ -96,23 +529,129 @@ class SQLiteService:
             logger.error(f"❌ 데이터베이스 초기화 오류: {e}")
             raise
 
+    async def _migrate_results(self, db):
+        """results 검색용 컬럼/인덱스 추가 및 기존 결과 백필 (user_version 으로 1회만)"""
+        async with db.execute("PRAGMA table_info(results)") as cursor:
+            existing = {row[1] for row in await cursor.fetchall()}
+        column_types = {"score": "REAL", "analyzed_at": "TIMESTAMP"}
+        for field in RESULT_FIELDS:
+            if field not in existing:
+                await db.execute(f"ALTER TABLE results ADD COLUMN {field} {column_types.get(field, 'TEXT')}")
+        for statement in RESULT_INDEXES + RESULTS_FTS_SCHEMA:
+            await db.execute(statement)
+        
+        async with db.execute("PRAGMA user_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        if version < 1:
+            await self._backfill_result_fields(db)
+        if version < 2:
+            await self._rebuild_text_index(db)
+        # 집계 트리거는 백필 이후에 생성 (백필 UPDATE 마다 집계가 갱신되지 않도록)
+        for statement in RESULT_STATS_SCHEMA:
+            await db.execute(statement)
+        if version < 3:
+            await self._rebuild_result_stats(db)
+        if version < RESULTS_SCHEMA_VERSION:
+            await db.execute(f"PRAGMA user_version = {RESULTS_SCHEMA_VERSION}")
+
+    async def _backfill_result_fields(self, db):
+        """기존 결과의 검색용 컬럼 채우기 (rowid 순 배치)"""
+        backfilled, last_rowid = 0, 0
+        assignments = ", ".join(f"{field} = ?" for field in RESULT_FIELDS)
+        while True:
+            async with db.execute("""
+                SELECT r.rowid, r.result_data, COALESCE(j.created_at, r.created_at)
+                FROM results r LEFT JOIN jobs j ON r.job_id = j.id
+                WHERE r.rowid > ? ORDER BY r.rowid LIMIT ?
+            """, (last_rowid, RESULT_BACKFILL_BATCH)) as cursor:
+                rows = await cursor.fetchall()
+            if not rows:
+                break
+            updates = []
+            for rowid, result_data, default_date in rows:
+                try:
+                    data = json.loads(result_data) if isinstance(result_data, str) else {}
+                except json.JSONDecodeError:
+                    data = {}
+                fields = extract_result_fields(data, default_date=default_date)
+                updates.append((*(fields[field] for field in RESULT_FIELDS), rowid))
+            await db.executemany(f"UPDATE results SET {assignments} WHERE rowid = ?", updates)
+            backfilled += len(rows)
+            last_rowid = rows[-1][0]
+        if backfilled:
+            logger.info(f"✅ results 검색용 컬럼 백필 완료: {backfilled}건")
+
+    async def _rebuild_text_index(self, db):
+        """
+        results_fts 를 results 전체에서 다시 구축 (rowid 가 바뀌는 VACUUM 이후에도 사용)
+        
+        한글 키가 이스케이프된 이전 result_data 도 읽을 수 있도록 Python 에서 JSON 을 파싱합니다.
+        """
+        await db.execute("DELETE FROM results_fts")
+        indexed, last_rowid = 0, 0
+        columns = ", ".join(RESULT_TEXT_FIELDS)
+        placeholders = ", ".join("?" * (len(RESULT_TEXT_FIELDS) + 1))
+        while True:
+            async with db.execute(
+                "SELECT rowid, result_data FROM results WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, RESULT_BACKFILL_BATCH)
+            ) as cursor:
+                rows = await cursor.fetchall()
+            if not rows:
+                break
+            entries = []
+            for rowid, result_data in rows:
+                try:
+                    data = json.loads(result_data) if isinstance(result_data, str) else {}
+                except json.JSONDecodeError:
+                    data = {}
+                texts = extract_result_texts(data)
+                entries.append((rowid, *(texts[field] for field in RESULT_TEXT_FIELDS)))
+            await db.executemany(f"INSERT INTO results_fts (rowid, {columns}) VALUES ({placeholders})", entries)
+            indexed += len(rows)
+            last_rowid = rows[-1][0]
+        if indexed:
+            logger.info(f"✅ results 전문 검색 인덱스 구축 완료: {indexed}건")
+
+    async def _rebuild_result_stats(self, db):
+        """result_stats 를 results 전체에서 다시 집계"""
+        await db.execute("DELETE FROM result_stats")
+        await db.execute(RESULT_STATS_REBUILD_SQL)
+        async with db.execute("SELECT COUNT(*), COALESCE(SUM(count), 0) FROM result_stats") as cursor:
+            groups, total = await cursor.fetchone()
+        if total:
+            logger.info(f"✅ results 집계 구축 완료: 결과 {total}건 → 집계 {groups}행")
+
+    async def rebuild_result_stats(self):
+        """대시보드 결과 집계 재구축"""
+        async with self.connection() as db:
+            await self._rebuild_result_stats(db)
+            await db.commit()
+        bump_data_version("result stats rebuilt")
+
+    async def rebuild_text_index(self):
+        """전문 검색 인덱스 재구축"""
+        async with self.connection() as db:
+            await self._rebuild_text_index(db)
+            await db.commit()
+
     async def save_file(self, file_data: Dict[str, Any]) -> str:
-        """파일 정보를 데이터베이스에 저장"""
+        """파일 정보를 데이터베이스에 저장 (DataFrame 은 컬럼 단위 데이터셋 파일로 저장하고 경로만 기록)"""
         try:
             file_id = str(uuid.uuid4())
             
-            # DataFrame을 pickle로 직렬화
+            # DataFrame을 컬럼 단위 데이터셋으로 저장
             df = file_data['dataframe']
-            file_data_blob = pickle.dumps(df)
+            file_path = await asyncio.to_thread(write_dataset, df, dataset_path(file_id))
             
             # 데이터베이스 스키마에 맞는 구조로 저장
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 await db.execute("""
                     INSERT INTO files (
                         id, filename, upload_time, total_records, 
                         columns, uid_columns, opinion_columns, 
-                        quantitative_columns, file_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        quantitative_columns, file_data, file_path
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     file_id,
                     file_data['filename'],
@@ -122,69 +661,87 @@ class SQLiteService:
                     json.dumps(file_data['uid_columns']),
                     json.dumps(file_data['opinion_columns']),
                     json.dumps(file_data.get('quantitative_columns', [])),
-                    file_data_blob
+                    b'',  # 이전 pickle 컬럼 (NOT NULL 이던 기존 스키마 호환)
+                    file_path
                 ))
                 await db.commit()
             
-            logger.info(f"✅ 파일 저장 완료: {file_id}")
+            logger.info(f"✅ 파일 저장 완료: {file_id} ({file_path})")
             return file_id
             
         except Exception as e:
             logger.error(f"❌ 파일 저장 오류: {e}")
             raise
 
-    async def get_file(self, file_id: str) -> Optional[Dict[str, Any]]:
-        """파일 정보를 데이터베이스에서 조회"""
+    async def get_file(self, file_id: str, columns: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        파일 정보를 데이터베이스에서 조회
+        
+        columns 를 주면 DataFrame 에 해당 컬럼만 읽습니다 (데이터셋 파일은 나머지 컬럼을 읽지 않음).
+        """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 async with db.execute("""
                     SELECT id, filename, upload_time, total_records,
                            columns, uid_columns, opinion_columns,
-                           quantitative_columns, file_data
+                           quantitative_columns, file_path
                     FROM files WHERE id = ?
                 """, (file_id,)) as cursor:
                     row = await cursor.fetchone()
-                    
-                    if not row:
-                        return None
-                    
-                    # bytes 변환 처리
-                    file_data_blob = row[8]
-                    if isinstance(file_data_blob, str):
-                        # string인 경우 bytes로 변환
-                        file_data_blob = file_data_blob.encode('latin1')
-                    
-                    # DataFrame 복원
-                    df = pickle.loads(file_data_blob)
-                    
-                    return {
-                        'id': row[0],
-                        'filename': row[1],
-                        'upload_time': row[2],
-                        'total_records': row[3],
-                        'columns': json.loads(row[4]),
-                        'uid_columns': json.loads(row[5]),
-                        'opinion_columns': json.loads(row[6]),
-                        'quantitative_columns': json.loads(row[7]),
-                        'dataframe': df
-                    }
+                
+                if not row:
+                    return None
+                
+                file_path = row[8]
+                if not is_dataset(file_path):
+                    # 이전 형식: DataFrame pickle BLOB
+                    async with db.execute("SELECT file_data FROM files WHERE id = ?", (file_id,)) as cursor:
+                        file_data_blob = (await cursor.fetchone())[0]
+            
+            if is_dataset(file_path):
+                df = await asyncio.to_thread(read_dataset, file_path, columns)
+            else:
+                if isinstance(file_data_blob, str):
+                    # string인 경우 bytes로 변환
+                    file_data_blob = file_data_blob.encode('latin1')
+                df = pickle.loads(file_data_blob)
+                if columns is not None:
+                    df = df[list(columns)]
+            
+            return {
+                'id': row[0],
+                'filename': row[1],
+                'upload_time': row[2],
+                'total_records': row[3],
+                'columns': json.loads(row[4]),
+                'uid_columns': json.loads(row[5]),
+                'opinion_columns': json.loads(row[6]),
+                'quantitative_columns': json.loads(row[7]),
+                'file_path': file_path,
+                'dataframe': df
+            }
                     
         except Exception as e:
             logger.error(f"❌ 파일 조회 오류: {e}")
             raise
 
     async def delete_file(self, file_id: str) -> bool:
-        """파일을 데이터베이스에서 삭제"""
+        """파일을 데이터베이스에서 삭제 (데이터셋 파일 포함)"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
+                async with db.execute("SELECT file_path FROM files WHERE id = ?", (file_id,)) as cursor:
+                    row = await cursor.fetchone()
                 # 관련 작업들도 함께 삭제
                 await db.execute("DELETE FROM results WHERE job_id IN (SELECT id FROM jobs WHERE file_id = ?)", (file_id,))
                 await db.execute("DELETE FROM jobs WHERE file_id = ?", (file_id,))
                 await db.execute("DELETE FROM files WHERE id = ?", (file_id,))
                 await db.commit()
-                
-                logger.info(f"✅ 파일 삭제 완료: {file_id}")
-                return True
+            bump_data_version(f"file deleted: {file_id}")
+            
+            if row and row[0]:
+                await asyncio.to_thread(delete_dataset, row[0])
+            logger.info(f"✅ 파일 삭제 완료: {file_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ 파일 삭제 오류: {e}")
@@ -193,7 +750,7 @@ class SQLiteService:
     async def list_files(self, limit: int = 100) -> List[Dict[str, Any]]:
         """파일 목록 조회"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 async with db.execute("""
                     SELECT id, filename, upload_time, total_records
                     FROM files 
@@ -235,7 +792,7 @@ class SQLiteService:
                 job_data['status'] = 'created'
             
             # 🔥 3단계: 중복 검사 (선택적)
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 # 기존 job_id 확인
                 async with db.execute("SELECT id FROM jobs WHERE id = ?", (job_id,)) as cursor:
                     existing = await cursor.fetchone()
@@ -269,7 +826,7 @@ class SQLiteService:
     async def get_analysis_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """분석 작업 조회"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 async with db.execute("""
                     SELECT id, file_id, status, created_at, updated_at, job_data
                     FROM jobs WHERE id = ?
@@ -297,7 +854,7 @@ class SQLiteService:
     async def update_analysis_job(self, job_id: str, updates: Dict[str, Any]) -> bool:
         """분석 작업 업데이트"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 # 기존 job_data 가져오기
                 async with db.execute("SELECT job_data FROM jobs WHERE id = ?", (job_id,)) as cursor:
                     row = await cursor.fetchone()
@@ -319,6 +876,8 @@ class SQLiteService:
                     job_id
                 ))
                 await db.commit()
+                if updates.get('status') in FINISHED_JOB_STATUSES:
+                    bump_data_version(f"job {updates['status']}: {job_id}")
                 
                 logger.info(f"✅ 분석 작업 업데이트 완료: {job_id}")
                 return True
@@ -330,7 +889,7 @@ class SQLiteService:
     async def get_completed_analysis_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
         """완료된 분석 작업 목록 조회"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 async with db.execute("""
                     SELECT id, file_id, status, created_at, updated_at, job_data
                     FROM jobs 
@@ -363,19 +922,12 @@ class SQLiteService:
         try:
             result_id = str(uuid.uuid4())
             
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    INSERT INTO results (
-                        id, job_id, uid, result_data, created_at
-                    ) VALUES (?, ?, ?, ?, ?)
-                """, (
-                    result_id,
-                    job_id,
-                    uid,
-                    json.dumps(result_data),
-                    datetime.now().isoformat()
+            async with self.connection() as db:
+                await db.execute(RESULT_INSERT_SQL, result_row(
+                    result_id, job_id, uid, result_data, datetime.now().isoformat()
                 ))
                 await db.commit()
+                bump_data_version(f"result saved: {job_id}")
                 
                 logger.info(f"✅ 분석 결과 저장 완료: {result_id}")
                 return True
@@ -384,10 +936,87 @@ class SQLiteService:
             logger.error(f"❌ 분석 결과 저장 오류: {e}")
             return False
 
+    async def search_text(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """
+        완료된 작업 결과의 의견/AI 피드백 전문 검색
+        
+        3글자 이상 검색어가 있고 일치 건수가 FULLTEXT_RANK_LIMIT 이하이면 bm25 순위와 FTS5 스니펫,
+        그 외(짧은 검색어만 있거나 일치 건수가 많은 경우)에는 최신순과 부분 일치 스니펫을 반환합니다.
+        
+        Returns:
+            {"results": [...], "total": 일치 건수 (상한 초과 시 상한값), "total_capped": bool, "ranked": bool}
+        """
+        terms = search_terms(query)
+        indexed, short = split_terms(terms)
+        clauses, params = _fulltext_clauses(indexed, short)
+        if not clauses:
+            return {"results": [], "total": 0, "total_capped": False, "ranked": False}
+        
+        # CROSS JOIN: 전문 검색 인덱스를 먼저 읽도록 조인 순서 고정 (rowid 순서 그대로 LIMIT 조기 종료)
+        from_sql = f"""
+            FROM results_fts
+            CROSS JOIN results r ON r.rowid = results_fts.rowid
+            JOIN jobs j ON r.job_id = j.id
+            WHERE j.status = 'completed' AND {' AND '.join(clauses)}
+        """
+        text_columns = ", ".join(f"results_fts.{field}" for field in RESULT_TEXT_FIELDS)
+        
+        async with self.connection() as db:
+            async with db.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 {from_sql} LIMIT ?)", [*params, FULLTEXT_RANK_LIMIT + 1]
+            ) as cursor:
+                total = (await cursor.fetchone())[0]
+            total_capped = total > FULLTEXT_RANK_LIMIT
+            ranked = bool(indexed) and not total_capped
+            
+            if ranked:
+                sql = f"""
+                    SELECT r.uid, r.job_id, r.score, r.grade, r.department, r.analyzed_at,
+                           bm25(results_fts) AS rank,
+                           snippet(results_fts, -1, '<mark>', '</mark>', '…', 24)
+                    {from_sql}
+                    ORDER BY rank, results_fts.rowid
+                    LIMIT ? OFFSET ?
+                """
+            else:
+                # 최신 저장순 - rowid 역순 스캔이라 필요한 행을 찾으면 바로 멈춤
+                sql = f"""
+                    SELECT r.uid, r.job_id, r.score, r.grade, r.department, r.analyzed_at,
+                           NULL AS rank, {text_columns}
+                    {from_sql}
+                    ORDER BY results_fts.rowid DESC
+                    LIMIT ? OFFSET ?
+                """
+            async with db.execute(sql, [*params, limit, offset]) as cursor:
+                rows = await cursor.fetchall()
+        
+        results = []
+        for uid, job_id, score, grade, department, analyzed_at, rank, *texts in rows:
+            if ranked:
+                snippet = texts[0]
+            else:
+                snippet = next(filter(None, (highlight_snippet(text, terms) for text in texts)), None)
+            results.append({
+                "uid": uid,
+                "job_id": job_id,
+                "score": score,
+                "grade": grade,
+                "department": department,
+                "analysis_date": analyzed_at,
+                "rank": round(-rank, 4) if rank is not None else None,
+                "snippet": snippet,
+            })
+        return {
+            "results": results,
+            "total": min(total, FULLTEXT_RANK_LIMIT),
+            "total_capped": total_capped,
+            "ranked": ranked,
+        }
+
     async def get_analysis_results(self, job_id: str) -> List[Dict[str, Any]]:
         """분석 결과 조회"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 async with db.execute("""
                     SELECT id, job_id, uid, result_data, created_at
                     FROM results WHERE job_id = ?
@@ -428,7 +1057,7 @@ class SQLiteService:
     async def list_jobs(self, limit: int = 100) -> List[Dict[str, Any]]:
         """모든 작업 목록 조회"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 async with db.execute("""
                     SELECT id, file_id, status, created_at, updated_at, job_data
                     FROM jobs 
@@ -458,24 +1087,14 @@ class SQLiteService:
     async def save_results(self, job_id: str, results: List[Dict[str, Any]]) -> bool:
         """여러 분석 결과 일괄 저장"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                for result in results:
-                    result_id = str(uuid.uuid4())
-                    uid = result.get('uid', 'unknown')
-                    
-                    await db.execute("""
-                        INSERT INTO results (
-                            id, job_id, uid, result_data, created_at
-                        ) VALUES (?, ?, ?, ?, ?)
-                    """, (
-                        result_id,
-                        job_id,
-                        uid,
-                        json.dumps(result),
-                        datetime.now().isoformat()
-                    ))
-                
+            async with self.connection() as db:
+                created_at = datetime.now().isoformat()
+                await db.executemany(RESULT_INSERT_SQL, [
+                    result_row(str(uuid.uuid4()), job_id, result.get('uid', 'unknown'), result, created_at)
+                    for result in results
+                ])
                 await db.commit()
+                bump_data_version(f"results saved: {job_id}")
                 logger.info(f"✅ {len(results)}개 분석 결과 일괄 저장 완료")
                 return True
                 
@@ -490,7 +1109,7 @@ class SQLiteService:
     async def get_database_stats(self) -> Dict[str, Any]:
         """데이터베이스 통계 정보 조회"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 stats = {}
                 
                 # 파일 수
@@ -522,15 +1141,20 @@ class SQLiteService:
             cutoff_date = datetime.now() - timedelta(days=days)
             cutoff_str = cutoff_date.isoformat()
             
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.connection() as db:
                 # 오래된 작업들 삭제
                 await db.execute("DELETE FROM results WHERE job_id IN (SELECT id FROM jobs WHERE created_at < ?)", (cutoff_str,))
                 await db.execute("DELETE FROM jobs WHERE created_at < ?", (cutoff_str,))
                 await db.commit()
+                bump_data_version("old data cleaned up")
                 
                 logger.info(f"✅ {days}일 이전 데이터 정리 완료")
                 return True
                 
         except Exception as e:
             logger.error(f"❌ 데이터 정리 오류: {e}")
-            return False 
\ No newline at end of file
+            return False 
+
+
+# 공용 서비스 인스턴스 (기본 경로)
+sqlite_service = SQLiteService()
@@ -337,7 +337,11 @@ async def startup_event():
         # Create all tables
         init_db()
         logger.info("Database tables initialized successfully")
-        
+
+        # 기존 jobs 테이블에 작업 임대 컬럼 추가 (여러 인스턴스의 중복 재개 방지)
+        from app.services.job_lease import ensure_job_lease_schema
+        ensure_job_lease_schema(engine)
+
         # List all tables for verification
         from sqlalchemy import inspect
         inspector = inspect(engine)
@@ -354,6 +358,45 @@ async def startup_event():
         logger.error(f"Failed to initialize database: {e}")
         # Continue anyway - don't crash the app
 
+    # SQLite 결과 저장소 스키마 초기화 (프로세스당 1회 - 요청마다 다시 실행하지 않음)
+    try:
+        from app.db.sqlite_service import sqlite_service
+        await sqlite_service.init_database()
+    except Exception as e:
+        logger.error(f"SQLite store initialization failed: {e}")
+
+    # 분석기 워밍업 - 무거운 모델을 첫 작업 전에 1회 로드
+    if os.getenv("AIRISS_ANALYZER_WARMUP", "true").lower() in ("1", "true", "yes"):
+        try:
+            import asyncio
+            from app.services.analyzer_registry import analyzer_registry
+            from app.services.scoring_pool import scoring_pool
+            await asyncio.to_thread(analyzer_registry.warmup)
+            await asyncio.to_thread(scoring_pool.warmup)
+        except Exception as e:
+            logger.error(f"Analyzer warmup failed: {e}")
+
+    # 서버 재시작 등으로 중단된 분석 작업을 체크포인트부터 재개
+    if os.getenv("AIRISS_RESUME_JOBS", "true").lower() in ("1", "true", "yes"):
+        try:
+            import asyncio
+            from app.core.websocket_manager import manager as ws_manager
+            from app.services.analysis_service import get_shared_analysis_service
+            asyncio.create_task(get_shared_analysis_service(ws_manager).run_recovery_loop())
+        except Exception as e:
+            logger.error(f"Job recovery failed: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """버퍼에 남은 분석 결과 기록, 점수화 워커 프로세스 및 SQLite 커넥션 풀 정리"""
+    import asyncio
+    from app.db.sqlite_service import close_pools
+    from app.services.result_writer import flush_all_writers
+    from app.services.scoring_pool import scoring_pool
+    await asyncio.to_thread(flush_all_writers)
+    scoring_pool.shutdown()
+    await close_pools()
+
 # Favicon endpoint - prevent 404 errors
 @app.get("/favicon.ico")
 async def favicon():
@@ -11,6 +11,7 @@ from .analysis import AnalysisResult
 from .analysis_result import AnalysisResultModel, AnalysisJobModel, AnalysisStatsModel
 from .opinion_result import OpinionResult, OpinionKeyword
 from .employee import EmployeeResult
+from .result_stats import EmployeeResultStats, AnalysisResultStats
 
 __all__ = [
     "Base",
@@ -23,5 +24,7 @@ __all__ = [
     "AnalysisStatsModel",
     "OpinionResult",
     "OpinionKeyword",
-    "EmployeeResult"
+    "EmployeeResult",
+    "EmployeeResultStats",
+    "AnalysisResultStats"
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # app/models/analysis_result.py
 # 분석 결과 영구 저장을 위한 SQLAlchemy 모델
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON, Index, literal_column
 from sqlalchemy.sql import func
 from app.db.database import Base
 import uuid
@@ -43,6 +43,13 @@ class AnalysisResultModel(Base):
     # 시간 정보
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # 직원 목록 키셋 페이지네이션용 (정렬 키, id) 인덱스
+    __table_args__ = (
+        Index("ix_analysis_results_score_keyset",
+              func.coalesce(hybrid_score, text_score, literal_column("0")), id),
+        Index("ix_analysis_results_uid_keyset", uid, id),
+    )
 
 class AnalysisJobModel(Base):
     """분석 작업 정보 저장 모델"""
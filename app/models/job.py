@@ -37,4 +37,8 @@ class Job(Base):
     results_data = Column(Text)  # JSON - Analysis results
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # 실행 인스턴스 임대 (app/services/job_lease.py) - 만료된 작업만 다른 인스턴스가 재개
+    owner = Column(String(100))
+    lease_expires_at = Column(DateTime(timezone=True))
\ No newline at end of file
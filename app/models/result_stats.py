@@ -0,0 +1,43 @@
+# app/models/result_stats.py
+# 대시보드 통계용 결과 집계 테이블 - 결과 저장과 같은 트랜잭션에서 증분 갱신
+
+from sqlalchemy import Column, Integer, String, Float, JSON, UniqueConstraint
+from app.db.database import Base
+
+
+class ResultStatsColumns:
+    """집계 행 공통 컬럼 (키 컬럼은 각 모델에서 정의)"""
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    count = Column(Integer, default=0, nullable=False)          # 결과 수
+    score_count = Column(Integer, default=0, nullable=False)    # 점수가 있는 결과 수
+    score_sum = Column(Float, default=0.0, nullable=False)
+    score_sumsq = Column(Float, default=0.0, nullable=False)    # 분산/표준편차 계산용
+    score_min = Column(Float)
+    score_max = Column(Float)
+    histogram = Column(JSON)                                    # 5점 구간별 인원 (마지막 구간은 100점 이상)
+    competency_sums = Column(JSON)                              # 역량별 점수 합계
+    promotion_count = Column(Integer, default=0, nullable=False)  # 리더십/실행력 모두 80 이상
+
+
+class EmployeeResultStats(ResultStatsColumns, Base):
+    """직원 분석 결과 집계 (작업 x 부서 x 등급)"""
+    __tablename__ = "employee_result_stats"
+
+    job_id = Column(String, index=True, nullable=False)
+    department = Column(String, default="", nullable=False)
+    grade = Column(String, default="", nullable=False)
+
+    __table_args__ = (UniqueConstraint("job_id", "department", "grade", name="uq_employee_result_stats_key"),)
+
+
+class AnalysisResultStats(ResultStatsColumns, Base):
+    """분석 결과 영구 저장소 집계 (파일 x 분석일 x 등급, 점수는 hybrid_score)"""
+    __tablename__ = "analysis_result_stats"
+
+    file_id = Column(String(100), index=True, nullable=False)
+    day = Column(String(10), index=True, nullable=False)  # YYYY-MM-DD
+    grade = Column(String(10), default="", nullable=False)
+
+    __table_args__ = (UniqueConstraint("file_id", "day", "grade", name="uq_analysis_result_stats_key"),)
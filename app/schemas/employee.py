@@ -134,6 +134,8 @@ class EmployeeAIAnalysisList(BaseModel):
     page: int = Field(..., ge=1, description="현재 페이지")
     page_size: int = Field(..., ge=1, le=100, description="페이지 크기")
     total_pages: int = Field(..., ge=1, description="전체 페이지 수")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (cursor 파라미터로 전달)")
+    has_more: bool = Field(False, description="다음 페이지 존재 여부")
     
     # 통계 정보
     statistics: Optional[Dict[str, Any]] = Field(None, description="통계 정보")
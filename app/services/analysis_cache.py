@@ -0,0 +1,213 @@
+# app/services/analysis_cache.py
+"""
+AIRISS 분석 결과 캐시
+정규화된 의견 텍스트 + 프레임워크 버전 + 모델 파라미터의 해시를 키로 하는 내용 주소 캐시
+
+- 1차: 메모리 LRU (직렬화 크기 기준 용량 제한)
+- 2차: 선택적 SQLite 영구 저장소 (AIRISS_ANALYSIS_CACHE_PATH 설정 시)
+
+같은 의견이 반복되는 재업로드/재분석에서 텍스트 점수화를 생략합니다.
+(LLM 응답 재사용은 app.services.llm_response_cache 가 담당)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 캐시 키 체계 버전 - 점수 산식/응답 형식이 바뀌면 올려서 기존 항목을 무효화
+CACHE_SCHEMA_VERSION = "1"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def normalize_opinion(opinion: Any) -> str:
+    """캐시 키용 의견 정규화 (공백 정리) - 텍스트 전처리 결과가 달라지지 않는 범위만 정규화"""
+    return re.sub(r'\s+', ' ', str(opinion)).strip()
+
+
+_fingerprint_cache: Dict[int, Tuple[Any, str]] = {}
+
+
+def framework_fingerprint(framework: Dict[str, Any]) -> str:
+    """프레임워크 정의(키워드/가중치)의 해시 - 정의가 바뀌면 캐시 키도 바뀜"""
+    cached = _fingerprint_cache.get(id(framework))
+    if cached is None or cached[0] is not framework:
+        payload = json.dumps(framework, ensure_ascii=False, sort_keys=True, default=str)
+        cached = (framework, hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16])
+        _fingerprint_cache[id(framework)] = cached
+    return cached[1]
+
+
+class AnalysisCache:
+    """메모리 LRU + 선택적 SQLite 2단 캐시"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, db_path: Optional[str] = None,
+                 enabled: bool = True):
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.db_path = db_path or None
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "disk_errors": 0,
+        }
+
+        if self.enabled and self.db_path:
+            self._open_disk_tier()
+
+    def _open_disk_tier(self):
+        """SQLite 영구 저장소 연결 (실패 시 메모리 전용으로 동작)"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "cache_key TEXT PRIMARY KEY, "
+                "namespace TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            logger.info(f"✅ 분석 캐시 영구 저장소 연결: {self.db_path}")
+        except Exception as e:
+            logger.warning(f"⚠️ 분석 캐시 영구 저장소 연결 실패 - 메모리 캐시만 사용: {e}")
+            self._conn = None
+
+    @staticmethod
+    def make_key(namespace: str, opinion: Any, **params) -> str:
+        """네임스페이스 + 정규화 의견 + 파라미터로 캐시 키 생성"""
+        payload = json.dumps(
+            {
+                "v": CACHE_SCHEMA_VERSION,
+                "ns": namespace,
+                "text": normalize_opinion(opinion),
+                "params": params,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return f"{namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 - 호출자가 결과를 수정해도 캐시가 오염되지 않도록 매번 새 객체 반환"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            raw = self._memory.get(key)
+            if raw is not None:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return json.loads(raw)
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value FROM analysis_cache WHERE cache_key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    row = None
+                    self.counters["disk_errors"] += 1
+                    logger.warning(f"⚠️ 분석 캐시 조회 실패: {e}")
+                if row is not None:
+                    self.counters["disk_hits"] += 1
+                    self._remember(key, row[0])
+                    return json.loads(row[0])
+
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        """캐시 저장 (메모리 + 영구 저장소)"""
+        if not self.enabled:
+            return
+
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            self._remember(key, raw)
+            self.counters["stores"] += 1
+
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO analysis_cache (cache_key, namespace, value, created_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, key.split(":", 1)[0], raw, time.time())
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    self.counters["disk_errors"] += 1
+                    logger.warning(f"⚠️ 분석 캐시 저장 실패: {e}")
+
+    def _remember(self, key: str, raw: str):
+        """메모리 LRU에 추가하고 용량 초과분을 오래된 순으로 제거 (lock 보유 상태에서 호출)"""
+        size = len(raw)
+        if size > self.max_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = raw
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.counters["evictions"] += 1
+
+    def clear(self, include_disk: bool = False):
+        """메모리 캐시 비우기 (include_disk=True면 영구 저장소도 삭제)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if include_disk and self._conn is not None:
+                self._conn.execute("DELETE FROM analysis_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 카운터 및 용량 현황"""
+        with self._lock:
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            lookups = hits + self.counters["misses"]
+            return {
+                "enabled": self.enabled,
+                **self.counters,
+                "hits": hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_bytes": self.max_bytes,
+                "disk_tier": self._conn is not None,
+                "db_path": self.db_path if self._conn is not None else None,
+            }
+
+
+# 전역 캐시 인스턴스
+analysis_cache = AnalysisCache(
+    max_bytes=int(os.getenv("AIRISS_ANALYSIS_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+    db_path=os.getenv("AIRISS_ANALYSIS_CACHE_PATH", ""),
+    enabled=os.getenv("AIRISS_ANALYSIS_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+)
@@ -0,0 +1,354 @@
+# app/services/analysis_pipeline.py
+"""
+AIRISS 단계별 스트리밍 분석 파이프라인
+읽기 → (컬럼 감지 1회) → 청크 단위 벡터 점수화 → LLM 보강 → 청크 단위 일괄 저장
+
+- 단계 사이는 크기가 제한된 큐로 연결되어 파일 크기와 무관하게 메모리에 올라가는 청크 수가 일정
+- 청크 크기: AIRISS_ANALYSIS_CHUNK_SIZE (작업별 chunk_size 로 재정의 가능)
+- 큐 깊이: AIRISS_PIPELINE_QUEUE_DEPTH
+- 작업 결과 JSON 에는 앞쪽 AIRISS_INLINE_RESULTS_LIMIT 건만 보관하고 전체 결과는 employee_results 테이블에 저장
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("AIRISS_ANALYSIS_CHUNK_SIZE", "256"))
+DEFAULT_QUEUE_DEPTH = int(os.getenv("AIRISS_PIPELINE_QUEUE_DEPTH", "2"))
+INLINE_RESULTS_LIMIT = int(os.getenv("AIRISS_INLINE_RESULTS_LIMIT", "2000"))
+
+CSV_ENCODINGS = ('utf-8', 'cp949', 'euc-kr', 'iso-8859-1')
+
+UID_COLUMN_NAMES = ['uid', 'id', '직원번호', 'employee_id', '사번']
+OPINION_COLUMN_KEYWORDS = ['opinion', '의견', '평가', 'comment', '코멘트', 'feedback', '리뷰', 'review',
+                           '자료', '내용', 'content', '텍스트', 'text']
+NAME_COLUMN_KEYWORDS = ['name', '이름', '성명', '직원명']
+DEPARTMENT_COLUMN_KEYWORDS = ['department', '부서', 'dept', '소속', '팀']
+POSITION_COLUMN_KEYWORDS = ['position', '직급', '직위', 'title', 'grade', '등급']
+
+
+def _find_column(columns: Sequence[Any], keywords: Sequence[str]) -> Optional[Any]:
+    for col in columns:
+        col_lower = str(col).lower().strip()
+        if any(keyword in col_lower for keyword in keywords):
+            return col
+    return None
+
+
+@dataclass
+class ColumnMapping:
+    """분석에 쓰이는 컬럼 매핑 (파일당 1회 감지)"""
+    uid: Any
+    opinion: Any
+    name: Optional[Any] = None
+    department: Optional[Any] = None
+    position: Optional[Any] = None
+
+    @classmethod
+    def detect(cls, columns: Sequence[Any]) -> "ColumnMapping":
+        """유연한 컬럼명 매칭 - 필수 컬럼(UID/의견)이 없으면 ValueError"""
+        uid_column = next(
+            (col for col in columns if str(col).lower().strip() in UID_COLUMN_NAMES), None
+        )
+        opinion_column = _find_column(columns, OPINION_COLUMN_KEYWORDS)
+
+        if uid_column is None:
+            logger.error(f"❌ UID 컬럼을 찾을 수 없습니다. 사용 가능한 컬럼: {list(columns)}")
+            raise ValueError("필수 컬럼 'UID' 또는 '직원번호'를 찾을 수 없습니다.")
+        if opinion_column is None:
+            logger.error(f"❌ 평가의견 컬럼을 찾을 수 없습니다. 사용 가능한 컬럼: {list(columns)}")
+            raise ValueError("필수 컬럼 '평가의견' 또는 'Opinion'을 찾을 수 없습니다.")
+
+        return cls(
+            uid=uid_column,
+            opinion=opinion_column,
+            name=_find_column(columns, NAME_COLUMN_KEYWORDS),
+            department=_find_column(columns, DEPARTMENT_COLUMN_KEYWORDS),
+            position=_find_column(columns, POSITION_COLUMN_KEYWORDS),
+        )
+
+    def describe(self) -> str:
+        return (f"uid={self.uid}, opinion={self.opinion}, name={self.name or '없음'}, "
+                f"department={self.department or '없음'}, position={self.position or '없음'}")
+
+
+class FileChunkReader:
+    """
+    업로드 파일을 청크 단위로 읽는 리더 (skip 행 이후부터 limit 행까지만)
+
+    CSV 는 chunksize 로 스트리밍하고, 컬럼 단위 데이터셋은 청크 구간만 메모리 매핑으로 읽으며,
+    Excel/Pickle 은 형식 특성상 한 번에 읽은 뒤 청크로 나눕니다.
+    skip 은 재개 시 이미 처리된 앞쪽 행을 건너뛰는 데 사용합니다.
+    """
+
+    def __init__(self, file_path: str, chunk_size: int, limit: Optional[int] = None, skip: int = 0):
+        self.file_path = file_path
+        self.chunk_size = max(1, int(chunk_size))
+        self.limit = limit
+        self.skip = max(0, int(skip))
+        self.columns: List[Any] = []
+        self._first: Optional[pd.DataFrame] = None
+        self._rest: Optional[Iterator[pd.DataFrame]] = None
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.limit is None else max(0, self.limit - self.skip)
+
+    def open(self) -> "FileChunkReader":
+        """첫 청크를 읽어 컬럼 목록을 확정 (처음부터 읽는데 데이터가 없으면 ValueError)"""
+        from app.utils.columnar_store import is_dataset
+
+        path = self.file_path
+        if is_dataset(path):
+            chunks = self._open_dataset()
+        elif path.endswith('.csv'):
+            chunks = self._open_csv()
+        elif path.endswith('.pkl'):
+            chunks = self._split(pd.read_pickle(path))
+        elif path.endswith(('.xlsx', '.xls')):
+            chunks = self._split(pd.read_excel(path, nrows=self.limit))
+        else:
+            raise ValueError(f"지원되지 않는 파일 형식: {path}")
+
+        self._first = next(chunks, None)
+        self._rest = chunks
+        if self._first is not None:
+            self.columns = list(self._first.columns)
+        if (self._first is None or self._first.empty) and self.skip == 0:
+            raise ValueError("파일에 데이터가 없습니다. 다른 파일을 선택해주십시오.")
+        return self
+
+    def _open_csv(self) -> Iterator[pd.DataFrame]:
+        last_error: Optional[Exception] = None
+        for encoding in CSV_ENCODINGS:
+            try:
+                if self.remaining == 0:
+                    self.columns = list(pd.read_csv(self.file_path, encoding=encoding, nrows=0).columns)
+                    return iter(())
+                reader = pd.read_csv(self.file_path, encoding=encoding, chunksize=self.chunk_size,
+                                     skiprows=range(1, self.skip + 1) if self.skip else None,
+                                     nrows=self.remaining)
+                first = next(reader, None)
+                if first is None:
+                    self.columns = list(pd.read_csv(self.file_path, encoding=encoding, nrows=0).columns)
+            except (UnicodeDecodeError, pd.errors.ParserError) as e:
+                last_error = e
+                continue
+            except pd.errors.EmptyDataError:
+                return iter(())
+            return self._chain(first, reader)
+        raise ValueError(f"CSV 파일 인코딩을 인식할 수 없습니다: {last_error}")
+
+    def _open_dataset(self) -> Iterator[pd.DataFrame]:
+        from app.utils.columnar_store import ColumnarDataset
+
+        dataset = ColumnarDataset(self.file_path)
+        self.columns = list(dataset.columns)
+        end = len(dataset) if self.limit is None else min(self.limit, len(dataset))
+        for start in range(self.skip, end, self.chunk_size):
+            yield dataset.read(start=start, stop=min(start + self.chunk_size, end))
+
+    @staticmethod
+    def _chain(first: Optional[pd.DataFrame], rest) -> Iterator[pd.DataFrame]:
+        if first is not None:
+            yield first
+        yield from rest
+
+    def _split(self, frame: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        self.columns = list(frame.columns)
+        end = len(frame) if self.limit is None else min(self.limit, len(frame))
+        for start in range(self.skip, end, self.chunk_size):
+            yield frame.iloc[start:min(start + self.chunk_size, end)]
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        if self._rest is None:
+            self.open()
+        first, self._first = self._first, None
+        if first is not None:
+            yield first
+        yield from self._rest
+
+
+@dataclass
+class PipelineChunk:
+    """파이프라인 단계 사이를 이동하는 청크"""
+    index: int
+    start: int                       # 파일 기준 첫 행 번호 (0부터, 재개 시에도 원본 파일 기준)
+    frame: pd.DataFrame
+    batch: Any = None                # BatchAnalysisResult (점수화 단계 이후)
+    results: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+
+class ResultAccumulator:
+    """청크 결과의 요약 통계를 누적하고 앞쪽 결과만 메모리에 보관"""
+
+    def __init__(self, inline_limit: int = INLINE_RESULTS_LIMIT):
+        self.inline_limit = inline_limit
+        self.inline_results: List[Dict[str, Any]] = []
+        self.total = 0
+        self.successful = 0
+        self.score_sum = 0.0
+        self.grade_distribution: Dict[str, int] = {}
+        self.last_uid: Optional[str] = None
+
+    def restore(self, total: int, successful: int, score_sum: float,
+                grade_distribution: Dict[str, int], inline_results: Sequence[Dict[str, Any]]):
+        """체크포인트에서 재개할 때 이미 저장된 결과의 집계로 초기화"""
+        self.total = total
+        self.successful = successful
+        self.score_sum = score_sum
+        self.grade_distribution = dict(grade_distribution)
+        self.inline_results = list(inline_results)[:self.inline_limit]
+        if self.inline_results:
+            self.last_uid = self.inline_results[-1].get("uid")
+
+    def add(self, results: Sequence[Dict[str, Any]]):
+        for result in results:
+            self.total += 1
+            if 'error' not in result:
+                self.successful += 1
+                self.score_sum += result['score']
+                grade = result['grade']
+                self.grade_distribution[grade] = self.grade_distribution.get(grade, 0) + 1
+            if len(self.inline_results) < self.inline_limit:
+                self.inline_results.append(result)
+        if results:
+            self.last_uid = results[-1].get("uid")
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.successful
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.inline_results)
+
+    def summary(self) -> Dict[str, Any]:
+        average = self.score_sum / self.successful if self.successful else 0
+        return {
+            "total_analyzed": self.total,
+            "successful": self.successful,
+            "failed": self.failed,
+            "average_score": round(average, 1),
+            "grade_distribution": dict(self.grade_distribution),
+            "results_inline": len(self.inline_results),
+            "results_truncated": self.truncated,
+        }
+
+
+class AnalysisPipeline:
+    """
+    크기 제한 큐로 연결된 4단계 파이프라인
+
+    Args:
+        reader: 청크 DataFrame 을 순서대로 내주는 리더
+        score: 동기 점수화 함수 (frame → BatchAnalysisResult), 이벤트 루프를 막지 않도록 스레드에서 실행
+        enrich: 비동기 보강 함수 (chunk → 행별 결과 목록), LLM 호출 포함
+        persist: 비동기 저장 함수 (chunk) - chunk.results 를 일괄 저장
+        on_chunk_done: 저장 완료 후 호출 (진행률 갱신 등)
+        start_row: 첫 청크의 파일 기준 행 번호 (체크포인트 재개 시 건너뛴 행 수)
+    """
+
+    def __init__(self,
+                 reader: FileChunkReader,
+                 score: Callable[[pd.DataFrame], Any],
+                 enrich: Callable[[PipelineChunk], Awaitable[List[Dict[str, Any]]]],
+                 persist: Callable[[PipelineChunk], Awaitable[None]],
+                 on_chunk_done: Optional[Callable[[PipelineChunk], Awaitable[None]]] = None,
+                 queue_depth: int = DEFAULT_QUEUE_DEPTH,
+                 start_row: int = 0):
+        self.reader = reader
+        self.score = score
+        self.enrich = enrich
+        self.persist = persist
+        self.on_chunk_done = on_chunk_done
+        self.queue_depth = max(1, int(queue_depth))
+        self.start_row = start_row
+        self.chunks_done = 0
+        self.rows_done = 0
+        self.stage_seconds = {"read": 0.0, "score": 0.0, "enrich": 0.0, "persist": 0.0}  # 단계별 소요 시간 합
+
+    async def _read_stage(self, output: asyncio.Queue):
+        iterator = iter(self.reader)
+        index, start = 0, self.start_row
+        while True:
+            started = time.monotonic()
+            frame = await asyncio.to_thread(next, iterator, None)
+            self.stage_seconds["read"] += time.monotonic() - started
+            if frame is None:
+                break
+            if frame.empty:
+                continue
+            await output.put(PipelineChunk(index=index, start=start, frame=frame))
+            index += 1
+            start += len(frame)
+        await output.put(None)
+
+    async def _score_stage(self, source: asyncio.Queue, output: asyncio.Queue):
+        while True:
+            chunk = await source.get()
+            if chunk is None:
+                break
+            started = time.monotonic()
+            chunk.batch = await asyncio.to_thread(self.score, chunk.frame)
+            self.stage_seconds["score"] += time.monotonic() - started
+            await output.put(chunk)
+        await output.put(None)
+
+    async def _enrich_stage(self, source: asyncio.Queue, output: asyncio.Queue):
+        while True:
+            chunk = await source.get()
+            if chunk is None:
+                break
+            started = time.monotonic()
+            chunk.results = await self.enrich(chunk)
+            self.stage_seconds["enrich"] += time.monotonic() - started
+            await output.put(chunk)
+        await output.put(None)
+
+    async def _persist_stage(self, source: asyncio.Queue):
+        while True:
+            chunk = await source.get()
+            if chunk is None:
+                break
+            started = time.monotonic()
+            await self.persist(chunk)
+            self.stage_seconds["persist"] += time.monotonic() - started
+            self.chunks_done += 1
+            self.rows_done += len(chunk)
+            if self.on_chunk_done is not None:
+                await self.on_chunk_done(chunk)
+            # 저장이 끝난 청크는 바로 해제
+            chunk.frame = None
+            chunk.batch = None
+            chunk.results = []
+
+    async def run(self):
+        """모든 청크 처리 - 한 단계라도 실패하면 나머지 단계를 취소하고 예외 전파"""
+        scored: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        raw: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        enriched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+
+        tasks = [
+            asyncio.create_task(self._read_stage(raw)),
+            asyncio.create_task(self._score_stage(raw, scored)),
+            asyncio.create_task(self._enrich_stage(scored, enriched)),
+            asyncio.create_task(self._persist_stage(enriched)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
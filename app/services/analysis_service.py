@@ -12,9 +12,21 @@ from datetime import datetime
 import pandas as pd
 import io
 import json
+import os
+import time
+
+from app.services.job_lease import JobLeaseLost, new_owner_id
+from app.services.result_stream import result_row_id, result_stream_notifier
+from app.utils.response_cache import bump_data_version
 
 logger = logging.getLogger(__name__)
 
+# 재개 대상 작업 상태와, 임대(job_lease) 도입 전 작업을 중단된 것으로 볼 최소 무갱신 시간
+# 임대가 있는 작업은 임대 만료(AIRISS_JOB_LEASE_SECONDS) 후에만 다른 인스턴스가 재개합니다.
+RESUMABLE_JOB_STATUSES = ('processing', 'pending')
+RESUME_STALE_SECONDS = float(os.getenv("AIRISS_RESUME_STALE_SECONDS", "120"))
+RESUME_SWEEP_SECONDS = float(os.getenv("AIRISS_RESUME_SWEEP_SECONDS", "60"))
+
 class AnalysisService:
     """분석 서비스 - 분석 작업의 라이프사이클 관리"""
     
@@ -22,6 +34,9 @@ class AnalysisService:
         self.websocket_manager = websocket_manager
         self.active_jobs = {}
         self.uploaded_files = {}  # 업로드된 파일 정보 저장
+        self.progress_reporters = {}  # 작업별 진행률 집계기
+        self._job_tasks: Dict[str, asyncio.Task] = {}  # 이 프로세스에서 실행 중인 작업
+        self.instance_id = new_owner_id()  # 작업 임대 소유자 ID
         logger.info("✅ AnalysisService 초기화 완료")
     
     async def upload_file(self, file_contents: bytes, filename: str) -> Dict[str, Any]:
@@ -158,6 +173,86 @@ class AnalysisService:
             logger.error(f"❌ 파일 업로드 오류: {e}")
             raise
     
+    def _find_uploaded_file(self, file_id: str) -> Dict[str, Any]:
+        """업로드 파일 정보 조회 - 데이터베이스 우선, 없으면 메모리 캐시 (파일이 없으면 ValueError)"""
+        from app.db.database import get_db
+        from app.models.file import File as FileModel
+        
+        db = next(get_db())
+        try:
+            file_record = db.query(FileModel).filter(FileModel.id == file_id).first()
+            if file_record:
+                logger.info(f"✅ 데이터베이스에서 파일 정보 찾음: {file_id}")
+                # 메모리 캐시에 저장
+                self.uploaded_files[file_id] = {
+                    'path': file_record.file_path,
+                    'filename': file_record.filename,
+                    'total_records': file_record.total_records,
+                    'columns': json.loads(file_record.columns) if file_record.columns else []
+                }
+            elif file_id in self.uploaded_files:
+                # 메모리에서 확인 (fallback)
+                logger.info(f"📦 메모리 캐시에서 파일 정보 찾음: {file_id}")
+            else:
+                logger.error(f"❌ 파일을 찾을 수 없습니다: {file_id}")
+                logger.error(f"📁 현재 업로드된 파일 목록: {list(self.uploaded_files.keys())}")
+                raise ValueError(f"파일을 찾을 수 없습니다: {file_id}")
+        finally:
+            db.close()
+        
+        file_info = self.uploaded_files[file_id]
+        if not os.path.exists(file_info['path']):
+            logger.error(f"❌ 파일이 파일시스템에 존재하지 않습니다: {file_info['path']}")
+            logger.error(f"📁 uploads 디렉토리 내용: {os.listdir('uploads') if os.path.exists('uploads') else '디렉토리 없음'}")
+            raise ValueError(f"파일이 존재하지 않습니다: {file_info['path']}")
+        return file_info
+    
+    async def estimate_analysis(self,
+                                file_id: str,
+                                sample_size: int = 10,
+                                enable_ai_feedback: bool = False,
+                                openai_model: str = "gpt-3.5-turbo",
+                                max_tokens: int = 1200,
+                                bypass_llm_cache: bool = False,
+                                llm_pack_size: Optional[int] = None,
+                                chunk_size: Optional[int] = None,
+                                dedup_opinions: Optional[bool] = None,
+                                compare_models: Optional[list] = None) -> Dict[str, Any]:
+        """분석 작업 사전 추정 - start_analysis 와 같은 옵션으로 행 수/토큰/비용/소요 시간/메모리 예측"""
+        from app.db.database import get_db
+        from app.services.analysis_pipeline import DEFAULT_CHUNK_SIZE
+        from app.services.feedback_packing import DEFAULT_PACK_SIZE
+        from app.services.job_estimator import estimate_job
+        from app.services.opinion_dedup import DEFAULT_DEDUP_ENABLED
+        from app.services.scoring_pool import scoring_pool
+        
+        file_info = await asyncio.to_thread(self._find_uploaded_file, file_id)
+        
+        def run_estimate():
+            db = next(get_db())
+            try:
+                return estimate_job(
+                    db,
+                    file_info['path'],
+                    sample_size=sample_size,
+                    enable_ai=enable_ai_feedback,
+                    model=openai_model,
+                    max_tokens=max_tokens,
+                    pack_size=int(llm_pack_size or DEFAULT_PACK_SIZE),
+                    chunk_size=max(1, int(chunk_size or scoring_pool.chunk_size(DEFAULT_CHUNK_SIZE))),
+                    dedup_enabled=DEFAULT_DEDUP_ENABLED if dedup_opinions is None else bool(dedup_opinions),
+                    bypass_cache=bypass_llm_cache,
+                    compare_models=compare_models or ()
+                )
+            finally:
+                db.close()
+        
+        estimate = await asyncio.to_thread(run_estimate)
+        estimate.update({"file_id": file_id, "filename": file_info.get('filename')})
+        logger.info(f"🧮 작업 사전 추정: {file_id} - {estimate['rows']}행, 고유 의견 {estimate['distinct_opinions']}개, "
+                    f"예상 {estimate['estimated_seconds']}초")
+        return estimate
+    
     async def start_analysis(self, 
                            file_id: str,
                            sample_size: int = 10,
@@ -165,7 +260,11 @@ class AnalysisService:
                            enable_ai_feedback: bool = False,
                            openai_api_key: Optional[str] = None,
                            openai_model: str = "gpt-3.5-turbo",
-                           max_tokens: int = 1200) -> str:
+                           max_tokens: int = 1200,
+                           bypass_llm_cache: bool = False,
+                           llm_pack_size: Optional[int] = None,
+                           chunk_size: Optional[int] = None,
+                           dedup_opinions: Optional[bool] = None) -> str:
         """분석 작업 시작"""
         try:
             logger.info(f"🎯 분석 시작 요청 - enable_ai_feedback: {enable_ai_feedback}")
@@ -183,7 +282,12 @@ class AnalysisService:
                 'enable_ai_feedback': enable_ai_feedback,
                 'openai_api_key': openai_api_key,
                 'openai_model': openai_model,
-                'max_tokens': max_tokens
+                'max_tokens': max_tokens,
+                'bypass_llm_cache': bypass_llm_cache,
+                'llm_pack_size': llm_pack_size,
+                'chunk_size': chunk_size,
+                'dedup_opinions': dedup_opinions,
+                'created_at_epoch': time.time()
             }
             
             # 데이터베이스에 Job 레코드 생성
@@ -206,7 +310,7 @@ class AnalysisService:
             logger.info(f"✅ 분석 작업 시작: job_id={job_id}, file_id={file_id}")
             
             # 실제 분석 작업을 비동기로 시작
-            asyncio.create_task(self._process_analysis(job_id, job_data))
+            self._start_job_task(job_id, self._process_analysis(job_id, job_data))
             
             return job_id
             
@@ -214,11 +318,21 @@ class AnalysisService:
             logger.error(f"❌ 분석 시작 오류: {e}")
             raise
     
+    def _start_job_task(self, job_id: str, coroutine):
+        """작업 코루틴을 백그라운드로 실행하고 완료 시 목록에서 제거"""
+        task = asyncio.create_task(coroutine)
+        self._job_tasks[job_id] = task
+        task.add_done_callback(
+            lambda done: self._job_tasks.pop(job_id, None) if self._job_tasks.get(job_id) is done else None
+        )
+        return task
+    
     async def _create_job_record(self, job_id: str, job_data: Dict[str, Any]):
         """데이터베이스에 Job 레코드 생성"""
         try:
             from app.db.database import get_db
             from app.models.job import Job
+            from app.services.job_lease import lease_expiry
             import json
             
             def create_job():
@@ -239,7 +353,9 @@ class AnalysisService:
                         openai_model=job_data.get('openai_model'),
                         max_tokens=job_data.get('max_tokens'),
                         total_records=file_info.get('total_records', 0),
-                        job_data=json.dumps(job_data)
+                        job_data=json.dumps(job_data),
+                        owner=self.instance_id,
+                        lease_expires_at=lease_expiry()
                     )
                     db.add(job)
                     db.commit()
@@ -260,45 +376,68 @@ class AnalysisService:
             logger.error(f"❌ Job 레코드 생성 중 오류: {e}")
             raise
     
-    async def update_progress(self, job_id: str, progress: float, details: Dict = None):
-        """분석 진행률 업데이트"""
+    async def update_progress(self, job_id: str, progress: float, details: Dict = None, force: bool = False):
+        """분석 진행률 업데이트 (메모리는 즉시, WebSocket/DB 는 집계기가 빈도 제한)"""
         try:
             # 메모리 업데이트
             if job_id in self.active_jobs:
                 self.active_jobs[job_id]['progress'] = progress
                 self.active_jobs[job_id]['last_update'] = datetime.now()
             
-            # 데이터베이스 업데이트
-            from app.db.database import get_db
-            from app.models.job import Job
-            
-            def update_job_progress():
-                db = next(get_db())
-                try:
-                    job = db.query(Job).filter(Job.id == job_id).first()
-                    if job:
-                        job.progress = progress
-                        job.updated_at = datetime.now()
-                        db.commit()
-                        logger.info(f"📊 진행률 업데이트: {job_id} - {progress}%")
-                finally:
-                    db.close()
-            
-            await asyncio.to_thread(update_job_progress)
-            
-            # WebSocket 알림
-            if self.websocket_manager:
-                await self.websocket_manager.send_analysis_progress(job_id, {
-                    "progress": progress,
-                    "details": details or {}
-                })
+            await self._progress_reporter(job_id).update(progress, details, force=force)
             
         except Exception as e:
             logger.error(f"❌ 진행률 업데이트 오류: {e}")
     
+    def _progress_reporter(self, job_id: str):
+        """작업별 진행률 집계기 (없으면 생성)"""
+        from app.services.progress_reporter import ProgressReporter
+        
+        reporter = self.progress_reporters.get(job_id)
+        if reporter is None:
+            async def emit(progress: float, details: Dict[str, Any]):
+                if self.websocket_manager:
+                    await self.websocket_manager.send_analysis_progress(job_id, {
+                        "progress": progress,
+                        "details": details
+                    })
+            
+            async def persist(progress: float):
+                await asyncio.to_thread(self._persist_progress, job_id, progress)
+            
+            reporter = ProgressReporter(job_id, emit=emit, persist=persist)
+            self.progress_reporters[job_id] = reporter
+        return reporter
+    
+    async def _close_progress_reporter(self, job_id: str):
+        """최종 진행 상태를 내보내고 집계기 통계를 작업 정보에 기록"""
+        reporter = self.progress_reporters.pop(job_id, None)
+        if reporter is None:
+            return
+        await reporter.flush()
+        if job_id in self.active_jobs:
+            self.active_jobs[job_id]['progress_updates'] = reporter.stats()
+    
+    def _persist_progress(self, job_id: str, progress: float):
+        """jobs 테이블 진행률 저장 (동기)"""
+        from app.db.database import get_db
+        from app.models.job import Job
+        
+        db = next(get_db())
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            if job:
+                job.progress = progress
+                job.updated_at = datetime.now()
+                db.commit()
+                logger.debug(f"📊 진행률 저장: {job_id} - {progress}%")
+        finally:
+            db.close()
+    
     async def complete_analysis(self, job_id: str, results: Dict[str, Any]):
         """분석 완료 처리"""
         try:
+            await self._close_progress_reporter(job_id)
             if job_id in self.active_jobs:
                 self.active_jobs[job_id]['status'] = 'completed'
                 self.active_jobs[job_id]['end_time'] = datetime.now()
@@ -306,6 +445,8 @@ class AnalysisService:
                 
                 # 데이터베이스 Job 레코드 업데이트
                 await self._update_job_completion(job_id, results)
+                result_stream_notifier.notify(job_id)
+                bump_data_version(f"job completed: {job_id}")
                 
                 if self.websocket_manager:
                     await self.websocket_manager.send_alert(
@@ -334,10 +475,19 @@ class AnalysisService:
                         job.status = 'completed'
                         job.end_time = datetime.now()
                         job.progress = 100.0
-                        job.processed_records = len(results.get('analysis_results', results.get('data', [])))
+                        job.processed_records = results.get('summary', {}).get(
+                            'total_analyzed', len(results.get('analysis_results', results.get('data', [])))
+                        )
                         job.average_score = results.get('summary', {}).get('average_score', 0.0)
                         job.results_data = json.dumps(results)
                         
+                        # 실행 기록은 작업 설정과 함께 보관 (사전 추정기가 결과 JSON 없이 읽도록)
+                        profile = results.get('summary', {}).get('profile')
+                        if profile:
+                            job_data = json.loads(job.job_data or "{}")
+                            job_data['run_profile'] = profile
+                            job.job_data = json.dumps(job_data)
+                        
                         db.commit()
                         logger.info(f"✅ Job 완료 업데이트: {job_id}")
                     else:
@@ -360,6 +510,7 @@ class AnalysisService:
     async def fail_analysis(self, job_id: str, error: str):
         """분석 실패 처리"""
         try:
+            await self._close_progress_reporter(job_id)
             if job_id in self.active_jobs:
                 self.active_jobs[job_id]['status'] = 'failed'
                 self.active_jobs[job_id]['error'] = error
@@ -375,7 +526,7 @@ class AnalysisService:
                         job = db.query(Job).filter(Job.id == job_id).first()
                         if job:
                             job.status = 'failed'
-                            job.error_message = error[:500] if error else None  # 에러 메시지 길이 제한
+                            job.error = error[:500] if error else None  # 에러 메시지 길이 제한
                             job.end_time = datetime.now()
                             db.commit()
                             logger.info(f"🔄 Job 실패 업데이트: {job_id}")
@@ -386,6 +537,8 @@ class AnalysisService:
                         db.close()
                 
                 await asyncio.to_thread(update_job_failure)
+                result_stream_notifier.notify(job_id)
+                bump_data_version(f"job failed: {job_id}")
                 
                 if self.websocket_manager:
                     await self.websocket_manager.send_alert(
@@ -401,8 +554,86 @@ class AnalysisService:
             import traceback
             logger.error(f"트레이스백:\n{traceback.format_exc()}")
     
-    async def _process_analysis(self, job_id: str, job_data: Dict[str, Any]):
-        """실제 분석 작업 처리 - HybridAnalyzer 통합"""
+    async def _process_analysis(self, job_id: str, job_data: Dict[str, Any], resume: bool = False):
+        """
+        분석 작업 실행 - LLM 응답 캐시/호출 사용량을 작업 단위로 집계
+        
+        재개(resume) 시에는 캐시 우회 작업이라도 중단 전 같은 작업이 받은 응답은 다시 요청하지 않습니다.
+        단, 이는 이 인스턴스의 로컬 LLM 응답 캐시 파일(AIRISS_LLM_CACHE_PATH)에 응답이 남아 있을 때만 성립하며,
+        다른 인스턴스가 재개하거나 재배포로 파일이 사라졌거나 캐시가 꺼져 있으면 체크포인트 이후 행은 다시 요청됩니다.
+        
+        실행 중에는 작업 임대를 주기적으로 연장하고, 다른 인스턴스가 임대를 가져가면 저장 없이 중단합니다.
+        """
+        from app.services.llm_executor import llm_executor
+        from app.services.llm_response_cache import llm_response_cache
+        
+        lease_lost = asyncio.Event()
+        with llm_response_cache.track_job(
+            job_id,
+            bypass=bool(job_data.get('bypass_llm_cache', False)),
+            fresh_since=job_data.get('created_at_epoch') if resume else None
+        ), llm_executor.track_job(job_id):
+            run = asyncio.ensure_future(self._run_analysis(job_id, job_data, resume=resume))
+            heartbeat = asyncio.create_task(self._keep_job_lease(job_id, run, lease_lost))
+            try:
+                await run
+            except JobLeaseLost:
+                lease_lost.set()
+            except asyncio.CancelledError:
+                if not lease_lost.is_set():
+                    raise
+            finally:
+                heartbeat.cancel()
+        
+        if lease_lost.is_set():
+            # 결과/상태는 작업을 가져간 인스턴스가 기록 - 이 인스턴스의 메모리 상태만 정리
+            logger.warning(f"⚠️ 작업 임대를 잃어 실행 중단: job_id={job_id}")
+            self.progress_reporters.pop(job_id, None)
+            self.active_jobs.pop(job_id, None)
+        else:
+            await asyncio.to_thread(self._release_job_lease, job_id)
+    
+    async def _keep_job_lease(self, job_id: str, run: asyncio.Future, lease_lost: asyncio.Event):
+        """작업 실행 중 임대를 주기적으로 연장 - 다른 인스턴스가 가져갔으면 실행 취소"""
+        from app.services.job_lease import HEARTBEAT_SECONDS, renew
+        
+        def renew_lease() -> bool:
+            db = self._get_db()
+            try:
+                renewed = renew(db, job_id, self.instance_id)
+                db.commit()
+                return renewed
+            finally:
+                db.close()
+        
+        while not run.done():
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            try:
+                renewed = await asyncio.to_thread(renew_lease)
+            except Exception as e:
+                # 일시적인 DB 오류 - 임대가 만료되더라도 청크 저장 시 소유권을 다시 확인함
+                logger.warning(f"⚠️ 작업 임대 연장 실패 (다음 주기에 재시도): {job_id} - {e}")
+                continue
+            if not renewed and not run.done():
+                lease_lost.set()
+                run.cancel()
+                return
+    
+    def _release_job_lease(self, job_id: str):
+        """작업 종료 후 임대 해제 (실패해도 임대 만료로 정리됨)"""
+        from app.services.job_lease import release
+        
+        db = self._get_db()
+        try:
+            release(db, job_id, self.instance_id)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"⚠️ 작업 임대 해제 실패: {job_id} - {e}")
+        finally:
+            db.close()
+    
+    async def _run_analysis(self, job_id: str, job_data: Dict[str, Any], resume: bool = False):
+        """실제 분석 작업 처리 - HybridAnalyzer 통합 (resume=True면 마지막 체크포인트 이후부터)"""
         logger.info("="*60)
         logger.info(f"🚀 _process_analysis 시작")
         logger.info(f"🆔 job_id: {job_id}")
@@ -417,242 +648,156 @@ class AnalysisService:
             await self.update_progress(job_id, 10, {"status": "파일 로드 중"})
             
             # 1. 파일 정보 가져오기 - 먼저 데이터베이스에서 확인
-            file_info = None
-            file_path = None
-            filename = None
+            file_info = await asyncio.to_thread(self._find_uploaded_file, file_id)
+            file_path = file_info['path']
+            filename = file_info['filename']
             
-            # 데이터베이스에서 파일 정보 조회
-            from app.db.database import get_db
-            from app.models.file import File as FileModel
-            import json
+            # 2. 청크 리더 열기 및 컬럼 감지 (파일당 1회)
+            from app.services.analysis_pipeline import (
+                AnalysisPipeline, ColumnMapping, DEFAULT_CHUNK_SIZE, FileChunkReader, ResultAccumulator
+            )
             
-            db = next(get_db())
-            try:
-                file_record = db.query(FileModel).filter(FileModel.id == file_id).first()
-                if file_record:
-                    logger.info(f"✅ 데이터베이스에서 파일 정보 찾음: {file_id}")
-                    file_path = file_record.file_path
-                    filename = file_record.filename
-                    
-                    # 메모리 캐시에 저장
-                    self.uploaded_files[file_id] = {
-                        'path': file_path,
-                        'filename': filename,
-                        'total_records': file_record.total_records,
-                        'columns': json.loads(file_record.columns) if file_record.columns else []
-                    }
-                    file_info = self.uploaded_files[file_id]
-                else:
-                    # 메모리에서 확인 (fallback)
-                    if file_id in self.uploaded_files:
-                        logger.info(f"📦 메모리 캐시에서 파일 정보 찾음: {file_id}")
-                        file_info = self.uploaded_files[file_id]
-                        file_path = file_info['path']
-                        filename = file_info['filename']
-                    else:
-                        logger.error(f"❌ 파일을 찾을 수 없습니다: {file_id}")
-                        logger.error(f"📁 현재 업로드된 파일 목록: {list(self.uploaded_files.keys())}")
-                        raise ValueError(f"파일을 찾을 수 없습니다: {file_id}")
-            finally:
-                db.close()
+            from app.services.scoring_pool import scoring_pool
             
-            # 파일 존재 여부 확인
-            import os
-            if not os.path.exists(file_path):
-                logger.error(f"❌ 파일이 파일시스템에 존재하지 않습니다: {file_path}")
-                logger.error(f"📁 uploads 디렉토리 내용: {os.listdir('uploads') if os.path.exists('uploads') else '디렉토리 없음'}")
-                raise ValueError(f"파일이 존재하지 않습니다: {file_path}")
+            # 작업별 청크 크기가 없으면 기본값 사용 (점수화 풀 사용 시 워커 수에 맞춰 상향)
+            chunk_size = max(1, int(job_data.get('chunk_size') or scoring_pool.chunk_size(DEFAULT_CHUNK_SIZE)))
+            sample_size = job_data.get('sample_size', 10)
             
-            # 2. 파일 읽기 및 데이터 로드
-            import pandas as pd
-            logger.info(f"파일 읽기 시작: {file_path}")
+            # 체크포인트: 저장이 끝난 행 수 (재개 시 이 행부터 다시 읽음)
+            accumulator = ResultAccumulator()
+            cursor = 0
+            if resume:
+                cursor = await asyncio.to_thread(self._restore_checkpoint, job_id, accumulator)
+                logger.info(f"♻️ 체크포인트에서 재개: job_id={job_id}, {cursor}행 이후부터")
             
+            reader = FileChunkReader(file_path, chunk_size=chunk_size, limit=sample_size, skip=cursor)
+            logger.info(f"파일 읽기 시작: {file_path}")
             try:
-                # pickle 파일로 저장된 경우
-                if file_path.endswith('.pkl'):
-                    df = pd.read_pickle(file_path)
-                    logger.info(f"📊 Pickle 파일 로드 완료: {len(df)} rows, {len(df.columns)} columns")
-                # Excel 파일인 경우
-                elif file_path.endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file_path)
-                    logger.info(f"📊 Excel 파일 로드 완료: {len(df)} rows, {len(df.columns)} columns")
-                # CSV 파일인 경우
-                elif file_path.endswith('.csv'):
-                    df = pd.read_csv(file_path)
-                    logger.info(f"📊 CSV 파일 로드 완료: {len(df)} rows, {len(df.columns)} columns")
-                else:
-                    raise ValueError(f"지원되지 않는 파일 형식: {file_path}")
-                
-                logger.info(f"📋 파일 컬럼명: {list(df.columns)}")
-                logger.info(f"📄 첫 5행 데이터 미리보기:\n{df.head()}")
+                await asyncio.to_thread(reader.open)
             except Exception as e:
                 logger.error(f"❌ 파일 읽기 오류: {e}")
                 raise ValueError(f"파일 읽기 실패: {e}")
+            logger.info(f"📋 파일 컬럼명: {reader.columns}")
             
-            # 데이터 프레임이 비어있는지 확인
-            if df.empty:
-                logger.error(f"❌ 파일에 데이터가 없습니다: {file_path}")
-                raise ValueError("파일에 데이터가 없습니다. 다른 파일을 선택해주십시오.")
+            total_records = (file_info or {}).get('total_records')
+            expected_rows = min(sample_size, total_records) if total_records else sample_size
             
             await self.update_progress(job_id, 20, {
                 "status": "데이터 검증 중",
-                "rows": len(df),
-                "columns": len(df.columns)
+                "rows": total_records,
+                "columns": len(reader.columns)
             })
             
             # 3. 필수 컬럼 확인 (유연한 컬럼명 매칭)
-            column_names = [col.lower().strip() for col in df.columns]
-            logger.info(f"🔍 소문자 변환된 컬럼명: {column_names}")
-            
-            # uid 컬럼 찾기
-            uid_column = None
-            for col in df.columns:
-                if col.lower().strip() in ['uid', 'id', '직원번호', 'employee_id', '사번']:
-                    uid_column = col
-                    break
-            
-            # opinion 컬럼 찾기  
-            opinion_column = None
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if any(keyword in col_lower for keyword in ['opinion', '의견', '평가', 'comment', '코멘트', 'feedback', '리뷰', 'review', '자료', '내용', 'content', '텍스트', 'text']):
-                    opinion_column = col
-                    break
-            
-            # 필수 컬럼 확인
-            if uid_column is None:
-                logger.error(f"❌ UID 컬럼을 찾을 수 없습니다. 사용 가능한 컬럼: {list(df.columns)}")
-                raise ValueError("필수 컬럼 'UID' 또는 '직원번호'를 찾을 수 없습니다.")
-                
-            if opinion_column is None:
-                logger.error(f"❌ 평가의견 컬럼을 찾을 수 없습니다. 사용 가능한 컬럼: {list(df.columns)}")
-                raise ValueError("필수 컬럼 '평가의견' 또는 'Opinion'을 찾을 수 없습니다.")
-            
-            # 이름 컬럼 찾기
-            name_column = None
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if any(keyword in col_lower for keyword in ['name', '이름', '성명', '직원명']):
-                    name_column = col
-                    break
-            
-            # 부서 컬럼 찾기
-            department_column = None
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if any(keyword in col_lower for keyword in ['department', '부서', 'dept', '소속', '팀']):
-                    department_column = col
-                    break
-            
-            # 직급 컬럼 찾기
-            position_column = None
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if any(keyword in col_lower for keyword in ['position', '직급', '직위', 'title', 'grade', '등급']):
-                    position_column = col
-                    break
-            
-            logger.info(f"📦 컬럼 매핑 결과:")
-            logger.info(f"  - UID: {uid_column}")
-            logger.info(f"  - Opinion: {opinion_column}")
-            logger.info(f"  - Name: {name_column or '없음'}")
-            logger.info(f"  - Department: {department_column or '없음'}")
-            logger.info(f"  - Position: {position_column or '없음'}")
-                
-            if not opinion_column:
-                logger.error(f"❌ 의견 컬럼을 찾을 수 없습니다. 사용 가능한 컬럼: {list(df.columns)}")
-                raise ValueError("의견 컬럼(opinion, 의견, 평가 등)을 찾을 수 없습니다.")
-            
-            logger.info(f"✅ 컬럼 매칭 성공: uid='{uid_column}', opinion='{opinion_column}'")
-            if name_column:
-                logger.info(f"✅ 이름 컬럼 발견: '{name_column}'")
-            if department_column:
-                logger.info(f"✅ 부서 컬럼 발견: '{department_column}'")
-            if position_column:
-                logger.info(f"✅ 직급 컬럼 발견: '{position_column}'")
-            
-            # 4. HybridAnalyzer 초기화
-            from app.services.hybrid_analyzer import AIRISSHybridAnalyzer
-            analyzer = AIRISSHybridAnalyzer()
-            
-            # 5. 샘플 크기 제한
-            sample_size = min(job_data.get('sample_size', 10), len(df))
-            df_sample = df.head(sample_size)
-            logger.info(f"📊 분석 대상: {sample_size}명 (전체: {len(df)}명)")
-            logger.info(f"📋 분석할 컬럼: uid={uid_column}, opinion={opinion_column}")
+            columns = ColumnMapping.detect(reader.columns)
+            logger.info(f"📦 컬럼 매핑 결과: {columns.describe()}")
             
-            await self.update_progress(job_id, 30, {
-                "status": "AI 분석 시작",
-                "analyzing": sample_size
-            })
+            # 4. HybridAnalyzer 준비 (프로세스 공용 인스턴스 재사용)
+            from app.services.analyzer_registry import get_hybrid_analyzer
+            from app.services.llm_response_cache import llm_response_cache
+            analyzer = get_hybrid_analyzer()
             
-            # 6. 각 행에 대해 분석 수행
-            analysis_results = []
-            logger.info(f"🔄 분석 루프 시작: {sample_size}개 레코드")
+            # 5. API 키 처리: 환경변수 우선, 그 다음 클라이언트 키
+            from app.core.config import settings
+            
+            enable_ai = job_data.get('enable_ai_feedback', False)
+            logger.info(f"🔑 API 키 처리 - enable_ai_feedback: {enable_ai}")
+            
+            # 1. 먼저 환경변수에서 API 키 확인
+            api_key = settings.OPENAI_API_KEY
+            if api_key and api_key.startswith('sk-'):
+                logger.info(f"✅ 환경변수에서 OpenAI API 키 사용: {api_key[:20]}...")
+            else:
+                # 2. 환경변수에 없으면 클라이언트 제공 키 사용
+                client_api_key = job_data.get('openai_api_key')
+                if client_api_key and client_api_key.startswith('sk-') and len(client_api_key) > 20:
+                    api_key = client_api_key
+                    logger.info(f"📱 클라이언트 제공 API 키 사용: {api_key[:20]}...")
+                else:
+                    api_key = None
+                    logger.warning("⚠️ 유효한 OpenAI API 키가 없습니다. LLM 분석이 비활성화됩니다.")
+            
+            logger.info(f"🔑 최종 API 키 사용: {'있음' if api_key else '없음'}")
+            
+            openai_model = job_data.get('openai_model', 'gpt-3.5-turbo')
+            max_tokens = job_data.get('max_tokens', 1200)
+            
+            # 묶음 요청 모드: 청크의 AI 피드백을 직원 N명씩 한 요청으로 먼저 생성
+            from app.services.feedback_packing import DEFAULT_PACK_SIZE
+            pack_size = int(job_data.get('llm_pack_size') or DEFAULT_PACK_SIZE)
+            use_packing = bool(enable_ai and api_key and pack_size > 1)
+            if use_packing:
+                logger.info(f"📦 AI 피드백 묶음 요청 사용: 최대 {pack_size}명/요청")
+            
+            # 중복 의견 묶기: 정규화한 의견이 같은 행은 텍스트 분석/AI 피드백을 그룹당 1회만 수행
+            from app.services.opinion_dedup import DEFAULT_DEDUP_ENABLED, OpinionDeduplicator
+            dedup_enabled = job_data.get('dedup_opinions')
+            dedup = OpinionDeduplicator(enabled=DEFAULT_DEDUP_ENABLED if dedup_enabled is None else bool(dedup_enabled))
+            
+            # 6. 파이프라인 단계 정의
+            def score_chunk(frame: pd.DataFrame):
+                """청크 전체 일괄 점수화 (텍스트/정량/하이브리드 벡터 연산, 큰 청크는 워커 프로세스로 분산)"""
+                _, representatives = dedup.assign(frame[columns.opinion].tolist())
+                return scoring_pool.analyze_batch(
+                    analyzer,
+                    opinions=representatives,  # 텍스트 점수는 그룹 대표 의견으로 (정량 점수는 행별)
+                    row_data=frame,
+                    uids=[str(value) for value in frame[columns.uid].tolist()]
+                )
             
-            for idx, (index, row) in enumerate(df_sample.iterrows()):
+            async def row_feedback(batch, offset: int, precomputed_ai_feedback: Optional[Dict[str, Any]] = None):
+                """한 행의 AI 피드백 (같은 의견 그룹은 한 번만 요청하고 공유) - 실패 시 예외 객체 반환"""
                 try:
-                    logger.info(f"📊 레코드 {idx+1}/{sample_size} 분석 시작")
-                    
-                    # 진행률 업데이트 - 더 세밀하게
-                    progress = 30 + ((idx + 0.5) / sample_size) * 50  # 30-80% 구간
-                    await self.update_progress(job_id, progress, {
-                        "status": f"분석 중: {idx+1}/{sample_size}",
-                        "current_uid": row.get(uid_column, f'ROW_{idx+1}'),
-                        "processed": idx + 1,
-                        "total": sample_size
-                    })
-                    
-                    # 분석 수행 (실제 컬럼명 사용)
-                    uid = str(row.get(uid_column, f'EMP_{idx+1}'))  
-                    opinion = str(row.get(opinion_column, ''))
+                    if enable_ai and api_key and precomputed_ai_feedback is None:
+                        precomputed_ai_feedback = await dedup.feedback(
+                            dedup.key(batch.opinions[offset]),
+                            lambda: analyzer.text_analyzer.generate_ai_feedback(
+                                uid=batch.uids[offset],
+                                opinion=batch.opinions[offset],
+                                api_key=api_key,
+                                model=openai_model,
+                                max_tokens=max_tokens
+                            )
+                        )
+                    return await analyzer.resolve_ai_feedback(
+                        batch.uids[offset],
+                        batch.opinions[offset],
+                        enable_ai=enable_ai,
+                        openai_api_key=api_key,
+                        openai_model=openai_model,
+                        max_tokens=max_tokens,
+                        precomputed_ai_feedback=precomputed_ai_feedback
+                    )
+                except Exception as e:
+                    return e
+            
+            def analyze_row(batch, offset: int, idx: int, row: pd.Series, ai_feedback) -> Dict[str, Any]:
+                """한 행의 결과 구성/저장 및 정리 (materialize_chunk 에서 스레드로 실행)"""
+                try:
+                    if isinstance(ai_feedback, Exception):
+                        raise ai_feedback
+                    uid = str(row.get(columns.uid, f'EMP_{idx+1}'))
+                    opinion = str(row.get(columns.opinion, ''))
                     
                     # 메타데이터 추출
-                    name = str(row.get(name_column, '')) if name_column else ''
-                    department = str(row.get(department_column, '')) if department_column else ''
-                    position = str(row.get(position_column, '')) if position_column else ''
-                    
-                    # API 키 처리: 환경변수 우선, 그 다음 클라이언트 키
-                    from app.core.config import settings
-                    
-                    logger.info(f"🔑 API 키 처리 - enable_ai_feedback: {job_data.get('enable_ai_feedback')}")
+                    name = str(row.get(columns.name, '')) if columns.name else ''
+                    department = str(row.get(columns.department, '')) if columns.department else ''
+                    position = str(row.get(columns.position, '')) if columns.position else ''
                     
-                    # 1. 먼저 환경변수에서 API 키 확인
-                    api_key = settings.OPENAI_API_KEY
-                    if api_key and api_key.startswith('sk-'):
-                        logger.info(f"✅ 환경변수에서 OpenAI API 키 사용: {api_key[:20]}...")
-                    else:
-                        # 2. 환경변수에 없으면 클라이언트 제공 키 사용
-                        client_api_key = job_data.get('openai_api_key')
-                        if client_api_key and client_api_key.startswith('sk-') and len(client_api_key) > 20:
-                            api_key = client_api_key
-                            logger.info(f"📱 클라이언트 제공 API 키 사용: {api_key[:20]}...")
-                        else:
-                            api_key = None
-                            logger.warning("⚠️ 유효한 OpenAI API 키가 없습니다. LLM 분석이 비활성화됩니다.")
-                    
-                    logger.info(f"🔑 최종 API 키 사용: {'있음' if api_key else '없음'}")
-                    
-                    # HybridAnalyzer로 종합 분석
-                    logger.info(f"🔬 HybridAnalyzer 호출 시작 - UID: {uid}")
-                    result = await analyzer.comprehensive_analysis(
-                        uid=uid,
-                        opinion=opinion,
-                        row_data=row,
+                    # HybridAnalyzer로 종합 분석 결과 구성 (배치 점수 배열 + AI 피드백)
+                    result = analyzer.finalize_batch_row(
+                        batch,
+                        offset,
+                        ai_feedback,
                         save_to_storage=True,
                         file_id=file_id,
                         filename=filename,
-                        enable_ai=job_data.get('enable_ai_feedback', False),
-                        openai_api_key=api_key,
-                        openai_model=job_data.get('openai_model', 'gpt-3.5-turbo'),
-                        max_tokens=job_data.get('max_tokens', 1200)
+                        opinion=opinion
                     )
                     
-                    logger.info(f"✅ HybridAnalyzer 분석 완료 - UID: {uid}")
-                    
                     # 결과 정리
                     ai_feedback_data = result.get('ai_feedback', {})
-                    analysis_results.append({
+                    return {
                         "uid": uid,
                         "name": name,
                         "department": department,
@@ -670,51 +815,130 @@ class AnalysisService:
                             'improvements': self._extract_improvements(ai_feedback_data),
                             'overall_comment': ai_feedback_data.get('ai_feedback', '')
                         }
-                    })
+                    }
                     
                 except Exception as e:
-                    logger.error(f"❌ 행 {idx+1} 분석 오류: {e}")
-                    logger.error(f"오류 상세: {type(e).__name__}: {str(e)}")
-                    logger.error(f"분석 파라미터: enable_ai={job_data.get('enable_ai_feedback')}, api_key={'있음' if api_key else '없음'}")
-                    import traceback
-                    logger.error(f"트레이스백:\n{traceback.format_exc()}")
+                    logger.error(f"❌ 행 {idx+1} 분석 오류: {type(e).__name__}: {e}")
+                    logger.debug("행 분석 오류 상세", exc_info=e)
                     
-                    analysis_results.append({
-                        "uid": row.get(uid_column, f'ROW_{idx+1}'),
+                    return {
+                        "uid": str(row.get(columns.uid, f'ROW_{idx+1}')),
                         "name": row.get('name', ''),
                         "score": 0,
                         "grade": "ERROR",
                         "error": str(e)
-                    })
-                    
-                    # 오류가 발생해도 진행률은 계속 업데이트
-                    progress = 30 + ((idx + 1) / sample_size) * 50  # 30-80% 구간
-                    await self.update_progress(job_id, progress, {
-                        "processed": idx + 1,
-                        "total": sample_size,
-                        "current_uid": row.get(uid_column, f'ROW_{idx+1}'),
-                        "error": str(e)
-                    })
+                    }
+            
+            def materialize_chunk(chunk, feedback: list) -> list:
+                """청크 행별 결과 dict 생성 및 저장 버퍼 적재 (CPU 작업 - 이벤트 루프 밖에서 실행)"""
+                return [
+                    analyze_row(chunk.batch, offset, chunk.start + offset, row, feedback[offset])
+                    for offset, (_, row) in enumerate(chunk.frame.iterrows())
+                ]
+            
+            async def enrich_chunk(chunk) -> list:
+                """청크의 AI 피드백 생성 및 결과 정리 (LLM 동시성/분당 한도는 공용 실행기가 제한)"""
+                batch = chunk.batch
+                packed_feedback = [None] * len(chunk)
+                if use_packing:
+                    try:
+                        packed_feedback = await dedup.feedback_packed(
+                            [dedup.key(opinion) for opinion in batch.opinions],
+                            [
+                                {"uid": batch.uids[offset], "opinion": batch.opinions[offset]}
+                                for offset in range(len(chunk))
+                            ],
+                            lambda items: analyzer.text_analyzer.generate_ai_feedback_packed(
+                                items,
+                                api_key=api_key,
+                                model=openai_model,
+                                max_tokens=max_tokens,
+                                max_pack_size=pack_size
+                            )
+                        )
+                    except Exception as e:
+                        logger.warning(f"⚠️ 묶음 AI 피드백 실패 - 행별 요청으로 진행: {e}")
+                
+                # LLM 호출은 이벤트 루프에서 동시에, 행 결과 구성(CPU)은 청크 단위로 스레드에서
+                feedback = await asyncio.gather(*(
+                    row_feedback(batch, offset, packed_feedback[offset]) for offset in range(len(chunk))
+                ))
+                return await asyncio.to_thread(materialize_chunk, chunk, feedback)
+            
+            async def persist_chunk(chunk):
+                """청크 결과와 체크포인트를 한 트랜잭션으로 저장 (파일 첫 청크에서 기존 결과 삭제, 임대를 잃었으면 JobLeaseLost)"""
+                accumulator.add(chunk.results)
+                # 일괄 저장기에 남은 분석 결과를 먼저 기록 (체크포인트 이후 재개 시 유실 방지)
+                await asyncio.to_thread(analyzer.flush_storage)
+                saved = await self._save_employee_results_chunk(
+                    job_id, chunk.results, replace_existing=(chunk.start == 0),
+                    checkpoint={"processed": chunk.start + len(chunk), "failed": accumulator.failed},
+                    first_row=chunk.start
+                )
+                if saved is None:
+                    raise RuntimeError(f"청크 저장 실패 (행 {chunk.start + 1}~{chunk.start + len(chunk)})")
+            
+            async def report_progress(chunk):
+                processed = accumulator.total
+                progress = 30 + min(processed / max(expected_rows, 1), 1.0) * 55  # 30-85% 구간
+                await self.update_progress(job_id, progress, {
+                    "status": f"분석 중: {processed}/{expected_rows}",
+                    "current_uid": accumulator.last_uid,
+                    "processed": processed,
+                    "total": expected_rows,
+                    "failed": accumulator.failed
+                })
+            
+            # 7. 파이프라인 실행 (읽기 → 점수화 → LLM 보강 → 일괄 저장)
+            logger.info(f"📊 분석 대상: 최대 {sample_size}명 (전체: {total_records or '알 수 없음'}명)")
+            logger.info(f"🔄 분석 시작: 청크 크기 {chunk_size}")
+            await self.update_progress(job_id, 30, {
+                "status": "AI 분석 시작",
+                "analyzing": expected_rows
+            })
+            
+            from app.services.llm_executor import llm_executor
+            pipeline_started = time.monotonic()
+            pipeline = AnalysisPipeline(
+                reader,
+                score=score_chunk,
+                enrich=enrich_chunk,
+                persist=persist_chunk,
+                on_chunk_done=report_progress,
+                start_row=cursor
+            )
+            await pipeline.run()
+            
+            if accumulator.total == 0:
+                raise ValueError("파일에 데이터가 없습니다. 다른 파일을 선택해주십시오.")
+            logger.info(f"⚡ 파이프라인 처리 완료: {accumulator.total}개 레코드, {pipeline.chunks_done}개 청크")
             
             await self.update_progress(job_id, 85, {
                 "status": "결과 생성 중",
-                "processed": sample_size,
-                "total": sample_size
+                "processed": accumulator.total,
+                "total": accumulator.total
             })
             
-            # 7. 분석 결과 요약
-            valid_results = [r for r in analysis_results if 'error' not in r]
-            if valid_results:
-                avg_score = sum(r['score'] for r in valid_results) / len(valid_results)
-                grade_distribution = {}
-                for r in valid_results:
-                    grade = r['grade']
-                    grade_distribution[grade] = grade_distribution.get(grade, 0) + 1
-            else:
-                avg_score = 0
-                grade_distribution = {}
+            # 실행 기록 (이후 작업의 사전 추정 보정용 - 이번 실행에서 처리한 행 기준)
+            llm_cache_stats = llm_response_cache.job_stats(job_id) or {}
+            run_profile = {
+                "rows": pipeline.rows_done,
+                "elapsed_seconds": round(time.monotonic() - pipeline_started, 3),
+                "stage_seconds": {stage: round(seconds, 3) for stage, seconds in pipeline.stage_seconds.items()},
+                "ai_enabled": bool(enable_ai and api_key),
+                "model": openai_model,
+                "max_tokens": max_tokens,
+                "pack_size": pack_size if use_packing else 1,
+                "chunk_size": chunk_size,
+                "distinct_opinions": dedup.stats()["distinct_opinions"],
+                "llm_employees": llm_cache_stats.get("misses", 0) + llm_cache_stats.get("bypassed", 0),
+                "llm": llm_executor.job_usage(job_id),
+                "llm_concurrency": llm_executor.concurrency,
+                "resumed": resume
+            }
             
-            # 8. 최종 결과 구성
+            # 8. 최종 결과 구성 (전체 결과는 EmployeeResult 테이블, 작업 JSON에는 앞쪽 일부만)
+            analysis_results = accumulator.inline_results
             results = {
                 "job_id": job_id,
                 "file_id": file_id,
@@ -722,13 +946,14 @@ class AnalysisService:
                 "data": analysis_results,
                 "analysis_results": analysis_results,  # 프론트엔드 호환성
                 "summary": {
-                    "total_analyzed": len(analysis_results),
-                    "successful": len(valid_results),
-                    "failed": len(analysis_results) - len(valid_results),
-                    "average_score": round(avg_score, 1),
-                    "grade_distribution": grade_distribution,
+                    **accumulator.summary(),
                     "analysis_mode": job_data.get('analysis_mode', 'hybrid'),
-                    "ai_enabled": job_data.get('enable_ai_feedback', False)
+                    "ai_enabled": job_data.get('enable_ai_feedback', False),
+                    "chunk_size": chunk_size,
+                    "dedup_ratio": dedup.stats()["dedup_ratio"],
+                    "opinion_dedup": dedup.stats(),
+                    "llm_cache": llm_response_cache.job_stats(job_id),
+                    "profile": run_profile
                 },
                 "metadata": {
                     "analyzer_version": "AIRISS v4.0",
@@ -737,22 +962,15 @@ class AnalysisService:
                 }
             }
             
-            await self.update_progress(job_id, 95, {"status": "분석 완료"})
+            await self.update_progress(job_id, 95, {"status": "분석 완료"}, force=True)
             
             # 9. 작업 완료 처리
             await self.complete_analysis(job_id, results)
+            logger.info(f"✅ 분석 처리 완료: job_id={job_id}, 총 {accumulator.total}명 분석")
             
-            # 10. EmployeeResult 테이블에 각 직원 결과 저장
-            logger.info(f"🔥 EmployeeResult 저장 함수 호출 전: job_id={job_id}, 결과 개수={len(analysis_results)}")
-            try:
-                await self._save_employee_results(job_id, analysis_results)
-            except Exception as save_error:
-                logger.error(f"❌ EmployeeResult 저장 중 예외 발생: {save_error}")
-                # 저장 실패해도 분석은 성공으로 처리
-            
-            # 11. 분석 작업 정보는 이미 complete_analysis에서 저장됨
-            logger.info(f"✅ 분석 처리 완료: job_id={job_id}, 총 {len(analysis_results)}명 분석")
-            
+        except JobLeaseLost:
+            # 다른 인스턴스가 실행 중이므로 실패로 기록하지 않음 (_process_analysis 에서 정리)
+            raise
         except Exception as e:
             import traceback
             logger.error(f"❌ 분석 처리 중 오류: {e}")
@@ -760,70 +978,267 @@ class AnalysisService:
             await self.fail_analysis(job_id, str(e))
     
     async def _save_employee_results(self, job_id: str, analysis_results: list):
-        """분석 결과를 EmployeeResult 테이블에 저장"""
+        """분석 결과를 EmployeeResult 테이블에 저장 (기존 결과 교체)"""
+        await self._save_employee_results_chunk(job_id, analysis_results, replace_existing=True)
+    
+    async def _save_employee_results_chunk(self, job_id: str, analysis_results: list,
+                                           replace_existing: bool = False,
+                                           checkpoint: Optional[Dict[str, int]] = None,
+                                           first_row: Optional[int] = None) -> Optional[int]:
+        """
+        분석 결과 청크를 EmployeeResult 테이블에 일괄 저장
+        
+        Args:
+            replace_existing: True면 job_id 기존 결과 삭제 후 저장
+            checkpoint: {"processed", "failed"} - 같은 트랜잭션에서 작업 임대를 확인·연장하고 Job 체크포인트(처리 행 수) 갱신
+            first_row: 청크 첫 행의 원본 행 번호 - 있으면 행 번호 기반 ID 로 저장 (결과 스트리밍 순서/재개 기준)
+        
+        Returns:
+            저장된 행 수 (저장 실패 시 None)
+        
+        Raises:
+            JobLeaseLost: checkpoint 저장 시 이 인스턴스가 더 이상 작업 임대를 갖고 있지 않음 (아무것도 저장하지 않음)
+        """
         try:
-            logger.info(f"🔄 EmployeeResult 저장 시작: job_id={job_id}, 결과 개수={len(analysis_results)}")
             from app.db.database import get_db
             from app.models.employee import EmployeeResult
             import uuid
             
-            # 동기 DB 세션 생성
+            rows = [
+                {
+                    'id': result_row_id(job_id, first_row + position) if first_row is not None else str(uuid.uuid4()),
+                    'job_id': job_id,
+                    'uid': result['uid'],
+                    'overall_score': result['score'],
+                    'grade': result['grade'],
+                    'text_score': result.get('text_score', 0),
+                    'quantitative_score': result.get('quantitative_score', 0),
+                    'confidence': result.get('confidence', 0),
+                    'dimension_scores': result.get('dimension_scores', {}),
+                    'ai_feedback': {
+                        'strengths': result.get('ai_feedback', {}).get('strengths', []),
+                        'improvements': result.get('ai_feedback', {}).get('improvements', []),
+                        'overall_comment': result.get('ai_feedback', {}).get('overall_comment', '')
+                    },
+                    'employee_metadata': {
+                        'name': result.get('name', ''),
+                        'department': result.get('department', ''),
+                        'position': result.get('position', '')
+                    }
+                }
+                for position, result in enumerate(analysis_results) if 'error' not in result
+            ]
+            skipped = len(analysis_results) - len(rows)
+            if skipped:
+                logger.warning(f"⚠️ 오류가 있는 결과 {skipped}개 건너뜀")
+            
             def save_results():
+                from app.models.job import Job
+                from app.services.job_lease import renew
+                from app.services.result_stats import record_employee_results, remove_job_stats
+                
                 db = next(get_db())
                 try:
-                    logger.info(f"📊 DB 세션 생성 완료, EmployeeResult 테이블에 저장 시작")
-                    
-                    # 기존 결과 삭제 (job_id 기준)
-                    deleted_count = db.query(EmployeeResult).filter(EmployeeResult.job_id == job_id).delete()
-                    logger.info(f"🗑️ 기존 결과 {deleted_count}개 삭제됨")
-                    
-                    # 새 결과 저장
-                    saved_count = 0
-                    for i, result in enumerate(analysis_results):
-                        if 'error' not in result:
-                            logger.info(f"💾 저장 중 [{i+1}/{len(analysis_results)}]: uid={result.get('uid')}, score={result.get('score')}")
-                            employee_result = EmployeeResult(
-                                id=str(uuid.uuid4()),
-                                job_id=job_id,
-                                uid=result['uid'],
-                                overall_score=result['score'],
-                                grade=result['grade'],
-                                text_score=result.get('text_score', 0),
-                                quantitative_score=result.get('quantitative_score', 0),
-                                confidence=result.get('confidence', 0),
-                                dimension_scores=result.get('dimension_scores', {}),
-                                ai_feedback={
-                                    'strengths': result.get('ai_feedback', {}).get('strengths', []),
-                                    'improvements': result.get('ai_feedback', {}).get('improvements', []),
-                                    'overall_comment': result.get('ai_feedback', {}).get('overall_comment', '')
-                                },
-                                employee_metadata={
-                                    'name': result.get('name', ''),
-                                    'department': result.get('department', ''),
-                                    'position': result.get('position', '')
-                                }
-                            )
-                            db.add(employee_result)
-                            saved_count += 1
-                        else:
-                            logger.warning(f"⚠️ 오류가 있는 결과 건너뜀 [{i+1}]: {result.get('error')}")
-                    
+                    # 소유권 확인/임대 연장을 먼저 - 작업 행을 잠가 커밋 전까지 다른 인스턴스가 가져가지 못함
+                    if checkpoint is not None and not renew(db, job_id, self.instance_id):
+                        raise JobLeaseLost(f"작업 임대를 다른 인스턴스가 가져감: {job_id}")
+                    # 결과와 대시보드 집계는 같은 트랜잭션에서 함께 반영
+                    if replace_existing:
+                        deleted_count = db.query(EmployeeResult).filter(EmployeeResult.job_id == job_id).delete()
+                        remove_job_stats(db, job_id)
+                        if deleted_count:
+                            logger.info(f"🗑️ 기존 결과 {deleted_count}개 삭제됨")
+                    if rows:
+                        db.bulk_insert_mappings(EmployeeResult, rows)
+                        record_employee_results(db, rows)
+                    if checkpoint is not None:
+                        db.query(Job).filter(Job.id == job_id).update({
+                            Job.processed_records: checkpoint["processed"],
+                            Job.failed_records: checkpoint["failed"],
+                            Job.updated_at: datetime.now()
+                        }, synchronize_session=False)
                     db.commit()
-                    logger.info(f"✅ {saved_count}개의 직원 분석 결과를 EmployeeResult 테이블에 저장 완료")
-                    
+                    logger.debug(f"💾 EmployeeResult {len(rows)}개 저장: job_id={job_id}")
+                    return len(rows)
+                except JobLeaseLost:
+                    db.rollback()
+                    raise
                 except Exception as e:
                     db.rollback()
                     logger.error(f"❌ EmployeeResult 저장 오류: {e}")
+                    return None
                 finally:
                     db.close()
             
-            # 동기 함수를 비동기로 실행 - Python 3.9 호환
-            import asyncio
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, save_results)
+            saved = await asyncio.to_thread(save_results)
+            if saved is not None:
+                result_stream_notifier.notify(job_id)
+                bump_data_version(f"results saved: {job_id}")
+            return saved
             
+        except JobLeaseLost:
+            raise
         except Exception as e:
             logger.error(f"❌ EmployeeResult 저장 중 오류: {e}")
+            return None
+    
+    def _load_employee_results(self, job_id: str, limit: Optional[int] = None) -> list:
+        """EmployeeResult 테이블에서 작업 결과를 분석 결과 형식으로 조회 (limit 없으면 전체)"""
+        from app.models.employee import EmployeeResult
+        
+        db = self._get_db()
+        try:
+            query = db.query(EmployeeResult).filter(EmployeeResult.job_id == job_id).order_by(EmployeeResult.id)
+            if limit is not None:
+                query = query.limit(limit)
+            records = query.yield_per(1000)
+            return [
+                {
+                    "uid": record.uid,
+                    "name": (record.employee_metadata or {}).get('name', ''),
+                    "department": (record.employee_metadata or {}).get('department', ''),
+                    "position": (record.employee_metadata or {}).get('position', ''),
+                    "score": record.overall_score,
+                    "grade": record.grade,
+                    "confidence": record.confidence,
+                    "text_score": record.text_score,
+                    "quantitative_score": record.quantitative_score,
+                    "dimension_scores": record.dimension_scores or {},
+                    "ai_feedback": record.ai_feedback or {}
+                }
+                for record in records
+            ]
+        finally:
+            db.close()
+    
+    def _restore_checkpoint(self, job_id: str, accumulator) -> int:
+        """Job 체크포인트와 저장된 결과로 집계 상태를 복원하고 재개할 행 번호 반환"""
+        from sqlalchemy import func
+        from app.models.employee import EmployeeResult
+        from app.models.job import Job
+        
+        db = self._get_db()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            cursor = int(job.processed_records or 0) if job else 0
+            failed = int(job.failed_records or 0) if job else 0
+            
+            successful, score_sum = db.query(
+                func.count(EmployeeResult.id), func.coalesce(func.sum(EmployeeResult.overall_score), 0.0)
+            ).filter(EmployeeResult.job_id == job_id).one()
+            grade_distribution = dict(
+                db.query(EmployeeResult.grade, func.count(EmployeeResult.id))
+                .filter(EmployeeResult.job_id == job_id)
+                .group_by(EmployeeResult.grade)
+                .all()
+            )
+        finally:
+            db.close()
+        
+        accumulator.restore(
+            total=successful + failed,
+            successful=successful,
+            score_sum=float(score_sum),
+            grade_distribution=grade_distribution,
+            inline_results=self._load_employee_results(job_id, limit=accumulator.inline_limit)
+        )
+        return cursor
+    
+    async def resume_analysis(self, job_id: str, stale_seconds: Optional[float] = None) -> bool:
+        """
+        중단된 작업을 마지막 체크포인트부터 재개 (작업이 없거나 이미 끝났거나 다른 인스턴스가 실행 중이면 False)
+        
+        작업 임대가 만료된 경우에만 조건부 UPDATE 로 임대를 가져와 재개하므로 여러 인스턴스 중 한 곳만 성공합니다.
+        체크포인트 이전 행은 다시 분석하지 않고, 체크포인트 이후 행의 LLM 피드백은 이 인스턴스의 로컬
+        LLM 응답 캐시에 남아 있는 것만 재사용합니다 (_process_analysis 참고).
+        """
+        from app.models.job import Job
+        from app.services.job_lease import claim
+        
+        running = self._job_tasks.get(job_id)
+        if running is not None and not running.done():
+            logger.info(f"⏭️ 이미 이 프로세스에서 실행 중인 작업: {job_id}")
+            return False
+        
+        stale_seconds = RESUME_STALE_SECONDS if stale_seconds is None else stale_seconds
+        
+        def claim_job():
+            db = self._get_db()
+            try:
+                job = db.query(Job).filter(Job.id == job_id).first()
+                if not job or job.status not in RESUMABLE_JOB_STATUSES or not job.job_data:
+                    return None
+                if not claim(db, job_id, self.instance_id, RESUMABLE_JOB_STATUSES, stale_seconds):
+                    logger.info(f"⏭️ 다른 인스턴스가 임대 중인 작업: {job_id}")
+                    return None
+                return json.loads(job.job_data), job.processed_records or 0
+            finally:
+                db.close()
+        
+        claimed = await asyncio.to_thread(claim_job)
+        if claimed is None:
+            return False
+        job_data, cursor = claimed
+        
+        self.active_jobs[job_id] = {
+            'status': 'processing',
+            'start_time': datetime.now(),
+            'data': job_data,
+            'progress': 0,
+            'resumed_from': cursor
+        }
+        self._start_job_task(job_id, self._process_analysis(job_id, job_data, resume=True))
+        
+        if self.websocket_manager:
+            await self.websocket_manager.send_alert(
+                "info",
+                f"분석 재개: {job_id}",
+                {"job_id": job_id, "resumed_from": cursor}
+            )
+        logger.info(f"♻️ 분석 재개 예약: job_id={job_id}, 체크포인트={cursor}행")
+        return True
+    
+    async def recover_incomplete_jobs(self, stale_seconds: Optional[float] = None) -> list:
+        """
+        서버 재시작 등으로 중단된 분석 작업을 찾아 체크포인트부터 재개
+        
+        실행 중인 인스턴스는 하트비트로 임대를 연장하므로 임대가 만료된 작업(임대 도입 전 작업은
+        stale_seconds 동안 갱신이 없던 작업)만 대상이 되며, resume_analysis 의 조건부 임대 획득으로
+        한 인스턴스만 재개합니다.
+        """
+        from app.services.job_lease import claimable_job_ids
+        
+        stale_seconds = RESUME_STALE_SECONDS if stale_seconds is None else stale_seconds
+        
+        def find_claimable_jobs() -> list:
+            db = self._get_db()
+            try:
+                return claimable_job_ids(db, RESUMABLE_JOB_STATUSES, stale_seconds)
+            finally:
+                db.close()
+        
+        try:
+            candidates = await asyncio.to_thread(find_claimable_jobs)
+        except Exception as e:
+            logger.error(f"❌ 중단된 작업 조회 실패: {e}")
+            return []
+        
+        resumed = []
+        for job_id in candidates:
+            try:
+                if await self.resume_analysis(job_id, stale_seconds=stale_seconds):
+                    resumed.append(job_id)
+            except Exception as e:
+                logger.error(f"❌ 작업 재개 실패 ({job_id}): {e}")
+        if resumed:
+            logger.info(f"♻️ 중단된 분석 작업 {len(resumed)}개 재개")
+        return resumed
+    
+    async def run_recovery_loop(self, interval: float = RESUME_SWEEP_SECONDS):
+        """중단된 작업을 주기적으로 찾아 재개 (재시작 직후에는 아직 stale 이 아닌 작업도 이후 주기에 재개됨)"""
+        while True:
+            await self.recover_incomplete_jobs()
+            await asyncio.sleep(interval)
     
     def _extract_strengths(self, ai_feedback_data: dict) -> list:
         """펼드백에서 강점 추출"""
@@ -938,9 +1353,11 @@ class AnalysisService:
                 logger.warning(f"작업 {job_id}가 아직 완료되지 않았습니다: {job_info['status']}")
                 return None
             
-            # 3. 결과 데이터 가져오기
+            # 3. 결과 데이터 가져오기 (작업 JSON에 일부만 보관된 경우 EmployeeResult 테이블에서 전체 조회)
             results = job_info.get('results', {})
             data = results.get('data', [])
+            if results.get('summary', {}).get('results_truncated'):
+                data = await asyncio.to_thread(self._load_employee_results, job_id)
             
             if not data:
                 logger.warning(f"job_id {job_id}에 대한 분석 결과 데이터가 없습니다")
@@ -1031,4 +1448,18 @@ class AnalysisService:
     def _get_db(self):
         """데이터베이스 세션 반환"""
         from app.db.database import get_db
-        return next(get_db())
\ No newline at end of file
+        return next(get_db())
+
+
+# 프로세스 공용 분석 서비스 (API 라우터와 작업 복구가 같은 인스턴스를 사용)
+_shared_service: Optional[AnalysisService] = None
+
+
+def get_shared_analysis_service(websocket_manager=None) -> AnalysisService:
+    """공용 AnalysisService 반환 (처음 호출 시 생성)"""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = AnalysisService(websocket_manager)
+    elif websocket_manager is not None and _shared_service.websocket_manager is None:
+        _shared_service.websocket_manager = websocket_manager
+    return _shared_service
@@ -4,21 +4,40 @@
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+import io
 import json
+import uuid
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, and_, or_
+from sqlalchemy import JSON, Text, cast, desc, func, and_, or_, text
 from app.db.database import SessionLocal
 from app.models.analysis_result import AnalysisResultModel, AnalysisJobModel, AnalysisStatsModel
+from app.models.result_stats import AnalysisResultStats
+from app.services.result_stats import (
+    HISTOGRAM_BIN_WIDTH, add_analysis_row, analysis_extremes, apply_stats_deltas, ensure_stats, merge_stats,
+    stats_mean
+)
+from app.utils.response_cache import FINISHED_JOB_STATUSES, bump_data_version
+from app.utils.text_search import highlight_snippet, like_pattern, search_terms
 
 logger = logging.getLogger(__name__)
 
+BULK_LOOKUP_SIZE = 500  # max uids per IN clause when looking up existing results
+
+# Result columns that feed the dashboard aggregates (analysis_result_stats)
+STATS_SOURCE_COLUMNS = ("file_id", "ok_grade", "hybrid_score", "created_at")
+
+# Columns covered by full-text search (pg_trgm GIN indexes on PostgreSQL)
+SEARCH_TEXT_COLUMNS = ("opinion", "ai_strengths", "ai_weaknesses", "ai_feedback")
+
 class PostgreSQLAnalysisStorageService:
     """PostgreSQL-only Analysis Storage Service - Complete Neon DB Integration"""
     
     def __init__(self):
         self.db_session_factory = SessionLocal
         self.connection_type = "postgresql"  # Default to PostgreSQL
+        self._search_indexes_checked = False
+        self._trigram_available = False
             
         logger.info(f"PostgreSQL Analysis Storage Service initialized")
     
@@ -42,13 +61,19 @@ class PostgreSQLAnalysisStorageService:
                 )
             ).first()
             
+            deltas = {}
             if existing:
-                # Update existing result
+                # Update existing result (aggregates: remove the old values, add the new ones)
+                add_analysis_row(deltas, {name: getattr(existing, name) for name in STATS_SOURCE_COLUMNS}, sign=-1)
                 for key, value in filtered_data.items():
                     if hasattr(existing, key) and key not in ['id', 'analysis_id', 'created_at']:
                         setattr(existing, key, value)
                 existing.updated_at = datetime.now()
+                add_analysis_row(deltas, {name: getattr(existing, name) for name in STATS_SOURCE_COLUMNS})
+                db.flush()
+                apply_stats_deltas(db, AnalysisResultStats, deltas, analysis_extremes(db))
                 db.commit()
+                bump_data_version("analysis result updated")
                 
                 logger.info(f"Analysis result updated: {existing.analysis_id}")
                 return existing.analysis_id
@@ -64,9 +89,13 @@ class PostgreSQLAnalysisStorageService:
                     if k not in filtered_data:
                         filtered_data[k] = None
                 
+                filtered_data.setdefault('created_at', datetime.now())
                 new_result = AnalysisResultModel(**filtered_data)
                 db.add(new_result)
+                add_analysis_row(deltas, filtered_data)
+                apply_stats_deltas(db, AnalysisResultStats, deltas)
                 db.commit()
+                bump_data_version("analysis result saved")
                 db.refresh(new_result)
                 
                 logger.info(f"Analysis result saved to PostgreSQL: {new_result.analysis_id}")
@@ -79,6 +108,105 @@ class PostgreSQLAnalysisStorageService:
         finally:
             db.close()
     
+    def save_analysis_results_bulk(self, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Save many analysis results in one transaction (same upsert rule as save_analysis_result)
+        
+        Rows that already exist for the same (uid, file_id) are updated in place and keep their
+        analysis_id; new rows are inserted with COPY on PostgreSQL and bulk_insert_mappings elsewhere.
+        """
+        model_keys = set(c.name for c in AnalysisResultModel.__table__.columns)
+        pending: Dict[tuple, Dict[str, Any]] = {}
+        now = datetime.now()
+        for row in rows:
+            filtered = {k: v for k, v in row.items() if k in model_keys}
+            filtered.setdefault('analysis_id', str(uuid.uuid4()))
+            filtered.setdefault('created_at', now)
+            for k in ["ai_strengths", "ai_weaknesses", "ai_feedback", "ai_recommendations"]:
+                filtered.setdefault(k, None)
+            key = (filtered.get('uid'), filtered.get('file_id'))
+            if key in pending:
+                # 같은 배치 안의 중복은 마지막 결과로 (먼저 받은 analysis_id 유지)
+                filtered['analysis_id'] = pending[key]['analysis_id']
+            pending[key] = filtered
+        if not pending:
+            return {"inserted": 0, "updated": 0}
+        
+        db = self._get_db_session()
+        try:
+            existing: Dict[tuple, Any] = {}
+            file_ids = sorted({file_id for _, file_id in pending}, key=str)
+            uids = sorted({uid for uid, _ in pending}, key=str)
+            stats_columns = [getattr(AnalysisResultModel, name) for name in STATS_SOURCE_COLUMNS]
+            for start in range(0, len(uids), BULK_LOOKUP_SIZE):
+                matches = db.query(AnalysisResultModel.id, AnalysisResultModel.uid, *stats_columns)\
+                    .filter(AnalysisResultModel.file_id.in_(file_ids),
+                            AnalysisResultModel.uid.in_(uids[start:start + BULK_LOOKUP_SIZE]))\
+                    .all()
+                existing.update({(match.uid, match.file_id): match for match in matches})
+            
+            updates = [
+                {**{k: v for k, v in data.items() if k not in ('analysis_id', 'created_at')},
+                 'id': existing[key].id, 'updated_at': now}
+                for key, data in pending.items() if key in existing
+            ]
+            inserts = [data for key, data in pending.items() if key not in existing]
+            
+            # Dashboard aggregates change in the same transaction as the rows
+            deltas = {}
+            for key, data in pending.items():
+                old = existing.get(key)
+                if old is not None:
+                    old_values = {name: getattr(old, name) for name in STATS_SOURCE_COLUMNS}
+                    add_analysis_row(deltas, old_values, sign=-1)
+                    add_analysis_row(deltas, {**old_values, **{k: v for k, v in data.items()
+                                                               if k in STATS_SOURCE_COLUMNS and k != 'created_at'}})
+                else:
+                    add_analysis_row(deltas, data)
+            
+            if updates:
+                db.bulk_update_mappings(AnalysisResultModel, updates)
+            if inserts:
+                if db.get_bind().dialect.name == "postgresql":
+                    self._copy_insert(db, inserts)
+                else:
+                    db.bulk_insert_mappings(AnalysisResultModel, inserts)
+            apply_stats_deltas(db, AnalysisResultStats, deltas, analysis_extremes(db))
+            db.commit()
+            bump_data_version("analysis results bulk saved")
+            return {"inserted": len(inserts), "updated": len(updates)}
+        except Exception as e:
+            logger.error(f"Failed to bulk save analysis results: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def _copy_insert(self, db: Session, rows: List[Dict[str, Any]]):
+        """COPY FROM STDIN insert within the session's transaction (PostgreSQL, psycopg2)"""
+        table = AnalysisResultModel.__table__
+        columns = [c.name for c in table.columns if c.name not in ('id', 'updated_at')]
+        json_columns = {c.name for c in table.columns if isinstance(c.type, JSON)}
+        
+        def encode(name: str, value: Any) -> str:
+            if value is None:
+                return r"\N"
+            if name in json_columns:
+                value = json.dumps(value, ensure_ascii=False, default=str)
+            return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+        
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(encode(name, row.get(name)) for name in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+        
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
+    
     def get_analysis_results(self, 
                            file_id: Optional[str] = None,
                            uid: Optional[str] = None,
@@ -144,6 +272,8 @@ class PostgreSQLAnalysisStorageService:
                     if hasattr(existing, key) and key not in ['id', 'started_at']:
                         setattr(existing, key, value)
                 db.commit()
+                if job_data.get('status') in FINISHED_JOB_STATUSES:
+                    bump_data_version(f"analysis job {job_data['status']}")
                 return existing.job_id
             else:
                 # Create new job
@@ -189,48 +319,29 @@ class PostgreSQLAnalysisStorageService:
             db.close()
     
     def get_analysis_statistics(self, days: int = 30) -> Dict[str, Any]:
-        """Get analysis statistics for specified period"""
+        """Get analysis statistics for specified period (read from the file x day x grade aggregates)"""
         db = self._get_db_session()
         
         try:
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=days)
             
-            # Basic statistics
-            total_analyses = db.query(AnalysisResultModel)\
-                              .filter(func.date(AnalysisResultModel.created_at) >= start_date)\
-                              .count()
-            
-            avg_score = db.query(func.avg(AnalysisResultModel.hybrid_score))\
-                         .filter(func.date(AnalysisResultModel.created_at) >= start_date)\
-                         .scalar() or 0
-            
-            # Grade distribution
-            grade_distribution = db.query(
-                AnalysisResultModel.ok_grade,
-                func.count(AnalysisResultModel.ok_grade)
-            ).filter(
-                func.date(AnalysisResultModel.created_at) >= start_date
-            ).group_by(AnalysisResultModel.ok_grade).all()
-            
-            # Daily counts
-            daily_counts = db.query(
-                func.date(AnalysisResultModel.created_at).label('date'),
-                func.count(AnalysisResultModel.id).label('count')
-            ).filter(
-                func.date(AnalysisResultModel.created_at) >= start_date
-            ).group_by(
-                func.date(AnalysisResultModel.created_at)
-            ).order_by('date').all()
+            ensure_stats(db, AnalysisResultStats)
+            rows = db.query(AnalysisResultStats).filter(AnalysisResultStats.day >= str(start_date)).all()
+            merged = merge_stats(rows)
+            
+            daily_counts: Dict[str, int] = {}
+            for row in rows:
+                daily_counts[row.day] = daily_counts.get(row.day, 0) + row.count
             
             return {
                 "period": f"{start_date} to {end_date}",
-                "total_analyses": total_analyses,
-                "average_score": round(avg_score, 2),
-                "grade_distribution": {grade: count for grade, count in grade_distribution if grade},
+                "total_analyses": merged["count"],
+                "average_score": round(stats_mean(merged), 2),
+                "grade_distribution": {grade: count for grade, count in merged["grades"].items() if grade},
                 "daily_counts": [
-                    {"date": str(date), "count": count} 
-                    for date, count in daily_counts
+                    {"date": day, "count": count}
+                    for day, count in sorted(daily_counts.items())
                 ],
                 "storage_mode": "postgresql",
                 "database_type": self.connection_type
@@ -246,36 +357,88 @@ class PostgreSQLAnalysisStorageService:
         finally:
             db.close()
     
+    def ensure_search_indexes(self, db: Session) -> bool:
+        """
+        Create pg_trgm GIN indexes for full-text search once per process (PostgreSQL only)
+        
+        Trigram indexes serve ILIKE '%term%' lookups, which also match Korean words inside
+        longer inflected forms (tsvector word splitting would not). Returns whether
+        pg_trgm is available for ranking.
+        """
+        if self._search_indexes_checked:
+            return self._trigram_available
+        self._search_indexes_checked = True
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+        
+        table = AnalysisResultModel.__tablename__
+        try:
+            db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for column in SEARCH_TEXT_COLUMNS:
+                db.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+                    f"ON {table} USING gin (({column}::text) gin_trgm_ops)"
+                ))
+            db.commit()
+            self._trigram_available = True
+            logger.info("Full-text search trigram indexes ready")
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"pg_trgm indexes unavailable, text search falls back to unindexed ILIKE: {e}")
+        return self._trigram_available
+    
     def search_analysis_results(self, 
                               search_term: str,
                               search_type: str = "opinion",
                               limit: int = 50) -> List[Dict[str, Any]]:
-        """Search analysis results"""
+        """
+        Search analysis results
+        
+        search_type "text" searches opinion and AI strengths/weaknesses/feedback, "all" adds uid
+        and filename. Every whitespace-separated term must match. Text matches are ranked by
+        trigram word similarity on PostgreSQL (newest first elsewhere) and carry a highlighted
+        "snippet".
+        """
         db = self._get_db_session()
         
         try:
-            query = db.query(AnalysisResultModel)
+            terms = search_terms(search_term)
+            if not terms:
+                return []
+            ranked = self.ensure_search_indexes(db)
+            
+            text_columns = {
+                "opinion": ("opinion",),
+                "text": SEARCH_TEXT_COLUMNS,
+                "all": SEARCH_TEXT_COLUMNS + ("uid", "filename"),
+            }.get(search_type, (search_type,) if search_type in ("uid", "filename") else None)
+            if text_columns is None:
+                return []
+            columns = [cast(getattr(AnalysisResultModel, name), Text) for name in text_columns]
             
-            if search_type == "opinion":
-                query = query.filter(AnalysisResultModel.opinion.contains(search_term))
-            elif search_type == "uid":
-                query = query.filter(AnalysisResultModel.uid.contains(search_term))
-            elif search_type == "filename":
-                query = query.filter(AnalysisResultModel.filename.contains(search_term))
-            elif search_type == "all":
-                query = query.filter(
-                    or_(
-                        AnalysisResultModel.opinion.contains(search_term),
-                        AnalysisResultModel.uid.contains(search_term),
-                        AnalysisResultModel.filename.contains(search_term)
-                    )
+            query = db.query(AnalysisResultModel)
+            for term in terms:
+                pattern = like_pattern(term)
+                query = query.filter(or_(*(column.ilike(pattern, escape="\\") for column in columns)))
+            
+            if ranked:
+                relevance = sum(
+                    func.coalesce(func.word_similarity(term, column), 0)
+                    for term in terms for column in columns
                 )
-            
-            results = query.order_by(desc(AnalysisResultModel.created_at))\
-                          .limit(limit)\
-                          .all()
-            
-            return [self._model_to_dict(result) for result in results]
+                query = query.order_by(desc(relevance), desc(AnalysisResultModel.created_at))
+            else:
+                query = query.order_by(desc(AnalysisResultModel.created_at))
+            
+            results = []
+            for model in query.limit(limit).all():
+                result = self._model_to_dict(model)
+                result["snippet"] = next(filter(None, (
+                    highlight_snippet(value if isinstance(value, str) else json.dumps(value, ensure_ascii=False), terms)
+                    for value in (result.get(name) for name in text_columns) if value
+                )), None)
+                results.append(result)
+            return results
             
         except Exception as e:
             logger.error(f"Failed to search analysis results: {e}")
@@ -285,13 +448,15 @@ class PostgreSQLAnalysisStorageService:
     
     def get_score_distribution(self, 
                              score_type: str = "hybrid_score") -> Dict[str, Any]:
-        """Get score distribution analysis"""
+        """Get score distribution analysis (hybrid_score is read from the aggregates)"""
         db = self._get_db_session()
         
         try:
             score_column = getattr(AnalysisResultModel, score_type, None)
             if not score_column:
                 return {"error": f"Invalid score type: {score_type}"}
+            if score_type == "hybrid_score":
+                return self._aggregated_score_distribution(db)
             
             # Score range distribution (10-point intervals)
             distribution = db.query(
@@ -331,18 +496,53 @@ class PostgreSQLAnalysisStorageService:
         finally:
             db.close()
     
+    def _aggregated_score_distribution(self, db: Session) -> Dict[str, Any]:
+        """hybrid_score distribution from analysis_result_stats (10-point ranges merged from 5-point bins)"""
+        ensure_stats(db, AnalysisResultStats)
+        merged = merge_stats(db.query(AnalysisResultStats).all())
+        
+        distribution: Dict[int, int] = {}
+        for index, count in enumerate(merged["histogram"]):
+            if count:
+                score_range = index * HISTOGRAM_BIN_WIDTH // 10 * 10
+                distribution[score_range] = distribution.get(score_range, 0) + count
+        
+        return {
+            "score_type": "hybrid_score",
+            "distribution": {
+                f"{score_range}-{score_range + 9}": count
+                for score_range, count in sorted(distribution.items())
+            },
+            "statistics": {
+                "min": float(merged["score_min"]) if merged["score_min"] else 0,
+                "max": float(merged["score_max"]) if merged["score_max"] else 0,
+                "average": round(stats_mean(merged), 2),
+                "total_count": merged["count"]
+            },
+            "storage_mode": "postgresql",
+            "database_type": self.connection_type
+        }
+    
     def cleanup_old_results(self, retention_days: int = 365):
         """Clean up old analysis results"""
         db = self._get_db_session()
         
         try:
             cutoff_date = datetime.now() - timedelta(days=retention_days)
+            old_results = db.query(AnalysisResultModel)\
+                           .filter(AnalysisResultModel.created_at < cutoff_date)
+            
+            deltas = {}
+            stats_columns = [getattr(AnalysisResultModel, name) for name in STATS_SOURCE_COLUMNS]
+            for row in old_results.with_entities(*stats_columns).yield_per(1000):
+                add_analysis_row(deltas, row._asdict(), sign=-1)
             
-            deleted_count = db.query(AnalysisResultModel)\
-                             .filter(AnalysisResultModel.created_at < cutoff_date)\
-                             .delete()
+            deleted_count = old_results.delete(synchronize_session=False)
+            apply_stats_deltas(db, AnalysisResultStats, deltas, analysis_extremes(db))
             
             db.commit()
+            if deleted_count:
+                bump_data_version("old analysis results cleaned up")
             logger.info(f"Cleaned up {deleted_count} old analysis results")
             return deleted_count
             
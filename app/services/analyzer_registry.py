@@ -0,0 +1,200 @@
+# app/services/analyzer_registry.py
+"""
+AIRISS 분석기 레지스트리
+프로세스 단위로 분석기 구성요소를 1회만 로드하여 작업/요청 간 공유
+
+- 무거운 구성요소(BERT 모델, 편향 탐지기, 저장 서비스 점검)는 첫 사용 시 또는
+  앱 시작 시 워밍업에서 한 번만 로드됩니다.
+- health() 로 어떤 구성요소가 로드되었고 각각 로드에 얼마나 걸렸는지 확인할 수 있습니다.
+- 로드 실패는 캐시하지 않습니다. 필수 구성요소(분석기)는 예외를 그대로 올리고 다음 호출에서
+  다시 시도하며, 선택 구성요소(편향 탐지기, 저장 서비스, BERT)는 None 을 반환하되
+  AIRISS_ANALYZER_RETRY_SECONDS 동안만 재시도를 미룹니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 선택 구성요소 로드 실패 후 재시도까지 대기 시간 (초)
+FAILURE_RETRY_SECONDS = float(os.getenv("AIRISS_ANALYZER_RETRY_SECONDS", "30"))
+
+# 워밍업 시 로드 순서 (health 출력 순서와 동일)
+COMPONENT_ORDER = (
+    "bias_detector",
+    "storage_service",
+    "text_analyzer",
+    "bert_model",
+    "quantitative_analyzer",
+    "hybrid_analyzer",
+)
+
+
+class AnalyzerRegistry:
+    """분석기 구성요소 지연 로드 및 공유 레지스트리"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._components: Dict[str, Any] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._retry_at: Dict[str, float] = {}  # 선택 구성요소 실패 -> 재시도 가능 시각
+        self.warmed_up_at: Optional[str] = None
+
+    def _load(self, name: str, factory: Callable[[], Any], required: bool = False) -> Any:
+        """
+        구성요소를 1회만 생성하고 로드 시간/결과를 기록
+
+        성공한 결과만 캐시합니다. 실패 시 required 구성요소는 예외를 올리고(다음 호출에서 재시도),
+        선택 구성요소는 None 을 반환하며 FAILURE_RETRY_SECONDS 뒤 다시 시도합니다.
+        """
+        if name in self._components:
+            return self._components[name]
+
+        with self._lock:
+            if name in self._components:
+                return self._components[name]
+            if not required and time.monotonic() < self._retry_at.get(name, 0.0):
+                return None
+
+            started = time.perf_counter()
+            try:
+                component = factory()
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                self._status[name] = {
+                    "loaded": False,
+                    "load_seconds": round(elapsed, 3),
+                    "loaded_at": datetime.now().isoformat(),
+                    "error": str(e),
+                }
+                logger.warning(f"⚠️ 분석기 구성요소 로드 실패 ({name}): {e}")
+                if required:
+                    raise
+                self._retry_at[name] = time.monotonic() + FAILURE_RETRY_SECONDS
+                return None
+            elapsed = time.perf_counter() - started
+
+            self._components[name] = component
+            self._retry_at.pop(name, None)
+            self._status[name] = {
+                "loaded": component is not None and component is not False,
+                "load_seconds": round(elapsed, 3),
+                "loaded_at": datetime.now().isoformat(),
+                "error": None,
+            }
+            logger.info(f"📦 분석기 구성요소 로드: {name} ({elapsed:.3f}s)")
+            return component
+
+    def get_bias_detector(self):
+        """공유 편향 탐지기 (모듈 없으면 None)"""
+        def factory():
+            from app.services.bias_detection import BiasDetector
+            return BiasDetector()
+        return self._load("bias_detector", factory)
+
+    def get_storage_service(self):
+        """가용성 점검을 마친 저장 서비스 (사용 불가 시 None)"""
+        def factory():
+            from app.services.analysis_storage_service import storage_service
+            if hasattr(storage_service, 'is_available') and storage_service.is_available():
+                return storage_service
+            logger.warning("⚠️ 저장 서비스가 비활성화 상태")
+            return None
+        return self._load("storage_service", factory)
+
+    def get_text_analyzer(self):
+        """공유 텍스트 분석기"""
+        def factory():
+            from app.services.text_analyzer import AIRISSTextAnalyzer
+            return AIRISSTextAnalyzer(bias_detector=self.get_bias_detector())
+        return self._load("text_analyzer", factory, required=True)
+
+    def get_quantitative_analyzer(self):
+        """공유 정량 분석기"""
+        def factory():
+            from app.services.quantitative_analyzer import QuantitativeAnalyzer
+            return QuantitativeAnalyzer()
+        return self._load("quantitative_analyzer", factory, required=True)
+
+    def get_hybrid_analyzer(self):
+        """공유 하이브리드 분석기"""
+        def factory():
+            from app.services.hybrid_analyzer import AIRISSHybridAnalyzer
+            bias_detector = self.get_bias_detector()
+            storage_service = self.get_storage_service()
+            analyzer = AIRISSHybridAnalyzer(
+                text_analyzer=self.get_text_analyzer(),
+                quantitative_analyzer=self.get_quantitative_analyzer(),
+                bias_detector=bias_detector,
+                storage_service=storage_service
+            )
+            return analyzer
+        return self._load("hybrid_analyzer", factory, required=True)
+
+    def load_bert_model(self) -> bool:
+        """텍스트 분석기의 BERT 모델 로드 (워밍업 전용, 실패해도 키워드 분석은 동작)"""
+        def factory():
+            return self.get_text_analyzer().load_bert_model() or None
+        return self._load("bert_model", factory) is not None
+
+    def warmup(self, load_bert: bool = True) -> Dict[str, Any]:
+        """앱 시작 시 모든 구성요소를 미리 로드"""
+        logger.info("🔥 분석기 워밍업 시작")
+        started = time.perf_counter()
+
+        loaders = [self.get_bias_detector, self.get_storage_service, self.get_text_analyzer]
+        if load_bert:
+            loaders.append(self.load_bert_model)
+        loaders += [self.get_quantitative_analyzer, self.get_hybrid_analyzer]
+        for loader in loaders:
+            try:
+                loader()
+            except Exception:
+                pass  # 실패는 health() 에 기록되고 첫 분석 요청에서 다시 로드
+
+        self.warmed_up_at = datetime.now().isoformat()
+        logger.info(f"✅ 분석기 워밍업 완료 ({time.perf_counter() - started:.3f}s)")
+        return self.health()
+
+    def health(self) -> Dict[str, Any]:
+        """로드된 구성요소와 구성요소별 로드 시간"""
+        with self._lock:
+            components = {
+                name: dict(self._status[name]) if name in self._status else {
+                    "loaded": False,
+                    "load_seconds": None,
+                    "loaded_at": None,
+                    "error": None,
+                }
+                for name in COMPONENT_ORDER
+            }
+        hybrid_ready = components["hybrid_analyzer"]["loaded"]
+        return {
+            "status": "ready" if hybrid_ready else "cold",
+            "warmed_up_at": self.warmed_up_at,
+            "total_load_seconds": round(
+                sum(c["load_seconds"] or 0 for c in components.values()), 3
+            ),
+            "components": components,
+        }
+
+    def reset(self):
+        """캐시된 구성요소 폐기 (다음 요청 시 다시 로드)"""
+        with self._lock:
+            self._components.clear()
+            self._status.clear()
+            self._retry_at.clear()
+            self.warmed_up_at = None
+
+
+# 전역 레지스트리 인스턴스
+analyzer_registry = AnalyzerRegistry()
+
+
+def get_hybrid_analyzer():
+    """프로세스 공용 하이브리드 분석기 반환"""
+    return analyzer_registry.get_hybrid_analyzer()
@@ -5,7 +5,7 @@ Employee AI Analysis Service Layer
 import logging
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, literal_column
 from datetime import datetime
 import json
 import pandas as pd
@@ -14,6 +14,7 @@ from pathlib import Path
 from app.models.file import File
 from app.models.analysis_result import AnalysisResultModel as AnalysisResult, AnalysisJobModel
 from app.models.employee import EmployeeResult
+from app.utils.pagination import count_cache, decode_cursor, encode_cursor, keyset_order_by, keyset_segments
 from app.schemas.employee import (
     EmployeeAIAnalysis,
     EmployeeAIAnalysisSummary,
@@ -28,6 +29,14 @@ from app.schemas.employee import (
 
 logger = logging.getLogger(__name__)
 
+# 직원 목록 정렬 키 - (정렬 식, 고유 ID) 키셋 페이지네이션에 사용
+# ai_score 는 화면 점수와 같은 식 (hybrid_score → text_score → 0), name 은 직원 ID 기준
+# (상수를 SQL 에 그대로 넣어야 모델의 식 인덱스와 일치함)
+EMPLOYEE_LIST_SORT_KEYS = {
+    "ai_score": func.coalesce(AnalysisResult.hybrid_score, AnalysisResult.text_score, literal_column("0")),
+    "name": AnalysisResult.uid,
+}
+
 
 class EmployeeService:
     """직원 AI 분석 서비스"""
@@ -270,24 +279,65 @@ class EmployeeService:
             logger.error(f"직원 AI 분석 조회 실패: {e}")
             return None
     
+    def _employee_list_sort(self, sort_options: Dict[str, str]):
+        """(정렬 필드, 내림차순 여부, 커서 정렬 식별자) - 지원하지 않는 필드는 ai_score"""
+        field = sort_options.get("field")
+        field = field if field in EMPLOYEE_LIST_SORT_KEYS else "ai_score"
+        descending = (sort_options.get("order") or "desc").lower() != "asc"
+        return field, descending, f"{field}:{'desc' if descending else 'asc'}"
+    
     def get_employees_ai_analysis_list(
         self,
         filters: Dict[str, Any],
         sort_options: Dict[str, str],
-        pagination: Dict[str, int]
+        pagination: Dict[str, Any]
     ) -> EmployeeAIAnalysisList:
-        """전체 직원 AI 분석 목록 조회 - 초간단 버전"""
+        """
+        전체 직원 AI 분석 목록 조회
+        
+        pagination["cursor"] (이전 응답의 next_cursor) 가 있으면 키셋, 없으면 page 기준으로 조회합니다.
+        잘못된 커서는 InvalidCursorError 를 그대로 발생시킵니다.
+        """
+        keyset = None
+        if pagination.get("cursor"):
+            keyset = decode_cursor(pagination["cursor"], self._employee_list_sort(sort_options)[2], size=2)
+        
         try:
             logger.info("📊 직원 목록 조회 시작")
             
-            # 가장 간단한 방법: analysis_results 테이블에서 직접 조회
+            # analysis_results 테이블에서 직접 조회 - (정렬 키, id) 키셋 페이지네이션
             page = pagination.get("page", 1)
             page_size = pagination.get("page_size", 20)
-            offset = (page - 1) * page_size
+            sort_field, descending, sort_token = self._employee_list_sort(sort_options)
+            sort_column = EMPLOYEE_LIST_SORT_KEYS[sort_field]
             
-            # 기본 쿼리 - 에러 방지를 위해 최소한의 조회
-            results = self.db.query(AnalysisResult).limit(page_size).offset(offset).all()
-            total_count = self.db.query(AnalysisResult).count()
+            query = self.db.query(AnalysisResult, sort_column).order_by(
+                *keyset_order_by(sort_column, AnalysisResult.id, descending)
+            )
+            if keyset:
+                # 커서 위치 다음부터 인덱스를 바로 읽음 (OFFSET 없이 깊은 페이지도 1페이지와 같은 비용)
+                # 같은 정렬값의 나머지 / 다음 값 구간 / NULL 구간(uid 는 NULL 가능)을 페이지가 찰 때까지 순서대로 조회
+                value, last_id = keyset
+                rows = []
+                for segment in keyset_segments(sort_column, AnalysisResult.id, value, last_id, descending):
+                    rows.extend(query.filter(segment).limit(page_size + 1 - len(rows)).all())
+                    if len(rows) > page_size:
+                        break
+            else:
+                rows = query.offset((page - 1) * page_size).limit(page_size + 1).all()
+            
+            has_more = len(rows) > page_size
+            rows = rows[:page_size]
+            results = [row[0] for row in rows]
+            next_cursor = None
+            if has_more and rows:
+                next_cursor = encode_cursor(sort_token, [rows[-1][1], rows[-1][0].id])
+            
+            # 전체 건수는 TTL 캐시 (페이지마다 COUNT 를 다시 세지 않음)
+            total_count = count_cache.get_or_compute(
+                ("employees.ai_analysis_list", str(self.db.get_bind().url)),
+                lambda: self.db.query(func.count(AnalysisResult.id)).scalar() or 0
+            )
             
             logger.info(f"📊 analysis_results에서 {len(results)}개 데이터 조회, 전체: {total_count}")
             
@@ -353,7 +403,9 @@ class EmployeeService:
                 total=total_count,
                 page=page,
                 page_size=page_size,
-                total_pages=(total_count + page_size - 1) // page_size if total_count > 0 else 1
+                total_pages=(total_count + page_size - 1) // page_size if total_count > 0 else 1,
+                next_cursor=next_cursor,
+                has_more=has_more
             )
             
         except Exception as e:
@@ -690,30 +742,30 @@ class EmployeeService:
         self,
         department: Optional[str] = None
     ) -> DashboardStatistics:
-        """대시보드 통계 데이터 조회"""
+        """대시보드 통계 데이터 조회 - 직원 행 대신 작업 x 부서 x 등급 집계(employee_result_stats)만 읽음"""
         try:
-            # EmployeeResult 테이블에서 직접 조회
-            query = self.db.query(EmployeeResult)
+            from app.models.result_stats import EmployeeResultStats
+            from app.services.result_stats import (
+                COMPETENCIES, ensure_stats, histogram_count_at_least, histogram_quantile, merge_stats, stats_mean
+            )
+            
+            ensure_stats(self.db, EmployeeResultStats)
+            query = self.db.query(EmployeeResultStats)
             
             # 부서 필터링
             if department:
-                query = query.filter(func.json_extract(EmployeeResult.employee_metadata, "$.department") == department)
-            
-            employee_results = query.all()
+                query = query.filter(EmployeeResultStats.department == department)
             
-            if not employee_results:
+            rows = query.all()
+            merged = merge_stats(rows)
+            total_employees = merged["count"]
+            if not total_employees:
                 return self._empty_statistics()
-                
-            # 통계 계산
-            total_employees = len(employee_results)
             
-            # 등급 분포
+            # 등급 분포 (등급 없음은 C)
             grade_distribution = {}
-            scores = []
-            for emp_result in employee_results:
-                grade = emp_result.grade or "C"
-                grade_distribution[grade] = grade_distribution.get(grade, 0) + 1
-                scores.append(int(emp_result.overall_score or 0))
+            for grade, count in merged["grades"].items():
+                grade_distribution[grade or "C"] = grade_distribution.get(grade or "C", 0) + count
                 
             # 등급 비율
             grade_percentage = {
@@ -721,44 +773,36 @@ class EmployeeService:
                 for grade, count in grade_distribution.items()
             }
             
-            # 점수 통계
-            average_score = sum(scores) / len(scores) if scores else 0
-            sorted_scores = sorted(scores)
-            median_score = sorted_scores[len(sorted_scores) // 2] if sorted_scores else 0
+            # 점수 통계 (점수 없는 직원은 0점, 중간값은 5점 구간 히스토그램 근사)
+            histogram = list(merged["histogram"])
+            histogram[0] += total_employees - merged["score_count"]
+            average_score = stats_mean(merged) * merged["score_count"] / total_employees
+            median_score = int(histogram_quantile(histogram, 0.5))
             
-            # 점수 구간
+            # 점수 구간 (100점 만점 점수는 모두 0-599 구간)
             score_range = {
-                "900-1000": len([s for s in scores if 900 <= s <= 1000]),
-                "800-899": len([s for s in scores if 800 <= s < 900]),
-                "700-799": len([s for s in scores if 700 <= s < 800]),
-                "600-699": len([s for s in scores if 600 <= s < 700]),
-                "0-599": len([s for s in scores if s < 600])
+                "900-1000": 0,
+                "800-899": 0,
+                "700-799": 0,
+                "600-699": 0,
+                "0-599": total_employees
             }
             
-            # 역량 평균 계산
-            competency_sums = {
-                "실행력": 0, "성장지향": 0, "협업": 0, "고객지향": 0,
-                "전문성": 0, "혁신성": 0, "리더십": 0, "커뮤니케이션": 0
-            }
-            
-            for emp_result in employee_results:
-                dimension_scores = emp_result.dimension_scores or {}
-                for comp in competency_sums.keys():
-                    score = dimension_scores.get(comp, 70)  # 기본값 70
-                    competency_sums[comp] += int(score)
-                    
-            competency_averages = CompetencyScores(
-                **{comp: int(total / total_employees) for comp, total in competency_sums.items()}
-            )
-            
-            # 추천 인재 수 계산
-            talent_count = len([e for e in employee_results if int(e.overall_score or 0) >= 85])
-            promotion_candidates = len([
-                e for e in employee_results
-                if int((e.dimension_scores or {}).get("리더십", 0)) >= 80 and 
-                   int((e.dimension_scores or {}).get("실행력", 0)) >= 80
-            ])
-            risk_employees = len([e for e in employee_results if e.grade in ["C", "D"]])
+            competency_averages = CompetencyScores(**{
+                comp: int(merged["competency_sums"].get(comp, 0) / total_employees) for comp in COMPETENCIES
+            })
+            
+            # 부서별 요약
+            department_stats = {}
+            for row in rows:
+                dept = department_stats.setdefault(row.department or "미지정", {
+                    "count": 0, "score_sum": 0.0, "grades": {}
+                })
+                dept["count"] += row.count
+                dept["score_sum"] += row.score_sum or 0.0
+                dept["grades"][row.grade or "C"] = dept["grades"].get(row.grade or "C", 0) + row.count
+            for dept in department_stats.values():
+                dept["average_score"] = round(dept.pop("score_sum") / dept["count"], 1)
             
             return DashboardStatistics(
                 total_employees=total_employees,
@@ -770,9 +814,10 @@ class EmployeeService:
                 competency_averages=competency_averages,
                 top_strengths=[],  # 실제로는 계산 필요
                 top_improvements=[],  # 실제로는 계산 필요
-                talent_count=talent_count,
-                promotion_candidates=promotion_candidates,
-                risk_employees=risk_employees
+                department_stats=department_stats,
+                talent_count=histogram_count_at_least(histogram, 85),
+                promotion_candidates=merged["promotion_count"],
+                risk_employees=merged["grades"].get("C", 0) + merged["grades"].get("D", 0)
             )
             
         except Exception as e:
@@ -0,0 +1,213 @@
+# app/services/feedback_packing.py
+"""
+AIRISS AI 피드백 다중 직원 묶음 요청 (packing)
+여러 직원의 평가 의견을 한 번의 chat completion 으로 요청하고 JSON 배열 응답을 직원별로 검증
+
+- 묶음 크기는 의견 길이와 모델 컨텍스트/출력 한도에 맞춰 자동 조정
+- 파싱/검증에 실패한 직원은 호출 측에서 단건 요청으로 재시도
+- 로컬 스텁으로 검증할 때는 OPENAI_BASE_URL(직접 호출) 또는 AIRISS_OPENAI_PROXY_URL 을 스텁 주소로 지정
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.services.llm_executor import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 모델별 컨텍스트 토큰 한도 (접두어 일치, 가장 긴 접두어 우선)
+MODEL_CONTEXT_TOKENS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1000000,
+}
+DEFAULT_CONTEXT_TOKENS = 8192
+MAX_COMPLETION_TOKENS = 4096
+
+OUTPUT_TOKENS_PER_EMPLOYEE = 450   # 직원 1명 응답 예상 토큰
+PROMPT_TOKENS_PER_EMPLOYEE = 40    # 직원별 머리말/구분자
+CONTEXT_SAFETY_RATIO = 0.9
+OPINION_CHAR_LIMIT = 1500          # 단건 프롬프트와 동일한 의견 길이 제한
+
+DEFAULT_PACK_SIZE = int(os.getenv("AIRISS_LLM_PACK_SIZE", "1"))  # 1이면 묶음 요청 비활성
+
+packing_counters = {
+    "packs_sent": 0,
+    "employees_packed": 0,
+    "entries_parsed": 0,
+    "entries_fallback": 0,
+    "pack_failures": 0,
+}
+
+PACKED_SYSTEM_PROMPT = (
+    "당신은 OK금융그룹의 수석 HR 전문가입니다. 건설적이고 실행 가능한 피드백을 제공하세요. "
+    "요청된 JSON 배열만 출력하고 다른 설명은 쓰지 마세요."
+)
+
+PACKED_PROMPT_HEADER = """
+아래 직원들의 평가 의견을 각각 AIRISS 8대 영역 기반으로 심층 분석하세요.
+
+8대 영역:
+1. 업무성과 (25%) - 업무 품질, 생산성, 목표 달성
+2. KPI달성 (20%) - 정량적 성과, 지표 달성률
+3. 태도마인드 (15%) - 적극성, 책임감, 성장 의지
+4. 커뮤니케이션 (15%) - 소통 능력, 협력적 대화
+5. 리더십협업 (10%) - 팀워크, 리더십, 영향력
+6. 전문성학습 (8%) - 기술 역량, 학습 속도
+7. 창의혁신 (5%) - 창의성, 변화 주도
+8. 조직적응 (2%) - 조직 문화 적응, 윤리성
+
+직원마다 배열 원소 하나씩, 입력 순서대로 다음 JSON 형식으로 응답하세요:
+[
+  {{
+    "id": 직원 번호(정수),
+    "strengths": ["(영역명) 구체적 행동/성과", "...", "..."],
+    "weaknesses": ["(영역명) 구체적 개선점", "...", "..."],
+    "overall": {{"current_level": "1-2문장", "growth_potential": "1-2문장", "key_advice": "1-2문장"}},
+    "action_plan": ["단기(1개월): 구체적 액션", "중기(3개월): 구체적 목표", "장기(6개월): 기대 성과"]
+  }}
+]
+
+직원 {count}명:
+"""
+
+
+def context_tokens_for(model: str) -> int:
+    """모델 컨텍스트 한도 (모르는 모델은 보수적 기본값)"""
+    matches = [name for name in MODEL_CONTEXT_TOKENS if model.startswith(name)]
+    if not matches:
+        return DEFAULT_CONTEXT_TOKENS
+    return MODEL_CONTEXT_TOKENS[max(matches, key=len)]
+
+
+def plan_feedback_packs(opinions: Sequence[str], model: str, max_pack_size: int) -> List[List[int]]:
+    """
+    입력 순서를 유지하며 묶음 구성 (의견 길이/컨텍스트/출력 한도 내에서 최대한 채움)
+
+    Returns:
+        묶음별 입력 인덱스 목록
+    """
+    if max_pack_size <= 1:
+        return [[i] for i in range(len(opinions))]
+
+    budget = int(context_tokens_for(model) * CONTEXT_SAFETY_RATIO)
+    max_by_output = max(1, MAX_COMPLETION_TOKENS // OUTPUT_TOKENS_PER_EMPLOYEE)
+    pack_limit = min(max_pack_size, max_by_output)
+    header_tokens = estimate_tokens(PACKED_SYSTEM_PROMPT + PACKED_PROMPT_HEADER)
+
+    packs: List[List[int]] = []
+    current: List[int] = []
+    used = header_tokens
+    for index, opinion in enumerate(opinions):
+        cost = (estimate_tokens(str(opinion)[:OPINION_CHAR_LIMIT])
+                + PROMPT_TOKENS_PER_EMPLOYEE + OUTPUT_TOKENS_PER_EMPLOYEE)
+        if current and (len(current) >= pack_limit or used + cost > budget):
+            packs.append(current)
+            current, used = [], header_tokens
+        current.append(index)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def create_packed_prompt(items: Sequence[Dict[str, str]]) -> str:
+    """
+    묶음 프롬프트 생성 (items: [{"uid", "opinion"}], 직원 번호는 1부터)
+
+    직원 UID 는 넣지 않습니다 - 응답 원소가 의견 단위 캐시 키로 저장되어 다른 직원에게도 재사용되므로
+    """
+    lines = [PACKED_PROMPT_HEADER.format(count=len(items))]
+    for number, item in enumerate(items, start=1):
+        lines.append(f"[{number}]")
+        lines.append(f"평가 의견: {str(item['opinion'])[:OPINION_CHAR_LIMIT]}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def packed_completion_tokens(count: int) -> int:
+    """묶음 요청 max_tokens"""
+    return min(MAX_COMPLETION_TOKENS, OUTPUT_TOKENS_PER_EMPLOYEE * count)
+
+
+def _as_text_list(value: Any) -> Optional[List[str]]:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return None
+    items = [str(item).strip() for item in value if str(item).strip()]
+    return items or None
+
+
+def _entry_to_feedback(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """배열 원소 1개를 단건 피드백 형식으로 변환 (필수 항목 누락 시 None)"""
+    strengths = _as_text_list(entry.get("strengths"))
+    weaknesses = _as_text_list(entry.get("weaknesses"))
+    action_plan = _as_text_list(entry.get("action_plan"))
+    overall = entry.get("overall")
+
+    if isinstance(overall, dict):
+        labels = [("current_level", "현재 수준"), ("growth_potential", "성장 잠재력"), ("key_advice", "핵심 제언")]
+        overall_lines = [f"- {label}: {str(overall[key]).strip()}" for key, label in labels if overall.get(key)]
+        overall_text = "\n".join(overall_lines)
+    elif isinstance(overall, str):
+        overall_text = overall.strip()
+    else:
+        overall_text = ""
+
+    if not strengths or not weaknesses or not overall_text:
+        return None
+
+    return {
+        "ai_strengths": "\n".join(f"- {item}" for item in strengths),
+        "ai_weaknesses": "\n".join(f"- {item}" for item in weaknesses),
+        "ai_feedback": overall_text,
+        "ai_recommendations": action_plan or [],
+        "error": None
+    }
+
+
+def parse_packed_response(content: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    JSON 배열 응답을 직원별 피드백으로 파싱/검증
+
+    Returns:
+        입력 순서의 피드백 목록 (파싱/검증 실패한 직원은 None)
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    if not content:
+        return results
+
+    text = content.strip()
+    if "```" in text:
+        start = text.find("```json") + 7 if "```json" in text else text.find("```") + 3
+        end = text.find("```", start)
+        text = text[start:end if end != -1 else None].strip()
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        logger.warning("⚠️ 묶음 응답에서 JSON 배열을 찾지 못했습니다")
+        return results
+
+    try:
+        entries = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        logger.warning(f"⚠️ 묶음 응답 JSON 파싱 실패: {e}")
+        return results
+    if not isinstance(entries, list):
+        return results
+
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        try:
+            number = int(entry.get("id", position + 1))
+        except (TypeError, ValueError):
+            continue
+        index = number - 1
+        if 0 <= index < count and results[index] is None:
+            results[index] = _entry_to_feedback(entry)
+    return results
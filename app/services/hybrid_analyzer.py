@@ -5,18 +5,24 @@ AIRISS v4.0 하이브리드 분석기 - Python 3.13 완전 호환 버전
 """
 
 import pandas as pd
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 import logging
 from datetime import datetime
+from dataclasses import dataclass
+from collections import deque
 import uuid
 import numpy as np
 import os
 
 from app.services.text_analyzer import AIRISSTextAnalyzer
-from app.services.quantitative_analyzer import QuantitativeAnalyzer
+from app.services.quantitative_analyzer import QUALITY_LABELS, QuantitativeAnalyzer
+from app.services.analysis_cache import analysis_cache as shared_analysis_cache, framework_fingerprint
 
 logger = logging.getLogger(__name__)
 
+# 편향 탐지용 메모리 분석 기록 최대 보관 건수
+ANALYSIS_HISTORY_LIMIT = int(os.getenv("AIRISS_ANALYSIS_HISTORY_LIMIT", "10000"))
+
 def safe_convert_numpy_types(value):
     """numpy 타입을 Python 기본 타입으로 안전하게 변환"""
     if isinstance(value, np.integer):
@@ -32,46 +38,209 @@ def safe_convert_numpy_types(value):
     else:
         return value
 
+# 하이브리드 7단계 등급 구간 (오름차순 하한값) - 점수 >= 하한값이면 해당 등급
+HYBRID_GRADE_THRESHOLDS = np.array([50, 60, 70, 80, 90, 95], dtype=float)
+HYBRID_GRADE_TABLE = [
+    {
+        "grade": "D",
+        "grade_description": "집중 관리 필요 (Requires Attention) - 하위 30%",
+        "percentile": "하위 30%"
+    },
+    {
+        "grade": "C",
+        "grade_description": "개선 필요 (Needs Improvement) - 전사 TOP 70%",
+        "percentile": "상위 70%"
+    },
+    {
+        "grade": "B",
+        "grade_description": "보통 (Average) - 전사 TOP 50%",
+        "percentile": "상위 50%"
+    },
+    {
+        "grade": "B+",
+        "grade_description": "양호 (Good) - 전사 TOP 30%",
+        "percentile": "상위 30%"
+    },
+    {
+        "grade": "A",
+        "grade_description": "우수 (Outstanding) - 전사 TOP 15%",
+        "percentile": "상위 15%"
+    },
+    {
+        "grade": "A+",
+        "grade_description": "매우 우수 (Excellent) - 전사 TOP 5%",
+        "percentile": "상위 5%"
+    },
+    {
+        "grade": "S",
+        "grade_description": "탁월함 (Superb) - 전사 TOP 1%",
+        "percentile": "상위 1%"
+    }
+]
+HYBRID_GRADE_LABELS = np.array([info["grade"] for info in HYBRID_GRADE_TABLE])
+
+
+def lookup_hybrid_grade_indices(scores) -> np.ndarray:
+    """하이브리드 점수 배열을 HYBRID_GRADE_TABLE 인덱스 배열로 변환 (벡터화 구간 조회)"""
+    scores = np.nan_to_num(np.asarray(scores, dtype=float), nan=-np.inf)
+    return np.searchsorted(HYBRID_GRADE_THRESHOLDS, scores, side="right")
+
+
+def hybrid_weights_for_data_count(data_counts) -> tuple:
+    """정량 데이터 개수(품질)에 따른 텍스트/정량 가중치 배열 (comprehensive_analysis와 동일 규칙)"""
+    data_counts = np.asarray(data_counts)
+    conditions = [data_counts == 0, data_counts <= 2, data_counts >= 5]
+    text_weights = np.select(conditions, [0.8, 0.7, 0.5], default=0.6)
+    quantitative_weights = np.select(conditions, [0.2, 0.3, 0.5], default=0.4)
+    return text_weights, quantitative_weights
+
+
+@dataclass
+class BatchAnalysisResult:
+    """배치 분석 결과 - 전체 행의 점수를 NumPy 배열로 보관하고 행 단위 dict는 요청 시에만 생성"""
+    analyzer: "AIRISSHybridAnalyzer"
+    uids: List[str]
+    opinions: List[str]
+    row_data: pd.DataFrame
+    dimensions: List[str]
+    dimension_scores: np.ndarray        # (행 수, 영역 수)
+    text_overall: np.ndarray
+    text_grades: np.ndarray
+    text_confidence: np.ndarray
+    quantitative_scores: np.ndarray
+    quantitative_confidence: np.ndarray
+    quantitative_data_counts: np.ndarray
+    text_weights: np.ndarray
+    quantitative_weights: np.ndarray
+    hybrid_scores: np.ndarray
+    confidence: np.ndarray
+    grade_indices: np.ndarray
+    quantitative_keys: List[str]               # 정량 데이터 키 (열 순서)
+    quantitative_matrix: np.ndarray            # (행 수, 키 수) 정규화 점수, 값 없으면 NaN
+    quantitative_inserted_at: np.ndarray       # (행 수, 키 수) 키가 처음 채워진 컬럼 위치, 없으면 -1
+
+    def __len__(self) -> int:
+        return len(self.uids)
+
+    @property
+    def grades(self) -> np.ndarray:
+        """하이브리드 등급 배열"""
+        return HYBRID_GRADE_LABELS[self.grade_indices]
+
+    def to_frame(self) -> pd.DataFrame:
+        """행별 핵심 점수를 DataFrame으로 반환 (dict 생성 없이 배열에서 직접 구성)"""
+        frame = pd.DataFrame(
+            np.round(self.dimension_scores, 1), columns=self.dimensions, index=self.row_data.index
+        )
+        frame.insert(0, "uid", self.uids)
+        frame["text_score"] = self.text_overall
+        frame["text_grade"] = self.text_grades
+        frame["quantitative_score"] = self.quantitative_scores
+        frame["hybrid_score"] = np.round(self.hybrid_scores, 1)
+        frame["confidence"] = np.round(self.confidence, 1)
+        frame["grade"] = self.grades
+        return frame
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """index번째 행의 분석 결과 dict 생성 (comprehensive_analysis 결과와 동일 구조, AI/저장 제외)"""
+        return self.analyzer.build_batch_row_result(self, index)
+
+    def to_arrays(self) -> Dict[str, Any]:
+        """프로세스 간 전달용 점수 배열 (분석기/원본 행 제외)"""
+        arrays = {name: getattr(self, name) for name in BATCH_ARRAY_FIELDS}
+        arrays["dimensions"] = list(self.dimensions)
+        arrays["quantitative_keys"] = list(self.quantitative_keys)
+        return arrays
+
+    @classmethod
+    def from_parts(cls, analyzer: "AIRISSHybridAnalyzer", uids: List[str], opinions: List[str],
+                   row_data: pd.DataFrame, parts: Sequence[Dict[str, Any]]) -> "BatchAnalysisResult":
+        """행 순서대로 나뉜 샤드별 to_arrays() 결과를 하나의 배치 결과로 병합"""
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in BATCH_ARRAY_FIELDS}
+        return cls(
+            analyzer=analyzer,
+            uids=uids,
+            opinions=opinions,
+            row_data=row_data,
+            dimensions=list(parts[0]["dimensions"]),
+            quantitative_keys=list(parts[0]["quantitative_keys"]),
+            **merged
+        )
+
+
+BATCH_ARRAY_FIELDS = (
+    "dimension_scores", "text_overall", "text_grades", "text_confidence",
+    "quantitative_scores", "quantitative_confidence", "quantitative_data_counts",
+    "text_weights", "quantitative_weights", "hybrid_scores", "confidence", "grade_indices",
+    "quantitative_matrix", "quantitative_inserted_at",
+)
+
+
 class AIRISSHybridAnalyzer:
     """텍스트 + 정량 통합 분석기 with 편향 탐지 + 안전한 영구 저장"""
     
-    def __init__(self):
-        self.text_analyzer = AIRISSTextAnalyzer()
-        self.quantitative_analyzer = QuantitativeAnalyzer()
+    def __init__(
+        self,
+        text_analyzer: Optional[AIRISSTextAnalyzer] = None,
+        quantitative_analyzer: Optional[QuantitativeAnalyzer] = None,
+        bias_detector=None,
+        storage_service=None,
+        analysis_cache=None
+    ):
+        """
+        하이브리드 분석기 초기화
         
+        구성요소를 주입받으면 그대로 공유하고, 없으면 직접 생성합니다.
+        프로세스 공용 인스턴스는 app.services.analyzer_registry 를 사용하세요.
+        """
         # 편향 탐지 시스템 초기화
-        self.bias_detector = None
-        try:
-            from app.services.bias_detection import BiasDetector
-            self.bias_detector = BiasDetector()
-            logger.info("✅ 편향 탐지 시스템 로드 완료")
-        except ImportError:
-            logger.warning("⚠️ 편향 탐지 모듈 없음 - 기본 분석만 수행")
-        except Exception as e:
-            logger.warning(f"⚠️ 편향 탐지 시스템 로드 실패: {e}")
+        self.bias_detector = bias_detector
+        if self.bias_detector is None:
+            try:
+                from app.services.bias_detection import BiasDetector
+                self.bias_detector = BiasDetector()
+                logger.info("✅ 편향 탐지 시스템 로드 완료")
+            except ImportError:
+                logger.warning("⚠️ 편향 탐지 모듈 없음 - 기본 분석만 수행")
+            except Exception as e:
+                logger.warning(f"⚠️ 편향 탐지 시스템 로드 실패: {e}")
+        
+        self.text_analyzer = text_analyzer or AIRISSTextAnalyzer(bias_detector=self.bias_detector)
+        self.quantitative_analyzer = quantitative_analyzer or QuantitativeAnalyzer()
+        self.analysis_cache = analysis_cache or shared_analysis_cache
         
         # 🔥 Python 3.13 호환: 완전한 조건부 저장 서비스 초기화
         self.storage_service = None
         self.storage_available = False
         
-        try:
-            # 단계별 안전한 import
-            logger.info("🔄 저장 서비스 로드 시도...")
-            from app.services.analysis_storage_service import storage_service
-            
-            # 서비스 가용성 확인
-            if hasattr(storage_service, 'is_available') and storage_service.is_available():
-                self.storage_service = storage_service
-                self.storage_available = True
-                logger.info("✅ 분석 결과 저장 서비스 로드 완료")
-            else:
-                logger.warning("⚠️ 저장 서비스가 비활성화 상태")
+        if storage_service is not None:
+            self.storage_service = storage_service
+            self.storage_available = True
+        else:
+            try:
+                # 단계별 안전한 import
+                logger.info("🔄 저장 서비스 로드 시도...")
+                from app.services.analysis_storage_service import storage_service
                 
-        except ImportError as e:
-            logger.warning(f"⚠️ 저장 서비스 모듈 없음: {e}")
-        except Exception as e:
-            logger.warning(f"⚠️ 저장 서비스 초기화 실패 (Python 3.13 호환성): {e}")
-            logger.info("📝 메모리 기반 분석만 수행됩니다")
+                # 서비스 가용성 확인
+                if hasattr(storage_service, 'is_available') and storage_service.is_available():
+                    self.storage_service = storage_service
+                    self.storage_available = True
+                    logger.info("✅ 분석 결과 저장 서비스 로드 완료")
+                else:
+                    logger.warning("⚠️ 저장 서비스가 비활성화 상태")
+                    
+            except ImportError as e:
+                logger.warning(f"⚠️ 저장 서비스 모듈 없음: {e}")
+            except Exception as e:
+                logger.warning(f"⚠️ 저장 서비스 초기화 실패 (Python 3.13 호환성): {e}")
+                logger.info("📝 메모리 기반 분석만 수행됩니다")
+        
+        # 분석 결과는 일괄 저장기로 모아서 배치 단위로 기록
+        self.result_writer = None
+        if self.storage_available and hasattr(self.storage_service, 'save_analysis_results_bulk'):
+            from app.services.result_writer import BatchedResultWriter
+            self.result_writer = BatchedResultWriter(self.storage_service)
         
         # 통합 가중치
         self.hybrid_weights = {
@@ -80,13 +249,25 @@ class AIRISSHybridAnalyzer:
         }
         
         # 분석 결과 저장 (편향 탐지용) - 항상 사용 가능한 메모리 저장소
-        self.analysis_history = []
+        # 프로세스 공용 인스턴스로 장시간 재사용되므로 최근 기록만 유지
+        self.analysis_history = deque(maxlen=ANALYSIS_HISTORY_LIMIT)
         
         # 초기화 상태 로깅
         logger.info(f"✅ AIRISS v4.0 하이브리드 분석기 초기화 완료")
         logger.info(f"   📊 편향 탐지: {'활성화' if self.bias_detector else '비활성화'}")
         logger.info(f"   💾 영구 저장: {'활성화' if self.storage_available else '비활성화 (메모리만)'}")
     
+    def analyze_text_cached(self, opinion: str) -> Dict[str, Dict]:
+        """8대 영역 텍스트 분석 - 정규화 의견 + 프레임워크 버전 기준 캐시를 먼저 조회"""
+        cache_key = self.analysis_cache.make_key(
+            "text", opinion, framework=framework_fingerprint(self.text_analyzer.framework)
+        )
+        text_results = self.analysis_cache.get(cache_key)
+        if text_results is None:
+            text_results = self.text_analyzer.analyze_all_dimensions(opinion)
+            self.analysis_cache.set(cache_key, text_results)
+        return text_results
+    
     async def comprehensive_analysis(self, 
                              uid: str, 
                              opinion: str, 
@@ -100,10 +281,8 @@ class AIRISSHybridAnalyzer:
                              max_tokens: int = 1200) -> Dict[str, Any]:
         """종합 분석: 텍스트 + 정량 + 편향 체크 + 안전한 영구 저장"""
         
-        # 1. 텍스트 분석
-        text_results = {}
-        for dimension in self.text_analyzer.framework.keys():
-            text_results[dimension] = self.text_analyzer.analyze_text(opinion, dimension)
+        # 1. 텍스트 분석 (8대 영역 단일 스캔, 동일 의견은 캐시 재사용)
+        text_results = self.analyze_text_cached(opinion)
         
         text_overall = self.text_analyzer.calculate_overall_score(
             {dim: result["score"] for dim, result in text_results.items()}
@@ -147,27 +326,72 @@ class AIRISSHybridAnalyzer:
             text_results, quant_results, text_weight, quant_weight, hybrid_score
         )
         
-        # 7. 분석 결과 저장 (편향 탐지용)
-        if hasattr(row_data, 'to_dict'):
-            analysis_record = {
-                'uid': uid,
-                'hybrid_score': hybrid_score,
-                'timestamp': datetime.now()
-            }
-            # 보호 속성 추가 (있는 경우) - pandas Series를 Python 네이티브 타입으로 변환
-            for attr in ['성별', '연령대', '부서', '직급']:
-                if attr in row_data:
-                    value = row_data[attr]
-                    # pandas Series나 numpy 타입을 Python 네이티브 타입으로 변환
-                    if hasattr(value, 'item'):  # numpy scalar
-                        analysis_record[attr] = value.item()
-                    elif hasattr(value, 'tolist'):  # pandas Series/array
-                        analysis_record[attr] = value.tolist() if hasattr(value, '__len__') and len(value) > 1 else value.iloc[0] if hasattr(value, 'iloc') else str(value)
-                    else:
-                        analysis_record[attr] = value
-            self.analysis_history.append(analysis_record)
+        components = {
+            "text_results": text_results,
+            "text_overall": text_overall,
+            "quant_data": quant_data,
+            "quant_results": quant_results,
+            "text_weight": text_weight,
+            "quant_weight": quant_weight,
+            "hybrid_score": hybrid_score,
+            "hybrid_confidence": hybrid_confidence,
+            "hybrid_grade_info": hybrid_grade_info,
+            "explainability_info": explainability_info
+        }
+        
+        return await self._finalize_analysis(
+            uid, opinion, row_data, components,
+            save_to_storage=save_to_storage,
+            file_id=file_id,
+            filename=filename,
+            enable_ai=enable_ai,
+            openai_api_key=openai_api_key,
+            openai_model=openai_model,
+            max_tokens=max_tokens
+        )
+    
+    async def _finalize_analysis(self,
+                                 uid: str,
+                                 opinion: str,
+                                 row_data: pd.Series,
+                                 components: Dict[str, Any],
+                                 save_to_storage: bool = True,
+                                 file_id: Optional[str] = None,
+                                 filename: Optional[str] = None,
+                                 enable_ai: bool = False,
+                                 openai_api_key: Optional[str] = None,
+                                 openai_model: str = "gpt-3.5-turbo",
+                                 max_tokens: int = 1200,
+                                 precomputed_ai_feedback: Optional[Dict[str, Any]] = None,
+                                 batched: bool = False) -> Dict[str, Any]:
+        """
+        점수 산출 이후 단계: AI 피드백 + 편향 탐지용 기록 + 결과 구성 + 영구 저장
         
-        # 8. AI 피드백 생성 (비동기 지원)
+        precomputed_ai_feedback 이 있으면 (예: 묶음 요청 결과) AI 피드백을 새로 요청하지 않습니다.
+        batched=True 면 (배치 행) 일괄 저장기에 넣고 바로 반환합니다.
+        """
+        ai_feedback_result = await self.resolve_ai_feedback(
+            uid, opinion,
+            enable_ai=enable_ai,
+            openai_api_key=openai_api_key,
+            openai_model=openai_model,
+            max_tokens=max_tokens,
+            precomputed_ai_feedback=precomputed_ai_feedback
+        )
+        return self._assemble_analysis(
+            uid, opinion, row_data, components, ai_feedback_result,
+            save_to_storage=save_to_storage, file_id=file_id, filename=filename, batched=batched
+        )
+    
+    async def resolve_ai_feedback(self,
+                                  uid: str,
+                                  opinion: str,
+                                  enable_ai: bool = False,
+                                  openai_api_key: Optional[str] = None,
+                                  openai_model: str = "gpt-3.5-turbo",
+                                  max_tokens: int = 1200,
+                                  precomputed_ai_feedback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """AI 피드백 결과 (비활성/키 없음/실패 시 오류 정보를 담은 기본 결과, precomputed 가 있으면 호출 없음)"""
         ai_feedback_result = {
             "ai_strengths": "",
             "ai_weaknesses": "",
@@ -197,13 +421,16 @@ class AIRISSHybridAnalyzer:
             if openai_api_key:
                 try:
                     logger.info(f"AI 피드백 생성 시작 - UID: {uid}, API 키: {openai_api_key[:10]}...")
-                    ai_feedback_result = await self.text_analyzer.generate_ai_feedback(
-                        uid=uid,
-                        opinion=opinion,
-                        api_key=openai_api_key,
-                        model=openai_model,
-                        max_tokens=max_tokens
-                    )
+                    if precomputed_ai_feedback is not None:
+                        ai_feedback_result = dict(precomputed_ai_feedback)
+                    else:
+                        ai_feedback_result = await self.text_analyzer.generate_ai_feedback(
+                            uid=uid,
+                            opinion=opinion,
+                            api_key=openai_api_key,
+                            model=openai_model,
+                            max_tokens=max_tokens
+                        )
                     logger.info(f"AI 피드백 생성 완료 - UID: {uid}")
                     logger.debug(f"AI 피드백 내용: {ai_feedback_result}")
                     
@@ -241,7 +468,70 @@ class AIRISSHybridAnalyzer:
                 ai_feedback_result["error"] = "API 키가 설정되지 않았습니다"
                 ai_feedback_result["user_error"] = "OpenAI API 키가 설정되지 않았습니다. 환경 변수에 OPENAI_API_KEY를 설정해주세요."
         
+        return ai_feedback_result
+    
+    def _assemble_analysis(self,
+                           uid: str,
+                           opinion: str,
+                           row_data: pd.Series,
+                           components: Dict[str, Any],
+                           ai_feedback_result: Dict[str, Any],
+                           save_to_storage: bool = True,
+                           file_id: Optional[str] = None,
+                           filename: Optional[str] = None,
+                           batched: bool = False) -> Dict[str, Any]:
+        """편향 탐지용 기록 + 결과 구성 + 영구 저장 (동기 - 대량 처리 시 스레드에서 실행 가능)"""
+        hybrid_score = components["hybrid_score"]
+        
+        # 7. 분석 결과 저장 (편향 탐지용)
+        if hasattr(row_data, 'to_dict'):
+            analysis_record = {
+                'uid': uid,
+                'hybrid_score': hybrid_score,
+                'timestamp': datetime.now()
+            }
+            # 보호 속성 추가 (있는 경우) - pandas Series를 Python 네이티브 타입으로 변환
+            for attr in ['성별', '연령대', '부서', '직급']:
+                if attr in row_data:
+                    value = row_data[attr]
+                    # pandas Series나 numpy 타입을 Python 네이티브 타입으로 변환
+                    if hasattr(value, 'item'):  # numpy scalar
+                        analysis_record[attr] = value.item()
+                    elif hasattr(value, 'tolist'):  # pandas Series/array
+                        analysis_record[attr] = value.tolist() if hasattr(value, '__len__') and len(value) > 1 else value.iloc[0] if hasattr(value, 'iloc') else str(value)
+                    else:
+                        analysis_record[attr] = value
+            self.analysis_history.append(analysis_record)
+        
         # 9. 분석 결과 구성 (numpy 타입 안전 변환)
+        analysis_result = self._build_analysis_result(uid, opinion, components, ai_feedback_result)
+        
+        # 9. 영구 저장 (조건부 안전한 저장)
+        if save_to_storage:
+            storage_result = self._safe_save_to_storage(
+                uid, file_id, filename, opinion, hybrid_score, 
+                components["text_overall"], components["quant_results"], components["hybrid_grade_info"],
+                components["hybrid_confidence"], components["text_results"],
+                ai_feedback_result, batched=batched
+            )
+            analysis_result["storage_info"] = storage_result
+        
+        return analysis_result
+    
+    def _build_analysis_result(self, uid: str, opinion: str, components: Dict[str, Any],
+                               ai_feedback_result: Dict[str, Any]) -> Dict[str, Any]:
+        """분석 결과 dict 구성 (numpy 타입 안전 변환)"""
+        text_results = components["text_results"]
+        text_overall = components["text_overall"]
+        quant_data = components["quant_data"]
+        quant_results = components["quant_results"]
+        text_weight = components["text_weight"]
+        quant_weight = components["quant_weight"]
+        hybrid_score = components["hybrid_score"]
+        hybrid_confidence = components["hybrid_confidence"]
+        hybrid_grade_info = components["hybrid_grade_info"]
+        explainability_info = components["explainability_info"]
+        
         analysis_result = {
             "text_analysis": {
                 "overall_score": safe_convert_numpy_types(text_overall["overall_score"]),
@@ -276,21 +566,192 @@ class AIRISSHybridAnalyzer:
             }
         }
         
-        # 9. 영구 저장 (조건부 안전한 저장)
-        if save_to_storage:
-            storage_result = self._safe_save_to_storage(
-                uid, file_id, filename, opinion, hybrid_score, 
-                text_overall, quant_results, hybrid_grade_info, hybrid_confidence, text_results,
-                ai_feedback_result
+        return analysis_result
+    
+    def analyze_batch(self,
+                      opinions: Sequence[str],
+                      row_data: pd.DataFrame,
+                      uids: Optional[Sequence[str]] = None) -> BatchAnalysisResult:
+        """
+        여러 직원을 한 번에 점수화 (comprehensive_analysis의 배치 버전, AI/저장 제외)
+        
+        Args:
+            opinions: 행 순서대로의 평가 의견
+            row_data: 정량 컬럼을 포함한 원본 행 데이터 (opinions와 같은 길이/순서)
+            uids: 행 순서대로의 직원 UID (없으면 EMP_n)
+        
+        Returns:
+            점수/등급/신뢰도를 NumPy 배열로 담은 BatchAnalysisResult
+        """
+        opinions = [str(opinion) for opinion in opinions]
+        row_count = len(opinions)
+        if len(row_data) != row_count:
+            raise ValueError(f"의견 수({row_count})와 행 데이터 수({len(row_data)})가 일치하지 않습니다")
+        uids = [str(uid) for uid in uids] if uids is not None else [f"EMP_{i + 1}" for i in range(row_count)]
+        
+        # 1. 텍스트 분석 - 의견당 키워드 단일 스캔 후 점수 행렬 구성
+        dimensions = list(self.text_analyzer.framework.keys())
+        dimension_scores = np.empty((row_count, len(dimensions)), dtype=float)
+        for i, opinion in enumerate(opinions):
+            text_results = self.analyze_text_cached(opinion)
+            dimension_scores[i] = [text_results[dim]["score"] for dim in dimensions]
+        text_overall = self.text_analyzer.calculate_overall_scores(dimension_scores, dimensions)
+        
+        # 2. 정량 분석 - 파일 단위 컬럼 계획으로 전체 행을 컬럼 단위 정규화
+        quant_batch = self.quantitative_analyzer.calculate_quantitative_scores(row_data)
+        quantitative_scores = quant_batch["quantitative_score"]
+        quantitative_confidence = quant_batch["confidence"]
+        quantitative_data_counts = quant_batch["data_count"]
+        
+        # 3. 하이브리드 점수/신뢰도/등급 (벡터 연산)
+        text_weights, quantitative_weights = hybrid_weights_for_data_count(quantitative_data_counts)
+        hybrid_scores = text_overall["overall_score"] * text_weights + quantitative_scores * quantitative_weights
+        confidence = text_overall["confidence"] * text_weights + quantitative_confidence * quantitative_weights
+        
+        return BatchAnalysisResult(
+            analyzer=self,
+            uids=uids,
+            opinions=opinions,
+            row_data=row_data,
+            dimensions=dimensions,
+            dimension_scores=dimension_scores,
+            text_overall=text_overall["overall_score"],
+            text_grades=text_overall["grade"],
+            text_confidence=text_overall["confidence"],
+            quantitative_scores=quantitative_scores,
+            quantitative_confidence=quantitative_confidence,
+            quantitative_data_counts=quantitative_data_counts,
+            text_weights=text_weights,
+            quantitative_weights=quantitative_weights,
+            hybrid_scores=hybrid_scores,
+            confidence=confidence,
+            grade_indices=lookup_hybrid_grade_indices(hybrid_scores),
+            quantitative_keys=list(quant_batch["plan"].keys),
+            quantitative_matrix=quant_batch["matrix"],
+            quantitative_inserted_at=quant_batch["inserted_at"]
+        )
+    
+    def _batch_row_components(self, batch: BatchAnalysisResult, index: int) -> Dict[str, Any]:
+        """배치 결과의 index번째 행에 대한 상세 구성요소 생성 (정량 기여요인은 배치 점수 행렬에서 복원)"""
+        opinion = batch.opinions[index]
+        text_results = self.analyze_text_cached(opinion)
+        quant_data, contributing_factors = self.quantitative_analyzer.contributing_factors_from_matrix(
+            batch.quantitative_keys, batch.quantitative_matrix[index], batch.quantitative_inserted_at[index]
+        )
+        data_count = int(batch.quantitative_data_counts[index])
+        quant_results = {
+            "quantitative_score": float(batch.quantitative_scores[index]),
+            "confidence": float(batch.quantitative_confidence[index]),
+            "contributing_factors": contributing_factors,
+            "data_quality": str(QUALITY_LABELS[3 if data_count >= 5 else 2 if data_count >= 3 else 1 if data_count >= 1 else 0]),
+            "data_count": data_count
+        }
+        
+        text_weight = float(batch.text_weights[index])
+        quant_weight = float(batch.quantitative_weights[index])
+        hybrid_score = float(batch.hybrid_scores[index])
+        
+        return {
+            "text_results": text_results,
+            "text_overall": {
+                "overall_score": float(batch.text_overall[index]),
+                "grade": str(batch.text_grades[index]),
+                "confidence": float(batch.text_confidence[index])
+            },
+            "quant_data": quant_data,
+            "quant_results": quant_results,
+            "text_weight": text_weight,
+            "quant_weight": quant_weight,
+            "hybrid_score": hybrid_score,
+            "hybrid_confidence": float(batch.confidence[index]),
+            "hybrid_grade_info": dict(HYBRID_GRADE_TABLE[int(batch.grade_indices[index])]),
+            "explainability_info": self._generate_explainability(
+                text_results, quant_results, text_weight, quant_weight, hybrid_score
             )
-            analysis_result["storage_info"] = storage_result
+        }
+    
+    def build_batch_row_result(self, batch: BatchAnalysisResult, index: int) -> Dict[str, Any]:
+        """배치 결과의 index번째 행을 comprehensive_analysis와 같은 구조의 dict로 생성 (AI/저장 제외)"""
+        return self._build_analysis_result(
+            batch.uids[index],
+            batch.opinions[index],
+            self._batch_row_components(batch, index),
+            {
+                "ai_strengths": "",
+                "ai_weaknesses": "",
+                "ai_feedback": "",
+                "ai_recommendations": [],
+                "error": None
+            }
+        )
+    
+    async def complete_batch_row(self,
+                                 batch: BatchAnalysisResult,
+                                 index: int,
+                                 save_to_storage: bool = True,
+                                 file_id: Optional[str] = None,
+                                 filename: Optional[str] = None,
+                                 enable_ai: bool = False,
+                                 openai_api_key: Optional[str] = None,
+                                 openai_model: str = "gpt-3.5-turbo",
+                                 max_tokens: int = 1200,
+                                 precomputed_ai_feedback: Optional[Dict[str, Any]] = None,
+                                 opinion: Optional[str] = None) -> Dict[str, Any]:
+        """
+        배치로 점수화된 행에 AI 피드백/영구 저장을 적용 (comprehensive_analysis와 동일한 결과 반환)
+        opinion: 저장할 원문 의견 (배치를 중복 그룹 대표 의견으로 점수화한 경우)
+        """
+        return await self._finalize_analysis(
+            batch.uids[index],
+            batch.opinions[index] if opinion is None else opinion,
+            batch.row_data.iloc[index],
+            self._batch_row_components(batch, index),
+            save_to_storage=save_to_storage,
+            file_id=file_id,
+            filename=filename,
+            enable_ai=enable_ai,
+            openai_api_key=openai_api_key,
+            openai_model=openai_model,
+            max_tokens=max_tokens,
+            precomputed_ai_feedback=precomputed_ai_feedback,
+            batched=True
+        )
+    
+    def finalize_batch_row(self,
+                           batch: BatchAnalysisResult,
+                           index: int,
+                           ai_feedback_result: Dict[str, Any],
+                           save_to_storage: bool = True,
+                           file_id: Optional[str] = None,
+                           filename: Optional[str] = None,
+                           opinion: Optional[str] = None) -> Dict[str, Any]:
+        """
+        complete_batch_row 의 동기 버전 - AI 피드백(resolve_ai_feedback 결과)을 받아 결과 구성/저장만 수행
         
-        return analysis_result
+        이벤트 루프를 막지 않도록 청크 단위로 asyncio.to_thread 에서 호출합니다.
+        """
+        return self._assemble_analysis(
+            batch.uids[index],
+            batch.opinions[index] if opinion is None else opinion,
+            batch.row_data.iloc[index],
+            self._batch_row_components(batch, index),
+            ai_feedback_result,
+            save_to_storage=save_to_storage,
+            file_id=file_id,
+            filename=filename,
+            batched=True
+        )
     
     def _safe_save_to_storage(self, uid, file_id, filename, opinion, hybrid_score,
                             text_overall, quant_results, hybrid_grade_info, hybrid_confidence, text_results,
-                            ai_feedback_result=None):
-        """안전한 저장 처리 (Python 3.13 호환)"""
+                            ai_feedback_result=None, batched=False):
+        """
+        안전한 저장 처리 (Python 3.13 호환)
+        
+        batched=True 면 일괄 저장기에 넣기만 하므로 아직 기록 전이며(storage_mode "pending"),
+        같은 uid/file_id 기존 결과는 기존 analysis_id 로 갱신되어 ID 를 알 수 없으므로 반환하지 않습니다.
+        단건 분석은 바로 기록하고 실제 저장된 analysis_id 를 반환합니다.
+        """
         
         if not self.storage_available or not self.storage_service:
             return {
@@ -325,8 +786,15 @@ class AIRISSHybridAnalyzer:
                     "ai_error": ai_feedback_result.get("error", None)
                 })
             
-            analysis_id = self.storage_service.save_analysis_result(storage_data)
+            if batched and self.result_writer is not None:
+                self.result_writer.add(storage_data)
+                return {
+                    "queued_at": datetime.now().isoformat(),
+                    "storage_enabled": True,
+                    "storage_mode": "pending"
+                }
             
+            analysis_id = self.storage_service.save_analysis_result(storage_data)
             return {
                 "analysis_id": analysis_id,
                 "saved_at": datetime.now().isoformat(),
@@ -348,6 +816,12 @@ class AIRISSHybridAnalyzer:
                 "message": "영구 저장 실패 - 메모리에만 저장됨"
             }
     
+    def flush_storage(self) -> int:
+        """일괄 저장기에 남은 분석 결과 즉시 기록 (기록한 행 수 반환)"""
+        if self.result_writer is None:
+            return 0
+        return self.result_writer.flush()
+    
     def save_analysis_job(self, job_info: Dict[str, Any]) -> Optional[str]:
         """분석 작업 정보 저장 (안전한 처리)"""
         if not self.storage_available or not self.storage_service:
@@ -404,48 +878,7 @@ class AIRISSHybridAnalyzer:
     
     def _calculate_hybrid_grade(self, score: float) -> Dict[str, str]:
         """하이브리드 점수를 7단계 등급으로 변환 (S, A+, A, B+, B, C, D)"""
-        if score >= 95:
-            return {
-                "grade": "S",
-                "grade_description": "탁월함 (Superb) - 전사 TOP 1%",
-                "percentile": "상위 1%"
-            }
-        elif score >= 90:
-            return {
-                "grade": "A+",
-                "grade_description": "매우 우수 (Excellent) - 전사 TOP 5%",
-                "percentile": "상위 5%"
-            }
-        elif score >= 80:
-            return {
-                "grade": "A",
-                "grade_description": "우수 (Outstanding) - 전사 TOP 15%",
-                "percentile": "상위 15%"
-            }
-        elif score >= 70:
-            return {
-                "grade": "B+",
-                "grade_description": "양호 (Good) - 전사 TOP 30%",
-                "percentile": "상위 30%"
-            }
-        elif score >= 60:
-            return {
-                "grade": "B",
-                "grade_description": "보통 (Average) - 전사 TOP 50%",
-                "percentile": "상위 50%"
-            }
-        elif score >= 50:
-            return {
-                "grade": "C",
-                "grade_description": "개선 필요 (Needs Improvement) - 전사 TOP 70%",
-                "percentile": "상위 70%"
-            }
-        else:
-            return {
-                "grade": "D",
-                "grade_description": "집중 관리 필요 (Requires Attention) - 하위 30%",
-                "percentile": "하위 30%"
-            }
+        return dict(HYBRID_GRADE_TABLE[int(lookup_hybrid_grade_indices([score])[0])])
     
     def _generate_explainability(self, 
                                text_results: Dict,
@@ -601,6 +1034,8 @@ class AIRISSHybridAnalyzer:
                 "storage_service": self.storage_available
             },
             "analysis_count": len(self.analysis_history),
+            "analysis_cache": self.analysis_cache.stats(),
+            "result_writer": self.result_writer.stats() if self.result_writer else None,
             "storage_mode": "persistent" if self.storage_available else "memory_only",
             "python_version_compatible": True
         }
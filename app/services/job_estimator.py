@@ -0,0 +1,300 @@
+# app/services/job_estimator.py
+"""
+AIRISS 분석 작업 사전 추정기
+작업을 시작하기 전에 업로드 파일을 읽어 행 수/고유 의견 수/모델별 토큰·비용/예상 소요 시간/예상 메모리를 계산
+
+- 고유 의견 수: 분석 작업과 같은 중복 의견 묶기 키 (OpinionDeduplicator.key)
+- 토큰: 실제 요청과 같은 프롬프트로 계산 (묶음 요청은 청크별 묶음 계획까지 재현), 응답 캐시에 있는 의견은 제외
+- 시간: 최근 완료 작업의 실행 기록(job_data.run_profile)으로 행당 처리 시간/LLM 응답 시간/응답 토큰을 보정
+  (기록이 없으면 기본값 사용), LLM 구간은 동시성(AIRISS_LLM_CONCURRENCY)과 분당 한도(RPM/TPM)를 반영
+- 메모리: 파일에서 측정한 행당 크기 × 파이프라인에 동시에 올라가는 행 수 + 보관 결과/의견 그룹
+"""
+
+import json
+import logging
+import os
+import statistics
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+HISTORY_JOBS = int(os.getenv("AIRISS_ESTIMATE_HISTORY_JOBS", "20"))  # 보정에 사용할 최근 완료 작업 수
+ESTIMATE_READ_CHUNK_SIZE = 5000
+
+# 실행 기록이 없을 때의 기본값
+DEFAULT_LOCAL_SECONDS_PER_ROW = 0.01        # AI 없이 읽기/점수화/저장까지 행당 시간
+DEFAULT_LLM_LATENCY_SECONDS = 8.0           # LLM 요청 1건 응답 시간
+DEFAULT_COMPLETION_TOKENS_PER_EMPLOYEE = 450
+
+RESULT_BYTES_PER_ROW = 2048                 # AI 피드백을 뺀 행 결과 dict 크기
+FEEDBACK_BYTES_PER_TOKEN = 4
+
+# 모델별 가격 (USD / 1M 토큰, 접두어 일치 - 가장 긴 접두어 우선), AIRISS_LLM_PRICING_JSON 으로 재정의
+MODEL_PRICING = {
+    "gpt-3.5-turbo": {"prompt": 0.5, "completion": 1.5},
+    "gpt-4": {"prompt": 30.0, "completion": 60.0},
+    "gpt-4-turbo": {"prompt": 10.0, "completion": 30.0},
+    "gpt-4o": {"prompt": 2.5, "completion": 10.0},
+    "gpt-4o-mini": {"prompt": 0.15, "completion": 0.6},
+    "gpt-4.1": {"prompt": 2.0, "completion": 8.0},
+    "gpt-4.1-mini": {"prompt": 0.4, "completion": 1.6},
+}
+try:
+    MODEL_PRICING.update(json.loads(os.getenv("AIRISS_LLM_PRICING_JSON", "") or "{}"))
+except ValueError:
+    logger.warning("⚠️ AIRISS_LLM_PRICING_JSON 형식 오류 - 기본 가격표 사용")
+
+
+def pricing_for(model: str) -> Optional[Dict[str, float]]:
+    """모델 가격 (모르는 모델은 None)"""
+    matches = [name for name in MODEL_PRICING if model.startswith(name)]
+    if not matches:
+        return None
+    return MODEL_PRICING[max(matches, key=len)]
+
+
+def _median(values: Sequence[float]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return statistics.median(values) if values else None
+
+
+def load_calibration(db, limit: int = HISTORY_JOBS) -> Dict[str, Any]:
+    """
+    최근 완료 작업의 실행 기록으로 보정값 계산
+
+    Returns:
+        {"jobs", "local_seconds_per_row", "llm_latency_seconds", "completion_tokens_per_employee", "source"}
+    """
+    from app.models.job import Job
+
+    rows = db.query(Job.job_data) \
+        .filter(Job.status == 'completed') \
+        .order_by(Job.end_time.desc()) \
+        .limit(max(1, limit) * 5) \
+        .all()
+
+    profiles: List[Dict[str, Any]] = []
+    for (job_data,) in rows:
+        try:
+            profile = json.loads(job_data or "{}").get("run_profile")
+        except (TypeError, ValueError):
+            continue
+        if profile and profile.get("rows"):
+            profiles.append(profile)
+        if len(profiles) >= limit:
+            break
+
+    local_rates, latencies, completions = [], [], []
+    for profile in profiles:
+        llm = profile.get("llm") or {}
+        if not profile.get("ai_enabled") or not llm.get("requests"):
+            local_rates.append(profile["elapsed_seconds"] / profile["rows"])
+            continue
+        latencies.append(llm["request_seconds"] / llm["requests"])
+        employees = profile.get("llm_employees") or 0
+        if employees and llm.get("succeeded"):
+            completions.append(llm["completion_tokens"] / employees)
+
+    calibration = {
+        "jobs": len(profiles),
+        "local_seconds_per_row": _median(local_rates) or DEFAULT_LOCAL_SECONDS_PER_ROW,
+        "llm_latency_seconds": _median(latencies) or DEFAULT_LLM_LATENCY_SECONDS,
+        "completion_tokens_per_employee": _median(completions) or DEFAULT_COMPLETION_TOKENS_PER_EMPLOYEE,
+        "local_jobs": len(local_rates),
+        "ai_jobs": len(latencies),
+    }
+    calibration["source"] = "history" if profiles else "defaults"
+    return calibration
+
+
+def scan_file(file_path: str, sample_size: Optional[int], chunk_size: int,
+              dedup_enabled: bool) -> Dict[str, Any]:
+    """
+    분석 대상 행을 읽어 고유 의견/청크별 신규 의견/행당 메모리 측정 (분석 작업과 같은 리더/컬럼 감지)
+
+    Returns:
+        {"rows", "distinct_opinions", "chunks": [[청크에서 처음 나온 (uid, 의견) ...], ...], "frame_bytes_per_row", "columns"}
+    """
+    from app.services.analysis_pipeline import ColumnMapping, FileChunkReader
+    from app.services.opinion_dedup import OpinionDeduplicator
+
+    reader = FileChunkReader(file_path, chunk_size=ESTIMATE_READ_CHUNK_SIZE, limit=sample_size)
+    reader.open()
+    columns = ColumnMapping.detect(reader.columns)
+    dedup = OpinionDeduplicator(enabled=dedup_enabled)
+
+    rows, frame_bytes = 0, 0
+    seen = set()
+    chunks: List[List[tuple]] = []
+    current: List[tuple] = []
+    in_chunk = 0
+    for frame in reader:
+        frame_bytes += int(frame.memory_usage(deep=True).sum())
+        uids = frame[columns.uid].astype(str).tolist()
+        keys, representatives = dedup.assign(frame[columns.opinion].tolist())
+        for uid, key, opinion in zip(uids, keys, representatives):
+            group = key if dedup_enabled else (rows, key)
+            if group not in seen:
+                seen.add(group)
+                current.append((uid, opinion))
+            rows += 1
+            in_chunk += 1
+            if in_chunk >= chunk_size:
+                chunks.append(current)
+                current, in_chunk = [], 0
+    if current:
+        chunks.append(current)
+
+    return {
+        "rows": rows,
+        "distinct_opinions": dedup.stats()["distinct_opinions"],
+        "chunks": chunks,
+        "frame_bytes_per_row": frame_bytes / rows if rows else 0.0,
+        "columns": columns.describe(),
+    }
+
+
+def estimate_llm(chunks: Sequence[Sequence[tuple]], model: str, max_tokens: int, pack_size: int,
+                 completion_per_employee: float, use_cache: bool = True) -> Dict[str, Any]:
+    """모델 1개의 요청 수/프롬프트·응답 토큰 (청크마다 처음 나온 의견만 요청, 묶음 요청은 같은 계획으로 재현)"""
+    from app.services.analyzer_registry import get_hybrid_analyzer
+    from app.services.feedback_packing import (
+        PACKED_SYSTEM_PROMPT, create_packed_prompt, packed_completion_tokens, plan_feedback_packs
+    )
+    from app.services.llm_executor import estimate_tokens
+
+    text_analyzer = get_hybrid_analyzer().text_analyzer
+    requests = employees = cached = prompt_tokens = 0
+    completion_tokens = 0.0
+    max_request_tokens = 0
+
+    for chunk in chunks:
+        pending = []
+        for uid, opinion in chunk:
+            if use_cache and text_analyzer.has_cached_feedback(opinion, model, max_tokens):
+                cached += 1
+            else:
+                pending.append((uid, opinion))
+        employees += len(pending)
+        if pack_size > 1:
+            packs = plan_feedback_packs([opinion for _, opinion in pending], model, pack_size)
+        else:
+            packs = [[index] for index in range(len(pending))]
+        for pack in packs:
+            if len(pack) > 1:
+                items = [{"uid": pending[i][0], "opinion": pending[i][1]} for i in pack]
+                tokens = estimate_tokens(PACKED_SYSTEM_PROMPT) + estimate_tokens(create_packed_prompt(items))
+                completion_cap = packed_completion_tokens(len(pack))
+            else:
+                tokens = text_analyzer.feedback_prompt_tokens(pending[pack[0]][1])
+                completion_cap = max_tokens
+            requests += 1
+            prompt_tokens += tokens
+            completion_tokens += min(completion_cap, completion_per_employee * len(pack))
+            max_request_tokens = max(max_request_tokens, tokens + completion_cap)
+
+    completion_tokens = int(round(completion_tokens))
+    pricing = pricing_for(model)
+    cost = None
+    if pricing is not None:
+        cost = round((prompt_tokens * pricing["prompt"] + completion_tokens * pricing["completion"]) / 1_000_000, 4)
+    return {
+        "model": model,
+        "requests": requests,
+        "employees_requested": employees,
+        "cached_opinions": cached,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "max_request_tokens": max_request_tokens,
+        "estimated_cost_usd": cost,
+    }
+
+
+def estimate_llm_seconds(requests: int, total_tokens: int, chunk_count: int, latency: float) -> Dict[str, Any]:
+    """LLM 구간 예상 시간 - 동시성 한도와 분당 요청/토큰 한도 중 느린 쪽 (청크 단위로 요청이 나뉨)"""
+    from app.services.llm_executor import llm_executor
+
+    if not requests:
+        return {"seconds": 0.0, "bound": None}
+    per_chunk = max(1.0, requests / max(1, chunk_count))
+    concurrency = min(llm_executor.concurrency, per_chunk)
+    bounds = {
+        "concurrency": requests / concurrency * latency,
+        "requests_per_minute": requests / llm_executor.request_bucket.capacity * 60
+        if llm_executor.request_bucket.capacity > 0 else 0.0,
+        "tokens_per_minute": total_tokens / llm_executor.token_bucket.capacity * 60
+        if llm_executor.token_bucket.capacity > 0 else 0.0,
+    }
+    bound = max(bounds, key=bounds.get)
+    return {"seconds": round(bounds[bound], 1), "bound": bound, "effective_concurrency": round(concurrency, 1)}
+
+
+def estimate_memory(scan: Dict[str, Any], rows: int, chunk_size: int, ai_enabled: bool,
+                    completion_per_employee: float) -> Dict[str, Any]:
+    """예상 추가 메모리 (파이프라인 큐/단계의 청크 + 작업 JSON 보관 결과 + 의견 그룹)"""
+    from app.services.analysis_pipeline import DEFAULT_QUEUE_DEPTH, INLINE_RESULTS_LIMIT
+    from app.services.opinion_dedup import DEFAULT_MAX_GROUPS
+
+    result_bytes = RESULT_BYTES_PER_ROW + (completion_per_employee * FEEDBACK_BYTES_PER_TOKEN if ai_enabled else 0)
+    rows_in_flight = min(rows, chunk_size * (3 * DEFAULT_QUEUE_DEPTH + 4))  # 큐 3개 + 단계 4개
+    # 청크 프레임은 점수화 결과(row_data)로 한 번 더 보관됨
+    pipeline_bytes = rows_in_flight * (scan["frame_bytes_per_row"] * 2 + result_bytes)
+    inline_bytes = min(rows, INLINE_RESULTS_LIMIT) * result_bytes
+    group_bytes = min(scan["distinct_opinions"], DEFAULT_MAX_GROUPS) * (
+        scan["frame_bytes_per_row"] + (completion_per_employee * FEEDBACK_BYTES_PER_TOKEN if ai_enabled else 0)
+    )
+    total = pipeline_bytes + inline_bytes + group_bytes
+    return {
+        "estimated_peak_mb": round(total / 1e6, 1),
+        "pipeline_mb": round(pipeline_bytes / 1e6, 1),
+        "inline_results_mb": round(inline_bytes / 1e6, 1),
+        "opinion_groups_mb": round(group_bytes / 1e6, 1),
+        "rows_in_flight": rows_in_flight,
+        "frame_bytes_per_row": round(scan["frame_bytes_per_row"], 1),
+    }
+
+
+def estimate_job(db, file_path: str, sample_size: Optional[int], enable_ai: bool, model: str,
+                 max_tokens: int, pack_size: int, chunk_size: int, dedup_enabled: bool,
+                 bypass_cache: bool = False, compare_models: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    분석 작업 사전 추정 (동기 - 파일 읽기/캐시 조회 포함이므로 스레드에서 호출)
+
+    Returns:
+        행 수, 고유 의견 수, 모델별 토큰/비용, 예상 소요 시간, 예상 메모리, 보정 정보
+    """
+    calibration = load_calibration(db)
+    scan = scan_file(file_path, sample_size, chunk_size, dedup_enabled)
+    rows = scan["rows"]
+    completion_per_employee = calibration["completion_tokens_per_employee"]
+
+    local_seconds = rows * calibration["local_seconds_per_row"]
+    models: Dict[str, Any] = {}
+    for name in dict.fromkeys([model, *compare_models]):
+        llm = estimate_llm(scan["chunks"], name, max_tokens, pack_size, completion_per_employee,
+                           use_cache=not bypass_cache)
+        timing = estimate_llm_seconds(llm["requests"], llm["total_tokens"], len(scan["chunks"]),
+                                      calibration["llm_latency_seconds"])
+        llm["llm_seconds"] = timing["seconds"]
+        llm["llm_bound"] = timing["bound"]
+        # 파이프라인 단계가 겹쳐 실행되므로 로컬 처리와 LLM 구간 중 긴 쪽이 전체 시간을 결정
+        llm["wall_clock_seconds"] = round(max(local_seconds, timing["seconds"]), 1)
+        models[name] = llm
+
+    selected = models[model]
+    wall_clock = selected["wall_clock_seconds"] if enable_ai else round(local_seconds, 1)
+    return {
+        "rows": rows,
+        "distinct_opinions": scan["distinct_opinions"],
+        "dedup_ratio": round(1 - scan["distinct_opinions"] / rows, 4) if rows else 0.0,
+        "chunks": len(scan["chunks"]),
+        "columns": scan["columns"],
+        "ai_enabled": enable_ai,
+        "pack_size": pack_size,
+        "models": models,
+        "estimated_seconds": wall_clock,
+        "local_seconds": round(local_seconds, 1),
+        "memory": estimate_memory(scan, rows, chunk_size, enable_ai, completion_per_employee),
+        "calibration": calibration,
+    }
@@ -0,0 +1,117 @@
+# app/services/job_lease.py
+"""
+AIRISS 분석 작업 임대(lease)
+여러 인스턴스가 같은 DB 를 쓸 때 작업 하나를 한 인스턴스만 실행하도록 jobs.owner / jobs.lease_expires_at 으로 소유권 관리
+
+- 실행 중인 인스턴스는 AIRISS_JOB_HEARTBEAT_SECONDS 마다 임대를 AIRISS_JOB_LEASE_SECONDS 만큼 연장
+- 다른 인스턴스는 임대가 만료된 작업만 조건부 UPDATE 로 가져감 (한 인스턴스만 성공)
+- 청크 저장은 같은 트랜잭션에서 소유권을 확인하고 임대를 연장 - 소유권을 잃었으면 JobLeaseLost
+- 임대 컬럼이 비어 있는 작업(임대 도입 전 생성)은 updated_at 이 AIRISS_RESUME_STALE_SECONDS 보다 오래된 경우만 가져감
+
+만료 시각은 각 인스턴스의 시계로 계산하므로 인스턴스 간 시계 차이는 임대 시간보다 충분히 작아야 합니다.
+"""
+
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, inspect, or_, text
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = float(os.getenv("AIRISS_JOB_LEASE_SECONDS", "60"))
+HEARTBEAT_SECONDS = float(os.getenv("AIRISS_JOB_HEARTBEAT_SECONDS", "10"))
+LEASE_COLUMNS = ("owner", "lease_expires_at")
+
+
+class JobLeaseLost(RuntimeError):
+    """다른 인스턴스가 작업을 가져가 더 이상 결과를 저장하면 안 됨"""
+
+
+def new_owner_id() -> str:
+    """인스턴스 식별자 (호스트:PID:임의값)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def lease_expiry(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now()) + timedelta(seconds=LEASE_SECONDS)
+
+
+def claimable_filter(now: datetime, stale_seconds: float):
+    """임대가 만료된 작업 (임대가 없는 이전 작업은 updated_at 기준)"""
+    stale_before = now - timedelta(seconds=stale_seconds)
+    return or_(
+        Job.lease_expires_at < now,
+        and_(
+            Job.lease_expires_at.is_(None),
+            or_(Job.updated_at < stale_before, and_(Job.updated_at.is_(None), Job.start_time < stale_before))
+        )
+    )
+
+
+def claim(db: Session, job_id: str, owner: str, statuses, stale_seconds: float) -> bool:
+    """만료된 임대를 조건부 UPDATE 로 가져옴 - 다른 인스턴스가 먼저 가져갔거나 아직 유효하면 False (커밋 포함)"""
+    now = datetime.now()
+    won = db.query(Job).filter(
+        Job.id == job_id,
+        Job.status.in_(statuses),
+        or_(Job.owner == owner, claimable_filter(now, stale_seconds))
+    ).update({Job.owner: owner, Job.lease_expires_at: lease_expiry(now), Job.updated_at: now},
+             synchronize_session=False)
+    db.commit()
+    return bool(won)
+
+
+def claimable_job_ids(db: Session, statuses, stale_seconds: float) -> List[str]:
+    """재개 후보 작업 ID (임대 만료)"""
+    now = datetime.now()
+    return [job_id for (job_id,) in db.query(Job.id).filter(
+        Job.status.in_(statuses), claimable_filter(now, stale_seconds)
+    ).all()]
+
+
+def renew(db: Session, job_id: str, owner: str) -> bool:
+    """
+    소유한 임대 연장 (호출 측 트랜잭션에서 - 커밋하지 않음)
+
+    PostgreSQL 에서는 이 UPDATE 가 작업 행을 잠그므로 같은 트랜잭션의 저장이 커밋될 때까지
+    다른 인스턴스의 claim 이 기다렸다가 연장된 임대를 보고 실패합니다.
+    """
+    return bool(db.query(Job).filter(Job.id == job_id, Job.owner == owner).update(
+        {Job.lease_expires_at: lease_expiry()}, synchronize_session=False
+    ))
+
+
+def release(db: Session, job_id: str, owner: str) -> bool:
+    """임대 해제 (작업 종료 시, 커밋 포함)"""
+    released = db.query(Job).filter(Job.id == job_id, Job.owner == owner).update(
+        {Job.lease_expires_at: None}, synchronize_session=False
+    )
+    db.commit()
+    return bool(released)
+
+
+def ensure_job_lease_schema(engine) -> List[str]:
+    """기존 jobs 테이블에 임대 컬럼 추가 (없는 컬럼만) - 추가된 컬럼 이름 반환"""
+    table = Job.__table__
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return []
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    added = []
+    with engine.begin() as conn:
+        for name in LEASE_COLUMNS:
+            if name in existing:
+                continue
+            column_type = table.c[name].type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}"))
+            added.append(name)
+    if added:
+        logger.info(f"Added job lease columns to {table.name}: {', '.join(added)}")
+    return added
@@ -0,0 +1,456 @@
+# app/services/llm_executor.py
+"""
+AIRISS LLM 실행기
+프로세스 단위 OpenAI 호출 실행기 - 공유 커넥션 풀 + 동시성 제한 + 토큰 버킷 + 재시도
+
+- 동시 요청 수 제한 (AIRISS_LLM_CONCURRENCY)
+- 분당 요청/토큰 한도 토큰 버킷 (AIRISS_LLM_RPM / AIRISS_LLM_TPM)
+- 429/5xx/연결 오류 재시도, Retry-After 헤더 준수 (AIRISS_LLM_MAX_ATTEMPTS)
+- API 키별 AsyncOpenAI 클라이언트와 httpx 커넥션 풀을 이벤트 루프 단위로 재사용
+"""
+
+import asyncio
+import contextvars
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROXY_URL = "http://localhost:8080/api/v1/proxy/openai/chat/completions"
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text: str) -> int:
+    """프롬프트 토큰 수 추정 (영문 약 4자당 1토큰, 한글 등 비ASCII는 글자당 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Retry-After / retry-after-ms 헤더를 대기 초로 변환 (없으면 None)"""
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMRequestError(Exception):
+    """LLM 호출 실패 (재시도 가능 여부/상태 코드/대기 시간 포함)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retryable: bool = False, retry_after: Optional[float] = None,
+                 kind: str = "error"):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.kind = kind  # auth / rate_limit / timeout / connection / error / exhausted
+
+
+@dataclass
+class LLMResponse:
+    """LLM 응답 텍스트와 사용량"""
+    content: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    via: str = "direct"
+    attempts: int = 1
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class TokenBucket:
+    """분당 한도 토큰 버킷 (용량 = 분당 한도, 초당 한도/60 씩 충전)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """amount 만큼 확보될 때까지 대기, 대기한 초를 반환"""
+        if self.capacity <= 0:
+            return 0.0
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def refund(self, amount: float):
+        """추정치보다 적게 사용한 만큼 반환"""
+        if self.capacity <= 0 or amount <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class LLMJobUsage:
+    """작업 단위 LLM 호출 사용량 (작업 시간/비용 예측 보정용)"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.requests = 0
+        self.succeeded = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.request_seconds = 0.0  # 응답 대기 시간 합 (동시성 제한/분당 한도 대기 제외)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "request_seconds": round(self.request_seconds, 3),
+            "avg_latency_seconds": round(self.request_seconds / self.requests, 3) if self.requests else None,
+        }
+
+
+_current_usage: contextvars.ContextVar[Optional[LLMJobUsage]] = contextvars.ContextVar(
+    "llm_job_usage", default=None
+)
+
+
+class _LoopResources:
+    """이벤트 루프에 묶이는 자원 (세마포어, httpx/OpenAI 클라이언트)"""
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.http_client = None
+        self.openai_clients: Dict[str, Any] = {}
+
+
+class LLMExecutor:
+    """프로세스 공용 LLM 호출 실행기"""
+
+    def __init__(self, concurrency: int = 16, requests_per_minute: int = 500,
+                 tokens_per_minute: int = 200000, max_attempts: int = 3,
+                 request_timeout: float = 60.0, proxy_url: Optional[str] = DEFAULT_PROXY_URL):
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.request_timeout = request_timeout
+        self.proxy_url = proxy_url or None
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+
+        self._resources: Dict[int, _LoopResources] = {}
+        self._resources_lock = threading.Lock()
+        self._proxy_retry_at = 0.0
+
+        self.counters = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "proxy_fallbacks": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "throttle_wait_seconds": 0.0,
+        }
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._recent_jobs: Dict[str, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------
+    # 자원 관리
+    # ------------------------------------------------------------------
+    def _loop_resources(self) -> _LoopResources:
+        loop = asyncio.get_running_loop()
+        with self._resources_lock:
+            resources = self._resources.get(id(loop))
+            if resources is None:
+                resources = _LoopResources(self.concurrency)
+                self._resources[id(loop)] = resources
+            return resources
+
+    def _http_client(self, resources: _LoopResources):
+        """커넥션 풀을 공유하는 httpx.AsyncClient (동시성 한도만큼 연결 유지)"""
+        if resources.http_client is None or resources.http_client.is_closed:
+            import httpx
+            resources.http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.request_timeout, connect=30.0),
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency
+                )
+            )
+        return resources.http_client
+
+    def _openai_client(self, resources: _LoopResources, api_key: str):
+        """API 키별 AsyncOpenAI 클라이언트 (재시도는 실행기가 담당하므로 max_retries=0)"""
+        client = resources.openai_clients.get(api_key)
+        if client is None:
+            import openai
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                max_retries=0,
+                http_client=self._http_client(resources)
+            )
+            resources.openai_clients[api_key] = client
+        return client
+
+    async def aclose(self):
+        """현재 이벤트 루프의 커넥션 풀 종료"""
+        loop = asyncio.get_running_loop()
+        with self._resources_lock:
+            resources = self._resources.pop(id(loop), None)
+        if resources and resources.http_client is not None:
+            await resources.http_client.aclose()
+
+    # ------------------------------------------------------------------
+    # 작업별 사용량
+    # ------------------------------------------------------------------
+    @contextmanager
+    def track_job(self, job_id: str):
+        """작업 범위 내 호출 수/토큰/응답 시간 집계"""
+        usage = LLMJobUsage(job_id)
+        token = _current_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _current_usage.reset(token)
+            self._recent_jobs[job_id] = usage.to_dict()
+            # 최근 작업 통계만 보관
+            while len(self._recent_jobs) > 100:
+                self._recent_jobs.pop(next(iter(self._recent_jobs)))
+
+    def job_usage(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업별 사용량 (진행 중인 현재 작업 포함)"""
+        usage = _current_usage.get()
+        if usage is not None and usage.job_id == job_id:
+            return usage.to_dict()
+        return self._recent_jobs.get(job_id)
+
+    # ------------------------------------------------------------------
+    # 호출
+    # ------------------------------------------------------------------
+    async def chat_completion(self, messages: List[Dict[str, str]], model: str,
+                              max_tokens: int, api_key: str,
+                              temperature: float = 0.7) -> LLMResponse:
+        """
+        동시성/분당 한도를 지키며 chat completion 호출 (재시도 포함)
+
+        Raises:
+            LLMRequestError: 재시도 불가 오류 또는 재시도 횟수 초과
+        """
+        resources = self._loop_resources()
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        estimated_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages) + max_tokens
+        usage = _current_usage.get()
+
+        last_error: Optional[LLMRequestError] = None
+        for attempt in range(1, self.max_attempts + 1):
+            # 분당 한도 대기는 세마포어 밖에서 (대기 중인 요청이 동시성 슬롯을 점유하지 않도록)
+            waited = await self.request_bucket.acquire(1)
+            waited += await self.token_bucket.acquire(estimated_tokens)
+            self.counters["throttle_wait_seconds"] += waited
+
+            async with resources.semaphore:
+                self.counters["requests"] += 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                started = time.monotonic()
+                try:
+                    response = await self._send(resources, payload, api_key)
+                except LLMRequestError as e:
+                    last_error = e
+                else:
+                    response.attempts = attempt
+                    self.counters["succeeded"] += 1
+                    self.counters["prompt_tokens"] += response.prompt_tokens
+                    self.counters["completion_tokens"] += response.completion_tokens
+                    if usage is not None:
+                        usage.succeeded += 1
+                        usage.prompt_tokens += response.prompt_tokens
+                        usage.completion_tokens += response.completion_tokens
+                    if response.total_tokens:
+                        self.token_bucket.refund(estimated_tokens - response.total_tokens)
+                    return response
+                finally:
+                    self.in_flight -= 1
+                    if usage is not None:
+                        usage.requests += 1
+                        usage.request_seconds += time.monotonic() - started
+
+            if last_error.kind == "rate_limit":
+                self.counters["rate_limited"] += 1
+            if not last_error.retryable or attempt == self.max_attempts:
+                break
+
+            # Retry-After 우선, 없으면 지수 백오프 + 지터 (세마포어 반납 후 대기)
+            delay = last_error.retry_after
+            if delay is None:
+                delay = min(30.0, 2.0 * (2 ** (attempt - 1))) * (0.5 + random.random() / 2)
+            self.counters["retries"] += 1
+            logger.info(f"⏳ LLM 재시도 {attempt}/{self.max_attempts - 1} - {delay:.1f}초 후 ({last_error})")
+            await asyncio.sleep(delay)
+
+        self.counters["failed"] += 1
+        if last_error.retryable:
+            raise LLMRequestError(
+                f"최대 재시도 횟수 초과: {last_error}",
+                status_code=last_error.status_code,
+                kind="exhausted" if last_error.kind != "timeout" else "timeout"
+            )
+        raise last_error
+
+    async def _send(self, resources: _LoopResources, payload: Dict[str, Any], api_key: str) -> LLMResponse:
+        """
+        내부 프록시 우선 호출, 프록시에 연결할 수 없을 때만 OpenAI 직접 호출
+
+        프록시가 돌려준 HTTP 오류(429/503 등)는 LLMRequestError 로 올려 Retry-After 를 지키며 재시도
+        """
+        if self.proxy_url and time.monotonic() >= self._proxy_retry_at:
+            import httpx
+            try:
+                return await self._send_via_proxy(resources, payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as proxy_error:
+                # 프록시 장애 동안 매 요청마다 왕복하지 않도록 잠시 건너뜀
+                self._proxy_retry_at = time.monotonic() + 60.0
+                self.counters["proxy_fallbacks"] += 1
+                logger.warning(f"⚠️ 내부 프록시 연결 실패, 직접 연결 사용: {proxy_error}")
+        return await self._send_direct(resources, payload, api_key)
+
+    async def _send_via_proxy(self, resources: _LoopResources, payload: Dict[str, Any]) -> LLMResponse:
+        """
+        내부 프록시 호출
+
+        Raises:
+            httpx.ConnectError / httpx.ConnectTimeout: 프록시 연결 불가 (직접 호출로 대체)
+            LLMRequestError: 프록시 응답 오류, 응답 대기 시간 초과, 잘못된 응답 형식
+        """
+        import httpx
+
+        try:
+            response = await self._http_client(resources).post(self.proxy_url, json=payload)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            raise
+        except httpx.TimeoutException as e:
+            raise LLMRequestError(f"proxy timeout: {e}", retryable=True, kind="timeout")
+        except httpx.TransportError as e:
+            raise LLMRequestError(f"proxy connection error: {e}", retryable=True, kind="connection")
+
+        status = response.status_code
+        if status != 200:
+            raise LLMRequestError(
+                f"프록시 오류: {status}",
+                status_code=status,
+                retryable=status in RETRYABLE_STATUS_CODES,
+                retry_after=parse_retry_after(response.headers),
+                kind="auth" if status == 401 else "rate_limit" if status == 429 else "error"
+            )
+        try:
+            result = response.json()
+        except ValueError:
+            result = None
+        if not isinstance(result, dict) or "choices" not in result:
+            raise LLMRequestError("Invalid response format (proxy)", status_code=status, kind="error")
+        usage = result.get("usage") or {}
+        return LLMResponse(
+            content=result["choices"][0]["message"]["content"],
+            model=result.get("model", payload["model"]),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            via="proxy"
+        )
+
+    async def _send_direct(self, resources: _LoopResources, payload: Dict[str, Any], api_key: str) -> LLMResponse:
+        import openai
+
+        client = self._openai_client(resources, api_key)
+        try:
+            completion = await client.chat.completions.create(**payload, timeout=self.request_timeout)
+        except openai.AuthenticationError as e:
+            raise LLMRequestError(str(e), status_code=401, kind="auth")
+        except openai.APIStatusError as e:
+            status = e.status_code
+            raise LLMRequestError(
+                str(e),
+                status_code=status,
+                retryable=status in RETRYABLE_STATUS_CODES,
+                retry_after=parse_retry_after(e.response.headers if e.response is not None else None),
+                kind="rate_limit" if status == 429 else "error"
+            )
+        except openai.APITimeoutError as e:
+            raise LLMRequestError(f"timeout: {e}", retryable=True, kind="timeout")
+        except openai.APIConnectionError as e:
+            raise LLMRequestError(f"connection error: {e}", retryable=True, kind="connection")
+
+        usage = completion.usage
+        return LLMResponse(
+            content=completion.choices[0].message.content if completion.choices else "",
+            model=completion.model or payload["model"],
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            via="direct"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """호출 통계"""
+        return {
+            **self.counters,
+            "throttle_wait_seconds": round(self.counters["throttle_wait_seconds"], 3),
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "concurrency": self.concurrency,
+            "requests_per_minute": self.request_bucket.capacity,
+            "tokens_per_minute": self.token_bucket.capacity,
+        }
+
+
+# 전역 실행기 인스턴스
+llm_executor = LLMExecutor(
+    concurrency=int(os.getenv("AIRISS_LLM_CONCURRENCY", "16")),
+    requests_per_minute=int(os.getenv("AIRISS_LLM_RPM", "500")),
+    tokens_per_minute=int(os.getenv("AIRISS_LLM_TPM", "200000")),
+    max_attempts=int(os.getenv("AIRISS_LLM_MAX_ATTEMPTS", "3")),
+    proxy_url=os.getenv("AIRISS_OPENAI_PROXY_URL", DEFAULT_PROXY_URL),
+)
@@ -0,0 +1,367 @@
+# app/services/llm_response_cache.py
+"""
+AIRISS LLM 응답 캐시
+모델 + 프롬프트 해시 + temperature + max_tokens 를 키로 하는 SQLite 영구 응답 캐시
+
+- 원문 응답과 파싱 결과를 함께 저장 (재실행/재시도/재내보내기 시 API 호출 생략)
+- TTL 만료 (AIRISS_LLM_CACHE_TTL_SECONDS), 항목 수 상한 초과 시 오래 사용되지 않은 순 제거
+- 호출 단위 bypass 플래그 + 전역 우회 (AIRISS_LLM_CACHE_BYPASS)
+- 작업 단위 적중률/절약 토큰 집계 (track_job 컨텍스트)
+- DB 파일은 첫 사용 시 연결 (기본 경로: 데이터셋 디렉터리 AIRISS_DATASET_DIR 아래)
+
+캐시는 인스턴스별 로컬 파일이므로 재배포/컨테이너 교체 시 사라지고 다른 인스턴스와 공유되지 않으며,
+AIRISS_LLM_CACHE_PATH 를 빈 값으로 두면 꺼집니다. 이 경우(다른 인스턴스가 재개한 경우 포함) 중단 후
+재개한 작업도 마지막 체크포인트 이후 행의 LLM 응답을 다시 요청합니다.
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from app.utils.columnar_store import DATASET_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 50000
+EVICTION_CHECK_INTERVAL = 100  # 저장 N회마다 상한 점검
+TOUCH_FLUSH_SIZE = 200         # 적중 시 접근 시각 갱신을 모아서 기록할 개수
+DEFAULT_DB_PATH = os.path.join(DATASET_DIR, "llm_response_cache.db")
+
+
+class LLMCacheJobStats:
+    """작업 단위 캐시 사용 통계"""
+
+    def __init__(self, job_id: str, bypass: bool = False, fresh_since: Optional[float] = None):
+        self.job_id = job_id
+        self.bypass = bypass
+        self.fresh_since = fresh_since  # bypass 작업이라도 이 시각 이후 저장된 응답은 재사용 (재개 시)
+        self.lookups = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.tokens_saved = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+        }
+
+
+_current_job: contextvars.ContextVar[Optional[LLMCacheJobStats]] = contextvars.ContextVar(
+    "llm_cache_job", default=None
+)
+
+
+class LLMResponseCache:
+    """SQLite 기반 LLM 응답 캐시"""
+
+    def __init__(self, db_path: Optional[str], ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, bypass: bool = False):
+        self.db_path = db_path or None
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.bypass = bypass
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open_failed = False
+        # 적중한 키 -> (마지막 접근 시각, 적중 횟수) - 조회마다 쓰기/커밋하지 않도록 모아서 기록
+        self._pending_touches: Dict[str, list] = {}
+        self._stores_since_check = 0
+        self._recent_jobs: Dict[str, Dict[str, Any]] = {}
+
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "evictions": 0,
+            "tokens_saved": 0,
+            "errors": 0,
+        }
+
+    def _open(self):
+        """캐시 DB 연결 및 테이블 생성 (실패 시 캐시 비활성)"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                "cache_key TEXT PRIMARY KEY, "
+                "model TEXT NOT NULL, "
+                "prompt_hash TEXT NOT NULL, "
+                "temperature REAL, "
+                "max_tokens INTEGER, "
+                "raw_text TEXT NOT NULL, "
+                "parsed TEXT, "
+                "prompt_tokens INTEGER DEFAULT 0, "
+                "completion_tokens INTEGER DEFAULT 0, "
+                "created_at REAL NOT NULL, "
+                "last_accessed REAL NOT NULL, "
+                "hit_count INTEGER DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_accessed ON llm_response_cache (last_accessed)"
+            )
+            self._conn.commit()
+            logger.info(f"✅ LLM 응답 캐시 연결: {self.db_path}")
+        except Exception as e:
+            logger.warning(f"⚠️ LLM 응답 캐시 연결 실패 - 캐시 없이 동작: {e}")
+            self._conn = None
+            self._open_failed = True
+
+    @property
+    def available(self) -> bool:
+        """캐시 사용 가능 여부 (처음 확인할 때 DB 연결 - 모듈 import 만으로 파일을 만들지 않음)"""
+        if self._conn is None and self.db_path and not self._open_failed:
+            with self._lock:
+                if self._conn is None and not self._open_failed:
+                    self._open()
+        return self._conn is not None
+
+    def _flush_touches(self):
+        """모아둔 접근 시각/적중 횟수 기록 (lock 보유 상태에서 호출, 커밋은 호출 측)"""
+        if not self._pending_touches:
+            return
+        self._conn.executemany(
+            "UPDATE llm_response_cache SET last_accessed = ?, hit_count = hit_count + ? WHERE cache_key = ?",
+            [(accessed, hits, cache_key) for cache_key, (accessed, hits) in self._pending_touches.items()]
+        )
+        self._pending_touches.clear()
+
+    @staticmethod
+    def prompt_hash(prompt: str, system_prompt: str = "") -> str:
+        """시스템 프롬프트 + 사용자 프롬프트 해시"""
+        return hashlib.sha256(f"{system_prompt}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    @classmethod
+    def make_key(cls, model: str, prompt: str, temperature: float, max_tokens: int,
+                 system_prompt: str = "") -> Dict[str, Any]:
+        """캐시 키 구성요소 (model + prompt_hash + temperature + max_tokens)"""
+        prompt_hash = cls.prompt_hash(prompt, system_prompt)
+        key_source = json.dumps([model, prompt_hash, float(temperature), int(max_tokens)])
+        return {
+            "cache_key": hashlib.sha256(key_source.encode("utf-8")).hexdigest(),
+            "model": model,
+            "prompt_hash": prompt_hash,
+            "temperature": float(temperature),
+            "max_tokens": int(max_tokens),
+        }
+
+    def _should_bypass(self, bypass: bool) -> bool:
+        job = _current_job.get()
+        return bypass or self.bypass or (job is not None and job.bypass and job.fresh_since is None)
+
+    def get(self, key: Dict[str, Any], bypass: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회
+
+        Returns:
+            {"raw_text", "parsed", "prompt_tokens", "completion_tokens", "created_at"} 또는 None
+        """
+        if not self.available:
+            return None
+
+        job = _current_job.get()
+        if self._should_bypass(bypass):
+            self.counters["bypassed"] += 1
+            if job is not None:
+                job.bypassed += 1
+            return None
+
+        fresh_since = job.fresh_since if job is not None and job.bypass else None
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT raw_text, parsed, prompt_tokens, completion_tokens, created_at "
+                    "FROM llm_response_cache WHERE cache_key = ?",
+                    (key["cache_key"],)
+                ).fetchone()
+                if row is not None and fresh_since is not None and row[4] < fresh_since:
+                    row = None
+                if row is not None and self.ttl_seconds and now - row[4] > self.ttl_seconds:
+                    # 만료 항목 삭제는 다음 정리(_evict)에서 - 조회 경로는 읽기만 함
+                    self.counters["expired"] += 1
+                    row = None
+                if row is not None:
+                    touch = self._pending_touches.setdefault(key["cache_key"], [now, 0])
+                    touch[0] = now
+                    touch[1] += 1
+                    if len(self._pending_touches) >= TOUCH_FLUSH_SIZE:
+                        self._flush_touches()
+                        self._conn.commit()
+            except sqlite3.Error as e:
+                self.counters["errors"] += 1
+                logger.warning(f"⚠️ LLM 응답 캐시 조회 실패: {e}")
+                row = None
+
+        if job is not None:
+            job.lookups += 1
+
+        if row is None:
+            self.counters["misses"] += 1
+            if job is not None:
+                job.misses += 1
+            return None
+
+        tokens = (row[2] or 0) + (row[3] or 0)
+        self.counters["hits"] += 1
+        self.counters["tokens_saved"] += tokens
+        if job is not None:
+            job.hits += 1
+            job.tokens_saved += tokens
+
+        return {
+            "raw_text": row[0],
+            "parsed": json.loads(row[1]) if row[1] is not None else None,
+            "prompt_tokens": row[2] or 0,
+            "completion_tokens": row[3] or 0,
+            "created_at": row[4],
+        }
+
+    def contains(self, key: Dict[str, Any]) -> bool:
+        """유효한 응답이 저장되어 있는지 확인 (통계/접근 시각을 바꾸지 않음 - 작업 사전 추정용)"""
+        if not self.available or self.bypass:
+            return False
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT created_at FROM llm_response_cache WHERE cache_key = ? AND parsed IS NOT NULL",
+                    (key["cache_key"],)
+                ).fetchone()
+            except sqlite3.Error:
+                return False
+        return row is not None and not (self.ttl_seconds and time.time() - row[0] > self.ttl_seconds)
+
+    def put(self, key: Dict[str, Any], raw_text: str, parsed: Any = None,
+            prompt_tokens: int = 0, completion_tokens: int = 0):
+        """응답 저장 (bypass 여부와 무관하게 최신 응답으로 갱신)"""
+        if not self.available:
+            return
+
+        now = time.time()
+        parsed_json = json.dumps(parsed, ensure_ascii=False, default=str) if parsed is not None else None
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_response_cache "
+                    "(cache_key, model, prompt_hash, temperature, max_tokens, raw_text, parsed, "
+                    "prompt_tokens, completion_tokens, created_at, last_accessed, hit_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (key["cache_key"], key["model"], key["prompt_hash"], key["temperature"],
+                     key["max_tokens"], raw_text, parsed_json, prompt_tokens or 0,
+                     completion_tokens or 0, now, now)
+                )
+                self._pending_touches.pop(key["cache_key"], None)
+                self._flush_touches()
+                self._conn.commit()
+                self._stores_since_check += 1
+                if self._stores_since_check >= EVICTION_CHECK_INTERVAL:
+                    self._stores_since_check = 0
+                    self._evict(now)
+            except sqlite3.Error as e:
+                self.counters["errors"] += 1
+                logger.warning(f"⚠️ LLM 응답 캐시 저장 실패: {e}")
+                return
+
+        self.counters["stores"] += 1
+        job = _current_job.get()
+        if job is not None:
+            job.stores += 1
+
+    def _evict(self, now: float):
+        """만료 항목 삭제 후 상한 초과분을 마지막 사용 시각이 오래된 순으로 제거 (lock 보유 상태에서 호출)"""
+        evicted = 0
+        self._flush_touches()
+        if self.ttl_seconds:
+            evicted += self._conn.execute(
+                "DELETE FROM llm_response_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        if self.max_entries:
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                evicted += self._conn.execute(
+                    "DELETE FROM llm_response_cache WHERE cache_key IN ("
+                    "SELECT cache_key FROM llm_response_cache ORDER BY last_accessed ASC LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+        self._conn.commit()
+        self.counters["evictions"] += evicted
+
+    @contextmanager
+    def track_job(self, job_id: str, bypass: bool = False, fresh_since: Optional[float] = None):
+        """
+        작업 범위 내 캐시 사용량 집계
+
+        bypass=True면 해당 작업은 캐시를 읽지 않음. 단 fresh_since(작업 시작 시각)를 주면
+        그 이후 저장된 응답(중단 전 같은 작업이 받은 응답)은 재사용합니다.
+        """
+        stats = LLMCacheJobStats(job_id, bypass=bypass, fresh_since=fresh_since)
+        token = _current_job.set(stats)
+        try:
+            yield stats
+        finally:
+            _current_job.reset(token)
+            self._recent_jobs[job_id] = stats.to_dict()
+            # 최근 작업 통계만 보관
+            while len(self._recent_jobs) > 100:
+                self._recent_jobs.pop(next(iter(self._recent_jobs)))
+
+    def job_stats(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업별 적중률/절약 토큰 (진행 중인 현재 작업 포함)"""
+        job = _current_job.get()
+        if job is not None and job.job_id == job_id:
+            return job.to_dict()
+        return self._recent_jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """전체 캐시 통계"""
+        entries = 0
+        if self.available:
+            with self._lock:
+                try:
+                    entries = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            "available": self.available,
+            "db_path": self.db_path if self.available else None,
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "bypass": self.bypass,
+        }
+
+
+# 전역 캐시 인스턴스 (AIRISS_LLM_CACHE_PATH 를 빈 값으로 두면 비활성, 첫 사용 시 연결)
+llm_response_cache = LLMResponseCache(
+    db_path=os.getenv("AIRISS_LLM_CACHE_PATH", DEFAULT_DB_PATH),
+    ttl_seconds=int(os.getenv("AIRISS_LLM_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS))),
+    max_entries=int(os.getenv("AIRISS_LLM_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))),
+    bypass=os.getenv("AIRISS_LLM_CACHE_BYPASS", "false").lower() in ("1", "true", "yes"),
+)
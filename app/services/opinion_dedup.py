@@ -0,0 +1,165 @@
+# app/services/opinion_dedup.py
+"""
+AIRISS 분석 작업 내 중복 의견 묶기
+같거나 거의 같은 평가 의견(템플릿 문구, 빈 의견 등)을 한 번만 분석하고 결과를 같은 그룹의 직원들에게 공유
+
+- 그룹 키: TextCleaner.clean 과 같은 정규화 (길이 제한 없이 - 짧은 의견도 서로 구분)
+- 텍스트 점수화: 그룹의 대표 의견(작업에서 처음 나온 원문)으로 계산 → 분석 캐시로 그룹당 1회
+- AI 피드백: 그룹당 1회 요청, 같은 청크/이후 청크의 같은 그룹 행은 결과를 공유 (실패한 응답은 공유하지 않음)
+- 정량 점수는 기존대로 행마다 계산
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.utils.text_cleaning import TextCleaner
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEDUP_ENABLED = os.getenv("AIRISS_DEDUP_OPINIONS", "true").lower() == "true"
+DEFAULT_MAX_GROUPS = int(os.getenv("AIRISS_DEDUP_MAX_GROUPS", "50000"))  # 대표 의견/피드백 보관 그룹 수 상한
+
+
+class OpinionDeduplicator:
+    """작업 1개의 의견 그룹 (정규화 키 → 대표 의견 / 공유 AI 피드백)"""
+
+    def __init__(self, enabled: bool = DEFAULT_DEDUP_ENABLED, max_groups: int = DEFAULT_MAX_GROUPS):
+        self.enabled = enabled
+        self.max_groups = max(1, max_groups)
+        self._cleaner = TextCleaner(min_length=0, max_length=sys.maxsize)
+        self._representatives: "OrderedDict[str, str]" = OrderedDict()
+        self._feedback: Dict[str, asyncio.Future] = {}
+
+        self.rows = 0
+        self.groups = 0
+        self.feedback_requests = 0
+        self.feedback_shared = 0
+
+    def key(self, opinion: Any) -> str:
+        """그룹 키 (TextCleaner.clean 정규화, 빈 의견은 빈 문자열)"""
+        if opinion is None:
+            return ""
+        return self._cleaner.clean(str(opinion)) or ""
+
+    def assign(self, opinions: Sequence[Any]) -> Tuple[List[str], List[str]]:
+        """
+        행별 그룹 키와 점수화에 쓸 대표 의견
+
+        Returns:
+            (그룹 키 목록, 대표 의견 목록) - 비활성화 상태면 원문을 그대로 사용
+        """
+        opinions = [str(opinion) for opinion in opinions]
+        self.rows += len(opinions)
+        if not self.enabled:
+            self.groups += len(opinions)
+            return opinions, opinions
+
+        keys, representatives = [], []
+        for opinion in opinions:
+            key = self.key(opinion)
+            representative = self._representatives.get(key)
+            if representative is None:
+                representative = opinion
+                self._representatives[key] = opinion
+                self.groups += 1
+                if len(self._representatives) > self.max_groups:
+                    evicted, _ = self._representatives.popitem(last=False)
+                    self._feedback.pop(evicted, None)
+            else:
+                self._representatives.move_to_end(key)
+            keys.append(key)
+            representatives.append(representative)
+        return keys, representatives
+
+    def cached_feedback(self, key: str) -> Optional[Dict[str, Any]]:
+        """이미 받은 그룹 AI 피드백 (없거나 아직 요청 중이면 None)"""
+        future = self._feedback.get(key)
+        if future is None or not future.done() or future.cancelled() or future.exception():
+            return None
+        return future.result()
+
+    def store_feedback(self, key: str, feedback: Optional[Dict[str, Any]]):
+        """묶음 요청 등으로 받은 그룹 AI 피드백 등록 (실패 응답은 등록하지 않음)"""
+        if not self.enabled or not feedback or feedback.get("error"):
+            return
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(feedback)
+        self._feedback[key] = future
+        self.feedback_requests += 1
+
+    async def feedback(self, key: str, request: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """그룹 AI 피드백 - 그룹당 한 번만 request() 를 호출하고 동시/이후 요청은 결과를 공유"""
+        if not self.enabled:
+            self.feedback_requests += 1
+            return await request()
+
+        future = self._feedback.get(key)
+        if future is not None:
+            self.feedback_shared += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._feedback[key] = future
+        self.feedback_requests += 1
+        try:
+            result = await request()
+        except Exception as e:
+            self._feedback.pop(key, None)
+            future.set_exception(e)
+            future.exception()  # 대기자가 없을 때 미확인 예외 경고 방지
+            raise
+        except BaseException:
+            self._feedback.pop(key, None)
+            future.cancel()
+            raise
+        if not result or result.get("error"):
+            # 실패 응답은 공유하지 않음 - 대기 중인 행에는 전달하고 이후 행은 다시 요청
+            self._feedback.pop(key, None)
+        future.set_result(result)
+        return result
+
+    async def feedback_packed(self, keys: Sequence[str], items: Sequence[Dict[str, str]],
+                              request: Callable[[List[Dict[str, str]]], Awaitable[List[Optional[Dict[str, Any]]]]]
+                              ) -> List[Optional[Dict[str, Any]]]:
+        """
+        묶음 요청 - 피드백이 없는 그룹의 첫 행만 request() 로 보내고 결과를 행별로 펼침
+
+        Returns:
+            행별 피드백 (파싱 실패 등으로 없으면 None - 호출 측에서 단건 요청으로 재시도)
+        """
+        if not self.enabled:
+            self.feedback_requests += len(items)
+            return await request(list(items))
+
+        first: Dict[str, int] = {}
+        for index, key in enumerate(keys):
+            if key not in first and self.cached_feedback(key) is None:
+                first[key] = index
+        if first:
+            fresh = await request([items[index] for index in first.values()])
+            for key, feedback in zip(first, fresh):
+                self.store_feedback(key, feedback)
+
+        results = []
+        for index, key in enumerate(keys):
+            feedback = self.cached_feedback(key)
+            if feedback is not None and first.get(key) != index:
+                self.feedback_shared += 1
+            results.append(feedback)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        duplicates = max(0, self.rows - self.groups)
+        return {
+            "enabled": self.enabled,
+            "rows": self.rows,
+            "distinct_opinions": self.groups,
+            "duplicate_rows": duplicates,
+            "dedup_ratio": round(duplicates / self.rows, 4) if self.rows else 0.0,
+            "ai_feedback_requests": self.feedback_requests,
+            "ai_feedback_shared": self.feedback_shared,
+        }
@@ -0,0 +1,147 @@
+# app/services/progress_reporter.py
+"""
+AIRISS 작업 진행률 집계기
+작업별로 잦은 진행률 갱신을 모아 WebSocket 전송/DB 저장 빈도를 제한
+
+- WebSocket: 초당 최대 AIRISS_PROGRESS_MAX_EMITS_PER_SECOND 회
+- jobs 테이블: AIRISS_PROGRESS_PERSIST_INTERVAL 초마다 최대 1회
+- 제한 구간 안에서 들어온 마지막 상태는 구간이 끝날 때 전송되고, flush() 는 항상 최종 상태를 내보냄
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EMITS_PER_SECOND = float(os.getenv("AIRISS_PROGRESS_MAX_EMITS_PER_SECOND", "4"))
+DEFAULT_PERSIST_INTERVAL = float(os.getenv("AIRISS_PROGRESS_PERSIST_INTERVAL", "2.0"))
+
+# 전체 작업 누적 카운터 (health 노출용)
+progress_counters = {
+    "received": 0,
+    "emitted": 0,
+    "suppressed": 0,
+    "persisted": 0,
+    "errors": 0,
+}
+
+
+class ProgressReporter:
+    """작업 1개의 진행률 갱신 병합기"""
+
+    def __init__(self,
+                 job_id: str,
+                 emit: Optional[Callable[[float, Dict[str, Any]], Awaitable[None]]] = None,
+                 persist: Optional[Callable[[float], Awaitable[None]]] = None,
+                 max_emits_per_second: float = DEFAULT_MAX_EMITS_PER_SECOND,
+                 persist_interval: float = DEFAULT_PERSIST_INTERVAL):
+        self.job_id = job_id
+        self._emit = emit
+        self._persist = persist
+        self.emit_interval = 1.0 / max_emits_per_second if max_emits_per_second > 0 else 0.0
+        self.persist_interval = max(0.0, persist_interval)
+
+        self._latest: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._emit_pending = False
+        self._persist_pending = False
+        self._last_emit = float("-inf")
+        self._last_persist = float("-inf")
+        self._timer: Optional[asyncio.Task] = None
+
+        self.counters = {name: 0 for name in progress_counters}
+
+    def _count(self, name: str):
+        self.counters[name] += 1
+        progress_counters[name] += 1
+
+    async def update(self, progress: float, details: Optional[Dict[str, Any]] = None, force: bool = False):
+        """진행률 갱신 (제한 구간 안이면 보관만 하고 나중에 병합 전송)"""
+        self._count("received")
+        self._latest = (progress, details or {})
+        self._emit_pending = self._emit is not None
+        self._persist_pending = self._persist is not None
+
+        now = time.monotonic()
+        emit_due = self._emit_pending and (force or now - self._last_emit >= self.emit_interval)
+        persist_due = self._persist_pending and (force or now - self._last_persist >= self.persist_interval)
+        if self._emit_pending and not emit_due:
+            self._count("suppressed")
+
+        if emit_due or persist_due:
+            await self._publish(emit=emit_due, persist=persist_due)
+        self._schedule_trailing()
+
+    def _schedule_trailing(self):
+        if (self._emit_pending or self._persist_pending) and (self._timer is None or self._timer.done()):
+            self._timer = asyncio.create_task(self._trailing())
+
+    async def _trailing(self):
+        """제한 구간이 끝나면 보류된 마지막 상태 전송"""
+        while self._emit_pending or self._persist_pending:
+            now = time.monotonic()
+            waits = []
+            if self._emit_pending:
+                waits.append(self._last_emit + self.emit_interval - now)
+            if self._persist_pending:
+                waits.append(self._last_persist + self.persist_interval - now)
+            await asyncio.sleep(max(0.0, min(waits)))
+
+            now = time.monotonic()
+            await self._publish(
+                emit=self._emit_pending and now - self._last_emit >= self.emit_interval,
+                persist=self._persist_pending and now - self._last_persist >= self.persist_interval
+            )
+
+    async def _publish(self, emit: bool, persist: bool):
+        if self._latest is None:
+            return
+        progress, details = self._latest
+
+        if emit:
+            self._emit_pending = False
+            self._last_emit = time.monotonic()
+            self._count("emitted")
+            try:
+                await self._emit(progress, details)
+            except asyncio.CancelledError:
+                self._emit_pending = True  # flush() 에서 다시 전송
+                raise
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"⚠️ 진행률 전송 실패 ({self.job_id}): {e}")
+
+        if persist:
+            self._persist_pending = False
+            self._last_persist = time.monotonic()
+            self._count("persisted")
+            try:
+                await self._persist(progress)
+            except asyncio.CancelledError:
+                self._persist_pending = True  # flush() 에서 다시 전송
+                raise
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"⚠️ 진행률 저장 실패 ({self.job_id}): {e}")
+
+    async def flush(self):
+        """보류 중인 최종 상태를 즉시 전송/저장하고 타이머 정리"""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+        self._timer = None
+        if self._emit_pending or self._persist_pending:
+            await self._publish(emit=self._emit_pending, persist=self._persist_pending)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            **self.counters,
+            "max_emits_per_second": round(1.0 / self.emit_interval, 2) if self.emit_interval else None,
+            "persist_interval": self.persist_interval,
+        }
@@ -6,16 +6,53 @@ AIRISS v4.0 정량 데이터 분석기
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 컬럼명 키워드 → 데이터 유형 (위에서부터 먼저 일치하는 유형 적용)
+COLUMN_KIND_KEYWORDS = [
+    ('score', ['점수', 'score', '평점', 'rating']),
+    ('grade', ['등급', 'grade', '평가', 'level']),
+    ('rate', ['달성률', '비율', 'rate', '%', 'percent']),
+    ('count', ['횟수', '건수', 'count', '회', '번']),
+]
+
+QUALITY_LABELS = np.array(["없음", "낮음", "중간", "높음"], dtype=object)
+
+
+def quantitative_weight(data_key: str) -> float:
+    """정량 데이터 키별 가중치 (키 문자열 기준)"""
+    if 'grade_' in data_key:
+        return 0.4
+    elif 'score_' in data_key:
+        return 0.3
+    elif 'rate_' in data_key:
+        return 0.2
+    else:
+        return 0.1
+
+
+@dataclass
+class QuantitativeColumnPlan:
+    """파일 단위로 1회 계산하는 정량 컬럼 계획 - 데이터 키별 원본 컬럼 위치/유형/가중치"""
+    keys: List[str]
+    kinds: List[str]
+    weights: np.ndarray
+    positions: List[List[int]]  # 같은 키로 모이는 컬럼 위치 (중복 컬럼명은 뒤 컬럼 값 우선)
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
 class QuantitativeAnalyzer:
     """정량 데이터 전문 분석기"""
     
     def __init__(self):
         self.grade_mappings = self._setup_grade_mappings()
+        self._column_kinds: Dict[Any, Optional[str]] = {}
         logger.info("✅ 정량 데이터 분석기 초기화 완료")
     
     def _setup_grade_mappings(self) -> Dict[str, float]:
@@ -44,6 +81,29 @@ class QuantitativeAnalyzer:
             '상위50%': 65, '하위50%': 50, '하위30%': 35, '하위10%': 20
         }
     
+    def classify_column(self, col_name) -> Optional[str]:
+        """컬럼명으로 정량 데이터 유형 판별 (score/grade/rate/count, 해당 없으면 None)"""
+        if col_name in self._column_kinds:
+            return self._column_kinds[col_name]
+        
+        col_lower = str(col_name).lower()
+        kind = None
+        for candidate, keywords in COLUMN_KIND_KEYWORDS:
+            if any(kw in col_lower for kw in keywords):
+                kind = candidate
+                break
+        self._column_kinds[col_name] = kind
+        return kind
+    
+    def _normalizer_for(self, kind: str):
+        """유형별 스칼라 정규화 함수"""
+        return {
+            'score': self._normalize_score,
+            'grade': self._convert_grade_to_score,
+            'rate': self._normalize_percentage,
+            'count': self._normalize_count,
+        }[kind]
+    
     def extract_quantitative_data(self, row: pd.Series) -> Dict[str, Any]:
         """행 데이터에서 정량적 요소 추출"""
         quant_data = {}
@@ -51,35 +111,175 @@ class QuantitativeAnalyzer:
         for col_name, value in row.items():
             if pd.isna(value) or value == '':
                 continue
-                
-            col_lower = str(col_name).lower()
-            
-            # 점수 관련
-            if any(kw in col_lower for kw in ['점수', 'score', '평점', 'rating']):
-                normalized = self._normalize_score(value)
-                if normalized is not None:
-                    quant_data[f'score_{col_name}'] = normalized
-            
-            # 등급 관련
-            elif any(kw in col_lower for kw in ['등급', 'grade', '평가', 'level']):
-                converted = self._convert_grade_to_score(value)
-                if converted is not None:
-                    quant_data[f'grade_{col_name}'] = converted
             
-            # 달성률/비율 관련
-            elif any(kw in col_lower for kw in ['달성률', '비율', 'rate', '%', 'percent']):
-                normalized = self._normalize_percentage(value)
-                if normalized is not None:
-                    quant_data[f'rate_{col_name}'] = normalized
+            kind = self.classify_column(col_name)
+            if kind is None:
+                continue
             
-            # 횟수/건수 관련
-            elif any(kw in col_lower for kw in ['횟수', '건수', 'count', '회', '번']):
-                normalized = self._normalize_count(value)
-                if normalized is not None:
-                    quant_data[f'count_{col_name}'] = normalized
+            normalized = self._normalizer_for(kind)(value)
+            if normalized is not None:
+                quant_data[f'{kind}_{col_name}'] = normalized
         
         return quant_data
     
+    def build_column_plan(self, columns) -> QuantitativeColumnPlan:
+        """파일 컬럼 목록으로 정량 컬럼 계획 생성 (유형 판별/가중치 계산을 파일당 1회로)"""
+        keys: List[str] = []
+        kinds: List[str] = []
+        positions: List[List[int]] = []
+        key_index: Dict[str, int] = {}
+        
+        for position, col_name in enumerate(columns):
+            kind = self.classify_column(col_name)
+            if kind is None:
+                continue
+            key = f'{kind}_{col_name}'
+            if key not in key_index:
+                key_index[key] = len(keys)
+                keys.append(key)
+                kinds.append(kind)
+                positions.append([])
+            positions[key_index[key]].append(position)
+        
+        return QuantitativeColumnPlan(
+            keys=keys,
+            kinds=kinds,
+            weights=np.array([quantitative_weight(key) for key in keys], dtype=float),
+            positions=positions
+        )
+    
+    def _normalize_column(self, column: pd.Series, kind: str) -> np.ndarray:
+        """
+        컬럼 전체를 0-100 점수로 정규화 (값이 없거나 변환 불가하면 NaN)
+        
+        숫자형 점수/비율/횟수 컬럼은 구간 연산으로, 그 외(등급, 문자열 등)는
+        고유값만 스칼라 변환 후 범주 코드로 펼쳐 행 단위 결과와 동일한 값을 만듭니다.
+        """
+        dtype = column.dtype
+        if (kind != 'grade' and pd.api.types.is_numeric_dtype(dtype)
+                and not pd.api.types.is_bool_dtype(dtype)):
+            values = column.to_numpy(dtype=float, na_value=np.nan)
+            valid = ~np.isnan(values)
+            with np.errstate(invalid='ignore'):
+                if kind == 'score':
+                    normalized = np.select(
+                        [(values >= 0) & (values <= 1), (values >= 0) & (values <= 5),
+                         (values >= 0) & (values <= 10), (values >= 0) & (values <= 100)],
+                        [values * 100, (values - 1) * 25, values * 10, values],
+                        default=np.clip(values, 0, 100)
+                    )
+                elif kind == 'rate':
+                    normalized = np.select(
+                        [(values >= 0) & (values <= 1), (values >= 0) & (values <= 100)],
+                        [values * 100, values],
+                        default=np.clip(values, 0, 100)
+                    )
+                else:
+                    normalized = np.select(
+                        [values <= 0, values <= 2, values <= 5, values <= 10],
+                        [30.0, 50.0, 70.0, 85.0],
+                        default=95.0
+                    )
+            return np.where(valid, normalized, np.nan)
+        
+        # 범주 코드 조회: 고유값별 1회 변환 (결측은 코드 -1)
+        # 스칼라 변환은 str(값) 기준이므로, 혼합 타입 컬럼은 True/1처럼 같은 값으로 묶이지 않게 문자열로 코드화
+        if dtype == object and pd.api.types.infer_dtype(column, skipna=True) not in ('string', 'empty'):
+            missing = column.isna().to_numpy()
+            codes, uniques = pd.factorize(column.map(str))
+            codes[missing] = -1
+        else:
+            codes, uniques = pd.factorize(column)
+        normalizer = self._normalizer_for(kind)
+        lookup = np.full(len(uniques) + 1, np.nan)
+        for i, value in enumerate(uniques):
+            if isinstance(value, str) and value == '':
+                continue
+            converted = normalizer(value)
+            if converted is not None:
+                lookup[i] = converted
+        return lookup[codes]
+    
+    def extract_quantitative_matrix(self, frame: pd.DataFrame,
+                                    plan: Optional[QuantitativeColumnPlan] = None
+                                    ) -> Tuple[QuantitativeColumnPlan, np.ndarray]:
+        """
+        DataFrame 전체의 정량 점수 행렬 추출
+        
+        Returns:
+            (컬럼 계획, [행 수 x 데이터 키 수] 점수 행렬 - 해당 값이 없으면 NaN)
+        """
+        plan, matrix, _ = self._extract_matrix(frame, plan)
+        return plan, matrix
+    
+    def _extract_matrix(self, frame: pd.DataFrame, plan: Optional[QuantitativeColumnPlan]
+                        ) -> Tuple[QuantitativeColumnPlan, np.ndarray, np.ndarray]:
+        """점수 행렬과 함께 행별로 각 키가 처음 채워진 컬럼 위치(행 단위 dict 삽입 순서)를 반환"""
+        if plan is None:
+            plan = self.build_column_plan(frame.columns)
+        
+        matrix = np.full((len(frame), len(plan)), np.nan)
+        inserted_at = np.full((len(frame), len(plan)), -1, dtype=int)
+        if len(frame) == 0 or len(plan) == 0:
+            return plan, matrix, inserted_at
+        
+        # 행 단위 처리(iterrows)와 동일하게 행 공통 dtype으로 맞춤 (예: int+float 프레임은 float)
+        row_dtype = frame.iloc[0].dtype
+        for j, positions in enumerate(plan.positions):
+            for position in positions:
+                column = frame.iloc[:, position]
+                if row_dtype != object and column.dtype != row_dtype:
+                    column = column.astype(row_dtype)
+                values = self._normalize_column(column, plan.kinds[j])
+                valid = ~np.isnan(values)
+                # 중복 컬럼명은 뒤 컬럼의 유효값이 앞 값을 덮어씀 (삽입 위치는 처음 값 기준)
+                inserted_at[:, j] = np.where(valid & (inserted_at[:, j] < 0), position, inserted_at[:, j])
+                matrix[:, j] = np.where(valid, values, matrix[:, j])
+        return plan, matrix, inserted_at
+    
+    def calculate_quantitative_scores(self, frame: pd.DataFrame,
+                                      plan: Optional[QuantitativeColumnPlan] = None
+                                      ) -> Dict[str, Any]:
+        """
+        전체 행의 정량 종합 점수를 한 번에 계산 (행별 calculate_quantitative_score와 동일한 값)
+        
+        Returns:
+            {"plan", "matrix", "inserted_at", "quantitative_score", "confidence", "data_count", "data_quality"}
+            (inserted_at: 행별로 각 키가 처음 채워진 컬럼 위치, 값이 없으면 -1 - 행 단위 dict 의 키 순서)
+        """
+        plan, matrix, inserted_at = self._extract_matrix(frame, plan)
+        present = ~np.isnan(matrix)
+        
+        # 행별 계산과 같은 순서(컬럼 위치 순)로 누적하여 부동소수점 결과를 일치시킴
+        total_score = np.zeros(len(frame))
+        total_weight = np.zeros(len(frame))
+        slots = sorted((position, j) for j, positions in enumerate(plan.positions) for position in positions)
+        for position, j in slots:
+            added = inserted_at[:, j] == position
+            weight = plan.weights[j]
+            total_score += np.where(added, matrix[:, j] * weight, 0.0)
+            total_weight += np.where(added, weight, 0.0)
+        
+        data_count = present.sum(axis=1)
+        has_data = total_weight > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            final_score = np.where(has_data, total_score / np.where(has_data, total_weight, 1.0), 50.0)
+        confidence = np.where(has_data, np.minimum(total_weight * 20, 100), 0.0)
+        
+        data_quality = QUALITY_LABELS[np.select(
+            [data_count >= 5, data_count >= 3, data_count >= 1], [3, 2, 1], default=0
+        )]
+        
+        return {
+            "plan": plan,
+            "matrix": matrix,
+            "inserted_at": inserted_at,
+            "quantitative_score": np.array([round(float(v), 1) for v in final_score]),
+            "confidence": np.array([round(float(v), 1) for v in confidence]),
+            "data_count": data_count,
+            "data_quality": data_quality
+        }
+    
     def _convert_grade_to_score(self, grade_value) -> Optional[float]:
         """등급을 점수로 변환"""
         try:
@@ -189,14 +389,7 @@ class QuantitativeAnalyzer:
         
         for data_key, score in quant_data.items():
             # 데이터 유형별 가중치
-            if 'grade_' in data_key:
-                weight = 0.4
-            elif 'score_' in data_key:
-                weight = 0.3
-            elif 'rate_' in data_key:
-                weight = 0.2
-            else:
-                weight = 0.1
+            weight = quantitative_weight(data_key)
             
             total_score += score * weight
             total_weight += weight
@@ -233,6 +426,26 @@ class QuantitativeAnalyzer:
             "data_count": data_count
         }
     
+    def contributing_factors_from_matrix(self, keys: Sequence[str], values: np.ndarray,
+                                         inserted_at: np.ndarray) -> Tuple[Dict[str, float], Dict[str, Any]]:
+        """
+        정량 점수 행렬의 한 행으로 행 단위 추출 결과(extract_quantitative_data)와 기여 요인 복원
+        
+        Returns:
+            (quant_data, contributing_factors) - 행별 계산과 같은 키 순서
+        """
+        order = sorted((int(inserted_at[j]), j) for j in range(len(keys)) if inserted_at[j] >= 0)
+        quant_data = {keys[j]: float(values[j]) for _, j in order}
+        contributing_factors = {}
+        for data_key, score in quant_data.items():
+            weight = quantitative_weight(data_key)
+            contributing_factors[data_key] = {
+                "score": round(score, 1),
+                "weight": weight,
+                "contribution": round(score * weight, 1)
+            }
+        return quant_data, contributing_factors
+    
     def analyze_row(self, row: pd.Series) -> Dict[str, Any]:
         """행 데이터 전체 분석"""
         quant_data = self.extract_quantitative_data(row)
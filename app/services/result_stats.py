@@ -0,0 +1,359 @@
+# app/services/result_stats.py
+"""
+AIRISS 대시보드 결과 집계
+결과 저장과 같은 트랜잭션에서 집계 테이블(app/models/result_stats.py)을 증분 갱신하고,
+대시보드는 직원 행 대신 (작업/파일 x 부서/일자 x 등급) 집계 행만 읽습니다.
+
+- 집계 항목: 결과 수, 점수 합/제곱합/최소/최대, 5점 구간 히스토그램, 역량 점수 합, 승진 후보 수
+- 최소/최대는 빼는 값이 현재 경계값이면 해당 키의 원본 행에서 다시 계산
+- rebuild_*_stats(): 원본 결과 테이블에서 전체 재구축 (scripts/rebuild_stats.py)
+"""
+
+import logging
+import math
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.models.result_stats import AnalysisResultStats, EmployeeResultStats
+
+logger = logging.getLogger(__name__)
+
+HISTOGRAM_BIN_WIDTH = 5
+HISTOGRAM_BINS = 21  # 0-4, 5-9, ..., 95-99, 100 이상
+
+COMPETENCIES = ("실행력", "성장지향", "협업", "고객지향", "전문성", "혁신성", "리더십", "커뮤니케이션")
+COMPETENCY_DEFAULT = 70       # 역량 점수가 없을 때 평균에 쓰는 값 (기존 대시보드 계산과 동일)
+PROMOTION_THRESHOLD = 80      # 리더십/실행력 모두 이 점수 이상이면 승진 후보
+
+STATS_KEYS = {
+    EmployeeResultStats: ("job_id", "department", "grade"),
+    AnalysisResultStats: ("file_id", "day", "grade"),
+}
+REBUILD_BATCH_SIZE = 1000
+
+_backfill_checked = set()
+
+
+def score_bin(score: float) -> int:
+    """점수의 히스토그램 구간 번호"""
+    return min(HISTOGRAM_BINS - 1, max(0, int(score // HISTOGRAM_BIN_WIDTH)))
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+class StatsDelta:
+    """집계 키 하나의 변화량 (sign=-1 로 빼기)"""
+
+    def __init__(self):
+        self.count = 0
+        self.score_count = 0
+        self.score_sum = 0.0
+        self.score_sumsq = 0.0
+        self.histogram = [0] * HISTOGRAM_BINS
+        self.competency_sums: Dict[str, float] = {}
+        self.promotion_count = 0
+        self.added_min: Optional[float] = None
+        self.added_max: Optional[float] = None
+        self.removed_scores = False
+
+    def add(self, score: Any, competencies: Optional[Dict[str, float]] = None,
+            promoted: bool = False, sign: int = 1):
+        self.count += sign
+        score = _number(score)
+        if score is not None:
+            self.score_count += sign
+            self.score_sum += sign * score
+            self.score_sumsq += sign * score * score
+            self.histogram[score_bin(score)] += sign
+            if sign > 0:
+                self.added_min = score if self.added_min is None else min(self.added_min, score)
+                self.added_max = score if self.added_max is None else max(self.added_max, score)
+            else:
+                self.removed_scores = True
+        for name, value in (competencies or {}).items():
+            self.competency_sums[name] = self.competency_sums.get(name, 0) + sign * value
+        if promoted:
+            self.promotion_count += sign
+
+
+def employee_stats_key(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    """EmployeeResult 행(매핑) 의 집계 키"""
+    metadata = row.get("employee_metadata") or {}
+    return row["job_id"], metadata.get("department") or "", row.get("grade") or ""
+
+
+def add_employee_row(deltas: Dict[tuple, StatsDelta], row: Dict[str, Any], sign: int = 1):
+    """EmployeeResult 행(매핑) 을 변화량에 반영"""
+    dimension_scores = row.get("dimension_scores") or {}
+    competencies = {}
+    for name in COMPETENCIES:
+        value = _number(dimension_scores.get(name, COMPETENCY_DEFAULT))
+        competencies[name] = int(value) if value is not None else COMPETENCY_DEFAULT
+    promoted = all(
+        int(_number(dimension_scores.get(name, 0)) or 0) >= PROMOTION_THRESHOLD for name in ("리더십", "실행력")
+    )
+    deltas.setdefault(employee_stats_key(row), StatsDelta()).add(
+        row.get("overall_score"), competencies, promoted, sign
+    )
+
+
+def analysis_stats_key(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    """AnalysisResultModel 행(매핑) 의 집계 키 - 분석일은 created_at 기준"""
+    created_at = row.get("created_at") or datetime.now()
+    day = created_at.date() if isinstance(created_at, datetime) else created_at
+    return row.get("file_id") or "", str(day)[:10], row.get("ok_grade") or ""
+
+
+def add_analysis_row(deltas: Dict[tuple, StatsDelta], row: Dict[str, Any], sign: int = 1):
+    """AnalysisResultModel 행(매핑) 을 변화량에 반영"""
+    deltas.setdefault(analysis_stats_key(row), StatsDelta()).add(row.get("hybrid_score"), sign=sign)
+
+
+def _upsert_statement(db: Session, model, key: tuple, delta: StatsDelta):
+    """
+    스칼라 컬럼을 원자적으로 더하는 INSERT ... ON CONFLICT DO UPDATE
+
+    동시 저장이 같은 키를 처음 만들어도 고유 제약 충돌 없이 한쪽이 다른 쪽에 더해지며,
+    JSON 컬럼(히스토그램/역량 합)은 0 으로 만들고 이후 행 잠금 상태에서 더합니다.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        least, greatest = func.least, func.greatest
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        least, greatest = func.min, func.max  # SQLite 다중 인자 min/max
+
+    key_names = STATS_KEYS[model]
+    statement = insert(model).values(
+        **dict(zip(key_names, key)),
+        count=delta.count, score_count=delta.score_count, score_sum=delta.score_sum,
+        score_sumsq=delta.score_sumsq, score_min=delta.added_min, score_max=delta.added_max,
+        histogram=[0] * HISTOGRAM_BINS, competency_sums={}, promotion_count=delta.promotion_count,
+    )
+    current, excluded = model.__table__.c, statement.excluded
+    return statement.on_conflict_do_update(
+        index_elements=list(key_names),
+        set_={
+            "count": current["count"] + excluded["count"],
+            "score_count": current.score_count + excluded.score_count,
+            "score_sum": current.score_sum + excluded.score_sum,
+            "score_sumsq": current.score_sumsq + excluded.score_sumsq,
+            # 한쪽이 NULL 이면 다른 쪽 값 (SQLite min/max 는 NULL 인자가 있으면 NULL)
+            "score_min": func.coalesce(least(current.score_min, excluded.score_min),
+                                       current.score_min, excluded.score_min),
+            "score_max": func.coalesce(greatest(current.score_max, excluded.score_max),
+                                       current.score_max, excluded.score_max),
+            "promotion_count": current.promotion_count + excluded.promotion_count,
+        },
+    )
+
+
+def apply_stats_deltas(db: Session, model, deltas: Dict[tuple, StatsDelta],
+                       refresh_extremes: Optional[Callable[[tuple], Tuple[Optional[float], Optional[float]]]] = None):
+    """
+    변화량을 집계 테이블에 반영 (커밋은 호출 측 트랜잭션에서)
+
+    결과 수/점수 합 등 스칼라 컬럼은 원자적 upsert(더하는 변화량) 또는 UPDATE ... SET count = count + n 으로,
+    JSON 컬럼(히스토그램/역량 합)은 키 행을 잠근(SELECT ... FOR UPDATE) 뒤 읽고 고쳐 써서
+    여러 워커가 같은 키를 동시에 갱신해도 변화량이 사라지지 않습니다.
+    키는 정렬된 순서로 갱신해 동시 트랜잭션 사이의 교착을 피합니다.
+
+    refresh_extremes(key) 는 원본 행에서 (최소, 최대) 를 다시 구함 - 점수를 뺀 키의 경계값 갱신용이며,
+    원본 행 변경이 같은 세션에 이미 반영(flush)된 뒤 호출해야 합니다.
+    """
+    if not deltas:
+        return
+    key_names = STATS_KEYS[model]
+
+    for key in sorted(deltas):
+        delta = deltas[key]
+        key_filter = [getattr(model, name) == value for name, value in zip(key_names, key)]
+        if delta.count > 0:
+            db.execute(_upsert_statement(db, model, key, delta))
+        else:
+            # 빼기/이동만 있는 키는 행이 이미 있어야 함 (없으면 반영할 것이 없음)
+            changed = db.execute(
+                update(model).where(*key_filter).values(
+                    count=model.count + delta.count,
+                    score_count=model.score_count + delta.score_count,
+                    score_sum=model.score_sum + delta.score_sum,
+                    score_sumsq=model.score_sumsq + delta.score_sumsq,
+                    promotion_count=model.promotion_count + delta.promotion_count,
+                ).execution_options(synchronize_session=False)
+            )
+            if not changed.rowcount:
+                continue
+
+        # 위 문장이 잡은 행 잠금을 명시적으로 유지한 채 최신 값을 다시 읽음 (세션에 남은 이전 값은 덮어씀)
+        row = db.query(model).filter(*key_filter).with_for_update().populate_existing().one_or_none()
+        if row is None:
+            continue
+        if row.count <= 0:
+            db.delete(row)
+            continue
+        histogram = list(row.histogram or [0] * HISTOGRAM_BINS)
+        row.histogram = [a + b for a, b in zip(histogram, delta.histogram)]  # 새 객체로 교체해야 JSON 변경이 기록됨
+        sums = dict(row.competency_sums or {})
+        for name, value in delta.competency_sums.items():
+            sums[name] = sums.get(name, 0) + value
+        row.competency_sums = sums
+
+        if delta.removed_scores and refresh_extremes is not None:
+            row.score_min, row.score_max = refresh_extremes(key)
+        elif delta.added_min is not None and delta.count <= 0:
+            # 같은 키 안에서 점수만 바뀐 경우 (upsert 를 거치지 않은 추가분)
+            row.score_min = delta.added_min if row.score_min is None else min(row.score_min, delta.added_min)
+            row.score_max = delta.added_max if row.score_max is None else max(row.score_max, delta.added_max)
+    db.flush()
+
+
+def remove_job_stats(db: Session, job_id: str) -> int:
+    """작업의 직원 결과 집계 삭제 (작업 결과 전체 교체 시)"""
+    return db.query(EmployeeResultStats).filter(EmployeeResultStats.job_id == job_id).delete(synchronize_session=False)
+
+
+def record_employee_results(db: Session, rows: Iterable[Dict[str, Any]]):
+    """새로 저장하는 EmployeeResult 행(매핑) 들을 집계에 더함"""
+    deltas: Dict[tuple, StatsDelta] = {}
+    for row in rows:
+        add_employee_row(deltas, row)
+    apply_stats_deltas(db, EmployeeResultStats, deltas)
+
+
+def analysis_extremes(db: Session) -> Callable[[tuple], Tuple[Optional[float], Optional[float]]]:
+    """AnalysisResultStats 키의 (최소, 최대) hybrid_score 를 원본에서 조회하는 함수"""
+    from app.models.analysis_result import AnalysisResultModel
+
+    def refresh(key: tuple):
+        file_id, day, grade = key
+        grade_filter = AnalysisResultModel.ok_grade == grade if grade else \
+            func.coalesce(AnalysisResultModel.ok_grade, "") == ""
+        return db.query(func.min(AnalysisResultModel.hybrid_score), func.max(AnalysisResultModel.hybrid_score))\
+            .filter(AnalysisResultModel.file_id == file_id,
+                    func.date(AnalysisResultModel.created_at) == day, grade_filter)\
+            .one()
+    return refresh
+
+
+def rebuild_employee_stats(db: Session, job_id: Optional[str] = None) -> int:
+    """EmployeeResult 에서 직원 결과 집계 재구축 (job_id 가 없으면 전체) - 집계한 결과 수 반환"""
+    from app.models.employee import EmployeeResult
+
+    query = db.query(EmployeeResult.job_id, EmployeeResult.grade, EmployeeResult.overall_score,
+                     EmployeeResult.dimension_scores, EmployeeResult.employee_metadata)
+    stats = db.query(EmployeeResultStats)
+    if job_id is not None:
+        query = query.filter(EmployeeResult.job_id == job_id)
+        stats = stats.filter(EmployeeResultStats.job_id == job_id)
+    stats.delete(synchronize_session=False)
+
+    deltas: Dict[tuple, StatsDelta] = {}
+    total = 0
+    for record in query.yield_per(REBUILD_BATCH_SIZE):
+        add_employee_row(deltas, record._asdict())
+        total += 1
+    apply_stats_deltas(db, EmployeeResultStats, deltas)
+    db.commit()
+    logger.info(f"📊 직원 결과 집계 재구축: 결과 {total}개 → 집계 {len(deltas)}행")
+    return total
+
+
+def rebuild_analysis_stats(db: Session, file_id: Optional[str] = None) -> int:
+    """AnalysisResultModel 에서 분석 결과 집계 재구축 (file_id 가 없으면 전체) - 집계한 결과 수 반환"""
+    from app.models.analysis_result import AnalysisResultModel
+
+    query = db.query(AnalysisResultModel.file_id, AnalysisResultModel.ok_grade,
+                     AnalysisResultModel.hybrid_score, AnalysisResultModel.created_at)
+    stats = db.query(AnalysisResultStats)
+    if file_id is not None:
+        query = query.filter(AnalysisResultModel.file_id == file_id)
+        stats = stats.filter(AnalysisResultStats.file_id == file_id)
+    stats.delete(synchronize_session=False)
+
+    deltas: Dict[tuple, StatsDelta] = {}
+    total = 0
+    for record in query.yield_per(REBUILD_BATCH_SIZE):
+        add_analysis_row(deltas, record._asdict())
+        total += 1
+    apply_stats_deltas(db, AnalysisResultStats, deltas)
+    db.commit()
+    logger.info(f"📊 분석 결과 집계 재구축: 결과 {total}개 → 집계 {len(deltas)}행")
+    return total
+
+
+def ensure_stats(db: Session, model) -> None:
+    """집계 테이블이 비어 있고 원본 결과가 있으면 한 번 재구축 (집계 도입 전 데이터)"""
+    if model in _backfill_checked:
+        return
+    from app.models.analysis_result import AnalysisResultModel
+    from app.models.employee import EmployeeResult
+
+    source = EmployeeResult if model is EmployeeResultStats else AnalysisResultModel
+    if db.query(model.id).first() is None and db.query(source.id).first() is not None:
+        logger.info(f"📊 {model.__tablename__} 비어 있음 - 기존 결과로 재구축")
+        (rebuild_employee_stats if model is EmployeeResultStats else rebuild_analysis_stats)(db)
+    _backfill_checked.add(model)
+
+
+def merge_stats(rows: Iterable[Any]) -> Dict[str, Any]:
+    """집계 행들을 하나로 합침 (grades: 등급별 결과 수)"""
+    merged = {
+        "count": 0, "score_count": 0, "score_sum": 0.0, "score_sumsq": 0.0,
+        "score_min": None, "score_max": None, "histogram": [0] * HISTOGRAM_BINS,
+        "competency_sums": {}, "promotion_count": 0, "grades": {},
+    }
+    for row in rows:
+        merged["count"] += row.count or 0
+        merged["score_count"] += row.score_count or 0
+        merged["score_sum"] += row.score_sum or 0.0
+        merged["score_sumsq"] += row.score_sumsq or 0.0
+        for bound, pick in (("score_min", min), ("score_max", max)):
+            value = getattr(row, bound)
+            if value is not None:
+                merged[bound] = value if merged[bound] is None else pick(merged[bound], value)
+        merged["histogram"] = [a + b for a, b in zip(merged["histogram"], row.histogram or [0] * HISTOGRAM_BINS)]
+        for name, value in (row.competency_sums or {}).items():
+            merged["competency_sums"][name] = merged["competency_sums"].get(name, 0) + value
+        merged["promotion_count"] += row.promotion_count or 0
+        merged["grades"][row.grade] = merged["grades"].get(row.grade, 0) + (row.count or 0)
+    return merged
+
+
+def stats_mean(merged: Dict[str, Any]) -> float:
+    return merged["score_sum"] / merged["score_count"] if merged["score_count"] else 0.0
+
+
+def stats_std(merged: Dict[str, Any]) -> float:
+    """모집단 표준편차 (제곱합 기반)"""
+    if not merged["score_count"]:
+        return 0.0
+    mean = stats_mean(merged)
+    return math.sqrt(max(0.0, merged["score_sumsq"] / merged["score_count"] - mean * mean))
+
+
+def histogram_quantile(histogram: List[int], q: float) -> float:
+    """히스토그램 구간 내 선형 보간으로 근사한 분위수 (정렬 위치 q * 전체 수 의 값, 중간값은 위쪽 중앙값)"""
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    target = q * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count > target:
+            return (index + (target - seen) / count) * HISTOGRAM_BIN_WIDTH
+        seen += count
+    return float(len(histogram) * HISTOGRAM_BIN_WIDTH)
+
+
+def histogram_count_at_least(histogram: List[int], score: float) -> int:
+    """score 이상 구간의 결과 수 (score 는 구간 경계 - 5의 배수)"""
+    return sum(histogram[score_bin(score):])
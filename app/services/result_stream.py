@@ -0,0 +1,174 @@
+# app/services/result_stream.py
+"""
+AIRISS 분석 결과 실시간 스트리밍
+실행 중인 작업의 직원 결과를 청크가 저장되는 즉시 NDJSON / Server-Sent Events 로 전달
+
+- 결과 행 ID 는 "{job_id}:{원본 행 번호 9자리}" 로 저장되어 행 번호 순 keyset 조회가 가능
+- offset 은 원본 파일 기준 행 번호 (재접속 시 마지막으로 받은 row + 1, SSE 는 Last-Event-ID 사용)
+- 같은 프로세스의 저장은 알림으로 즉시 깨우고, 다른 워커 프로세스의 저장은 주기 조회로 감지
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH_SIZE = int(os.getenv("AIRISS_RESULT_STREAM_BATCH_SIZE", "500"))
+STREAM_POLL_SECONDS = float(os.getenv("AIRISS_RESULT_STREAM_POLL_SECONDS", "1.0"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("AIRISS_RESULT_STREAM_HEARTBEAT_SECONDS", "15"))
+
+TERMINAL_JOB_STATUSES = ("completed", "failed")
+STREAM_FORMATS = ("ndjson", "sse")
+
+ROW_DIGITS = 9
+
+
+def result_row_id(job_id: str, row: int) -> str:
+    """결과 행 ID (같은 작업 안에서 문자열 정렬 = 원본 행 순서)"""
+    return f"{job_id}:{row:0{ROW_DIGITS}d}"
+
+
+def row_from_result_id(result_id: str) -> Optional[int]:
+    """결과 행 ID 에서 원본 행 번호 추출 (이전 형식의 UUID ID 는 None)"""
+    _, _, suffix = result_id.rpartition(":")
+    return int(suffix) if suffix.isdigit() else None
+
+
+class ResultStreamNotifier:
+    """작업별 청크 저장 알림 (대기 중인 스트림을 즉시 깨움)"""
+
+    def __init__(self):
+        self._events: Dict[str, asyncio.Event] = {}
+
+    def notify(self, job_id: str):
+        event = self._events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def wait(self, job_id: str, timeout: float):
+        event = self._events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+# 전역 알림 인스턴스
+result_stream_notifier = ResultStreamNotifier()
+
+
+def _record_to_result(record) -> Dict[str, Any]:
+    metadata = record.employee_metadata or {}
+    return {
+        "row": row_from_result_id(record.id),
+        "uid": record.uid,
+        "name": metadata.get('name', ''),
+        "department": metadata.get('department', ''),
+        "position": metadata.get('position', ''),
+        "score": record.overall_score,
+        "grade": record.grade,
+        "confidence": record.confidence,
+        "text_score": record.text_score,
+        "quantitative_score": record.quantitative_score,
+        "dimension_scores": record.dimension_scores or {},
+        "ai_feedback": record.ai_feedback or {}
+    }
+
+
+def fetch_result_page(db, job_id: str, offset: int, limit: int) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    작업 상태와 offset 행 이후 결과 한 페이지 조회
+
+    상태를 먼저 읽으므로 완료 상태와 빈 페이지가 함께 오면 남은 결과가 없음이 보장됩니다
+    (결과 저장은 완료 처리보다 먼저 커밋됨).
+
+    Returns:
+        (작업 상태 - 없으면 None, 결과 목록)
+    """
+    from app.models.employee import EmployeeResult
+    from app.models.job import Job
+
+    job = db.query(Job.status, Job.processed_records, Job.total_records, Job.error) \
+        .filter(Job.id == job_id).first()
+    if job is None:
+        return None, []
+    state = {
+        "status": job.status,
+        "processed": job.processed_records or 0,
+        "total": job.total_records,
+        "error": job.error,
+    }
+
+    records = db.query(EmployeeResult) \
+        .filter(EmployeeResult.job_id == job_id,
+                EmployeeResult.id >= result_row_id(job_id, offset),
+                EmployeeResult.id < f"{job_id};") \
+        .order_by(EmployeeResult.id) \
+        .limit(limit) \
+        .all()
+    return state, [_record_to_result(record) for record in records]
+
+
+async def iter_job_results(get_db, job_id: str, offset: int = 0,
+                           batch_size: int = STREAM_BATCH_SIZE,
+                           poll_seconds: float = STREAM_POLL_SECONDS,
+                           heartbeat_seconds: float = STREAM_HEARTBEAT_SECONDS) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    작업 결과를 저장 순서대로 내보내는 비동기 이터레이터
+
+    Yields:
+        ("result", 결과) / ("heartbeat", 진행 상태) / ("end", 최종 상태)
+        작업이 없으면 ("error", ...) 후 종료
+    """
+    cursor = max(0, int(offset))
+    last_sent = time.monotonic()
+
+    def fetch():
+        db = get_db()
+        try:
+            return fetch_result_page(db, job_id, cursor, batch_size)
+        finally:
+            db.close()
+
+    while True:
+        state, results = await asyncio.to_thread(fetch)
+        if state is None:
+            yield "error", {"job_id": job_id, "error": "작업을 찾을 수 없습니다"}
+            return
+
+        for result in results:
+            yield "result", result
+        if results:
+            last_row = results[-1]["row"]
+            cursor = (last_row + 1) if last_row is not None else cursor + len(results)
+            last_sent = time.monotonic()
+            if len(results) >= batch_size:
+                continue
+
+        if state["status"] in TERMINAL_JOB_STATUSES:
+            yield "end", {"job_id": job_id, "next_offset": cursor, **state}
+            return
+
+        if time.monotonic() - last_sent >= heartbeat_seconds:
+            yield "heartbeat", {"job_id": job_id, "next_offset": cursor, **state}
+            last_sent = time.monotonic()
+        await result_stream_notifier.wait(job_id, poll_seconds)
+
+
+def format_ndjson(event: str, payload: Dict[str, Any]) -> str:
+    """NDJSON 한 줄 (결과는 그대로, 나머지 이벤트는 event 필드로 구분)"""
+    body = payload if event == "result" else {"event": event, **payload}
+    return json.dumps(body, ensure_ascii=False, default=str) + "\n"
+
+
+def format_sse(event: str, payload: Dict[str, Any]) -> str:
+    """Server-Sent Events 한 건 (결과 이벤트 id = 원본 행 번호 → Last-Event-ID 로 재개)"""
+    lines = [f"event: {event}"]
+    if event == "result" and payload.get("row") is not None:
+        lines.append(f"id: {payload['row']}")
+    lines.append(f"data: {json.dumps(payload, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,166 @@
+# app/services/result_writer.py
+"""
+AIRISS 분석 결과 일괄 저장기
+행마다 커밋하던 분석 결과 영구 저장을 모아서 배치 단위 한 트랜잭션으로 기록
+
+- add(): 결과를 버퍼에 넣고 analysis_id 를 바로 반환 (DB 기록을 하지 않음 - 버퍼가 배치 크기에
+  도달하면 백그라운드 스레드에서 기록)
+- flush(): 남은 결과 즉시 기록 (파이프라인은 청크 저장 직전에 호출 → 체크포인트 이후 결과 유실 없음)
+- 배치 크기 AIRISS_RESULT_WRITE_BATCH_SIZE, 마지막 추가 후 AIRISS_RESULT_WRITE_FLUSH_SECONDS 가 지나면 자동 기록
+- 배치 기록이 실패하면 행 단위 저장으로 재시도해 문제 행만 실패 처리
+- 타이머/기록 스레드는 데몬이므로 종료 시 flush_all_writers() 로 남은 결과를 기록
+  (FastAPI shutdown 에서 호출, 그 외 프로세스는 atexit 으로)
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv("AIRISS_RESULT_WRITE_BATCH_SIZE", "500"))
+DEFAULT_FLUSH_SECONDS = float(os.getenv("AIRISS_RESULT_WRITE_FLUSH_SECONDS", "1.0"))
+
+_writers: "weakref.WeakSet[BatchedResultWriter]" = weakref.WeakSet()
+
+
+def flush_all_writers() -> int:
+    """프로세스의 모든 일괄 저장기에 남은 결과 기록 (종료 시) - 기록한 행 수 반환"""
+    written = 0
+    for writer in list(_writers):
+        try:
+            written += writer.flush()
+        except Exception as e:
+            logger.error(f"❌ 종료 시 분석 결과 기록 실패: {e}")
+    if written:
+        logger.info(f"💾 종료 전 분석 결과 {written}건 기록")
+    return written
+
+
+atexit.register(flush_all_writers)
+
+
+class BatchedResultWriter:
+    """분석 결과 일괄 저장기 (storage_service.save_analysis_results_bulk 사용)"""
+
+    def __init__(self, storage_service, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_seconds: float = DEFAULT_FLUSH_SECONDS):
+        self.storage_service = storage_service
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()        # 버퍼 보호
+        self._write_lock = threading.Lock()  # 배치 기록 순서 보장
+        self._timer: Optional[threading.Timer] = None
+        self._background: Optional[threading.Thread] = None
+
+        self.counters = {
+            "added": 0,
+            "written": 0,
+            "inserted": 0,
+            "updated": 0,
+            "batches": 0,
+            "batch_failures": 0,
+            "row_fallbacks": 0,
+            "failed": 0,
+            "write_seconds": 0.0,
+        }
+        _writers.add(self)
+
+    def add(self, row: Dict[str, Any]) -> str:
+        """결과 추가 - 기록될 analysis_id 반환 (같은 uid/file_id 기존 결과가 있으면 기존 ID 로 갱신됨)"""
+        row = dict(row)
+        row.setdefault("analysis_id", str(uuid.uuid4()))
+        with self._lock:
+            self._buffer.append(row)
+            self.counters["added"] += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._start_background_flush()
+        self._schedule_flush()  # 기록 중인 스레드가 막 끝나던 참이어도 남은 결과는 타이머가 기록
+        return row["analysis_id"]
+
+    def _start_background_flush(self):
+        """가득 찬 버퍼를 호출 스레드(이벤트 루프일 수 있음)를 막지 않고 기록"""
+        with self._lock:
+            if self._background is not None and self._background.is_alive():
+                return  # 진행 중인 기록이 버퍼를 끝까지 비움
+            self._background = threading.Thread(target=self.flush, name="result-writer-flush", daemon=True)
+            self._background.start()
+
+    def _schedule_flush(self):
+        if self.flush_seconds <= 0:
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.flush_seconds, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self) -> int:
+        """버퍼의 결과를 배치 크기 단위로 기록하고 기록한 행 수 반환"""
+        written = 0
+        with self._write_lock:
+            while True:
+                with self._lock:
+                    batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+                    if not self._buffer and self._timer is not None:
+                        self._timer.cancel()
+                        self._timer = None
+                if not batch:
+                    return written
+                written += self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> int:
+        started = time.monotonic()
+        try:
+            result = self.storage_service.save_analysis_results_bulk(batch)
+        except Exception as e:
+            self.counters["batch_failures"] += 1
+            logger.warning(f"⚠️ 분석 결과 일괄 저장 실패 ({len(batch)}건) - 행 단위로 재시도: {e}")
+            written = self._write_rows(batch)
+        else:
+            written = len(batch)
+            self.counters["inserted"] += result.get("inserted", 0)
+            self.counters["updated"] += result.get("updated", 0)
+            self.counters["batches"] += 1
+        self.counters["written"] += written
+        self.counters["write_seconds"] += time.monotonic() - started
+        logger.debug(f"💾 분석 결과 {written}/{len(batch)}건 기록 ({time.monotonic() - started:.3f}초)")
+        return written
+
+    def _write_rows(self, batch: List[Dict[str, Any]]) -> int:
+        written = 0
+        for row in batch:
+            self.counters["row_fallbacks"] += 1
+            try:
+                self.storage_service.save_analysis_result(row)
+                written += 1
+            except Exception as e:
+                self.counters["failed"] += 1
+                logger.error(f"❌ 분석 결과 저장 실패 - UID: {row.get('uid')}: {e}")
+        return written
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "write_seconds": round(self.counters["write_seconds"], 3),
+            "pending": self.pending,
+            "batch_size": self.batch_size,
+            "flush_seconds": self.flush_seconds,
+        }
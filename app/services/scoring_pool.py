@@ -0,0 +1,190 @@
+# app/services/scoring_pool.py
+"""
+AIRISS 점수화 프로세스 풀
+CPU 중심의 키워드/정량 점수화를 워커 프로세스로 분산해 이벤트 루프와 다른 요청을 막지 않도록 함
+
+- 입력 DataFrame 을 행 순서대로 샤드로 나눠 워커별로 점수화한 뒤 순서대로 병합
+- 워커는 시작 시 분석기를 미리 로드 (BERT 제외 - 점수화에는 사용하지 않음)
+- 샤드가 AIRISS_SCORING_MIN_SHARD_ROWS 보다 작아지는 입력은 프로세스 내에서 처리
+- 풀 사용 시 파이프라인 기본 청크 크기를 워커 수 × 최소 샤드 행 수 이상으로 올려 청크마다 모든 워커를 사용
+  (단 AIRISS_SCORING_MAX_CHUNK_ROWS 안에서만 - 파이프라인 큐에 청크 여러 개가 동시에 메모리에 올라가므로)
+- AIRISS_SCORING_PROCESSES=0 (기본값) 이면 프로세스 풀을 사용하지 않음
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROCESSES = int(os.getenv("AIRISS_SCORING_PROCESSES", "0"))
+DEFAULT_MIN_SHARD_ROWS = int(os.getenv("AIRISS_SCORING_MIN_SHARD_ROWS", "2000"))
+DEFAULT_MAX_CHUNK_ROWS = int(os.getenv("AIRISS_SCORING_MAX_CHUNK_ROWS", "8000"))
+START_METHOD = os.getenv("AIRISS_SCORING_START_METHOD", "spawn")
+
+_worker_analyzer = None
+
+
+def _init_worker():
+    """워커 프로세스 초기화 - 분석기 1회 로드"""
+    global _worker_analyzer
+    from app.services.analyzer_registry import analyzer_registry
+    _worker_analyzer = analyzer_registry.get_hybrid_analyzer()
+
+
+def _score_shard(opinions: List[str], row_data: pd.DataFrame, uids: List[str]) -> Dict[str, Any]:
+    """워커에서 샤드 하나를 점수화하고 배열만 반환"""
+    if _worker_analyzer is None:
+        _init_worker()
+    return _worker_analyzer.analyze_batch(opinions, row_data, uids).to_arrays()
+
+
+def _ping(_: int = 0) -> int:
+    return os.getpid()
+
+
+def shard_bounds(row_count: int, shards: int) -> List[range]:
+    """row_count 행을 최대한 균등한 연속 구간 shards 개로 분할"""
+    shards = max(1, min(shards, row_count))
+    base, extra = divmod(row_count, shards)
+    bounds, start = [], 0
+    for shard in range(shards):
+        size = base + (1 if shard < extra else 0)
+        bounds.append(range(start, start + size))
+        start += size
+    return bounds
+
+
+class ScoringPool:
+    """analyze_batch 를 샤드 단위로 워커 프로세스에 분산하는 풀"""
+
+    def __init__(self, processes: int = DEFAULT_PROCESSES,
+                 min_shard_rows: int = DEFAULT_MIN_SHARD_ROWS,
+                 max_chunk_rows: int = DEFAULT_MAX_CHUNK_ROWS,
+                 start_method: str = START_METHOD):
+        self.processes = max(0, int(processes))
+        self.min_shard_rows = max(1, int(min_shard_rows))
+        self.max_chunk_rows = max(1, int(max_chunk_rows))
+        self._logged_chunk_sizes = set()
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.counters = {
+            "pooled_batches": 0,
+            "inline_batches": 0,
+            "shards": 0,
+            "rows": 0,
+            "pool_errors": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker
+                )
+                logger.info(f"✅ 점수화 프로세스 풀 시작: {self.processes}개 워커 ({self.start_method})")
+            return self._executor
+
+    def warmup(self) -> float:
+        """모든 워커를 띄우고 분석기 로드를 마칠 때까지 대기 (소요 시간 반환)"""
+        if not self.enabled:
+            return 0.0
+        started = time.perf_counter()
+        executor = self._get_executor()
+        list(executor.map(_ping, range(self.processes)))
+        elapsed = time.perf_counter() - started
+        logger.info(f"🔥 점수화 워커 워밍업 완료 ({elapsed:.3f}s)")
+        return elapsed
+
+    def plan_shards(self, row_count: int) -> int:
+        """입력 행 수에 맞는 샤드 수 (1이면 프로세스 내 처리)"""
+        if not self.enabled:
+            return 1
+        return max(1, min(self.processes, row_count // self.min_shard_rows))
+
+    def chunk_size(self, requested: int) -> int:
+        """
+        파이프라인 청크 크기 - 풀 사용 시 청크 하나가 모든 워커에 최소 샤드 이상씩 나뉘도록 상향
+
+        점수화는 청크 단위로 호출되므로 기본 청크(256행)로는 plan_shards 가 항상 1이 되어
+        풀이 쓰이지 않습니다. 상향은 max_chunk_rows 안에 들어가는 샤드 수만큼만 하며,
+        샤드 2개도 들어가지 않으면 설정값을 그대로 씁니다 (설정값보다 작게 줄이지는 않음).
+        """
+        if not self.enabled:
+            return requested
+        shards = min(self.processes, self.max_chunk_rows // self.min_shard_rows)
+        size = max(requested, shards * self.min_shard_rows) if shards > 1 else requested
+        if (requested, size) not in self._logged_chunk_sizes:
+            self._logged_chunk_sizes.add((requested, size))
+            if size != requested:
+                logger.info(f"📦 점수화 풀 사용으로 청크 크기 {requested} → {size}행 "
+                            f"(샤드 {shards}개 × {self.min_shard_rows}행, 상한 {self.max_chunk_rows}행)")
+            elif shards <= 1:
+                logger.info(f"📦 청크 상한 {self.max_chunk_rows}행에 샤드({self.min_shard_rows}행) 2개가 들어가지 않아 "
+                            f"청크 크기 {requested}행 유지 - 작은 청크는 프로세스 내에서 점수화")
+        return size
+
+    def analyze_batch(self, analyzer, opinions: Sequence[str], row_data: pd.DataFrame,
+                      uids: Optional[Sequence[str]] = None):
+        """
+        analyzer.analyze_batch 와 같은 결과를 샤드 병렬로 계산
+
+        풀 실행이 실패하면 경고 후 프로세스 내에서 다시 계산합니다.
+        """
+        opinions = [str(opinion) for opinion in opinions]
+        uids = [str(uid) for uid in uids] if uids is not None else [f"EMP_{i + 1}" for i in range(len(opinions))]
+        shards = self.plan_shards(len(opinions))
+        self.counters["rows"] += len(opinions)
+
+        if shards > 1:
+            try:
+                executor = self._get_executor()
+                futures = [
+                    executor.submit(_score_shard, opinions[bound.start:bound.stop],
+                                    row_data.iloc[bound.start:bound.stop], uids[bound.start:bound.stop])
+                    for bound in shard_bounds(len(opinions), shards)
+                ]
+                parts = [future.result() for future in futures]
+                self.counters["pooled_batches"] += 1
+                self.counters["shards"] += shards
+                from app.services.hybrid_analyzer import BatchAnalysisResult
+                return BatchAnalysisResult.from_parts(analyzer, uids, opinions, row_data, parts)
+            except Exception as e:
+                self.counters["pool_errors"] += 1
+                logger.warning(f"⚠️ 프로세스 풀 점수화 실패 - 프로세스 내에서 처리: {e}")
+
+        self.counters["inline_batches"] += 1
+        return analyzer.analyze_batch(opinions, row_data, uids)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "processes": self.processes,
+            "min_shard_rows": self.min_shard_rows,
+            "max_chunk_rows": self.max_chunk_rows,
+            "started": self._executor is not None,
+            **self.counters,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# 전역 점수화 풀 인스턴스
+scoring_pool = ScoringPool()
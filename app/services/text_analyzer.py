@@ -10,10 +10,20 @@ from datetime import datetime
 import asyncio
 import numpy as np
 import re
+import json
 from collections import Counter
 import time
 import os
 
+from app.utils.keyword_matcher import get_keyword_matcher
+from app.services.analysis_cache import normalize_opinion
+from app.services.llm_response_cache import llm_response_cache
+from app.services.llm_executor import estimate_tokens, llm_executor, LLMRequestError
+from app.services.feedback_packing import (
+    PACKED_SYSTEM_PROMPT, create_packed_prompt, packed_completion_tokens,
+    parse_packed_response, plan_feedback_packs, packing_counters
+)
+
 logger = logging.getLogger(__name__)
 
 # AIRISS 8대 영역 정의 (기존 유지 + 확장)
@@ -141,17 +151,36 @@ AIRISS_FRAMEWORK = {
     }
 }
 
+# AI 피드백 생성용 시스템 프롬프트
+AI_FEEDBACK_SYSTEM_PROMPT = "당신은 OK금융그룹의 수석 HR 전문가입니다. 건설적이고 실행 가능한 피드백을 제공하세요."
+AI_FEEDBACK_TEMPERATURE = 0.7
+
+# 텍스트 종합 등급 구간 (오름차순 하한값) - 점수 >= 하한값이면 해당 등급
+TEXT_GRADE_THRESHOLDS = np.array([50, 60, 70, 80, 90], dtype=float)
+TEXT_GRADE_LABELS = np.array(["F", "D", "C", "B", "A", "S"])
+TEXT_OVERALL_CONFIDENCE = 75  # 기본 신뢰도
+
+
+def lookup_text_grades(scores) -> np.ndarray:
+    """텍스트 종합 점수 배열을 등급 배열로 변환 (벡터화 구간 조회)"""
+    scores = np.nan_to_num(np.asarray(scores, dtype=float), nan=-np.inf)
+    return TEXT_GRADE_LABELS[np.searchsorted(TEXT_GRADE_THRESHOLDS, scores, side="right")]
+
+
 class AIRISSTextAnalyzer:
     """AIRISS v4.1 딥러닝 기반 텍스트 분석기"""
     
-    def __init__(self):
+    def __init__(self, bias_detector=None):
         self.framework = AIRISS_FRAMEWORK
+        self.keyword_matcher = get_keyword_matcher(self.framework)
         self.openai_available = False
         self.openai = None
-        self.bert_model = None
-        self.bias_detector = None
+        self.tokenizer = None
+        self._bert_model = None
+        self._bert_load_attempted = False
+        self.bias_detector = bias_detector
         
-        # 모델 초기화
+        # 모델 초기화 (BERT는 첫 사용 또는 워밍업 시 지연 로드)
         self._initialize_models()
         
     def _initialize_models(self):
@@ -169,7 +198,24 @@ class AIRISSTextAnalyzer:
             logger.error(f"OpenAI 모듈 로드 중 예외 발생: {e}")
             self.openai_available = False
         
-        # 한국어 BERT 모델 초기화 시도
+        # 편향성 탐지기 초기화 (레지스트리가 공유 인스턴스를 주입한 경우 재사용)
+        if self.bias_detector is None:
+            from app.services.bias_detection import BiasDetector
+            self.bias_detector = BiasDetector()
+    
+    @property
+    def bert_model(self):
+        """한국어 BERT 모델 (첫 접근 시 1회 로드)"""
+        if not self._bert_load_attempted:
+            self.load_bert_model()
+        return self._bert_model
+    
+    def load_bert_model(self) -> bool:
+        """한국어 BERT 모델 로드 - 프로세스당 1회만 시도, 로드 성공 여부 반환"""
+        if self._bert_load_attempted:
+            return self._bert_model is not None
+        self._bert_load_attempted = True
+        
         try:
             from transformers import AutoTokenizer, AutoModelForSequenceClassification
             import torch
@@ -177,18 +223,15 @@ class AIRISSTextAnalyzer:
             # KcELECTRA 또는 KoBERT 모델 사용
             model_name = "beomi/KcELECTRA-base-v2022"
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.bert_model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            self._bert_model = AutoModelForSequenceClassification.from_pretrained(model_name)
             logger.info(f"✅ 한국어 BERT 모델 로드 성공: {model_name}")
         except ImportError:
             logger.warning("⚠️ Transformers 라이브러리 없음 - BERT 기반 분석 비활성화")
-            self.bert_model = None
+            self._bert_model = None
         except Exception as e:
             logger.error(f"BERT 모델 로드 실패: {e}")
-            self.bert_model = None
-        
-        # 편향성 탐지기 초기화
-        from app.services.bias_detection import BiasDetector
-        self.bias_detector = BiasDetector()
+            self._bert_model = None
+        return self._bert_model is not None
     
     async def analyze_text(
         self, 
@@ -227,10 +270,11 @@ class AIRISSTextAnalyzer:
         # 텍스트 전처리
         cleaned_text = self._preprocess_text(opinion)
         
-        # 8대 영역별 분석
+        # 8대 영역별 분석 (키워드 단일 스캔)
+        keyword_hits = self.keyword_matcher.scan(cleaned_text)
         dimension_results = {}
         for dimension, config in self.framework.items():
-            score = self._analyze_dimension(cleaned_text, config)
+            score = self._analyze_dimension(keyword_hits[dimension])
             dimension_results[dimension] = {
                 "score": score,
                 "weight": config["weight"],
@@ -263,20 +307,10 @@ class AIRISSTextAnalyzer:
         text = re.sub(r'[^\w\s가-힣]', ' ', text)
         return text.strip()
     
-    def _analyze_dimension(self, text: str, config: Dict) -> float:
-        """개별 영역 분석"""
-        positive_score = 0
-        negative_score = 0
-        
-        # 긍정 키워드 매칭
-        for keyword in config["keywords"]["positive"]:
-            if keyword in text:
-                positive_score += 1
-        
-        # 부정 키워드 매칭
-        for keyword in config["keywords"]["negative"]:
-            if keyword in text:
-                negative_score += 1
+    def _analyze_dimension(self, hits: Dict[str, List[str]]) -> float:
+        """개별 영역 분석 (키워드 매칭 결과 기반)"""
+        positive_score = len(hits["positive"])
+        negative_score = len(hits["negative"])
         
         # 점수 계산 (0-100)
         if positive_score + negative_score == 0:
@@ -297,30 +331,24 @@ class AIRISSTextAnalyzer:
                 }
             }
         
-        config = self.framework[dimension]
+        return self.analyze_all_dimensions(opinion)[dimension]
+    
+    def analyze_all_dimensions(self, opinion: str) -> Dict[str, Dict]:
+        """8대 영역 전체를 한 번의 키워드 스캔으로 분석 (영역별 결과는 analyze_text와 동일)"""
         text = self._preprocess_text(opinion)
-        score = self._analyze_dimension(text, config)
-        
-        # 키워드 매칭 결과 수집
-        positive_words = []
-        negative_words = []
-        
-        for keyword in config["keywords"]["positive"]:
-            if keyword in text:
-                positive_words.append(keyword)
+        keyword_hits = self.keyword_matcher.scan(text)
         
-        for keyword in config["keywords"]["negative"]:
-            if keyword in text:
-                negative_words.append(keyword)
-        
-        return {
-            "score": score,
-            "confidence": 70,
-            "signals": {
-                "positive_words": positive_words[:5],  # 최대 5개
-                "negative_words": negative_words[:5]   # 최대 5개
+        results = {}
+        for dimension, hits in keyword_hits.items():
+            results[dimension] = {
+                "score": self._analyze_dimension(hits),
+                "confidence": 70,
+                "signals": {
+                    "positive_words": hits["positive"][:5],  # 최대 5개
+                    "negative_words": hits["negative"][:5]   # 최대 5개
+                }
             }
-        }
+        return results
     
     def calculate_overall_score(self, dimension_scores: Dict[str, float]) -> Dict:
         """8대 영역 점수를 종합하여 최종 점수 계산"""
@@ -342,23 +370,41 @@ class AIRISSTextAnalyzer:
             overall_score = 50.0
         
         # 등급 계산
-        if overall_score >= 90:
-            grade = "S"
-        elif overall_score >= 80:
-            grade = "A"
-        elif overall_score >= 70:
-            grade = "B"
-        elif overall_score >= 60:
-            grade = "C"
-        elif overall_score >= 50:
-            grade = "D"
-        else:
-            grade = "F"
+        grade = str(lookup_text_grades([overall_score])[0])
         
         return {
             "overall_score": round(overall_score, 1),
             "grade": grade,
-            "confidence": 75  # 기본 신뢰도
+            "confidence": TEXT_OVERALL_CONFIDENCE
+        }
+    
+    def calculate_overall_scores(self, dimension_matrix: np.ndarray, dimensions: List[str]) -> Dict[str, np.ndarray]:
+        """
+        여러 행의 8대 영역 점수를 한 번에 종합 (calculate_overall_score의 벡터화 버전)
+        
+        Args:
+            dimension_matrix: (행 수, 영역 수) 점수 행렬
+            dimensions: 행렬 열 순서에 대응하는 영역명
+        """
+        dimension_matrix = np.asarray(dimension_matrix, dtype=float)
+        
+        # 열 단위로 순차 누적하여 calculate_overall_score와 부동소수점 결과를 일치시킴
+        weighted_score = np.zeros(len(dimension_matrix))
+        total_weight = 0
+        for column, dimension in enumerate(dimensions):
+            weight = self.framework[dimension]["weight"]
+            weighted_score += dimension_matrix[:, column] * weight
+            total_weight += weight
+        
+        if total_weight > 0:
+            overall = weighted_score / total_weight
+        else:
+            overall = np.full(len(dimension_matrix), 50.0)
+        
+        return {
+            "overall_score": np.array([round(score, 1) for score in overall.tolist()]),
+            "grade": lookup_text_grades(overall),
+            "confidence": np.full(len(overall), float(TEXT_OVERALL_CONFIDENCE))
         }
     
     def _analyze_sentiment(self, text: str) -> Dict[str, float]:
@@ -399,9 +445,14 @@ class AIRISSTextAnalyzer:
         opinion: str,
         api_key: str,
         model: str = "gpt-3.5-turbo",
-        max_tokens: int = 1500
+        max_tokens: int = 1500,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
-        """OpenAI를 사용한 고급 AI 피드백 생성 (재시도 로직 포함)"""
+        """
+        OpenAI를 사용한 고급 AI 피드백 생성 (공용 LLM 실행기 - 동시성 제한/재시도 포함)
+        
+        같은 의견/모델 설정의 응답은 LLM 응답 캐시에서 재사용합니다 (bypass_cache=True면 새로 호출).
+        """
         
         if not self.openai_available:
             logger.error("OpenAI 모듈이 설치되지 않았습니다.")
@@ -411,188 +462,194 @@ class AIRISSTextAnalyzer:
             logger.error("OpenAI API 키가 제공되지 않았습니다.")
             return self._get_fallback_response("API 키 없음")
         
-        # 재시도 로직
-        max_retries = 3
-        retry_delay = 2  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"🔄 OpenAI API 호출 시도 {attempt + 1}/{max_retries} - UID: {uid}")
-                
-                # API 키 유효성 검증
-                if not api_key:
-                    logger.error("API 키가 없습니다")
-                    raise ValueError("OpenAI API 키가 제공되지 않았습니다.")
-                
-                # API 키 정리 (공백 제거)
-                cleaned_api_key = api_key.strip()
-                
-                # API 키 형식 검증 (sk-로 시작하는지 확인)
-                if not cleaned_api_key.startswith('sk-') and not cleaned_api_key.startswith('sess-'):
-                    logger.error(f"잘못된 API 키 형식: {cleaned_api_key[:10]}...")
-                    raise ValueError("올바른 OpenAI API 키 형식이 아닙니다.")
-                
-                # OpenAI 클라이언트 생성 (타임아웃 설정 추가)
-                try:
-                    import httpx
-                    # Railway 환경에서 연결 시간 증가
-                    client = self.openai.OpenAI(
-                        api_key=cleaned_api_key,
-                        timeout=httpx.Timeout(60.0, connect=30.0),  # 연결 타임아웃 30초, 전체 60초
-                        max_retries=2  # 재시도 횟수 제한
-                    )
-                except Exception as client_error:
-                    logger.error(f"OpenAI 클라이언트 생성 실패: {client_error}")
-                    raise ValueError(f"API 클라이언트 초기화 실패: {str(client_error)}")
-                
-                # 프롬프트 생성
-                prompt = self._create_analysis_prompt(uid, opinion)
-                
-                # 프록시 사용 시도 (항상 시도, Railway 환경이 아니어도 가능)
-                logger.info("🔄 OpenAI API 호출: 프록시 연결 시도")
-                try:
-                    response = await self._use_internal_proxy(prompt, model, max_tokens)
-                    if response:
-                        logger.info("✅ 내부 프록시를 통한 OpenAI API 호출 성공")
-                    else:
-                        raise Exception("프록시 응답이 비어있음")
-                except Exception as proxy_error:
-                    logger.warning(f"⚠️ 내부 프록시 실패, 직접 연결 시도: {proxy_error}")
-                    # 프록시 실패시 직접 연결 시도
-                    response = await self._direct_openai_call(client, prompt, model, max_tokens)
-                
-                # 응답 처리
-                if response and response.choices and len(response.choices) > 0:
-                    feedback = response.choices[0].message.content
-                    logger.info(f"✅ OpenAI API 호출 성공 - UID: {uid}")
-                    return self._parse_ai_response(feedback)
-                else:
-                    logger.error("OpenAI API 응답이 비어있습니다")
-                    raise ValueError("API 응답 없음")
-                    
-            except asyncio.TimeoutError:
-                logger.warning(f"⏱️ OpenAI API 타임아웃 (시도 {attempt + 1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
-                    continue
+        # 캐시 키는 실제로 보내는 메시지 그대로 (프롬프트에 UID 가 없으므로 다른 직원의 ID 가 섞인 응답이 재사용되지 않음)
+        messages = self._feedback_messages(opinion)
+        cache_key = self._feedback_cache_key(opinion, model, max_tokens, messages)
+        cached = llm_response_cache.get(cache_key, bypass=bypass_cache)
+        if cached is not None and cached["parsed"] is not None:
+            logger.info(f"♻️ AI 피드백 캐시 적중 - UID: {uid}")
+            return cached["parsed"]
+        
+        # API 키 정리 (공백 제거) 및 형식 검증 (sk-로 시작하는지 확인)
+        cleaned_api_key = api_key.strip()
+        if not cleaned_api_key.startswith('sk-') and not cleaned_api_key.startswith('sess-'):
+            logger.error(f"잘못된 API 키 형식: {cleaned_api_key[:10]}...")
+            return self._get_fallback_response("AI 분석 오류: 올바른 OpenAI API 키 형식이 아닙니다.")
+        
+        # 공용 실행기로 호출 (동시성/분당 한도/재시도는 실행기가 처리)
+        try:
+            logger.info(f"🔄 OpenAI API 호출 - UID: {uid}")
+            response = await llm_executor.chat_completion(
+                messages=messages,
+                model=model,
+                max_tokens=max_tokens,
+                api_key=cleaned_api_key,
+                temperature=AI_FEEDBACK_TEMPERATURE
+            )
+        except LLMRequestError as e:
+            logger.error(f"❌ OpenAI API 호출 최종 실패 - UID: {uid} ({e.kind}): {e}")
+            if e.kind == "connection":
+                logger.error("🔥 OpenAI API 연결 실패 - 네트워크 정책/OpenAI 서버 상태/네트워크 타임아웃을 확인하세요")
+                logger.info("💡 해결 방법: AI 분석을 비활성화하고 진행하거나 네트워크 설정을 확인하세요")
+            if e.kind == "auth":
+                return self._get_fallback_response("API 키 인증 실패 - 올바른 API 키를 설정해주세요")
+            if e.kind == "timeout":
                 return self._get_fallback_response("API 타임아웃")
-                
-            except Exception as e:
-                error_msg = str(e)
-                error_type = type(e).__name__
-                logger.error(f"❌ OpenAI API 오류 (시도 {attempt + 1}/{max_retries})")
-                logger.error(f"   오류 타입: {error_type}")
-                logger.error(f"   오류 메시지: {error_msg}")
-                
-                # 연결 실패 처리
-                if "connection" in error_msg.lower():
-                    logger.error("🔥 OpenAI API 연결 실패")
-                    logger.error("   가능한 원인:")
-                    logger.error("   1. 네트워크 정책으로 외부 API 호출 차단")
-                    logger.error("   2. OpenAI 서버 일시적 문제")
-                    logger.error("   3. 네트워크 타임아웃")
-                    logger.info("💡 해결 방법: AI 분석을 비활성화하고 진행하거나 네트워크 설정을 확인하세요")
-                
-                # API 키 관련 오류 처리
-                if "api_key" in error_msg.lower() or "authentication" in error_msg.lower() or "unauthorized" in error_msg.lower():
-                    logger.error("API 키 인증 실패")
-                    return self._get_fallback_response("API 키 인증 실패 - 올바른 API 키를 설정해주세요")
-                
-                # 재시도 가능한 오류인지 확인
-                if "connection" in error_msg.lower() or "timeout" in error_msg.lower() or "network" in error_msg.lower():
-                    if attempt < max_retries - 1:
-                        wait_time = retry_delay * (attempt + 1)
-                        logger.info(f"⏳ {wait_time}초 후 재시도...")
-                        await asyncio.sleep(wait_time)  # 지수 백오프
-                        continue
-                
-                # 속도 제한 오류
-                if "rate" in error_msg.lower() or "limit" in error_msg.lower():
-                    if attempt < max_retries - 1:
-                        wait_time = retry_delay * (2 ** attempt)  # 지수 백오프
-                        logger.info(f"⏳ 속도 제한 - {wait_time}초 후 재시도...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                
-                # 재시도 불가능한 오류
-                return self._get_fallback_response(f"AI 분석 오류: {error_msg}")
-        
-        # 모든 재시도 실패
-        logger.error(f"❌ OpenAI API 호출 최종 실패 - UID: {uid}")
-        return self._get_fallback_response("최대 재시도 횟수 초과")
+            if e.kind == "exhausted":
+                return self._get_fallback_response("최대 재시도 횟수 초과")
+            return self._get_fallback_response(f"AI 분석 오류: {e}")
+        except Exception as e:
+            logger.error(f"❌ OpenAI API 오류 - {type(e).__name__}: {e}")
+            return self._get_fallback_response(f"AI 분석 오류: {e}")
+        
+        if not response.content:
+            logger.error("OpenAI API 응답이 비어있습니다")
+            return self._get_fallback_response("AI 분석 오류: API 응답 없음")
+        
+        logger.info(f"✅ OpenAI API 호출 성공 - UID: {uid} ({response.via}, 시도 {response.attempts}회)")
+        parsed_feedback = self._parse_ai_response(response.content)
+        llm_response_cache.put(
+            cache_key,
+            response.content,
+            parsed=parsed_feedback,
+            prompt_tokens=response.prompt_tokens,
+            completion_tokens=response.completion_tokens
+        )
+        return parsed_feedback
     
-    async def _use_internal_proxy(self, prompt: str, model: str, max_tokens: int) -> Any:
-        """내부 프록시를 통한 OpenAI API 호출"""
-        import httpx
-        
-        # Railway 환경에서는 localhost 사용
-        base_url = "http://localhost:8080"
-        
-        request_data = {
-            "model": model,
-            "messages": [
-                {
-                    "role": "system", 
-                    "content": "당신은 OK금융그룹의 수석 HR 전문가입니다. 건설적이고 실행 가능한 피드백을 제공하세요."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": max_tokens,
-            "temperature": 0.7
-        }
+    def feedback_prompt_tokens(self, opinion: str) -> int:
+        """단건 AI 피드백 요청의 프롬프트 토큰 추정치 (시스템 프롬프트 포함)"""
+        return sum(estimate_tokens(message["content"]) for message in self._feedback_messages(opinion))
+    
+    def has_cached_feedback(self, opinion: str, model: str, max_tokens: int) -> bool:
+        """같은 의견/모델 설정의 AI 피드백이 응답 캐시에 있는지 (캐시 통계에 반영하지 않음)"""
+        return llm_response_cache.contains(self._feedback_cache_key(opinion, model, max_tokens))
+    
+    def _feedback_messages(self, opinion: str) -> List[Dict[str, str]]:
+        """단건 AI 피드백 요청 메시지 (직원 UID 없이 정규화된 의견만 포함 - 같은 의견은 같은 메시지)"""
+        return [
+            {"role": "system", "content": AI_FEEDBACK_SYSTEM_PROMPT},
+            {"role": "user", "content": self._create_analysis_prompt(normalize_opinion(opinion))}
+        ]
+    
+    def _feedback_cache_key(self, opinion: str, model: str, max_tokens: int,
+                            messages: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+        """AI 피드백 캐시 키 - 단건 요청으로 실제 전송하는 메시지 기준 (같은 의견은 한 번만 호출)"""
+        messages = messages or self._feedback_messages(opinion)
+        return llm_response_cache.make_key(
+            model,
+            messages[1]["content"],
+            AI_FEEDBACK_TEMPERATURE,
+            max_tokens,
+            system_prompt=messages[0]["content"]
+        )
+    
+    async def generate_ai_feedback_packed(
+        self,
+        items: List[Dict[str, str]],
+        api_key: str,
+        model: str = "gpt-3.5-turbo",
+        max_tokens: int = 1500,
+        max_pack_size: int = 8,
+        bypass_cache: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 직원의 AI 피드백을 묶음 요청으로 생성
+        
+        Args:
+            items: [{"uid": ..., "opinion": ...}] (결과는 같은 순서로 반환)
+            max_pack_size: 한 요청에 넣을 최대 직원 수 (의견 길이/모델 한도에 따라 더 작아질 수 있음)
+        
+        Returns:
+            직원별 generate_ai_feedback 과 같은 형식의 피드백 목록
+            (묶음 응답에서 파싱/검증에 실패한 직원은 단건 요청 결과)
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        if not items:
+            return []
+        
+        if not self.openai_available or not api_key or max_pack_size <= 1:
+            return list(await asyncio.gather(*(
+                self.generate_ai_feedback(item["uid"], item["opinion"], api_key, model, max_tokens, bypass_cache)
+                for item in items
+            )))
+        
+        # 1. 캐시에 있는 직원은 제외
+        cache_keys = [self._feedback_cache_key(item["opinion"], model, max_tokens) for item in items]
+        pending: List[int] = []
+        for index, cache_key in enumerate(cache_keys):
+            cached = llm_response_cache.get(cache_key, bypass=bypass_cache)
+            if cached is not None and cached["parsed"] is not None:
+                results[index] = cached["parsed"]
+            else:
+                pending.append(index)
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{base_url}/api/v1/proxy/openai/chat/completions",
-                json=request_data
-            )
+        # 2. 남은 직원을 묶어서 동시 요청
+        packs = plan_feedback_packs([items[i]["opinion"] for i in pending], model, max_pack_size)
+        fallback: List[int] = []
+        
+        async def run_pack(pack: List[int]):
+            indices = [pending[i] for i in pack]
+            if len(indices) == 1:
+                fallback.extend(indices)
+                return
             
-            if response.status_code == 200:
-                result = response.json()
-                # OpenAI 응답 형식으로 변환
-                if "choices" in result:
-                    return type('MockResponse', (), {
-                        'choices': [type('Choice', (), {
-                            'message': type('Message', (), {
-                                'content': result["choices"][0]["message"]["content"]
-                            })()
-                        })()]
-                    })()
-                else:
-                    raise Exception("Invalid response format")
-            else:
-                raise Exception(f"프록시 오류: {response.status_code}")
-    
-    async def _direct_openai_call(self, client, prompt: str, model: str, max_tokens: int) -> Any:
-        """직접 OpenAI API 호출"""
-        import asyncio
-        
-        # 타임아웃을 30초로 설정
-        response = await asyncio.wait_for(
-            asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: client.chat.completions.create(
-                    model=model,
+            pack_items = [items[i] for i in indices]
+            packing_counters["packs_sent"] += 1
+            packing_counters["employees_packed"] += len(indices)
+            try:
+                response = await llm_executor.chat_completion(
                     messages=[
-                        {
-                            "role": "system", 
-                            "content": "당신은 OK금융그룹의 수석 HR 전문가입니다. 건설적이고 실행 가능한 피드백을 제공하세요."
-                        },
-                        {"role": "user", "content": prompt}
+                        {"role": "system", "content": PACKED_SYSTEM_PROMPT},
+                        {"role": "user", "content": create_packed_prompt(pack_items)}
                     ],
-                    max_tokens=max_tokens,
-                    temperature=0.7,
-                    timeout=30  # 30초 타임아웃
+                    model=model,
+                    max_tokens=packed_completion_tokens(len(indices)),
+                    api_key=api_key.strip(),
+                    temperature=AI_FEEDBACK_TEMPERATURE
                 )
-            ),
-            timeout=35  # asyncio 타임아웃은 약간 더 길게
-        )
-        return response
+            except Exception as e:
+                packing_counters["pack_failures"] += 1
+                packing_counters["entries_fallback"] += len(indices)
+                logger.warning(f"⚠️ 묶음 AI 피드백 요청 실패 ({len(indices)}명) - 단건 요청으로 전환: {e}")
+                fallback.extend(indices)
+                return
+            
+            parsed_entries = parse_packed_response(response.content, len(indices))
+            share = len(indices)
+            for index, feedback in zip(indices, parsed_entries):
+                if feedback is None:
+                    packing_counters["entries_fallback"] += 1
+                    fallback.append(index)
+                    continue
+                packing_counters["entries_parsed"] += 1
+                results[index] = feedback
+                llm_response_cache.put(
+                    cache_keys[index],
+                    json.dumps(feedback, ensure_ascii=False),
+                    parsed=feedback,
+                    prompt_tokens=response.prompt_tokens // share,
+                    completion_tokens=response.completion_tokens // share
+                )
+        
+        await asyncio.gather(*(run_pack(pack) for pack in packs))
+        
+        # 3. 묶음에서 빠진 직원은 단건 요청
+        if fallback:
+            singles = await asyncio.gather(*(
+                self.generate_ai_feedback(items[i]["uid"], items[i]["opinion"], api_key, model, max_tokens, bypass_cache)
+                for i in fallback
+            ))
+            for index, feedback in zip(fallback, singles):
+                results[index] = feedback
+        
+        logger.info(f"📦 묶음 AI 피드백 완료: {len(items)}명, 묶음 {sum(1 for p in packs if len(p) > 1)}개, 단건 {len(fallback)}명")
+        return results
     
-    def _create_analysis_prompt(self, uid: str, opinion: str) -> str:
-        """AI 분석용 프롬프트 생성"""
+    def _create_analysis_prompt(self, opinion: str) -> str:
+        """AI 분석용 프롬프트 생성 (직원 식별자는 넣지 않음 - 응답이 의견 단위로 캐시되어 공유됨)"""
         return f"""
-직원 {uid}의 평가 의견을 AIRISS 8대 영역 기반으로 심층 분석하세요:
+직원의 평가 의견을 AIRISS 8대 영역 기반으로 심층 분석하세요:
 
 평가 의견: {opinion[:1500]}
 
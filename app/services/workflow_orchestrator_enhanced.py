@@ -64,7 +64,13 @@ class EnhancedWorkflowOrchestrator:
         await self.task_manager.stop()
         
     async def _recover_incomplete_jobs(self):
-        """서버 재시작 시 미완료 작업 복구"""
+        """서버 재시작 시 미완료 작업 복구 (분석 작업은 체크포인트부터 재개)"""
+        try:
+            from app.services.analysis_service import get_shared_analysis_service
+            await get_shared_analysis_service().recover_incomplete_jobs()
+        except Exception as e:
+            logger.error(f"Error resuming analysis jobs: {e}")
+        
         try:
             incomplete_jobs = self.db.query(WorkflowJob).filter(
                 WorkflowJob.status.in_(['initializing', 'running'])
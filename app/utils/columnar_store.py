@@ -0,0 +1,202 @@
+"""
+AIRISS 컬럼 단위 데이터셋 저장소
+업로드 DataFrame 을 컬럼별 파일로 저장하고 필요한 컬럼/행 구간만 메모리 매핑으로 읽습니다.
+
+디렉터리 구성 ({file_id}.cols/):
+    meta.json          - 행 수, 컬럼 순서/이름/종류/dtype
+    c{i}.npy           - 숫자/불리언/날짜 컬럼 (np.load(mmap_mode='r'))
+    c{i}.bin           - 문자열 컬럼 UTF-8 바이트 연결본
+    c{i}.offsets.npy   - 문자열 컬럼 행별 시작 바이트 위치 (int64, 행 수 + 1)
+    c{i}.chars.npy     - 문자열 컬럼 행별 시작 문자 위치 (디코딩한 구간을 바로 잘라내기 위함)
+    c{i}.nulls.npy     - 문자열 컬럼 결측 여부
+
+pickle 과 달리 읽기 시 전체 프레임을 복원하지 않으므로 40개 중 2개 컬럼만 읽으면
+나머지 38개 컬럼은 디스크에서 읽히지 않습니다.
+"""
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DATASET_DIR = os.getenv("AIRISS_DATASET_DIR", "temp_data")
+DATASET_SUFFIX = ".cols"
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+NUMPY_KINDS = "biufcMm"  # 그대로 .npy 로 저장하는 numpy dtype 종류
+
+
+def dataset_path(file_id: str, directory: Optional[str] = None) -> str:
+    """업로드 파일 ID 의 데이터셋 경로 (절대 경로)"""
+    return os.path.abspath(os.path.join(directory or DATASET_DIR, f"{file_id}{DATASET_SUFFIX}"))
+
+
+def is_dataset(path: Optional[str]) -> bool:
+    """컬럼 단위 데이터셋 경로 여부"""
+    return bool(path) and os.path.isfile(os.path.join(path, META_FILE))
+
+
+def write_dataset(df: pd.DataFrame, path: str) -> str:
+    """
+    DataFrame 을 컬럼 단위로 저장 (인덱스는 저장하지 않음)
+
+    Returns:
+        저장한 디렉터리 경로
+    """
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)  # 임시 디렉터리에 쓴 뒤 교체 → 읽는 쪽은 완성된 데이터셋만 봄
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df.iloc[:, i]
+        entry = {"name": _json_name(name), "file": f"c{i}"}
+        if series.dtype.kind in NUMPY_KINDS and isinstance(series.dtype, np.dtype):
+            np.save(os.path.join(tmp_path, f"c{i}.npy"), series.to_numpy(), allow_pickle=False)
+            entry.update(kind="numpy", dtype=series.dtype.str)
+        else:
+            values = series.to_numpy(dtype=object)
+            nulls = pd.isna(values)
+            present = values[~nulls]
+            as_text = all(isinstance(value, str) for value in present)
+            entry.update(kind="text" if as_text else "json", dtype=str(series.dtype))
+            _write_strings(tmp_path, f"c{i}", values, nulls, as_text)
+        columns.append(entry)
+
+    meta = {"version": FORMAT_VERSION, "rows": len(df), "columns": columns}
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _json_name(name: Any) -> Any:
+    return name if isinstance(name, (str, int, float, bool)) or name is None else str(name)
+
+
+def _write_strings(directory: str, stem: str, values: np.ndarray, nulls: np.ndarray, as_text: bool):
+    texts = [
+        "" if null else (value if as_text else json.dumps(value, ensure_ascii=False, default=str))
+        for value, null in zip(values, nulls)
+    ]
+    encoded = [text.encode("utf-8") for text in texts]
+    for suffix, items in (("offsets", encoded), ("chars", texts)):
+        bounds = np.zeros(len(items) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, items), dtype=np.int64, count=len(items)), out=bounds[1:])
+        np.save(os.path.join(directory, f"{stem}.{suffix}.npy"), bounds, allow_pickle=False)
+    with open(os.path.join(directory, f"{stem}.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+    np.save(os.path.join(directory, f"{stem}.nulls.npy"), np.asarray(nulls, dtype=bool), allow_pickle=False)
+
+
+class ColumnarDataset:
+    """컬럼 단위 데이터셋 읽기 (컬럼 파일은 처음 접근할 때 메모리 매핑)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원되지 않는 데이터셋 형식 버전: {meta.get('version')}")
+        self.num_rows: int = meta["rows"]
+        self._entries: List[Dict[str, Any]] = meta["columns"]
+        self.columns: List[Any] = [entry["name"] for entry in self._entries]
+        self._maps: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def _map(self, name: str):
+        mapped = self._maps.get(name)
+        if mapped is None:
+            full = os.path.join(self.path, name)
+            if name.endswith(".npy"):
+                mapped = np.load(full, mmap_mode="r", allow_pickle=False)
+            elif os.path.getsize(full) == 0:
+                mapped = np.empty(0, dtype=np.uint8)  # 빈 파일은 mmap 불가
+            else:
+                mapped = np.memmap(full, dtype=np.uint8, mode="r")
+            self._maps[name] = mapped
+        return mapped
+
+    def _entry(self, column: Any) -> Dict[str, Any]:
+        for entry in self._entries:
+            if entry["name"] == column:
+                return entry
+        raise KeyError(column)
+
+    def read_column(self, column: Any, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """컬럼 하나의 [start, stop) 구간"""
+        entry = self._entry(column)
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        start = min(max(0, start), stop)
+        stem = entry["file"]
+        if entry["kind"] == "numpy":
+            return np.array(self._map(f"{stem}.npy")[start:stop])
+
+        data = self._map(f"{stem}.bin")
+        offsets = np.asarray(self._map(f"{stem}.offsets.npy")[start:stop + 1])
+        nulls = np.asarray(self._map(f"{stem}.nulls.npy")[start:stop])
+        values = np.empty(stop - start, dtype=object)
+        if stop == start:
+            return values
+
+        # 구간 바이트를 한 번에 디코딩하고 문자 위치로 잘라냄
+        text = np.asarray(data[int(offsets[0]):int(offsets[-1])]).tobytes().decode("utf-8")
+        chars = np.asarray(self._map(f"{stem}.chars.npy")[start:stop + 1])
+        bounds = (chars - chars[0]).tolist()
+        pieces = [text[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        if entry["kind"] == "text":
+            values[:] = pieces
+            values[nulls] = None
+        else:
+            for row, (piece, null) in enumerate(zip(pieces, nulls.tolist())):
+                if not null:
+                    values[row] = json.loads(piece)
+        return values
+
+    def read(self, columns: Optional[Sequence[Any]] = None, start: int = 0,
+             stop: Optional[int] = None) -> pd.DataFrame:
+        """
+        선택한 컬럼/행 구간만 DataFrame 으로 읽기
+
+        Args:
+            columns: 읽을 컬럼 (None 이면 전체, 없는 컬럼은 KeyError)
+            start, stop: 행 구간 - 결과 인덱스는 원본 행 번호
+        """
+        names = self.columns if columns is None else list(columns)
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        start = min(max(0, start), stop)
+        data = {}
+        for position, name in enumerate(names):
+            values = self.read_column(name, start, stop)
+            entry = self._entry(name)
+            series = None
+            if entry["kind"] == "text" and entry.get("dtype") not in ("object", "O"):
+                try:
+                    series = pd.Series(values, dtype=entry["dtype"])
+                except (TypeError, ValueError):
+                    pass
+            data[position] = series if series is not None else pd.Series(values)
+        frame = pd.DataFrame(data, columns=range(len(names)))
+        frame.columns = names
+        frame.index = pd.RangeIndex(start, stop)
+        return frame
+
+
+def read_dataset(path: str, columns: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+    """컬럼 단위 데이터셋 전체 행 읽기 (columns 로 컬럼 선택)"""
+    return ColumnarDataset(path).read(columns)
+
+
+def delete_dataset(path: Optional[str]) -> bool:
+    """컬럼 단위 데이터셋 디렉터리 삭제"""
+    if not is_dataset(path):
+        return False
+    shutil.rmtree(path, ignore_errors=True)
+    return True
@@ -0,0 +1,128 @@
+"""
+AIRISS 키워드 매처
+Aho-Corasick 오토마톤 기반 다중 패턴 키워드 매칭
+
+8대 영역의 긍정/부정 키워드 전체를 하나의 오토마톤으로 컴파일하여
+의견 텍스트를 한 번만 스캔하고 모든 영역의 매칭 결과를 함께 반환합니다.
+매칭 의미는 기존 `keyword in text` 부분 문자열 검사와 동일합니다.
+"""
+from collections import deque
+from typing import Dict, List, Tuple, Any
+
+POLARITIES = ("positive", "negative")
+
+
+class KeywordMatcher:
+    """AIRISS 프레임워크 키워드용 Aho-Corasick 매처"""
+
+    def __init__(self, framework: Dict[str, Any]):
+        """
+        프레임워크 키워드로 오토마톤 컴파일
+
+        Args:
+            framework: AIRISS_FRAMEWORK 형식의 영역 정의
+                ({영역: {"keywords": {"positive": [...], "negative": [...]}}})
+        """
+        self.dimensions: List[str] = []
+        # 패턴 -> [(프레임워크 내 순번, 영역, 극성, 패턴), ...]
+        self._entries: Dict[str, List[Tuple[int, str, str, str]]] = {}
+
+        rank = 0
+        for dimension, config in framework.items():
+            keywords = config.get("keywords") if isinstance(config, dict) else None
+            if not isinstance(keywords, dict):
+                continue
+            self.dimensions.append(dimension)
+            for polarity in POLARITIES:
+                for keyword in keywords.get(polarity, []):
+                    if not keyword:
+                        continue
+                    self._entries.setdefault(keyword, []).append((rank, dimension, polarity, keyword))
+                    rank += 1
+
+        self._delta: List[Dict[str, int]] = []
+        self._output: List[Tuple[str, ...]] = []
+        self._build()
+
+    def _build(self):
+        """트라이 구성 → BFS로 실패 링크 계산 → 실패 링크를 전이 테이블에 펼쳐 DFA화"""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Tuple[str, ...]] = [()]
+        for pattern in self._entries:
+            state = 0
+            for ch in pattern:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    output.append(())
+                state = next_state
+            output[state] = output[state] + (pattern,)
+
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        delta[0] = dict(goto[0])
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # BFS 순서상 실패 상태(더 얕은 깊이)의 전이 테이블은 이미 완성되어 있음
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fail[next_state] = delta[fail[state]].get(ch, 0)
+                output[next_state] = output[next_state] + output[fail[next_state]]
+
+        self._delta = delta
+        self._output = output
+
+    def find_patterns(self, text: str) -> set:
+        """텍스트에 포함된 고유 키워드 집합 반환 (단일 스캔, 문자당 dict 조회 1회)"""
+        found = set()
+        if not text:
+            return found
+
+        delta = self._delta
+        output = self._output
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def scan(self, text: str) -> Dict[str, Dict[str, List[str]]]:
+        """
+        텍스트를 한 번 스캔하여 모든 영역의 키워드 매칭 결과 반환
+
+        Returns:
+            {영역: {"positive": [...], "negative": [...]}}
+            각 리스트는 프레임워크 키워드 순서를 유지하여 기존 루프 결과와 동일합니다.
+        """
+        hits: Dict[str, Dict[str, List[str]]] = {
+            dimension: {"positive": [], "negative": []} for dimension in self.dimensions
+        }
+        found = self.find_patterns(text)
+        if not found:
+            return hits
+
+        # 프레임워크 순번으로 정렬 후 추가하면 각 리스트가 키워드 정의 순서를 유지
+        entries = sorted(entry for pattern in found for entry in self._entries[pattern])
+        for _, dimension, polarity, keyword in entries:
+            hits[dimension][polarity].append(keyword)
+        return hits
+
+
+_matcher_cache: Dict[int, Tuple[Dict[str, Any], KeywordMatcher]] = {}
+
+
+def get_keyword_matcher(framework: Dict[str, Any]) -> KeywordMatcher:
+    """프레임워크별 컴파일된 매처 반환 (프로세스 내 1회 컴파일)"""
+    cached = _matcher_cache.get(id(framework))
+    if cached is None or cached[0] is not framework:
+        cached = (framework, KeywordMatcher(framework))
+        _matcher_cache[id(framework)] = cached
+    return cached[1]
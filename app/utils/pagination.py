@@ -0,0 +1,141 @@
+"""
+AIRISS 키셋(커서) 페이지네이션 유틸리티
+(정렬 키, 고유 ID) 기준 다음 페이지 위치를 불투명 커서 토큰으로 주고받고,
+페이지마다 반복되던 전체 건수 COUNT 는 짧은 TTL 캐시로 재사용합니다.
+
+OFFSET 은 앞 페이지 행을 모두 읽고 버리므로 깊은 페이지일수록 느려지지만,
+키셋은 마지막 행 다음부터 인덱스를 바로 읽으므로 500 페이지도 1 페이지와 같은 비용입니다.
+"""
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_
+
+COUNT_CACHE_SECONDS = float(os.getenv("AIRISS_PAGINATION_COUNT_TTL", "60"))
+COUNT_CACHE_SIZE = 256
+CURSOR_VERSION = 1
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없거나 다른 정렬 기준으로 만들어진 커서"""
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """
+    다음 페이지 커서 생성
+
+    Args:
+        sort: 정렬 기준 식별자 (예: "score:desc") - 다른 정렬로 커서를 재사용하는 것을 막음
+        values: 현재 페이지 마지막 행의 (정렬 키..., 고유 ID)
+    """
+    payload = json.dumps({"v": CURSOR_VERSION, "s": sort, "k": list(values)},
+                         ensure_ascii=False, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort: str, size: Optional[int] = None) -> List[Any]:
+    """
+    커서 토큰에서 (정렬 키..., 고유 ID) 복원
+
+    형식이 틀리거나, 정렬 기준이 다르거나, 값 개수가 size 와 다르면 InvalidCursorError
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError, binascii.Error) as e:
+        raise InvalidCursorError(f"잘못된 커서: {e}") from e
+    if not isinstance(payload, dict) or payload.get("v") != CURSOR_VERSION or not isinstance(payload.get("k"), list):
+        raise InvalidCursorError("잘못된 커서 형식")
+    if payload.get("s") != sort:
+        raise InvalidCursorError(f"커서의 정렬 기준({payload.get('s')})이 요청({sort})과 다릅니다")
+    if size is not None and len(payload["k"]) != size:
+        raise InvalidCursorError(f"커서 값 개수({len(payload['k'])})가 정렬 기준과 맞지 않습니다")
+    return payload["k"]
+
+
+def sqlite_keyset_segments(column: str, tiebreaker: str, value: Any, tie_value: Any,
+                           descending: bool) -> List[Tuple[str, List[Any]]]:
+    """
+    SQLite 키셋 WHERE 조건 목록 - ORDER BY {column} {dir}, {tiebreaker} {dir} 에서 커서 다음 행들
+
+    SQLite 는 NULL 을 가장 작은 값으로 정렬하므로 (내림차순이면 마지막, 오름차순이면 처음)
+    같은 정렬값의 나머지 / 다음 값 구간 / NULL 구간을 별도 조건으로 나눕니다.
+    OR 로 합치면 인덱스 순서 탐색 대신 임시 정렬이 생기므로, 호출 측은 페이지가 찰 때까지
+    조건을 순서대로 조회합니다 (각 조건은 정렬 컬럼 인덱스 하나로 바로 탐색됨).
+    """
+    op = "<" if descending else ">"
+    if value is None:
+        segments = [(f"({column} IS NULL AND {tiebreaker} {op} ?)", [tie_value])]
+        return segments if descending else segments + [(f"{column} IS NOT NULL", [])]
+    segments = [
+        (f"({column} = ? AND {tiebreaker} {op} ?)", [value, tie_value]),
+        (f"{column} {op} ?", [value]),
+    ]
+    return segments + [(f"{column} IS NULL", [])] if descending else segments
+
+
+def keyset_segments(column, tiebreaker, value: Any, tie_value: Any, descending: bool) -> List[Any]:
+    """
+    sqlite_keyset_segments 의 SQLAlchemy 조건식 버전 (ORM 쿼리용)
+
+    NULL 을 가장 작은 값으로 보는 정렬이어야 하므로 keyset_order_by() 와 함께 사용합니다.
+    """
+    if value is None:
+        after = tiebreaker < tie_value if descending else tiebreaker > tie_value
+        segments = [and_(column.is_(None), after)]
+        return segments if descending else segments + [column.isnot(None)]
+    if descending:
+        segments = [and_(column == value, tiebreaker < tie_value), column < value]
+        return segments + [column.is_(None)]
+    return [and_(column == value, tiebreaker > tie_value), column > value]
+
+
+def keyset_order_by(column, tiebreaker, descending: bool) -> Tuple[Any, Any]:
+    """keyset_segments 와 같은 순서의 ORDER BY (DB 와 관계없이 NULL 을 가장 작은 값으로 정렬)"""
+    if descending:
+        return column.desc().nulls_last(), tiebreaker.desc()
+    return column.asc().nulls_first(), tiebreaker.asc()
+
+
+class CountCache:
+    """필터 조건별 전체 건수 TTL 캐시 (페이지 이동마다 COUNT 를 다시 세지 않기 위함)"""
+
+    def __init__(self, ttl_seconds: float = COUNT_CACHE_SECONDS, max_entries: int = COUNT_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                return None
+            return entry[1]
+
+    def set(self, key: Hashable, count: int):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # 가장 오래된 항목부터 제거
+                for stale in sorted(self._entries, key=lambda k: self._entries[k][0])[:len(self._entries) // 2 + 1]:
+                    del self._entries[stale]
+            self._entries[key] = (time.monotonic(), count)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], int]) -> int:
+        count = self.get(key)
+        if count is None:
+            count = compute()
+            self.set(key, count)
+        return count
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache()
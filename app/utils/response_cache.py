@@ -0,0 +1,330 @@
+"""
+AIRISS 대시보드/통계 응답 캐시
+(엔드포인트, 요청 파라미터, 전역 데이터 버전) 을 키로 직렬화된 JSON 응답을 재사용합니다.
+
+- 데이터 버전: 작업 완료 / 결과 저장·삭제 시 bump_data_version() 으로 증가 → 이전 응답은 자동 무효화
+- 단일 실행(single-flight): 같은 키의 동시 미스는 한 번만 계산하고 나머지는 결과를 기다림
+- 용량 제한: 항목 수 / 직렬화 바이트 기준 LRU
+- ETag / If-None-Match: 내용 해시가 같으면 본문 없이 304 응답
+
+데이터 버전은 프로세스 카운터 + 공유 DB 카운터(response_cache_versions 테이블) 로 관리합니다.
+bump_data_version() 은 공유 카운터도 올리고, 요청 처리 시 최대 AIRISS_RESPONSE_CACHE_VERSION_POLL_SECONDS 마다
+공유 카운터를 읽어 다른 프로세스(작업 워커/다른 레플리카)의 변경도 반영합니다.
+공유 카운터를 쓸 수 없으면 프로세스 카운터만 사용하며, 이때는 최대 TTL 만큼 늦게 반영될 수 있습니다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED = os.getenv("AIRISS_RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_TTL = float(os.getenv("AIRISS_RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_SHARED_VERSION = os.getenv("AIRISS_RESPONSE_CACHE_SHARED_VERSION", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_VERSION_POLL_SECONDS = float(os.getenv("AIRISS_RESPONSE_CACHE_VERSION_POLL_SECONDS", "1"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("AIRISS_RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("AIRISS_RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# 이 상태로 바뀌는 작업 갱신은 대시보드 수치(완료 작업/성공률 등)를 바꾸므로 데이터 버전을 올림
+FINISHED_JOB_STATUSES = ("completed", "failed", "cancelled")
+
+# 브라우저는 보관하되 매번 ETag 로 재검증 (HR 데이터이므로 공유 캐시 저장 금지)
+CACHE_CONTROL = "private, no-cache"
+
+VERSION_TABLE = "response_cache_versions"
+VERSION_NAME = "data"
+
+_data_version = 0
+_version_lock = threading.Lock()
+
+# 공유 카운터 상태 (마지막으로 본 값, 마지막 확인 시각, 테이블 준비 여부)
+_shared_seen: Optional[int] = None
+_shared_checked = 0.0
+_shared_ready = False
+_shared_lock = threading.Lock()
+
+
+def data_version() -> int:
+    """현재 전역 데이터 버전 (프로세스 카운터 - 공유 카운터 변경은 refresh_data_version() 에서 반영)"""
+    return _data_version
+
+
+def _bump_local() -> int:
+    global _data_version
+    with _version_lock:
+        _data_version += 1
+        return _data_version
+
+
+def _version_table():
+    from sqlalchemy import BigInteger, Column, MetaData, String, Table
+
+    return Table(VERSION_TABLE, MetaData(),
+                 Column("name", String(50), primary_key=True),
+                 Column("version", BigInteger, nullable=False))
+
+
+def _shared_engine():
+    """공유 카운터용 엔진 (처음 사용 시 테이블/행 생성)"""
+    global _shared_ready
+    from app.db.database import engine
+
+    if not _shared_ready:
+        from sqlalchemy import text
+        from sqlalchemy.exc import IntegrityError
+
+        _version_table().create(engine, checkfirst=True)
+        try:
+            with engine.begin() as conn:
+                exists = conn.execute(text(f"SELECT 1 FROM {VERSION_TABLE} WHERE name = :name"),
+                                      {"name": VERSION_NAME}).first()
+                if exists is None:
+                    conn.execute(text(f"INSERT INTO {VERSION_TABLE} (name, version) VALUES (:name, 0)"),
+                                 {"name": VERSION_NAME})
+        except IntegrityError:
+            pass  # 다른 프로세스가 먼저 생성
+        _shared_ready = True
+    return engine
+
+
+def _increment_shared():
+    """공유 카운터 증가 - 실패해도 프로세스 카운터로 계속 동작"""
+    global _shared_seen
+    from sqlalchemy import text
+
+    try:
+        with _shared_lock, _shared_engine().begin() as conn:
+            conn.execute(text(f"UPDATE {VERSION_TABLE} SET version = version + 1 WHERE name = :name"),
+                         {"name": VERSION_NAME})
+            shared = conn.execute(text(f"SELECT version FROM {VERSION_TABLE} WHERE name = :name"),
+                                  {"name": VERSION_NAME}).scalar()
+            # 자신의 증가는 이미 프로세스 카운터에 반영했으므로 다음 확인에서 다시 올리지 않음
+            if _shared_seen is not None and shared is not None and shared == _shared_seen + 1:
+                _shared_seen = shared
+    except Exception as e:
+        logger.debug(f"공유 데이터 버전 증가 실패: {e}")
+
+
+def refresh_data_version() -> int:
+    """
+    공유 카운터를 읽어 다른 프로세스의 변경을 반영한 데이터 버전 (DB 조회 - 스레드에서 호출)
+
+    공유 카운터가 마지막으로 본 값과 다르면 프로세스 카운터를 올립니다.
+    """
+    global _shared_seen, _shared_checked
+    from sqlalchemy import text
+
+    try:
+        with _shared_lock, _shared_engine().connect() as conn:
+            shared = conn.execute(text(f"SELECT version FROM {VERSION_TABLE} WHERE name = :name"),
+                                  {"name": VERSION_NAME}).scalar()
+            _shared_checked = time.monotonic()
+            changed = _shared_seen is not None and shared != _shared_seen
+            _shared_seen = shared
+    except Exception as e:
+        _shared_checked = time.monotonic()
+        logger.debug(f"공유 데이터 버전 조회 실패: {e}")
+        return _data_version
+    if changed:
+        version = _bump_local()
+        logger.debug(f"🔄 데이터 버전 {version} (다른 프로세스 변경)")
+        return version
+    return _data_version
+
+
+async def current_data_version() -> int:
+    """요청 처리용 데이터 버전 - 확인 주기가 지났을 때만 공유 카운터를 조회"""
+    if not RESPONSE_CACHE_SHARED_VERSION:
+        return _data_version
+    if time.monotonic() - _shared_checked < RESPONSE_CACHE_VERSION_POLL_SECONDS:
+        return _data_version
+    return await asyncio.to_thread(refresh_data_version)
+
+
+def bump_data_version(reason: str = "") -> int:
+    """결과/작업 데이터가 바뀌었음을 알림 - 이후 요청(다른 프로세스 포함)은 새 버전 키로 다시 계산"""
+    version = _bump_local()
+    logger.debug(f"🔄 데이터 버전 {version}{f' ({reason})' if reason else ''}")
+    if RESPONSE_CACHE_SHARED_VERSION:
+        try:
+            # 이벤트 루프 안(aiosqlite 저장 경로)에서는 공유 카운터 갱신으로 루프를 막지 않음
+            asyncio.get_running_loop().run_in_executor(None, _increment_shared)
+        except RuntimeError:
+            _increment_shared()
+    return version
+
+
+@dataclass
+class CachedResponse:
+    """직렬화된 응답 본문과 ETag"""
+    body: bytes
+    etag: str
+    version: int
+    created: float
+
+
+class ResponseCache:
+    """데이터 버전 키 기반 응답 LRU 캐시 (단일 실행 보장)"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 ttl_seconds: float = RESPONSE_CACHE_TTL, enabled: bool = RESPONSE_CACHE_ENABLED):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        # 계산 중인 키 -> 계산 태스크 (이벤트 루프 안에서만 접근)
+        self._inflight: Dict[Tuple[str, int], "asyncio.Future[CachedResponse]"] = {}
+
+        self.counters = {"hits": 0, "misses": 0, "coalesced": 0, "not_modified": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """엔드포인트 + 정렬된 파라미터 (None 값은 생략)"""
+        items = sorted((k, v) for k, v in (params or {}).items() if v is not None)
+        return json.dumps([endpoint, items], ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def get(self, key: str, version: int) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get((key, version))
+            if entry is None:
+                return None
+            if time.monotonic() - entry.created > self.ttl_seconds:
+                self._remove((key, version))
+                return None
+            self._entries.move_to_end((key, version))
+            return entry
+
+    def _remove(self, cache_key: Tuple[str, int]):
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def _store(self, key: str, entry: CachedResponse):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            # 이전 버전 항목은 다시 쓰일 일이 없으므로 먼저 정리
+            for stale in [k for k, e in self._entries.items() if e.version < entry.version]:
+                self._remove(stale)
+            self._remove((key, entry.version))
+            self._entries[(key, entry.version)] = entry
+            self._bytes += len(entry.body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.counters["evictions"] += 1
+
+    async def get_or_compute(self, key: str,
+                             compute: Callable[[], Union[Any, Awaitable[Any]]]) -> Tuple[CachedResponse, str]:
+        """
+        캐시된 응답 반환, 없으면 계산 후 저장
+
+        compute 가 동기 함수면 스레드에서 실행합니다 (DB 조회로 이벤트 루프를 막지 않도록).
+        같은 키를 계산 중인 요청이 있으면 새로 계산하지 않고 그 결과를 기다립니다.
+
+        Returns:
+            (응답, "HIT" | "MISS" | "COALESCED")
+        """
+        version = await current_data_version()
+        entry = self.get(key, version)
+        if entry is not None:
+            self.counters["hits"] += 1
+            return entry, "HIT"
+
+        task = self._inflight.get((key, version))
+        if task is not None:
+            self.counters["coalesced"] += 1
+            status = "COALESCED"
+        else:
+            self.counters["misses"] += 1
+            status = "MISS"
+            task = asyncio.ensure_future(self._compute(key, version, compute))
+            self._inflight[(key, version)] = task
+            task.add_done_callback(lambda _: self._inflight.pop((key, version), None))
+        # 한 요청이 끊겨도 계산은 계속되어 기다리는 다른 요청에 전달됨
+        return await asyncio.shield(task), status
+
+    async def _compute(self, key: str, version: int, compute: Callable[[], Any]) -> CachedResponse:
+        from fastapi.encoders import jsonable_encoder
+
+        if asyncio.iscoroutinefunction(compute):
+            value = await compute()
+        else:
+            value = await asyncio.to_thread(compute)
+        body = json.dumps(jsonable_encoder(value), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+        entry = CachedResponse(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                               version=version, created=time.monotonic())
+        if self.enabled:
+            self._store(key, entry)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 카운터 및 용량 현황"""
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"] + self.counters["coalesced"]
+            return {
+                "enabled": self.enabled,
+                **self.counters,
+                "hit_rate": round((lookups - self.counters["misses"]) / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "data_version": data_version(),
+            }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag 와 일치하는지 (약한 비교, '*' 허용)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def cached_json_response(request, endpoint: str, params: Optional[Mapping[str, Any]],
+                               compute: Callable[[], Union[Any, Awaitable[Any]]]):
+    """
+    읽기 전용 엔드포인트 응답 캐시 (read-through)
+
+    Args:
+        request: FastAPI Request (If-None-Match 확인용)
+        endpoint: 캐시 키 구분용 엔드포인트 이름
+        params: 응답을 바꾸는 요청 파라미터
+        compute: 응답 데이터를 만드는 함수 (동기/비동기)
+
+    Returns:
+        JSON 본문과 ETag 를 담은 Response, 클라이언트 ETag 가 같으면 304
+    """
+    from fastapi.responses import Response
+
+    entry, status = await response_cache.get_or_compute(response_cache.make_key(endpoint, params), compute)
+    headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL, "X-Cache": status}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        response_cache.counters["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# 전역 캐시 인스턴스
+response_cache = ResponseCache()
@@ -0,0 +1,71 @@
+"""
+AIRISS 전문 검색 유틸리티
+검색어 분리, SQLite FTS5 trigram MATCH 식 생성, 검색어 강조 스니펫
+
+trigram 인덱스는 3글자 이상 검색어만 인덱스로 찾을 수 있으므로
+2글자 이하 검색어(예: "성실")는 호출 측에서 부분 문자열 조건으로 처리합니다.
+"""
+import html
+import re
+from typing import List, Optional, Sequence, Tuple
+
+TRIGRAM_MIN_LENGTH = 3
+MAX_SEARCH_TERMS = 8
+SNIPPET_MARK = ("<mark>", "</mark>")
+SNIPPET_ELLIPSIS = "…"
+
+
+def search_terms(query: Optional[str]) -> List[str]:
+    """공백 기준 검색어 목록 (중복 제거, 최대 MAX_SEARCH_TERMS 개)"""
+    terms: List[str] = []
+    for term in (query or "").split():
+        term = term.strip()
+        if term and term not in terms:
+            terms.append(term)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+def split_terms(terms: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """(trigram 인덱스로 찾을 검색어, 부분 문자열로 찾을 짧은 검색어)"""
+    indexed = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    short = [term for term in terms if len(term) < TRIGRAM_MIN_LENGTH]
+    return indexed, short
+
+
+def fts5_match_expression(terms: Sequence[str]) -> Optional[str]:
+    """FTS5 MATCH 식 - 검색어를 따옴표로 감싸 AND 결합 (검색어 안의 FTS 문법은 무시됨)"""
+    if not terms:
+        return None
+    return " AND ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def like_pattern(term: str) -> str:
+    """LIKE 부분 문자열 패턴 (ESCAPE '\\' 와 함께 사용)"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def highlight_snippet(text: Optional[str], terms: Sequence[str], width: int = 40) -> Optional[str]:
+    """
+    첫 번째 일치 위치 주변 스니펫 (일치 부분은 <mark> 로 감싸고 나머지는 HTML 이스케이프)
+
+    Returns:
+        일치하는 검색어가 없으면 None
+    """
+    if not text or not terms:
+        return None
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    match = pattern.search(text)
+    if match is None:
+        return None
+
+    start = max(0, match.start() - width)
+    end = min(len(text), match.end() + width)
+    window = text[start:end]
+    pieces, cursor = [], 0
+    for found in pattern.finditer(window):
+        pieces.append(html.escape(window[cursor:found.start()]))
+        pieces.append(f"{SNIPPET_MARK[0]}{html.escape(found.group())}{SNIPPET_MARK[1]}")
+        cursor = found.end()
+    pieces.append(html.escape(window[cursor:]))
+    return (SNIPPET_ELLIPSIS if start > 0 else "") + "".join(pieces) + (SNIPPET_ELLIPSIS if end < len(text) else "")
@@ -0,0 +1,160 @@
+# scripts/benchmark_scoring_pool.py
+"""
+점수화 프로세스 풀 벤치마크
+
+합성 데이터(기본 100,000행)를 프로세스 내 analyze_batch 와 워커 수별 ScoringPool 로 점수화하여
+소요 시간/속도 향상과 결과 일치 여부를 출력합니다.
+--pipeline 을 주면 같은 데이터를 CSV 로 저장해 AnalysisPipeline(읽기 → 점수화, 보강/저장 생략)으로
+실행하고, 작업과 같은 방식으로 정한 청크 크기와 풀 샤드 사용 현황을 함께 출력합니다.
+
+사용법:
+    python scripts/benchmark_scoring_pool.py --rows 100000 --processes 1 2 4 8
+    python scripts/benchmark_scoring_pool.py --rows 100000 --processes 2 4 --pipeline
+"""
+
+import argparse
+import logging
+import os
+import asyncio
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+PHRASES = [
+    "업무 성과가 우수하고", "목표 달성률이 높으며", "책임감이 강하고", "소통이 다소 부족하지만",
+    "팀워크를 중시하며", "리더십을 발휘하여", "새로운 기술 학습에 적극적이고", "보고가 늦는 편이며",
+    "창의적인 아이디어로", "고객 만족도를 높였고", "지각이 잦아 개선이 필요하고", "윤리 의식이 투철하다",
+]
+
+
+def build_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """평가 의견 + 정량 컬럼을 가진 합성 데이터"""
+    rng = random.Random(seed)
+    numbers = np.random.RandomState(seed)
+    return pd.DataFrame({
+        "uid": [f"EMP{i:06d}" for i in range(rows)],
+        "평가의견": [
+            " ".join(rng.choices(PHRASES, k=rng.randint(3, 7))) + f" (프로젝트 {rng.randint(1, 500)}건)"
+            for _ in range(rows)
+        ],
+        "성과점수": numbers.randint(40, 100, rows),
+        "KPI달성률": np.round(numbers.rand(rows) * 120, 1),
+        "평가등급": numbers.choice(["S", "A", "B", "C", "D"], rows),
+    })
+
+
+def run_pipeline(analyzer, pool, csv_path: str, rows: int, chunk_size: int):
+    """AnalysisPipeline 으로 CSV 전체를 점수화 (보강/저장 단계는 비움) - (소요 시간, 하이브리드 점수) 반환"""
+    from app.services.analysis_pipeline import AnalysisPipeline, FileChunkReader
+
+    scores = []
+
+    def score(frame: pd.DataFrame):
+        return pool.analyze_batch(analyzer, frame["평가의견"].tolist(), frame, frame["uid"].tolist())
+
+    async def enrich(chunk):
+        scores.append(chunk.batch.hybrid_scores)
+        return []
+
+    async def persist(chunk):
+        return None
+
+    pipeline = AnalysisPipeline(FileChunkReader(csv_path, chunk_size=chunk_size, limit=rows), score, enrich, persist)
+    started = time.perf_counter()
+    asyncio.run(pipeline.run())
+    return time.perf_counter() - started, np.concatenate(scores)
+
+
+def benchmark_pipeline(analyzer, frame: pd.DataFrame, processes_list, min_shard_rows: int):
+    """작업 실행 경로(AnalysisPipeline + 기본 청크 크기)에서 워커 수별 점수화 시간 비교"""
+    from app.services.analysis_cache import analysis_cache
+    from app.services.analysis_pipeline import DEFAULT_CHUNK_SIZE
+    from app.services.scoring_pool import ScoringPool
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, "benchmark.csv")
+        frame.to_csv(csv_path, index=False)
+
+        print(f"\n[AnalysisPipeline] 기본 청크 크기: {DEFAULT_CHUNK_SIZE}")
+        print(f"{'프로세스':>8} {'청크':>8} {'시간(s)':>10} {'속도 향상':>10} {'샤드':>6} {'일치':>6}")
+        analysis_cache.clear()
+        inline = ScoringPool(processes=0)
+        baseline_seconds, baseline = run_pipeline(analyzer, inline, csv_path, len(frame),
+                                                  inline.chunk_size(DEFAULT_CHUNK_SIZE))
+        print(f"{'inline':>8} {DEFAULT_CHUNK_SIZE:>8} {baseline_seconds:>10.2f} {1.0:>10.2f} {0:>6} {'-':>6}")
+
+        for processes in processes_list:
+            if processes <= 1:
+                continue
+            pool = ScoringPool(processes=processes, min_shard_rows=min_shard_rows)
+            pool.warmup()
+            chunk_size = pool.chunk_size(DEFAULT_CHUNK_SIZE)
+            try:
+                analysis_cache.clear()
+                seconds, scores = run_pipeline(analyzer, pool, csv_path, len(frame), chunk_size)
+            finally:
+                pool.shutdown()
+            identical = np.array_equal(scores, baseline)
+            print(f"{processes:>8} {chunk_size:>8} {seconds:>10.2f} {baseline_seconds / seconds:>10.2f} "
+                  f"{pool.counters['shards']:>6} {str(identical):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIRISS 점수화 프로세스 풀 벤치마크")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--processes", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--min-shard-rows", type=int, default=1000)
+    parser.add_argument("--pipeline", action="store_true", help="AnalysisPipeline 경로로도 측정")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    from app.services.analysis_cache import analysis_cache
+    from app.services.analyzer_registry import analyzer_registry
+    from app.services.scoring_pool import ScoringPool
+
+    analyzer = analyzer_registry.get_hybrid_analyzer()
+    frame = build_frame(args.rows)
+    opinions = frame["평가의견"].tolist()
+    uids = frame["uid"].tolist()
+    print(f"행 수: {args.rows:,} / CPU: {os.cpu_count()}")
+
+    # 기준: 프로세스 내 처리 (캐시를 비워 매 실행이 같은 조건에서 시작)
+    analysis_cache.clear()
+    started = time.perf_counter()
+    baseline = analyzer.analyze_batch(opinions, frame, uids)
+    baseline_seconds = time.perf_counter() - started
+    print(f"{'프로세스':>8} {'시간(s)':>10} {'속도 향상':>10} {'일치':>6}")
+    print(f"{'inline':>8} {baseline_seconds:>10.2f} {1.0:>10.2f} {'-':>6}")
+
+    for processes in args.processes:
+        if processes <= 1:
+            continue
+        pool = ScoringPool(processes=processes, min_shard_rows=args.min_shard_rows)
+        pool.warmup()  # 워커 기동/분석기 로드는 측정에서 제외
+        try:
+            started = time.perf_counter()
+            result = pool.analyze_batch(analyzer, opinions, frame, uids)
+            seconds = time.perf_counter() - started
+        finally:
+            pool.shutdown()
+        identical = (
+            np.array_equal(result.hybrid_scores, baseline.hybrid_scores)
+            and np.array_equal(result.grade_indices, baseline.grade_indices)
+            and np.array_equal(result.dimension_scores, baseline.dimension_scores)
+        )
+        print(f"{processes:>8} {seconds:>10.2f} {baseline_seconds / seconds:>10.2f} {str(identical):>6}")
+
+    if args.pipeline:
+        benchmark_pipeline(analyzer, frame, args.processes, args.min_shard_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# scripts/rebuild_stats.py
+"""대시보드 결과 집계 전체 재구축 스크립트 (직원 결과 / 분석 결과 영구 저장소 / SQLite results)"""
+
+import argparse
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal, init_db
+from app.services.result_stats import rebuild_analysis_stats, rebuild_employee_stats
+
+TARGETS = ("employee", "analysis", "sqlite")
+
+
+def rebuild_stats(targets=TARGETS):
+    """선택한 집계 테이블 재구축"""
+    print("결과 집계 재구축 시작...")
+    init_db()  # 집계 테이블이 없으면 생성
+
+    db = SessionLocal()
+    try:
+        if "employee" in targets:
+            print(f"✅ employee_result_stats: 결과 {rebuild_employee_stats(db)}개 집계")
+        if "analysis" in targets:
+            print(f"✅ analysis_result_stats: 결과 {rebuild_analysis_stats(db)}개 집계")
+    finally:
+        db.close()
+
+    if "sqlite" in targets:
+        from app.db.sqlite_service import close_pools, sqlite_service
+
+        async def rebuild_sqlite():
+            try:
+                await sqlite_service.init_database()
+                await sqlite_service.rebuild_result_stats()
+            finally:
+                await close_pools()
+
+        asyncio.run(rebuild_sqlite())
+        print("✅ result_stats (SQLite) 재구축 완료")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="대시보드 결과 집계 재구축")
+    parser.add_argument("targets", nargs="*", choices=TARGETS, help="재구축할 집계 (기본: 전체)")
+    args = parser.parse_args()
+    rebuild_stats(args.targets or TARGETS)